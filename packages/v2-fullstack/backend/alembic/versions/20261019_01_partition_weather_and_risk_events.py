@@ -0,0 +1,184 @@
+"""Partition weather_data and risk_events by data_type and month
+
+Revision ID: 20261019_01
+Revises: 20260121_01
+Create Date: 2026-10-19
+
+分区方案: LIST(data_type) → RANGE(timestamp) 按UTC自然月, 见 app/models/partitioning.py
+
+迁移步骤(每张表):
+1. 原表改名为 *_legacy
+2. 创建分区父表 + 覆盖历史数据月份及未来月份的子分区
+3. INSERT ... SELECT 搬迁数据
+4. 删除 legacy 表后在父表上重建索引(自动下推到所有分区)
+
+注意:
+- 分区表主键必须包含分区键: (id, timestamp, data_type)
+- claims.risk_event_id 外键无法指向分区表, 改为逻辑关联
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.partitioning import (
+    DEFAULT_MONTHS_AHEAD,
+    add_months,
+    build_partition_ddl,
+    iter_month_starts,
+    month_start,
+)
+
+# revision identifiers, used by Alembic.
+revision = "20261019_01"
+down_revision = "20260121_01"
+branch_labels = None
+depends_on = None
+
+
+WEATHER_INDEXES = [
+    ("ix_weather_data_timestamp", ["timestamp"]),
+    ("ix_weather_data_region_code", ["region_code"]),
+    ("ix_weather_data_weather_type", ["weather_type"]),
+    ("ix_weather_data_data_type", ["data_type"]),
+    ("ix_weather_data_prediction_run_id", ["prediction_run_id"]),
+    ("ix_weather_data_h3_index", ["h3_index"]),
+    ("idx_weather_query", ["region_code", "weather_type", "data_type", "timestamp"]),
+    ("idx_weather_predicted", ["prediction_run_id", "weather_type", "timestamp"]),
+]
+
+RISK_EVENT_INDEXES = [
+    ("ix_risk_events_timestamp", ["timestamp"]),
+    ("ix_risk_events_region_code", ["region_code"]),
+    ("ix_risk_events_product_id", ["product_id"]),
+    ("ix_risk_events_weather_type", ["weather_type"]),
+    ("ix_risk_events_data_type", ["data_type"]),
+    ("ix_risk_events_prediction_run_id", ["prediction_run_id"]),
+    ("idx_risk_query", ["region_code", "weather_type", "data_type", "timestamp"]),
+    ("idx_risk_predicted", ["prediction_run_id", "product_id", "timestamp"]),
+]
+
+HISTORICAL_WHERE = "data_type = 'historical' AND prediction_run_id IS NULL"
+
+
+def _partition_months(table_name: str) -> list:
+    """覆盖已有数据的月份 + 当月起未来 DEFAULT_MONTHS_AHEAD 个月"""
+    bind = op.get_bind()
+    row = bind.execute(
+        sa.text(f"SELECT min(timestamp), max(timestamp) FROM {table_name}")
+    ).one()
+    current = month_start(datetime.now(timezone.utc))
+    start = month_start(row[0]) if row[0] is not None else current
+    end = add_months(current, DEFAULT_MONTHS_AHEAD)
+    if row[1] is not None and month_start(row[1]) > end:
+        end = month_start(row[1])
+    return iter_month_starts(min(start, current), end)
+
+
+def _create_weather_parent(table_name: str, partitioned: bool) -> None:
+    kwargs = {"postgresql_partition_by": "LIST (data_type)"} if partitioned else {}
+    primary_key = ["id", "timestamp", "data_type"] if partitioned else ["id"]
+    op.create_table(
+        table_name,
+        sa.Column("id", sa.String(100), nullable=False, comment="主键ID"),
+        sa.Column("timestamp", sa.DateTime(timezone=True), nullable=False, comment="观测/预测时间(UTC)"),
+        sa.Column("region_code", sa.String(20), nullable=False, comment="区域代码"),
+        sa.Column("weather_type", sa.String(20), nullable=False, comment="天气类型(rainfall/wind/temperature)"),
+        sa.Column("value", sa.Numeric(precision=10, scale=2), nullable=False, comment="数值"),
+        sa.Column("unit", sa.String(20), nullable=False, comment="单位(mm/celsius/km_h)"),
+        sa.Column("data_type", sa.String(20), nullable=False, comment="historical/predicted"),
+        sa.Column("prediction_run_id", sa.String(50), nullable=True, comment="预测批次ID(predicted必须)"),
+        sa.Column("h3_index", sa.String(20), nullable=True, comment="H3索引(用于空间聚合)"),
+        sa.Column("metadata_json", postgresql.JSONB(), nullable=True, comment="扩展元数据"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, comment="创建时间(UTC)"),
+        sa.PrimaryKeyConstraint(*primary_key),
+        **kwargs,
+    )
+
+
+def _create_risk_event_parent(table_name: str, partitioned: bool) -> None:
+    kwargs = {"postgresql_partition_by": "LIST (data_type)"} if partitioned else {}
+    primary_key = ["id", "timestamp", "data_type"] if partitioned else ["id"]
+    op.create_table(
+        table_name,
+        sa.Column("id", sa.String(50), nullable=False, comment="事件ID"),
+        sa.Column("timestamp", sa.DateTime(timezone=True), nullable=False, comment="事件时间(UTC)"),
+        sa.Column("region_code", sa.String(20), nullable=False, comment="区域代码"),
+        sa.Column("product_id", sa.String(50), sa.ForeignKey("products.id"), nullable=False, comment="产品ID"),
+        sa.Column("product_version", sa.String(20), nullable=False, comment="产品版本(可追溯)"),
+        sa.Column("weather_type", sa.String(20), nullable=False, comment="天气类型"),
+        sa.Column("tier_level", sa.Integer(), nullable=False, comment="风险等级(1/2/3)"),
+        sa.Column("trigger_value", sa.Numeric(10, 2), nullable=False, comment="触发值"),
+        sa.Column("threshold_value", sa.Numeric(10, 2), nullable=False, comment="阈值"),
+        sa.Column("data_type", sa.String(20), nullable=False, comment="historical/predicted"),
+        sa.Column("prediction_run_id", sa.String(50), nullable=True, comment="预测批次ID(predicted必须)"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, comment="创建时间(UTC)"),
+        sa.PrimaryKeyConstraint(*primary_key),
+        **kwargs,
+    )
+
+
+def _swap_table(table_name: str, create_parent, indexes: list, partitioned: bool) -> None:
+    legacy = f"{table_name}_legacy"
+    months = _partition_months(table_name) if partitioned else []
+
+    # 索引名全局唯一: 先删旧索引, 再改名
+    for index_name, _ in indexes:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+    op.rename_table(table_name, legacy)
+    op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table_name}_pkey TO {legacy}_pkey")
+
+    create_parent(table_name, partitioned)
+    if partitioned:
+        for statement in build_partition_ddl(table_name, months):
+            op.execute(statement)
+
+    columns = ", ".join(
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns(legacy)
+    )
+    op.execute(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {legacy}")
+    op.drop_table(legacy)
+
+    for index_name, columns in indexes:
+        op.create_index(index_name, table_name, columns)
+
+
+def upgrade() -> None:
+    op.drop_constraint("claims_risk_event_id_fkey", "claims", type_="foreignkey")
+    op.drop_index("uq_risk_event_historical", table_name="risk_events")
+
+    _swap_table("weather_data", _create_weather_parent, WEATHER_INDEXES, partitioned=True)
+    _swap_table("risk_events", _create_risk_event_parent, RISK_EVENT_INDEXES, partitioned=True)
+
+    # 分区表上的唯一索引必须包含分区键(data_type)
+    op.create_index(
+        "uq_risk_event_historical",
+        "risk_events",
+        ["data_type", "product_id", "region_code", "timestamp", "weather_type", "tier_level"],
+        unique=True,
+        postgresql_where=sa.text(HISTORICAL_WHERE),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_risk_event_historical", table_name="risk_events")
+
+    # 分区 → 普通表 (分区子表随 legacy 父表一起删除)
+    _swap_table("weather_data", _create_weather_parent, WEATHER_INDEXES, partitioned=False)
+    _swap_table("risk_events", _create_risk_event_parent, RISK_EVENT_INDEXES, partitioned=False)
+
+    op.create_index(
+        "uq_risk_event_historical",
+        "risk_events",
+        ["product_id", "region_code", "timestamp", "weather_type", "tier_level"],
+        unique=True,
+        postgresql_where=sa.text(HISTORICAL_WHERE),
+    )
+    op.create_foreign_key(
+        "claims_risk_event_id_fkey",
+        "claims",
+        "risk_events",
+        ["risk_event_id"],
+        ["id"],
+    )
@@ -0,0 +1,47 @@
+"""Add H3 cell mapping tables
+
+Revision ID: 20261019_02
+Revises: 20261019_01
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_02"
+down_revision = "20261019_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "h3_cell_regions",
+        sa.Column("h3_index", sa.String(20), primary_key=True, comment="H3单元索引"),
+        sa.Column("resolution", sa.Integer(), nullable=False, comment="H3分辨率"),
+        sa.Column("province_code", sa.String(20), nullable=False, comment="省级区域代码(RegionScope.PROVINCE)"),
+        sa.Column("district_code", sa.String(20), nullable=True, comment="区县级区域代码(RegionScope.DISTRICT, 可选)"),
+    )
+    op.create_index("ix_h3_cell_regions_province_code", "h3_cell_regions", ["province_code"])
+    op.create_index("ix_h3_cell_regions_district_code", "h3_cell_regions", ["district_code"])
+
+    op.create_table(
+        "h3_cell_parents",
+        sa.Column("h3_index", sa.String(20), primary_key=True, comment="H3单元索引"),
+        sa.Column("parent_resolution", sa.Integer(), primary_key=True, comment="父单元分辨率"),
+        sa.Column("parent_index", sa.String(20), nullable=False, comment="父单元索引"),
+    )
+    op.create_index(
+        "idx_h3_parent_lookup",
+        "h3_cell_parents",
+        ["parent_resolution", "parent_index"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_h3_parent_lookup", table_name="h3_cell_parents")
+    op.drop_table("h3_cell_parents")
+    op.drop_index("ix_h3_cell_regions_district_code", table_name="h3_cell_regions")
+    op.drop_index("ix_h3_cell_regions_province_code", table_name="h3_cell_regions")
+    op.drop_table("h3_cell_regions")
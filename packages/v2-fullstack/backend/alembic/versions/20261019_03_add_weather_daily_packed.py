@@ -0,0 +1,56 @@
+"""Add weather_daily_packed compact storage table
+
+Revision ID: 20261019_03
+Revises: 20261019_02
+Create Date: 2026-10-19
+
+数据回填: python -m app.tools.backfill_weather_packed --start ... --end ...
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_03"
+down_revision = "20261019_02"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "weather_daily_packed",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True, comment="主键ID"),
+        sa.Column("region_code", sa.String(20), nullable=False, comment="区域代码"),
+        sa.Column("weather_type", sa.String(20), nullable=False, comment="天气类型"),
+        sa.Column("data_type", sa.String(20), nullable=False, comment="historical/predicted"),
+        sa.Column("prediction_run_id", sa.String(50), nullable=True, comment="预测批次ID(predicted必须)"),
+        sa.Column("local_date", sa.Date(), nullable=False, comment="本地自然日"),
+        sa.Column("region_timezone", sa.String(50), nullable=False, comment="自然日所用时区"),
+        sa.Column("day_start", sa.DateTime(timezone=True), nullable=False, comment="本地自然日起点(UTC), 槽位0对应时间"),
+        sa.Column("slot_count", sa.SmallInteger(), nullable=False, comment="小时槽位数(DST日为23/25)"),
+        sa.Column("unit", sa.String(20), nullable=False, comment="单位"),
+        sa.Column("scale", sa.SmallInteger(), nullable=False, comment="数值放大位数(10^scale)"),
+        sa.Column("packed_values", sa.LargeBinary(), nullable=False, comment="小端int64数组"),
+        sa.Column("validity", sa.LargeBinary(), nullable=False, comment="有效位图(LSB first)"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, comment="更新时间(UTC)"),
+    )
+    op.create_index(
+        "uq_weather_packed_historical",
+        "weather_daily_packed",
+        ["region_code", "weather_type", "local_date"],
+        unique=True,
+        postgresql_where=sa.text("data_type = 'historical' AND prediction_run_id IS NULL"),
+    )
+    op.create_index(
+        "uq_weather_packed_predicted",
+        "weather_daily_packed",
+        ["prediction_run_id", "region_code", "weather_type", "local_date"],
+        unique=True,
+        postgresql_where=sa.text("prediction_run_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_weather_packed_predicted", table_name="weather_daily_packed")
+    op.drop_index("uq_weather_packed_historical", table_name="weather_daily_packed")
+    op.drop_table("weather_daily_packed")
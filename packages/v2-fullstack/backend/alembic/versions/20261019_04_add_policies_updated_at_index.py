@@ -0,0 +1,23 @@
+"""Add policies.updated_at index for incremental portfolio refresh
+
+Revision ID: 20261019_04
+Revises: 20261019_03
+Create Date: 2026-10-19
+
+保单组合索引(app/services/policy_portfolio.py)按 updated_at 水位增量拉取变更
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_04"
+down_revision = "20261019_03"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_policies_updated_at", "policies", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_policies_updated_at", table_name="policies")
@@ -0,0 +1,55 @@
+"""Add claim/policy daily summary tables for statistics endpoints
+
+Revision ID: 20261019_05
+Revises: 20261019_04
+Create Date: 2026-10-19
+
+汇总口径见 app/models/stats_summary.py; 建表后按事实表回填理赔汇总
+(与对账任务 reconcile_stats_summaries_task 使用同一组语句);
+保单汇总在 20261019_10 补齐保障结束日主键列后回填
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.stats_summary import build_claim_rebuild_statements
+
+# revision identifiers, used by Alembic.
+revision = "20261019_05"
+down_revision = "20261019_04"
+branch_labels = None
+depends_on = None
+
+
+def _create_summary_table(table_name: str, count_column: str, amount_column: str) -> None:
+    op.create_table(
+        table_name,
+        sa.Column("region_code", sa.String(20), nullable=False, comment="区域代码"),
+        sa.Column("product_id", sa.String(50), nullable=False, comment="产品ID"),
+        sa.Column("local_date", sa.Date(), nullable=False, comment="本地自然日"),
+        sa.Column("status", sa.String(20), nullable=False, comment="状态"),
+        sa.Column(count_column, sa.BigInteger(), nullable=False, server_default="0", comment="数量"),
+        sa.Column(
+            amount_column,
+            sa.Numeric(precision=18, scale=2),
+            nullable=False,
+            server_default="0",
+            comment="金额合计",
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, comment="更新时间(UTC)"),
+        sa.PrimaryKeyConstraint("region_code", "product_id", "local_date", "status"),
+    )
+
+
+def upgrade() -> None:
+    _create_summary_table("claim_daily_summary", "claim_count", "payout_amount_sum")
+    _create_summary_table("policy_daily_summary", "policy_count", "coverage_amount_sum")
+
+    bind = op.get_bind()
+    regions = bind.execute(sa.text("SELECT DISTINCT region_code FROM claims")).scalars().all()
+    for statement in build_claim_rebuild_statements(regions):
+        bind.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_table("policy_daily_summary")
+    op.drop_table("claim_daily_summary")
@@ -0,0 +1,44 @@
+"""Add composite indexes for claim keyset listings
+
+Revision ID: 20261019_06
+Revises: 20261019_05
+Create Date: 2026-10-19
+
+理赔列表按 (triggered_at DESC, id DESC) keyset 分页, 常见筛选形态:
+- 无筛选 / 仅时间范围
+- policy_id
+- region_code
+- product_id + status
+- status + tier_level
+
+idx_claim_query / idx_claim_region_time 为新索引的前缀, 一并替换
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_06"
+down_revision = "20261019_05"
+branch_labels = None
+depends_on = None
+
+LISTING_INDEXES = {
+    "ix_claims_triggered_id": ["triggered_at", "id"],
+    "ix_claims_policy_triggered_id": ["policy_id", "triggered_at", "id"],
+    "ix_claims_region_triggered_id": ["region_code", "triggered_at", "id"],
+    "ix_claims_product_status_triggered_id": ["product_id", "status", "triggered_at", "id"],
+    "ix_claims_status_tier_triggered_id": ["status", "tier_level", "triggered_at", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in LISTING_INDEXES.items():
+        op.create_index(name, "claims", columns)
+    op.drop_index("idx_claim_query", table_name="claims")
+    op.drop_index("idx_claim_region_time", table_name="claims")
+
+
+def downgrade() -> None:
+    op.create_index("idx_claim_region_time", "claims", ["region_code", "triggered_at"])
+    op.create_index("idx_claim_query", "claims", ["policy_id", "triggered_at", "status"])
+    for name in reversed(list(LISTING_INDEXES)):
+        op.drop_index(name, table_name="claims")
@@ -0,0 +1,64 @@
+"""Add risk_event_episodes companion table
+
+Revision ID: 20261019_07
+Revises: 20261019_06
+Create Date: 2026-10-19
+
+连续触发窗口合并后的风险事件段, 口径见 app/models/risk_episode.py。
+不在迁移中回填: 合并依赖产品 riskRules(步长/operator), 由风险计算任务
+在下一次写入对应序列时按已落库 risk_events 重建。
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_07"
+down_revision = "20261019_06"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "risk_event_episodes",
+        sa.Column("id", sa.String(50), primary_key=True, comment="事件段ID"),
+        sa.Column("region_code", sa.String(20), nullable=False, comment="区域代码"),
+        sa.Column(
+            "product_id",
+            sa.String(50),
+            sa.ForeignKey("products.id"),
+            nullable=False,
+            comment="产品ID",
+        ),
+        sa.Column("product_version", sa.String(20), nullable=False, comment="产品版本"),
+        sa.Column("weather_type", sa.String(20), nullable=False, comment="天气类型"),
+        sa.Column("data_type", sa.String(20), nullable=False, comment="historical/predicted"),
+        sa.Column("prediction_run_id", sa.String(50), nullable=True, comment="预测批次ID"),
+        sa.Column("start_at", sa.DateTime(timezone=True), nullable=False, comment="首个触发窗口结束时刻"),
+        sa.Column("end_at", sa.DateTime(timezone=True), nullable=False, comment="末个触发窗口结束时刻"),
+        sa.Column("peak_at", sa.DateTime(timezone=True), nullable=False, comment="最严重窗口时刻"),
+        sa.Column("peak_tier", sa.Integer(), nullable=False, comment="最高风险等级"),
+        sa.Column("peak_value", sa.Numeric(10, 2), nullable=False, comment="最严重窗口触发值"),
+        sa.Column("threshold_value", sa.Numeric(10, 2), nullable=False, comment="最高等级对应阈值"),
+        sa.Column("window_count", sa.Integer(), nullable=False, comment="合并的触发窗口数"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, comment="创建时间(UTC)"),
+    )
+    op.create_index(
+        "ix_risk_episodes_query",
+        "risk_event_episodes",
+        ["region_code", "weather_type", "data_type", "start_at"],
+    )
+    op.create_index(
+        "ix_risk_episodes_series",
+        "risk_event_episodes",
+        ["product_id", "region_code", "weather_type", "data_type", "end_at"],
+    )
+    op.create_index(
+        "ix_risk_episodes_predicted",
+        "risk_event_episodes",
+        ["prediction_run_id", "product_id", "start_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("risk_event_episodes")
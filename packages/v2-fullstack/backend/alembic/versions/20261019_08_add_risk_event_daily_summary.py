@@ -0,0 +1,54 @@
+"""Add risk event daily summary and date indexes for L0 KPI cubes
+
+Revision ID: 20261019_08
+Revises: 20261019_07
+Create Date: 2026-10-19
+
+L0 Dashboard 从日汇总立方体读取 KPI/TopN(见 app/services/kpi_cube.py):
+- 新增 risk_event_daily_summary(仅 historical), 建表后按事实表回填一次
+- claim/policy 汇总表补 (local_date, region_code) 索引, 支撑跨区域的本地日范围扫描
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.stats_summary import build_risk_rebuild_statements
+
+# revision identifiers, used by Alembic.
+revision = "20261019_08"
+down_revision = "20261019_07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "risk_event_daily_summary",
+        sa.Column("region_code", sa.String(20), nullable=False, comment="区域代码"),
+        sa.Column("product_id", sa.String(50), nullable=False, comment="产品ID"),
+        sa.Column("weather_type", sa.String(20), nullable=False, comment="天气类型"),
+        sa.Column("local_date", sa.Date(), nullable=False, comment="事件时间的区域本地自然日"),
+        sa.Column("tier_level", sa.Integer(), nullable=False, comment="风险等级(1/2/3)"),
+        sa.Column("event_count", sa.BigInteger(), nullable=False, server_default="0", comment="事件数量"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, comment="更新时间(UTC)"),
+        sa.PrimaryKeyConstraint("region_code", "product_id", "weather_type", "local_date", "tier_level"),
+    )
+    op.create_index(
+        "ix_risk_event_daily_summary_date",
+        "risk_event_daily_summary",
+        ["local_date", "weather_type", "region_code"],
+    )
+    op.create_index("ix_claim_daily_summary_date", "claim_daily_summary", ["local_date", "region_code"])
+    op.create_index("ix_policy_daily_summary_date", "policy_daily_summary", ["local_date", "region_code"])
+
+    bind = op.get_bind()
+    regions = bind.execute(
+        sa.text("SELECT DISTINCT region_code FROM risk_events WHERE data_type = 'historical'")
+    ).scalars().all()
+    for statement in build_risk_rebuild_statements(regions):
+        bind.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_policy_daily_summary_date", table_name="policy_daily_summary")
+    op.drop_index("ix_claim_daily_summary_date", table_name="claim_daily_summary")
+    op.drop_table("risk_event_daily_summary")
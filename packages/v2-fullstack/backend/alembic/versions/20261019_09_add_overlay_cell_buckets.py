@@ -0,0 +1,60 @@
+"""Add overlay_cell_buckets and tile coordinates for map overlay tiles
+
+Revision ID: 20261019_09
+Revises: 20261019_08
+Create Date: 2026-10-19
+
+地图叠加层瓦片(见 app/services/overlay_tiles.py):
+- h3_cell_regions 增加 base zoom 瓦片坐标(由 seed_h3_cells 重新执行回填, 需要 h3 库)
+- overlay_cell_buckets 由 precompute_overlays_task 维护, 迁移不回填
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_09"
+down_revision = "20261019_08"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "h3_cell_regions",
+        sa.Column("tile_x", sa.Integer(), nullable=True, comment="单元中心点瓦片X(OVERLAY_BASE_ZOOM)"),
+    )
+    op.add_column(
+        "h3_cell_regions",
+        sa.Column("tile_y", sa.Integer(), nullable=True, comment="单元中心点瓦片Y(OVERLAY_BASE_ZOOM)"),
+    )
+    op.create_table(
+        "overlay_cell_buckets",
+        sa.Column("weather_type", sa.String(20), nullable=False, comment="天气类型"),
+        sa.Column("series_key", sa.String(80), nullable=False, comment="historical / predicted:{run_id}"),
+        sa.Column("granularity", sa.String(10), nullable=False, comment="时间桶粒度"),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False, comment="时间桶起点(UTC)"),
+        sa.Column("h3_index", sa.String(20), nullable=False, comment="H3单元索引"),
+        sa.Column("province_code", sa.String(20), nullable=False, comment="省级区域代码"),
+        sa.Column("district_code", sa.String(20), nullable=True, comment="区县级区域代码"),
+        sa.Column("tile_x", sa.Integer(), nullable=False, comment="瓦片X(OVERLAY_BASE_ZOOM)"),
+        sa.Column("tile_y", sa.Integer(), nullable=False, comment="瓦片Y(OVERLAY_BASE_ZOOM)"),
+        sa.Column("weather_avg", sa.Numeric(precision=10, scale=2), nullable=False, comment="桶内均值"),
+        sa.Column("weather_max", sa.Numeric(precision=10, scale=2), nullable=False, comment="桶内最大值"),
+        sa.Column("risk_tier", sa.SmallInteger(), nullable=False, server_default="0", comment="风险强度(0-3)"),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False, comment="预计算时间(UTC)"),
+        sa.PrimaryKeyConstraint(
+            "weather_type", "series_key", "granularity", "bucket_start", "h3_index"
+        ),
+    )
+    op.create_index(
+        "ix_overlay_cell_buckets_tile",
+        "overlay_cell_buckets",
+        ["weather_type", "series_key", "granularity", "bucket_start", "tile_x", "tile_y"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_overlay_cell_buckets_tile", table_name="overlay_cell_buckets")
+    op.drop_table("overlay_cell_buckets")
+    op.drop_column("h3_cell_regions", "tile_y")
+    op.drop_column("h3_cell_regions", "tile_x")
@@ -0,0 +1,69 @@
+"""Key policy daily summary by coverage end day (in-force policy counts)
+
+Revision ID: 20261019_10
+Revises: 20261019_09
+Create Date: 2026-10-19
+
+L0 KPI 的 policy_count 为时间范围内的在保保单(保障期间与范围重叠), 而非范围内新起保的保单:
+- policy_daily_summary 增加 end_local_date(coverage_end 在保单 timezone 的自然日)并入主键
+- 新增 (end_local_date, region_code) 索引, 立方体查询按保障结束日排除已到期的组
+- 按事实表重建保单汇总(与对账任务同一组语句)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.stats_summary import build_policy_rebuild_statements
+
+# revision identifiers, used by Alembic.
+revision = "20261019_10"
+down_revision = "20261019_09"
+branch_labels = None
+depends_on = None
+
+OLD_KEY = ["region_code", "product_id", "local_date", "status"]
+
+
+def upgrade() -> None:
+    op.drop_constraint("policy_daily_summary_pkey", "policy_daily_summary", type_="primary")
+    op.add_column(
+        "policy_daily_summary",
+        sa.Column("end_local_date", sa.Date(), nullable=True, comment="保障结束的保单本地自然日"),
+    )
+
+    bind = op.get_bind()
+    for statement in build_policy_rebuild_statements():
+        bind.execute(statement)
+
+    op.alter_column("policy_daily_summary", "end_local_date", nullable=False)
+    op.create_primary_key(
+        "policy_daily_summary_pkey",
+        "policy_daily_summary",
+        ["region_code", "product_id", "local_date", "end_local_date", "status"],
+    )
+    op.create_index(
+        "ix_policy_daily_summary_end_date",
+        "policy_daily_summary",
+        ["end_local_date", "region_code"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_policy_daily_summary_end_date", table_name="policy_daily_summary")
+    op.drop_constraint("policy_daily_summary_pkey", "policy_daily_summary", type_="primary")
+    # 按旧主键合并各保障结束日的行
+    columns = ", ".join(OLD_KEY)
+    op.execute(
+        "CREATE TEMPORARY TABLE policy_daily_summary_merged ON COMMIT DROP AS "
+        f"SELECT {columns}, SUM(policy_count) AS policy_count, "
+        "SUM(coverage_amount_sum) AS coverage_amount_sum, MAX(updated_at) AS updated_at "
+        f"FROM policy_daily_summary GROUP BY {columns}"
+    )
+    op.execute("DELETE FROM policy_daily_summary")
+    op.drop_column("policy_daily_summary", "end_local_date")
+    op.execute(
+        f"INSERT INTO policy_daily_summary "
+        f"({columns}, policy_count, coverage_amount_sum, updated_at) "
+        f"SELECT {columns}, policy_count, coverage_amount_sum, updated_at "
+        "FROM policy_daily_summary_merged"
+    )
+    op.create_primary_key("policy_daily_summary_pkey", "policy_daily_summary", OLD_KEY)
@@ -4,11 +4,16 @@ Claim API Routes
 提供 claims 的查询与统计入口（对外读路径）。
 
 Endpoints:
-- GET /claims - 查询理赔列表（筛选）
+- GET /claims - 查询理赔列表（筛选, keyset 分页）
 - GET /claims/{id} - 获取理赔详情
-- GET /policies/{id}/claims - 获取保单理赔列表
+- POST /claims:batchGet - 批量按ID获取理赔（按请求顺序）
+- GET /policies/{id}/claims - 获取保单理赔列表（keyset 分页）
 - GET /statistics/claims - 理赔统计
 
+分页:
+- 列表按 (triggered_at DESC, id DESC) 排序, 响应体仍为数组(兼容旧调用方)
+- 下一页游标通过响应头 X-Next-Cursor 返回, 作为 cursor 参数回传; 无更多数据时不返回该头
+
 Reference:
 - docs/v2/v2实施细则/30-理赔表与Claim-Service-细则.md
 """
@@ -17,12 +22,12 @@ import logging
 from datetime import datetime
 from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_access_mode, get_session
-from app.schemas.claim import Claim, ClaimFilter, ClaimStats
-from app.schemas.shared import AccessMode
+from app.schemas.claim import Claim, ClaimBatch, ClaimFilter, ClaimPage, ClaimStats
+from app.schemas.shared import AccessMode, BatchGetRequest
 from app.services.claim_service import claim_service
 
 logger = logging.getLogger(__name__)
@@ -31,9 +36,18 @@ router = APIRouter(prefix="/claims", tags=["claims"])
 policy_router = APIRouter(prefix="/policies", tags=["claims"])
 stats_router = APIRouter(prefix="/statistics", tags=["statistics"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _page_body(page: ClaimPage, response: Response) -> List[Claim]:
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
 
 @router.get("", response_model=List[Claim])
 async def list_claims(
+    response: Response,
     session: Annotated[AsyncSession, Depends(get_session)],
     access_mode: Annotated[AccessMode, Depends(get_access_mode)],
     policy_id: Optional[str] = Query(None, description="保单ID"),
@@ -43,7 +57,8 @@ async def list_claims(
     tier_level: Optional[int] = Query(None, ge=1, le=3, description="档位等级"),
     start_time: Optional[datetime] = Query(None, description="开始时间(UTC)"),
     end_time: Optional[datetime] = Query(None, description="结束时间(UTC)"),
-    limit: int = Query(100, ge=1, le=1000, description="返回数量上限"),
+    limit: int = Query(100, ge=1, le=1000, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor"),
 ) -> List[Claim]:
     """按筛选条件查询理赔列表"""
     claim_filter = ClaimFilter(
@@ -55,8 +70,13 @@ async def list_claims(
         start_time=start_time,
         end_time=end_time,
         limit=limit,
+        cursor=cursor,
     )
-    return await claim_service.list_by_filter(session, claim_filter, access_mode)
+    try:
+        page = await claim_service.list_by_filter(session, claim_filter, access_mode)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _page_body(page, response)
 
 
 @router.get("/{claim_id}", response_model=Claim)
@@ -72,16 +92,36 @@ async def get_claim(
     return claim
 
 
+@router.post(":batchGet", response_model=ClaimBatch)
+async def batch_get_claims(
+    payload: BatchGetRequest,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    access_mode: Annotated[AccessMode, Depends(get_access_mode)],
+) -> ClaimBatch:
+    """批量按ID获取理赔(裁剪规则同详情接口)"""
+    try:
+        return await claim_service.get_by_ids(session, payload.ids, access_mode)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @policy_router.get("/{policy_id}/claims", response_model=List[Claim])
 async def list_claims_by_policy(
     policy_id: str,
+    response: Response,
     session: Annotated[AsyncSession, Depends(get_session)],
     access_mode: Annotated[AccessMode, Depends(get_access_mode)],
+    limit: int = Query(100, ge=1, le=1000, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor"),
 ) -> List[Claim]:
     """按保单查询理赔列表"""
-    return await claim_service.list_by_policy(session, policy_id, access_mode)
+    try:
+        page = await claim_service.list_by_policy(
+            session, policy_id, access_mode, limit=limit, cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _page_body(page, response)
 
 
 @stats_router.get("/claims", response_model=ClaimStats)
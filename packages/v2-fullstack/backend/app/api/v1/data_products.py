@@ -3,10 +3,20 @@ Data Product API Routes
 
 提供L0/L1/L2/Overlays数据产品的统一接口
 
+L0/Overlays/L1 统一走 build_data_product(缓存 + Mode 裁剪), 见 data_product_cache;
+响应按预编译裁剪计划直接序列化一次(compile_pruning_plan), 不再经过 response_model 二次校验,
+response_model 仅用于 OpenAPI 文档
+
 Endpoints:
 - POST /data-products/l0-dashboard
 - POST /data-products/map-overlays
+- GET  /data-products/map-overlays/tiles/{zoom}/{x}/{y}  (预计算瓦片, ETag/304)
 - POST /data-products/l1-intelligence
+- POST /data-products/batch  (多个数据产品一次请求, 逐项结果/错误)
+- POST /data-products/l2-evidence
+
+条件请求: L0/Overlays/L1/L2 返回数据版本 ETag(见 data_versions);
+If-None-Match 命中时在任何查询/序列化之前返回 304
 
 Reference:
 - docs/v2/v2实施细则/11-L0-Dashboard-细则.md
@@ -14,88 +24,194 @@ Reference:
 - docs/v2/v2实施细则/13-L1-Intelligence-细则.md
 """
 
+import hashlib
 import logging
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_session
 from app.schemas.access_control import DataProductType
-from app.schemas.shared import DataProductResponse, SharedDimensions
+from app.schemas.data_product_batch import DataProductBatchRequest, DataProductBatchResponse
+from app.schemas.shared import DataProductResponse, DataType, SharedDimensions, WeatherType
+from app.schemas.time import TimeGranularity
 from app.schemas.l2_evidence import L2EvidenceRequest, L2EvidenceResponse
+from app.services.data_product_batch import data_product_batch_service
+from app.services.data_product_cache import build_cache_key
+from app.services.data_versions import (
+    data_version_service,
+    dimension_scopes,
+    etag_headers,
+    if_none_match as etag_matches,
+    request_scopes,
+)
 from app.services.l2_evidence_service import l2_evidence_service
+from app.services.overlay_tiles import overlay_tile_service
 from app.services.data_products_service import (
+    DataProductBuilder,
+    build_data_product,
     l0_dashboard_service,
     map_overlays_service,
     l1_intelligence_service,
 )
-from app.utils.access_control import AccessControlManager
+from app.utils.access_control import compile_pruning_plan
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/data-products", tags=["data-products"])
 
 
+async def _serve_data_product(
+    product_type: DataProductType,
+    dimensions: SharedDimensions,
+    builder: DataProductBuilder,
+    if_none_match: Optional[str],
+) -> Response:
+    """
+    条件请求 → 数据产品管线 → 按 Mode 裁剪计划单次序列化(策略外字段不输出)
+
+    ETag 由缓存键 + 数据版本生成, 命中 If-None-Match 时不构建、不序列化
+    """
+    etag = await data_version_service.etag(
+        build_cache_key(product_type, dimensions), dimension_scopes(product_type, dimensions)
+    )
+    headers = etag_headers(etag)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response = await build_data_product(product_type, dimensions, builder)
+    plan = compile_pruning_plan(dimensions.access_mode, product_type)
+    return Response(
+        content=plan.to_json(response), media_type="application/json", headers=headers
+    )
+
+
 @router.post("/l0-dashboard", response_model=DataProductResponse)
 async def get_l0_dashboard(
     dimensions: SharedDimensions,
-    session: Annotated[AsyncSession, Depends(get_session)],
-) -> DataProductResponse:
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """
     L0 Dashboard 数据产品
     
     返回: KPI + TopN排名
     """
-    # 应用Access Control
-    ac_manager = AccessControlManager(
-        mode=dimensions.access_mode,
-        data_product=DataProductType.L0_DASHBOARD,
+    return await _serve_data_product(
+        DataProductType.L0_DASHBOARD,
+        dimensions,
+        l0_dashboard_service.build_response,
+        if_none_match,
     )
 
-    response = l0_dashboard_service.build_response(dimensions)
-    pruned, _ = ac_manager.prune_data(response.model_dump())
-    return DataProductResponse.model_validate(pruned)
-
 
 @router.post("/map-overlays", response_model=DataProductResponse)
 async def get_map_overlays(
     dimensions: SharedDimensions,
-    session: Annotated[AsyncSession, Depends(get_session)],
-) -> DataProductResponse:
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """Map Overlays 数据产品"""
-    ac_manager = AccessControlManager(
-        mode=dimensions.access_mode,
-        data_product=DataProductType.MAP_OVERLAYS,
+    return await _serve_data_product(
+        DataProductType.MAP_OVERLAYS,
+        dimensions,
+        map_overlays_service.build_response,
+        if_none_match,
     )
-    response = map_overlays_service.build_response(dimensions)
-    pruned, _ = ac_manager.prune_data(response.model_dump())
-    return DataProductResponse.model_validate(pruned)
+
+
+@router.get("/map-overlays/tiles/{zoom}/{x}/{y}")
+async def get_map_overlay_tile(
+    zoom: int,
+    x: int,
+    y: int,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    weather_type: WeatherType,
+    bucket_start: Annotated[datetime, Query(description="时间桶内任一时刻(UTC), 自动对齐到桶起点")],
+    data_type: DataType = DataType.HISTORICAL,
+    prediction_run_id: Optional[str] = None,
+    granularity: TimeGranularity = TimeGranularity.DAY,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
+    """
+    Map Overlays 瓦片
+    
+    返回: 列式紧凑瓦片(OverlayTile); If-None-Match 命中时返回 304
+    """
+    try:
+        bucket = overlay_tile_service.bucket(
+            weather_type=weather_type,
+            data_type=data_type,
+            prediction_run_id=prediction_run_id,
+            granularity=granularity,
+            bucket_start=bucket_start,
+        )
+        tile = await overlay_tile_service.get_tile(session, bucket, zoom, x, y)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    headers = {"ETag": tile.etag, "Cache-Control": "public, max-age=60"}
+    if if_none_match and tile.etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    return Response(content=tile.body, media_type="application/json", headers=headers)
 
 
 @router.post("/l1-intelligence", response_model=DataProductResponse)
 async def get_l1_intelligence(
     dimensions: SharedDimensions,
-    session: Annotated[AsyncSession, Depends(get_session)],
-) -> DataProductResponse:
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
     """L1 Region Intelligence 数据产品"""
-    ac_manager = AccessControlManager(
-        mode=dimensions.access_mode,
-        data_product=DataProductType.L1_REGION_INTELLIGENCE,
+    return await _serve_data_product(
+        DataProductType.L1_REGION_INTELLIGENCE,
+        dimensions,
+        l1_intelligence_service.build_response,
+        if_none_match,
+    )
+
+
+@router.post("/batch", response_model=DataProductBatchResponse)
+async def get_data_product_batch(request: DataProductBatchRequest) -> Response:
+    """
+    批量数据产品
+    
+    各项并发构建(同批次内相同项只构建一次), 结果按请求顺序返回;
+    单项失败以 status_code/error 表示, 不影响整体 200
+    """
+    outcomes = await data_product_batch_service.run(
+        [(item.data_product, item.dimensions) for item in request.items]
+    )
+    return Response(
+        content=data_product_batch_service.to_json(outcomes), media_type="application/json"
     )
-    response = l1_intelligence_service.build_response(dimensions)
-    pruned, _ = ac_manager.prune_data(response.model_dump())
-    return DataProductResponse.model_validate(pruned)
 
 
 @router.post("/l2-evidence", response_model=L2EvidenceResponse)
 async def get_l2_evidence(
     request: L2EvidenceRequest,
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> L2EvidenceResponse:
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Union[L2EvidenceResponse, Response]:
     """
     L2 Evidence 数据产品
     
-    返回: 风险事件 + 理赔 + 天气证据
+    返回: 风险事件 + 理赔 + 天气证据; If-None-Match 命中时返回 304
     """
+    request_key = hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+    etag = await data_version_service.etag(
+        f"{DataProductType.L2_EVIDENCE.value}:{request_key}",
+        request_scopes(
+            region_code=request.region_code,
+            product_id=request.product_id,
+            weather_type=request.weather_type.value,
+            data_type=request.data_type,
+            prediction_run_id=request.prediction_run_id,
+        ),
+    )
+    headers = etag_headers(etag)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
     return await l2_evidence_service.get_evidence(session, request)
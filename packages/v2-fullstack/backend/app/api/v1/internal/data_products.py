@@ -0,0 +1,28 @@
+"""
+Internal Data Product API Routes
+
+数据产品缓存/单飞的运行指标（不对外公开）。
+"""
+
+import logging
+from typing import Annotated, Dict
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.deps import get_access_mode
+from app.schemas.shared import AccessMode
+from app.services.single_flight import data_product_flight
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/internal/data-products", tags=["internal-data-products"])
+
+
+@router.get("/flight-stats", response_model=Dict[str, int])
+async def get_flight_stats(
+    access_mode: Annotated[AccessMode, Depends(get_access_mode)],
+) -> Dict[str, int]:
+    """本进程单飞计数(leader / coalesced_local / coalesced_remote / lease_wait_timeout)"""
+    if access_mode != AccessMode.ADMIN_INTERNAL:
+        raise HTTPException(status_code=403, detail="Only Admin can read data product stats")
+    return data_product_flight.stats.snapshot()
@@ -6,6 +6,7 @@ Policy API Routes
 Endpoints:
 - GET /policies - 查询保单列表（筛选）
 - GET /policies/{id} - 获取保单详情
+- POST /policies:batchGet - 批量按ID获取保单（按请求顺序）
 - GET /statistics/policies - 保单统计
 
 Reference:
@@ -19,8 +20,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_access_mode, get_session
-from app.schemas.policy import Policy, PolicyStats
-from app.schemas.shared import AccessMode
+from app.schemas.policy import Policy, PolicyBatch, PolicyStats
+from app.schemas.shared import AccessMode, BatchGetRequest
 from app.services.policy_service import policy_service
 
 logger = logging.getLogger(__name__)
@@ -62,6 +63,19 @@ async def get_policy(
     return policy
 
 
+@router.post(":batchGet", response_model=PolicyBatch)
+async def batch_get_policies(
+    payload: BatchGetRequest,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    access_mode: Annotated[AccessMode, Depends(get_access_mode)],
+) -> PolicyBatch:
+    """批量按ID获取保单(裁剪规则同详情接口)"""
+    try:
+        return await policy_service.get_by_ids(session, payload.ids, access_mode)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @stats_router.get("/policies", response_model=PolicyStats)
 async def get_policy_stats(
     session: Annotated[AsyncSession, Depends(get_session)],
@@ -5,7 +5,13 @@ Risk Events API Routes
 
 Endpoints:
 - GET /risk-events - 查询风险事件列表（必填维度）
+- GET /risk-events/page - Keyset 分页查询（不透明游标）
+- GET /risk-events/export - NDJSON 流式导出
+- GET /risk-events/timeline - 按本地时间桶聚合(day/week/month)
+- GET /risk-events/by-region - 按区域聚合
+- GET /risk-events/episodes - 风险事件段(连续触发窗口合并)
 - GET /risk-events/{id} - 获取风险事件详情（可选）
+- POST /risk-events:batchGet - 批量按ID获取风险事件（按请求顺序）
 
 Reference:
 - docs/v2/v2实施细则/09-风险事件表与Risk-Service-细则.md
@@ -13,14 +19,25 @@ Reference:
 
 import logging
 from datetime import datetime
-from typing import Annotated, List, Optional
+from typing import Annotated, AsyncIterator, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_session
-from app.schemas.risk_event import RiskEventResponse
-from app.schemas.shared import DataType, WeatherType
+from app.db import get_sessionmaker
+from app.schemas.risk_event import (
+    RiskEventBatch,
+    RiskEpisodeResponse,
+    RiskEventBucket,
+    RiskEventPage,
+    RiskEventRegionAggregate,
+    RiskEventResponse,
+)
+from app.schemas.shared import BatchGetRequest, DataType, WeatherType
+from app.schemas.time import TimeGranularity
+from app.services.risk_episode_service import risk_episode_service
 from app.services.risk_service import risk_service
 
 logger = logging.getLogger(__name__)
@@ -28,6 +45,177 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/risk-events", tags=["risk-events"])
 
 
+# NOTE: 静态路径必须声明在 /{event_id} 之前
+@router.get("/page", response_model=RiskEventPage)
+async def page_risk_events(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    region_code: str = Query(..., description="区域代码"),
+    weather_type: WeatherType = Query(..., description="天气类型"),
+    data_type: DataType = Query(..., description="数据类型"),
+    time_range_start: datetime = Query(..., description="开始时间(UTC)"),
+    time_range_end: datetime = Query(..., description="结束时间(UTC)"),
+    prediction_run_id: Optional[str] = Query(None, description="预测批次ID(predicted必须)"),
+    product_id: Optional[str] = Query(None, description="产品ID"),
+    page_size: int = Query(100, ge=1, le=1000, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+) -> RiskEventPage:
+    """Keyset 分页查询风险事件"""
+    try:
+        return await risk_service.query_events_page(
+            session,
+            region_code=region_code,
+            weather_type=weather_type,
+            data_type=data_type,
+            time_range_start=time_range_start,
+            time_range_end=time_range_end,
+            prediction_run_id=prediction_run_id,
+            product_id=product_id,
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/timeline", response_model=List[RiskEventBucket])
+async def risk_event_timeline(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    region_code: str = Query(..., description="区域代码"),
+    weather_type: WeatherType = Query(..., description="天气类型"),
+    data_type: DataType = Query(..., description="数据类型"),
+    time_range_start: datetime = Query(..., description="开始时间(UTC)"),
+    time_range_end: datetime = Query(..., description="结束时间(UTC)"),
+    granularity: TimeGranularity = Query(TimeGranularity.DAY, description="桶粒度"),
+    region_timezone: Optional[str] = Query(None, description="业务时区(默认按区域)"),
+    prediction_run_id: Optional[str] = Query(None, description="预测批次ID(predicted必须)"),
+    product_id: Optional[str] = Query(None, description="产品ID"),
+) -> List[RiskEventBucket]:
+    """按 region_timezone 自然时间桶聚合风险事件(计数/最高等级/最大触发值)"""
+    try:
+        return await risk_service.aggregate_by_bucket(
+            session,
+            region_code=region_code,
+            weather_type=weather_type,
+            data_type=data_type,
+            time_range_start=time_range_start,
+            time_range_end=time_range_end,
+            granularity=granularity,
+            region_timezone=region_timezone,
+            prediction_run_id=prediction_run_id,
+            product_id=product_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/by-region", response_model=List[RiskEventRegionAggregate])
+async def risk_event_by_region(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    region_codes: List[str] = Query(..., min_length=1, description="区域代码(可重复)"),
+    weather_type: WeatherType = Query(..., description="天气类型"),
+    data_type: DataType = Query(..., description="数据类型"),
+    time_range_start: datetime = Query(..., description="开始时间(UTC)"),
+    time_range_end: datetime = Query(..., description="结束时间(UTC)"),
+    prediction_run_id: Optional[str] = Query(None, description="预测批次ID(predicted必须)"),
+    product_id: Optional[str] = Query(None, description="产品ID"),
+) -> List[RiskEventRegionAggregate]:
+    """按区域聚合风险事件(一次查询覆盖全部区域)"""
+    try:
+        return await risk_service.aggregate_by_region(
+            session,
+            region_codes=region_codes,
+            weather_type=weather_type,
+            data_type=data_type,
+            time_range_start=time_range_start,
+            time_range_end=time_range_end,
+            prediction_run_id=prediction_run_id,
+            product_id=product_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/export")
+async def export_risk_events(
+    region_code: str = Query(..., description="区域代码"),
+    weather_type: WeatherType = Query(..., description="天气类型"),
+    data_type: DataType = Query(..., description="数据类型"),
+    time_range_start: datetime = Query(..., description="开始时间(UTC)"),
+    time_range_end: datetime = Query(..., description="结束时间(UTC)"),
+    prediction_run_id: Optional[str] = Query(None, description="预测批次ID(predicted必须)"),
+    product_id: Optional[str] = Query(None, description="产品ID"),
+) -> StreamingResponse:
+    """
+    NDJSON 流式导出风险事件
+
+    注意: 依赖注入的 session 在响应发送前关闭, 流式生成器自行持有 session。
+    """
+    try:
+        risk_service.validate_run_binding(data_type, prediction_run_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    async def body() -> AsyncIterator[str]:
+        session_maker = get_sessionmaker()
+        async with session_maker() as session:
+            async for event in risk_service.stream_events(
+                session,
+                region_code=region_code,
+                weather_type=weather_type,
+                data_type=data_type,
+                time_range_start=time_range_start,
+                time_range_end=time_range_end,
+                prediction_run_id=prediction_run_id,
+                product_id=product_id,
+            ):
+                yield event.model_dump_json() + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.get("/episodes", response_model=List[RiskEpisodeResponse])
+async def list_risk_episodes(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    region_code: str = Query(..., description="区域代码"),
+    weather_type: WeatherType = Query(..., description="天气类型"),
+    data_type: DataType = Query(..., description="数据类型"),
+    time_range_start: datetime = Query(..., description="开始时间(UTC)"),
+    time_range_end: datetime = Query(..., description="结束时间(UTC)"),
+    prediction_run_id: Optional[str] = Query(None, description="预测批次ID(predicted必须)"),
+    product_id: Optional[str] = Query(None, description="产品ID"),
+    offset: int = Query(0, ge=0, description="偏移量"),
+    limit: int = Query(100, ge=1, le=1000, description="返回数量上限"),
+) -> List[RiskEpisodeResponse]:
+    """查询与时间窗重叠的风险事件段(按 start_at 升序)"""
+    try:
+        return await risk_episode_service.query_episodes(
+            session,
+            region_code=region_code,
+            weather_type=weather_type,
+            data_type=data_type,
+            time_range_start=time_range_start,
+            time_range_end=time_range_end,
+            prediction_run_id=prediction_run_id,
+            product_id=product_id,
+            offset=offset,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post(":batchGet", response_model=RiskEventBatch)
+async def batch_get_risk_events(
+    payload: BatchGetRequest,
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> RiskEventBatch:
+    """批量按ID获取风险事件"""
+    try:
+        return await risk_service.get_by_ids(session, payload.ids)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @router.get("/{event_id}", response_model=RiskEventResponse)
 async def get_risk_event(
     event_id: str,
@@ -8,6 +8,8 @@ Reference:
 import os
 
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_process_init
 
 DEFAULT_REDIS_URL = "redis://localhost:6379/0"
 DEFAULT_RESULT_BACKEND = "redis://localhost:6379/1"
@@ -16,7 +18,14 @@ celery_app = Celery(
     "igloo",
     broker=os.getenv("CELERY_BROKER_URL", os.getenv("REDIS_URL", DEFAULT_REDIS_URL)),
     backend=os.getenv("CELERY_RESULT_BACKEND", DEFAULT_RESULT_BACKEND),
-    include=["app.tasks.risk_calculation", "app.tasks.claim_calculation"],
+    include=[
+        "app.tasks.risk_calculation",
+        "app.tasks.claim_calculation",
+        "app.tasks.partition_maintenance",
+        "app.tasks.stats_reconciliation",
+        "app.tasks.overlay_precompute",
+        "app.tasks.cache_warming",
+    ],
 )
 
 celery_app.conf.update(
@@ -29,3 +38,34 @@ celery_app.conf.update(
     task_time_limit=3600,
     worker_prefetch_multiplier=1,
 )
+
+celery_app.conf.beat_schedule = {
+    # 每日预建未来月分区(weather_data / risk_events)
+    "ensure-partitions-daily": {
+        "task": "app.tasks.partition_maintenance.ensure_partitions_task",
+        "schedule": crontab(hour=0, minute=30),
+    },
+    # 每日按事实表重建统计汇总(修正增量漂移)
+    "reconcile-stats-summaries-daily": {
+        "task": "app.tasks.stats_reconciliation.reconcile_stats_summaries_task",
+        "schedule": crontab(hour=1, minute=0),
+    },
+    # 每小时重算最近的地图叠加层日桶
+    "precompute-recent-overlays-hourly": {
+        "task": "app.tasks.overlay_precompute.precompute_recent_overlays_task",
+        "schedule": crontab(minute=15),
+    },
+    # 每日 UTC 零点预设区间滚动后预热数据产品缓存
+    "warm-data-product-presets-daily": {
+        "task": "app.tasks.cache_warming.warm_daily_presets_task",
+        "schedule": crontab(hour=0, minute=5),
+    },
+}
+
+
+@worker_process_init.connect
+def _start_product_cache_listener(**_kwargs) -> None:
+    """每个 worker 子进程订阅产品缓存失效广播"""
+    from app.services.product_service import product_service
+
+    product_service.cache.start_listener()
@@ -8,15 +8,22 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import claims, data_products, policies, products, risk_events
 from app.api.v1.internal import claims as internal_claims
+from app.api.v1.internal import data_products as internal_data_products
 from app.api.v1.internal import policies as internal_policies
 from app.api.v1.internal import products as internal_products
 from app.api.v1.internal import risk_events as internal_risk_events
 from app.db import dispose_engine
+from app.services.data_product_cache import data_product_cache
+from app.services.product_service import product_service
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    product_service.cache.start_listener()
+    data_product_cache.start_listener()
     yield
+    data_product_cache.stop_listener()
+    product_service.cache.stop_listener()
     await dispose_engine()
 
 app = FastAPI(
@@ -33,6 +40,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 前端需读取: ETag(条件请求 If-None-Match), X-Next-Cursor(理赔列表翻页游标)
+    expose_headers=["ETag", claims.NEXT_CURSOR_HEADER],
 )
 
 # API routers
@@ -48,6 +57,7 @@ app.include_router(internal_policies.router, prefix="/api/v1")
 app.include_router(internal_claims.router, prefix="/api/v1")
 app.include_router(internal_products.router, prefix="/api/v1")
 app.include_router(internal_risk_events.router, prefix="/api/v1")
+app.include_router(internal_data_products.router, prefix="/api/v1")
 
 
 @app.get("/")
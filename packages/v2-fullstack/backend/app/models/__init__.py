@@ -9,8 +9,17 @@ from app.models.product import Product
 from app.models.policy import Policy
 from app.models.weather import WeatherData
 from app.models.risk_event import RiskEvent
+from app.models.risk_episode import RiskEventEpisode
 from app.models.prediction_run import PredictionRun
 from app.models.claim import Claim
+from app.models.h3_cell import H3CellParent, H3CellRegion
+from app.models.weather_packed import WeatherDailyPacked
+from app.models.overlay import OverlayCellBucket
+from app.models.stats_summary import (
+    ClaimDailySummary,
+    PolicyDailySummary,
+    RiskEventDailySummary,
+)
 
 __all__ = [
     "Base",
@@ -18,6 +27,14 @@ __all__ = [
     "Policy",
     "WeatherData",
     "RiskEvent",
+    "RiskEventEpisode",
     "PredictionRun",
     "Claim",
+    "H3CellRegion",
+    "H3CellParent",
+    "WeatherDailyPacked",
+    "OverlayCellBucket",
+    "ClaimDailySummary",
+    "PolicyDailySummary",
+    "RiskEventDailySummary",
 ]
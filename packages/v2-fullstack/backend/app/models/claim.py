@@ -72,12 +72,12 @@ class Claim(Base):
         index=True,
         comment="产品ID"
     )
+    # risk_events 为分区表(主键含分区键), 无法建立外键; 逻辑关联见 risk_event relationship
     risk_event_id = Column(
         String(50),
-        ForeignKey("risk_events.id"),
         nullable=True,
         index=True,
-        comment="关联风险事件ID (可选)"
+        comment="关联风险事件ID (可选, 逻辑关联)"
     )
     
     # 区域信息 (冗余,便于查询)
@@ -186,13 +186,19 @@ class Claim(Base):
         )
         risk_event: Mapped["RiskEvent"] = relationship(
             "RiskEvent",
+            primaryjoin="foreign(Claim.risk_event_id) == RiskEvent.id",
             back_populates="claims",
             lazy="selectin"
         )
     else:
         policy = relationship("Policy", back_populates="claims", lazy="selectin")
         product = relationship("Product", back_populates="claims", lazy="selectin")
-        risk_event = relationship("RiskEvent", back_populates="claims", lazy="selectin")
+        risk_event = relationship(
+            "RiskEvent",
+            primaryjoin="foreign(Claim.risk_event_id) == RiskEvent.id",
+            back_populates="claims",
+            lazy="selectin",
+        )
     
     # 唯一约束 (幂等写入)
     __table_args__ = (
@@ -200,13 +206,27 @@ class Claim(Base):
             'policy_id', 'triggered_at', 'tier_level',
             name='uq_claim_policy_time_tier'
         ),
+        # 列表 keyset 分页索引: 等值筛选列在前, 以 (triggered_at, id) 结尾,
+        # 反向扫描即满足 ORDER BY triggered_at DESC, id DESC, 无需排序
+        Index(
+            'ix_claims_triggered_id',
+            'triggered_at', 'id'
+        ),
+        Index(
+            'ix_claims_policy_triggered_id',
+            'policy_id', 'triggered_at', 'id'
+        ),
+        Index(
+            'ix_claims_region_triggered_id',
+            'region_code', 'triggered_at', 'id'
+        ),
         Index(
-            'idx_claim_query',
-            'policy_id', 'triggered_at', 'status'
+            'ix_claims_product_status_triggered_id',
+            'product_id', 'status', 'triggered_at', 'id'
         ),
         Index(
-            'idx_claim_region_time',
-            'region_code', 'triggered_at'
+            'ix_claims_status_tier_triggered_id',
+            'status', 'tier_level', 'triggered_at', 'id'
         ),
     )
     
@@ -0,0 +1,58 @@
+"""
+H3 Cell Mapping Models (H3 单元 → 区域/父单元 映射表)
+
+用途:
+- weather_data.h3_index 的空间聚合在数据库内完成(JOIN + GROUP BY)
+- 单元 → 省/区县 区域代码(对应 RegionScope)
+- 单元 → 各级父单元(预计算, 避免运行时依赖 h3 库)
+- 单元中心点 → 地图瓦片坐标(OVERLAY_BASE_ZOOM, 见 app/utils/map_tiles.py)
+
+数据来源: app/seeds/seed_h3_cells.py
+"""
+
+from sqlalchemy import Column, Index, Integer, String
+
+from app.models.base import Base
+
+
+class H3CellRegion(Base):
+    """H3 单元 → 区域映射表"""
+    
+    __tablename__ = "h3_cell_regions"
+    
+    h3_index = Column(String(20), primary_key=True, comment="H3单元索引")
+    resolution = Column(Integer, nullable=False, comment="H3分辨率")
+    province_code = Column(
+        String(20),
+        nullable=False,
+        index=True,
+        comment="省级区域代码(RegionScope.PROVINCE)"
+    )
+    district_code = Column(
+        String(20),
+        nullable=True,
+        index=True,
+        comment="区县级区域代码(RegionScope.DISTRICT, 可选)"
+    )
+    tile_x = Column(Integer, nullable=True, comment="单元中心点瓦片X(OVERLAY_BASE_ZOOM)")
+    tile_y = Column(Integer, nullable=True, comment="单元中心点瓦片Y(OVERLAY_BASE_ZOOM)")
+    
+    def __repr__(self) -> str:
+        return (
+            f"<H3CellRegion(h3_index={self.h3_index}, "
+            f"province={self.province_code}, district={self.district_code})>"
+        )
+
+
+class H3CellParent(Base):
+    """H3 单元 → 父单元映射表(每个单元每个父分辨率一行)"""
+    
+    __tablename__ = "h3_cell_parents"
+    
+    h3_index = Column(String(20), primary_key=True, comment="H3单元索引")
+    parent_resolution = Column(Integer, primary_key=True, comment="父单元分辨率")
+    parent_index = Column(String(20), nullable=False, comment="父单元索引")
+    
+    __table_args__ = (
+        Index('idx_h3_parent_lookup', 'parent_resolution', 'parent_index'),
+    )
@@ -0,0 +1,52 @@
+"""
+Map Overlay Models (地图叠加层预计算)
+
+用途:
+- 每个 H3 单元 × 时间桶 预计算天气值与风险强度, 地图瓦片按 (zoom, x, y, 时间桶) 读取
+- 单元携带区域代码与 base zoom 瓦片坐标(来自 h3_cell_regions), 瓦片查询只做整数范围扫描
+
+口径:
+- series_key: "historical" 或 "predicted:{prediction_run_id}"(主键不允许 NULL, 批次并入序列键)
+- 时间桶按 region_timezone 自然边界(与 SpatialAggregationService 一致)
+- risk_tier: 时间桶内单元所属区县/省份风险事件的最高等级, 无事件为 0
+
+数据来源: app/services/overlay_tiles.py (precompute), 由 app/tasks/overlay_precompute.py 维护
+"""
+
+from datetime import datetime, timezone as tz
+
+from sqlalchemy import Column, DateTime, Index, Integer, Numeric, SmallInteger, String
+
+from app.models.base import Base
+
+
+class OverlayCellBucket(Base):
+    """叠加层单元时间桶 (weather_type, series, granularity, bucket, h3 cell)"""
+    
+    __tablename__ = "overlay_cell_buckets"
+    __table_args__ = (
+        # 瓦片查询: 序列 + 时间桶 + base zoom 坐标范围
+        Index(
+            "ix_overlay_cell_buckets_tile",
+            "weather_type", "series_key", "granularity", "bucket_start", "tile_x", "tile_y",
+        ),
+    )
+    
+    weather_type = Column(String(20), primary_key=True, comment="天气类型")
+    series_key = Column(String(80), primary_key=True, comment="historical / predicted:{run_id}")
+    granularity = Column(String(10), primary_key=True, comment="时间桶粒度(hour/day/week/month)")
+    bucket_start = Column(DateTime(timezone=True), primary_key=True, comment="时间桶起点(UTC)")
+    h3_index = Column(String(20), primary_key=True, comment="H3单元索引")
+    province_code = Column(String(20), nullable=False, comment="省级区域代码")
+    district_code = Column(String(20), nullable=True, comment="区县级区域代码")
+    tile_x = Column(Integer, nullable=False, comment="瓦片X(OVERLAY_BASE_ZOOM)")
+    tile_y = Column(Integer, nullable=False, comment="瓦片Y(OVERLAY_BASE_ZOOM)")
+    weather_avg = Column(Numeric(precision=10, scale=2), nullable=False, comment="桶内均值")
+    weather_max = Column(Numeric(precision=10, scale=2), nullable=False, comment="桶内最大值")
+    risk_tier = Column(SmallInteger, nullable=False, default=0, comment="风险强度(0-3)")
+    computed_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(tz.utc),
+        comment="预计算时间(UTC)"
+    )
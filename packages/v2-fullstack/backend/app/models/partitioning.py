@@ -0,0 +1,151 @@
+"""
+Declarative Partitioning (weather_data / risk_events 分区管理)
+
+分区方案:
+- 一级: LIST (data_type) → {table}_historical / {table}_predicted
+- 二级: RANGE (timestamp) 按 UTC 自然月 → {table}_{data_type}_pYYYY_MM
+- 每个 data_type 分区带 DEFAULT 子分区兜底(避免越界写入失败)
+
+查询裁剪前提:
+- WHERE 必须带 data_type 等值 + timestamp 范围(query_time_series/query_events 已满足)
+
+硬规则:
+- 分区键必须包含在主键/唯一索引中 (id, data_type, timestamp)
+- 未来分区必须提前创建(ensure_partitions / partition maintenance task), 否则数据落入 DEFAULT 后无法再拆出该月
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Table, event, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("weather_data", "risk_events")
+DATA_TYPE_PARTITIONS = ("historical", "predicted")
+
+# 建表时预建的月份数(当月起)
+DEFAULT_MONTHS_AHEAD = 3
+
+
+def month_start(value: datetime) -> datetime:
+    """对齐到UTC自然月起始"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """月份偏移(value 必须已对齐到月起始)"""
+    total = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=total // 12, month=total % 12 + 1)
+
+
+def iter_month_starts(start: datetime, end: datetime) -> List[datetime]:
+    """返回覆盖 [start, end] 的所有UTC月起始"""
+    current = month_start(start)
+    last = month_start(end)
+    months = []
+    while current <= last:
+        months.append(current)
+        current = add_months(current, 1)
+    return months
+
+
+def data_type_partition_name(table_name: str, data_type: str) -> str:
+    return f"{table_name}_{data_type}"
+
+
+def month_partition_name(table_name: str, data_type: str, month: datetime) -> str:
+    return f"{table_name}_{data_type}_p{month.year:04d}_{month.month:02d}"
+
+
+def build_data_type_partition_ddl(table_name: str, data_type: str) -> List[str]:
+    """一级分区(LIST data_type) + DEFAULT 子分区"""
+    parent = data_type_partition_name(table_name, data_type)
+    return [
+        (
+            f"CREATE TABLE IF NOT EXISTS {parent} PARTITION OF {table_name} "
+            f"FOR VALUES IN ('{data_type}') PARTITION BY RANGE (timestamp)"
+        ),
+        f"CREATE TABLE IF NOT EXISTS {parent}_default PARTITION OF {parent} DEFAULT",
+    ]
+
+
+def build_month_partition_ddl(table_name: str, data_type: str, month: datetime) -> str:
+    """二级分区(RANGE timestamp, 一个UTC自然月)"""
+    start = month_start(month)
+    end = add_months(start, 1)
+    parent = data_type_partition_name(table_name, data_type)
+    name = month_partition_name(table_name, data_type, start)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def build_partition_ddl(
+    table_name: str,
+    months: Iterable[datetime],
+    data_types: Iterable[str] = DATA_TYPE_PARTITIONS,
+) -> List[str]:
+    """生成某张表在给定月份上的完整分区DDL(幂等)"""
+    months = list(months)
+    statements: List[str] = []
+    for data_type in data_types:
+        statements.extend(build_data_type_partition_ddl(table_name, data_type))
+        statements.extend(
+            build_month_partition_ddl(table_name, data_type, month) for month in months
+        )
+    return statements
+
+
+def ensure_partitions(
+    connection: Connection,
+    *,
+    months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    now: Optional[datetime] = None,
+    tables: Iterable[str] = PARTITIONED_TABLES,
+) -> List[str]:
+    """
+    创建当月及未来 months_ahead 个月的分区(同步连接, 可用于 run_sync)
+
+    Returns:
+        执行过的DDL(IF NOT EXISTS, 重复执行无副作用)
+    """
+    tables = tuple(tables)
+    current = month_start(now or datetime.now(timezone.utc))
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+
+    executed: List[str] = []
+    for table_name in tables:
+        for statement in build_partition_ddl(table_name, months):
+            connection.execute(text(statement))
+            executed.append(statement)
+
+    logger.info(
+        "Partitions ensured",
+        extra={
+            "tables": list(tables),
+            "from_month": months[0].isoformat(),
+            "to_month": months[-1].isoformat(),
+        },
+    )
+    return executed
+
+
+def attach_partition_ddl(table: Table) -> None:
+    """
+    Base.metadata.create_all 时自动建分区
+
+    create_all 只会创建分区父表; 没有子分区时任何写入都会失败。
+    """
+
+    @event.listens_for(table, "after_create")
+    def _create_partitions(target: Table, connection: Connection, **_kw) -> None:
+        if connection.dialect.name != "postgresql":
+            return
+        ensure_partitions(connection, tables=(target.name,))
@@ -127,7 +127,8 @@ class Policy(Base):
         nullable=False,
         default=lambda: datetime.now(tz.utc),
         onupdate=lambda: datetime.now(tz.utc),
-        comment="更新时间 (UTC)"
+        index=True,
+        comment="更新时间 (UTC) - 保单组合索引增量刷新水位"
     )
     
     # Relationships - use Mapped[] for SQLAlchemy 2.0
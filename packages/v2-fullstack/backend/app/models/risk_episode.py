@@ -0,0 +1,87 @@
+"""
+Risk Event Episode Model (风险事件段表)
+
+risk_events 的伴随表: 连续触发的滑动窗口合并为一行
+(一场持续一周的降雨: ~168 行小时窗口 → 1 行事件段)
+
+口径:
+- start_at/end_at 为首/末个触发窗口的结束时刻(与 risk_events.timestamp 同口径)
+- peak_* 取最严重窗口(tier 最高, 同 tier 按 operator 取最极端值)
+- 由 RiskCalculator.compact_episodes 基于已落库 risk_events 生成
+  (见 app/services/risk_episode_service.py), 不替代 risk_events 事实
+
+硬规则:
+- predicted必须包含prediction_run_id
+- 读路径按 [start_at, end_at] 与查询窗口重叠返回, 边界不裁剪
+"""
+
+from datetime import datetime, timezone as tz
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, String
+
+from app.models.base import Base
+
+
+class RiskEventEpisode(Base):
+    """风险事件段表"""
+    
+    __tablename__ = "risk_event_episodes"
+    
+    id = Column(String(50), primary_key=True, comment="事件段ID(序列+start_at 哈希)")
+    
+    # 序列维度
+    region_code = Column(String(20), nullable=False, comment="区域代码")
+    product_id = Column(
+        String(50),
+        ForeignKey("products.id"),
+        nullable=False,
+        comment="产品ID"
+    )
+    product_version = Column(String(20), nullable=False, comment="产品版本(可追溯)")
+    weather_type = Column(String(20), nullable=False, comment="天气类型")
+    data_type = Column(String(20), nullable=False, comment="historical/predicted")
+    prediction_run_id = Column(
+        String(50),
+        nullable=True,
+        comment="预测批次ID(predicted必须)"
+    )
+    
+    # 事件段
+    start_at = Column(DateTime(timezone=True), nullable=False, comment="首个触发窗口结束时刻(UTC)")
+    end_at = Column(DateTime(timezone=True), nullable=False, comment="末个触发窗口结束时刻(UTC)")
+    peak_at = Column(DateTime(timezone=True), nullable=False, comment="最严重窗口时刻(UTC)")
+    peak_tier = Column(Integer, nullable=False, comment="最高风险等级(1/2/3)")
+    peak_value = Column(Numeric(10, 2), nullable=False, comment="最严重窗口触发值")
+    threshold_value = Column(Numeric(10, 2), nullable=False, comment="最高等级对应阈值")
+    window_count = Column(Integer, nullable=False, comment="合并的触发窗口数")
+    
+    # 审计
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(tz.utc),
+        comment="创建时间(UTC)"
+    )
+    
+    __table_args__ = (
+        # 与 idx_risk_query 同形: 区域/天气/数据类型 + 时间
+        Index(
+            "ix_risk_episodes_query",
+            "region_code", "weather_type", "data_type", "start_at"
+        ),
+        # 重建时按序列查找重叠事件段
+        Index(
+            "ix_risk_episodes_series",
+            "product_id", "region_code", "weather_type", "data_type", "end_at"
+        ),
+        Index(
+            "ix_risk_episodes_predicted",
+            "prediction_run_id", "product_id", "start_at"
+        ),
+    )
+    
+    def __repr__(self) -> str:
+        return (
+            f"<RiskEventEpisode(id='{self.id}', region='{self.region_code}', "
+            f"start='{self.start_at}', end='{self.end_at}', peak_tier={self.peak_tier})>"
+        )
@@ -9,6 +9,9 @@ Reference:
 硬规则:
 - predicted必须包含prediction_run_id
 - 关联product和policy
+
+分区: LIST(data_type) → RANGE(timestamp) 按月, 见 app/models/partitioning.py
+- 分区表无法作为外键目标(主键含分区键), claims.risk_event_id 为逻辑关联
 """
 
 from datetime import datetime, timezone as tz
@@ -19,6 +22,7 @@ from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, St
 from sqlalchemy.orm import relationship, Mapped
 
 from app.models.base import Base
+from app.models.partitioning import attach_partition_ddl
 
 if TYPE_CHECKING:
     from app.models.product import Product
@@ -30,11 +34,13 @@ class RiskEvent(Base):
     
     __tablename__ = "risk_events"
     
+    # 主键 (id + 分区键 data_type/timestamp)
     id = Column(String(50), primary_key=True, comment="事件ID")
     
     # 时空维度
     timestamp = Column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         index=True,
         comment="事件时间(UTC)"
@@ -86,6 +92,7 @@ class RiskEvent(Base):
     # 数据类型
     data_type = Column(
         String(20),
+        primary_key=True,
         nullable=False,
         index=True,
         comment="historical/predicted"
@@ -115,6 +122,7 @@ class RiskEvent(Base):
         
         claims: Mapped[List["Claim"]] = relationship(
             "Claim",
+            primaryjoin="RiskEvent.id == foreign(Claim.risk_event_id)",
             back_populates="risk_event",
             lazy="selectin"
         )
@@ -127,6 +135,7 @@ class RiskEvent(Base):
         
         claims = relationship(
             "Claim",
+            primaryjoin="RiskEvent.id == foreign(Claim.risk_event_id)",
             back_populates="risk_event",
             lazy="selectin"
         )
@@ -142,6 +151,7 @@ class RiskEvent(Base):
         ),
         Index(
             "uq_risk_event_historical",
+            "data_type",
             "product_id",
             "region_code",
             "timestamp",
@@ -150,4 +160,8 @@ class RiskEvent(Base):
             unique=True,
             postgresql_where=text("data_type = 'historical' AND prediction_run_id IS NULL"),
         ),
+        {"postgresql_partition_by": "LIST (data_type)"},
     )
+
+
+attach_partition_ddl(RiskEvent.__table__)
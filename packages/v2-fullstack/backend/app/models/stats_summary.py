@@ -0,0 +1,102 @@
+"""
+Statistics Summary Models (理赔/保单/风险事件 日汇总表)
+
+用途:
+- /statistics/* 读汇总表, 不再对 claims/policies 全表 COUNT/SUM
+- L0 Dashboard 的 KPI 立方体(区域 × 产品 × 天气类型 × 本地日), 见 app/services/kpi_cube.py
+  (claims/policies 的天气类型经 products.weather_type 关联)
+- 写路径在同一事务内按增量 upsert(见 app/services/stats_summary.py)
+- 对账任务按事实表全量重建(app/tasks/stats_reconciliation.py)
+
+口径:
+- claims: local_date = triggered_at 在 region_code 对应时区的自然日
+- policies: local_date / end_local_date = coverage_start / coverage_end 在保单 timezone 的自然日,
+  status = active / inactive; 按保障期间入键, 任意本地日范围的在保保单可只读汇总表求得
+- risk_events: 只汇总 historical; local_date = timestamp 在 region_code 对应时区的自然日
+"""
+
+from datetime import datetime, timezone as tz
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, Index, Integer, Numeric, String
+
+from app.models.base import Base
+
+
+class ClaimDailySummary(Base):
+    """理赔日汇总 (region, product, local day, status)"""
+    
+    __tablename__ = "claim_daily_summary"
+    __table_args__ = (
+        # KPI 立方体按本地日范围扫描(跨区域)
+        Index("ix_claim_daily_summary_date", "local_date", "region_code"),
+    )
+    
+    region_code = Column(String(20), primary_key=True, comment="区域代码")
+    product_id = Column(String(50), primary_key=True, comment="产品ID")
+    local_date = Column(Date, primary_key=True, comment="触发时间的区域本地自然日")
+    status = Column(String(20), primary_key=True, comment="理赔状态")
+    claim_count = Column(BigInteger, nullable=False, default=0, comment="理赔数量")
+    payout_amount_sum = Column(
+        Numeric(precision=18, scale=2),
+        nullable=False,
+        default=0,
+        comment="赔付金额合计"
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(tz.utc),
+        comment="更新时间(UTC)"
+    )
+
+
+class PolicyDailySummary(Base):
+    """保单日汇总 (region, product, coverage start day, coverage end day, status)"""
+    
+    __tablename__ = "policy_daily_summary"
+    __table_args__ = (
+        Index("ix_policy_daily_summary_date", "local_date", "region_code"),
+        # KPI 立方体取在保保单: 按保障结束日排除已到期的组
+        Index("ix_policy_daily_summary_end_date", "end_local_date", "region_code"),
+    )
+    
+    region_code = Column(String(20), primary_key=True, comment="覆盖区域代码")
+    product_id = Column(String(50), primary_key=True, comment="产品ID")
+    local_date = Column(Date, primary_key=True, comment="保障开始的保单本地自然日")
+    end_local_date = Column(Date, primary_key=True, comment="保障结束的保单本地自然日")
+    status = Column(String(20), primary_key=True, comment="active/inactive")
+    policy_count = Column(BigInteger, nullable=False, default=0, comment="保单数量")
+    coverage_amount_sum = Column(
+        Numeric(precision=18, scale=2),
+        nullable=False,
+        default=0,
+        comment="保额合计"
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(tz.utc),
+        comment="更新时间(UTC)"
+    )
+
+
+class RiskEventDailySummary(Base):
+    """风险事件日汇总 (region, product, weather_type, local day, tier), 仅 historical"""
+    
+    __tablename__ = "risk_event_daily_summary"
+    __table_args__ = (
+        Index("ix_risk_event_daily_summary_date", "local_date", "weather_type", "region_code"),
+    )
+    
+    region_code = Column(String(20), primary_key=True, comment="区域代码")
+    product_id = Column(String(50), primary_key=True, comment="产品ID")
+    weather_type = Column(String(20), primary_key=True, comment="天气类型")
+    local_date = Column(Date, primary_key=True, comment="事件时间的区域本地自然日")
+    tier_level = Column(Integer, primary_key=True, comment="风险等级(1/2/3)")
+    event_count = Column(BigInteger, nullable=False, default=0, comment="事件数量")
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(tz.utc),
+        comment="更新时间(UTC)"
+    )
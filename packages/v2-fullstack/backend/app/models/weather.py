@@ -5,6 +5,8 @@ Weather Data Models (历史/预测天气数据)
 - historical: 单一真值(不可变)
 - predicted: 批次版本化(prediction_run_id)
 
+分区: LIST(data_type) → RANGE(timestamp) 按月, 见 app/models/partitioning.py
+
 Reference:
 - docs/v2/v2实施细则/07-天气数据表与Weather-Service-细则.md
 """
@@ -16,6 +18,7 @@ from sqlalchemy import Column, DateTime, Index, Numeric, String
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.models.base import Base
+from app.models.partitioning import attach_partition_ddl
 
 
 class WeatherData(Base):
@@ -33,12 +36,13 @@ class WeatherData(Base):
     
     __tablename__ = "weather_data"
     
-    # 主键 (复合: timestamp + region + weather_type + data_type + run_id)
+    # 主键 (id + 分区键 data_type/timestamp; 分区表要求主键包含分区键)
     id = Column(String(100), primary_key=True, comment="主键ID")
     
     # 时空维度
     timestamp = Column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         index=True,
         comment="观测/预测时间(UTC)"
@@ -71,6 +75,7 @@ class WeatherData(Base):
     # 数据类型
     data_type = Column(
         String(20),
+        primary_key=True,
         nullable=False,
         index=True,
         comment="historical/predicted"
@@ -114,6 +119,7 @@ class WeatherData(Base):
             'idx_weather_predicted',
             'prediction_run_id', 'weather_type', 'timestamp'
         ),
+        {"postgresql_partition_by": "LIST (data_type)"},
     )
     
     def __repr__(self) -> str:
@@ -126,3 +132,6 @@ class WeatherData(Base):
             f"data_type={self.data_type}"
             f")>"
         )
+
+
+attach_partition_ddl(WeatherData.__table__)
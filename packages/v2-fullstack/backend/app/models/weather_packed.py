@@ -0,0 +1,77 @@
+"""
+Weather Daily Packed Model (天气序列紧凑存储)
+
+weather_data 的替代存储格式: 一行 = 区域 × 天气类型 × data_type × 批次 × 本地自然日
+- packed_values: 打包的小时数值数组(int64, 按 scale 放大)
+- validity: 有效位图
+
+与 weather_data 相比每个区域日只占 1 行堆元组 + 1 条索引项(原为 ~24 行)。
+编解码见 app/utils/weather_packing.py; 读取见 WeatherService.query_time_series_packed。
+"""
+
+from datetime import datetime, timezone as tz
+
+from sqlalchemy import (
+    BigInteger, Column, Date, DateTime, Identity, Index, LargeBinary, SmallInteger, String, text
+)
+
+from app.models.base import Base
+
+
+class WeatherDailyPacked(Base):
+    """天气日序列紧凑表"""
+    
+    __tablename__ = "weather_daily_packed"
+    
+    id = Column(BigInteger, Identity(), primary_key=True, comment="主键ID")
+    
+    # 序列维度
+    region_code = Column(String(20), nullable=False, comment="区域代码")
+    weather_type = Column(String(20), nullable=False, comment="天气类型")
+    data_type = Column(String(20), nullable=False, comment="historical/predicted")
+    prediction_run_id = Column(String(50), nullable=True, comment="预测批次ID(predicted必须)")
+    
+    # 时间维度 (region_timezone 自然日)
+    local_date = Column(Date, nullable=False, comment="本地自然日")
+    region_timezone = Column(String(50), nullable=False, comment="自然日所用时区")
+    day_start = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="本地自然日起点(UTC), 槽位0对应时间"
+    )
+    slot_count = Column(SmallInteger, nullable=False, comment="小时槽位数(DST日为23/25)")
+    
+    # 打包数据
+    unit = Column(String(20), nullable=False, comment="单位")
+    scale = Column(SmallInteger, nullable=False, comment="数值放大位数(10^scale)")
+    packed_values = Column(LargeBinary, nullable=False, comment="小端int64数组")
+    validity = Column(LargeBinary, nullable=False, comment="有效位图(LSB first)")
+    
+    # 审计
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(tz.utc),
+        onupdate=lambda: datetime.now(tz.utc),
+        comment="更新时间(UTC)"
+    )
+    
+    __table_args__ = (
+        Index(
+            "uq_weather_packed_historical",
+            "region_code",
+            "weather_type",
+            "local_date",
+            unique=True,
+            postgresql_where=text("data_type = 'historical' AND prediction_run_id IS NULL"),
+        ),
+        Index(
+            "uq_weather_packed_predicted",
+            "prediction_run_id",
+            "region_code",
+            "weather_type",
+            "local_date",
+            unique=True,
+            postgresql_where=text("prediction_run_id IS NOT NULL"),
+        ),
+    )
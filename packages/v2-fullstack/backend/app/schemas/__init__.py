@@ -23,6 +23,9 @@ from app.schemas.shared import (
     LegendMeta,
     DataProductResponse,
     
+    # Batch Lookup
+    BatchGetRequest,
+    
     # Observability
     TraceContext,
 )
@@ -130,6 +133,9 @@ __all__ = [
     "LegendMeta",
     "DataProductResponse",
     
+    # Shared Contract - Batch Lookup
+    "BatchGetRequest",
+    
     # Shared Contract - Observability
     "TraceContext",
     
@@ -18,7 +18,7 @@ Reference:
 
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -168,7 +168,7 @@ class PruningPolicyRegistry:
         field_pruning=FieldPruningRule(
             allowed_fields={
                 "region_code", "region_name", "rank", 
-                "policy_count", "claim_count", "claim_rate",
+                "policy_count", "claim_count", "claim_rate", "risk_event_count",
                 # 金额字段必须允许输出，但在 Demo/Public 下强制区间化
                 "policy_amount_total", "claim_amount_total",
             },
@@ -196,7 +196,7 @@ class PruningPolicyRegistry:
         field_pruning=FieldPruningRule(
             allowed_fields={
                 "region_code", "region_name", "rank",
-                "policy_count", "claim_count", "claim_rate",
+                "policy_count", "claim_count", "claim_rate", "risk_event_count",
                 "policy_amount_total", "claim_amount_total",  # 允许金额
                 # 仍隐藏: internal_id, debug_info
             }
@@ -220,7 +220,7 @@ class PruningPolicyRegistry:
         field_pruning=FieldPruningRule(
             allowed_fields={
                 "region_code", "region_name", "rank",
-                "policy_count", "claim_count", "claim_rate",
+                "policy_count", "claim_count", "claim_rate", "risk_event_count",
                 "policy_amount_total", "claim_amount_total",
                 "internal_id", "debug_info", "created_at", "updated_at"
             }
@@ -433,6 +433,26 @@ class FieldPruner:
         """裁剪列表中每个字典的字段"""
         return [FieldPruner.prune_dict(item, policy) for item in data]
     
+    @staticmethod
+    def range_bounds(value: Union[int, float, Decimal]) -> Tuple[Decimal, Decimal]:
+        """
+        数值区间化的上下界 [lower, upper)
+        
+        安全优先：按数量级做区间化，避免过细暴露（Demo/Public）
+        """
+        decimal_value = value if isinstance(value, Decimal) else Decimal(str(value))
+        abs_value = abs(decimal_value)
+        if abs_value == 0:
+            step = Decimal(10)
+        else:
+            # value.adjusted(): 10^n 的 n（例如 12345 -> 4）
+            # 让区间至少是 10^1，并随数量级变粗（例如 12345 -> step=1000）
+            step_exp = max(abs_value.adjusted() - 1, 1)
+            step = Decimal(10) ** step_exp
+
+        lower = (decimal_value // step) * step
+        return lower, lower + step
+    
     @staticmethod
     def _mask_value(value: Any, mask_rule: str) -> Any:
         """
@@ -448,23 +468,7 @@ class FieldPruner:
         if mask_rule == "range":
             # 转为区间表示
             if isinstance(value, (int, float, Decimal)):
-                # 安全优先：按数量级做区间化，避免过细暴露（Demo/Public）
-                decimal_value = (
-                    value
-                    if isinstance(value, Decimal)
-                    else Decimal(str(value))
-                )
-                abs_value = abs(decimal_value)
-                if abs_value == 0:
-                    step = Decimal(10)
-                else:
-                    # value.adjusted(): 10^n 的 n（例如 12345 -> 4）
-                    # 让区间至少是 10^1，并随数量级变粗（例如 12345 -> step=1000）
-                    step_exp = max(abs_value.adjusted() - 1, 1)
-                    step = Decimal(10) ** step_exp
-
-                lower = (decimal_value // step) * step
-                upper = lower + step
+                lower, upper = FieldPruner.range_bounds(value)
                 # 统一输出为字符串，避免 Decimal/float 在跨端展示时产生歧义
                 return f"[{lower}, {upper})"
             return value
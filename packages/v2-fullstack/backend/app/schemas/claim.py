@@ -14,7 +14,7 @@ Reference:
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -74,6 +74,22 @@ class ClaimListItem(BaseModel):
     status: str
 
 
+class ClaimPage(BaseModel):
+    """理赔分页结果(keyset, 按 triggered_at DESC, id DESC)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    items: List[Claim] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="下一页游标(不透明), 无更多数据时为空")
+
+
+class ClaimBatch(BaseModel):
+    """理赔批量查询结果(按请求顺序)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    items: List[Claim] = Field(default_factory=list)
+    missing: List[str] = Field(default_factory=list, description="不存在的ID")
+
+
 class ClaimStats(BaseModel):
     """理赔统计"""
     model_config = ConfigDict(from_attributes=True)
@@ -97,3 +113,4 @@ class ClaimFilter(BaseModel):
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     limit: int = Field(default=100, ge=1, le=1000)
+    cursor: Optional[str] = Field(None, description="上一页返回的 next_cursor(不透明)")
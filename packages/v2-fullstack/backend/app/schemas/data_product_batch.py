@@ -0,0 +1,53 @@
+"""
+Data Product Batch Schemas
+
+一次请求获取多个数据产品(L0/Overlays/L1), 减少 HTTP 往返
+
+硬规则:
+- 每一项独立走数据产品管线(缓存 + Mode 裁剪), 各自的 access_mode 独立生效
+- 结果与请求顺序一一对应; 单项失败不影响其他项(status_code/error 逐项给出)
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import DataProductResponse, SharedDimensions
+
+# 单次批量请求最多项数(并发受 DATA_PRODUCT_BATCH_CONCURRENCY 约束)
+MAX_BATCH_ITEMS = 10
+
+
+class DataProductBatchItem(BaseModel):
+    """批量请求中的一项"""
+
+    data_product: DataProductType = Field(..., description="数据产品类型")
+    dimensions: SharedDimensions = Field(..., description="该项的共享维度")
+
+
+class DataProductBatchRequest(BaseModel):
+    """批量数据产品请求"""
+
+    items: List[DataProductBatchItem] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_ITEMS,
+        description=f"请求项(1~{MAX_BATCH_ITEMS}), 结果按相同顺序返回",
+    )
+
+
+class DataProductBatchResult(BaseModel):
+    """批量结果中的一项"""
+    model_config = ConfigDict(from_attributes=True)
+
+    data_product: DataProductType = Field(..., description="数据产品类型")
+    status_code: int = Field(..., description="该项的 HTTP 语义状态码(200/400/500)")
+    data: Optional[DataProductResponse] = Field(None, description="成功时的数据产品响应")
+    error: Optional[str] = Field(None, description="失败原因")
+
+
+class DataProductBatchResponse(BaseModel):
+    """批量数据产品响应"""
+
+    results: List[DataProductBatchResult] = Field(..., description="与请求项顺序一致的结果")
@@ -9,7 +9,7 @@ Reference:
 
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -25,6 +25,7 @@ class L2Summary(BaseModel):
     claim_count: int = Field(..., description="理赔数量")
     total_payout: Optional[Decimal] = Field(None, description="总赔付(Mode裁剪)")
     max_tier: int = Field(..., description="最高tier级别")
+    episode_count: Optional[int] = Field(None, description="事件段数量(risk_view=episodes)")
 
 
 class L2RiskEvent(BaseModel):
@@ -41,6 +42,23 @@ class L2RiskEvent(BaseModel):
     prediction_run_id: Optional[str] = None
 
 
+class L2RiskEpisode(BaseModel):
+    """L2风险事件段(连续触发窗口合并)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: str
+    start_at: datetime
+    end_at: datetime
+    peak_at: datetime
+    peak_tier: int
+    peak_value: Decimal
+    threshold_value: Decimal
+    window_count: int
+    weather_type: WeatherType
+    data_type: DataType
+    prediction_run_id: Optional[str] = None
+
+
 class L2Claim(BaseModel):
     """L2理赔"""
     model_config = ConfigDict(from_attributes=True)
@@ -71,6 +89,7 @@ class L2EvidenceResponse(BaseModel):
     meta: "L2EvidenceMeta"
     summary: L2Summary
     risk_events: List[L2RiskEvent] = Field(default_factory=list)
+    risk_episodes: List[L2RiskEpisode] = Field(default_factory=list)
     claims: List[L2Claim] = Field(default_factory=list)
     weather_evidence: List[L2WeatherEvidence] = Field(default_factory=list)
     
@@ -117,6 +136,9 @@ class L2EvidenceRequest(BaseModel):
     focus_id: Optional[str] = None
     cursor_time_utc: Optional[datetime] = None
 
+    # 风险视图: events=逐窗口 risk_events, episodes=连续触发合并后的事件段
+    risk_view: Literal["events", "episodes"] = "events"
+
     # 分页
     page_size: int = Field(default=50, ge=1, le=200)
     cursor: Optional[int] = Field(default=0, ge=0)
@@ -13,7 +13,7 @@ Reference:
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -74,6 +74,14 @@ class PolicyListItem(BaseModel):
     is_active: bool
 
 
+class PolicyBatch(BaseModel):
+    """保单批量查询结果(按请求顺序)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    items: List[Policy] = Field(default_factory=list)
+    missing: List[str] = Field(default_factory=list, description="不存在的ID")
+
+
 class PolicyStats(BaseModel):
     """保单统计"""
     model_config = ConfigDict(from_attributes=True)
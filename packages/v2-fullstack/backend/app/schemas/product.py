@@ -15,6 +15,7 @@ Reference:
 - riskRules 与 payoutRules 职责隔离
 - weather_type 必须与 riskRules 一致
 - 规则必须可追溯版本
+- 规则模型只读(frozen): 产品缓存在请求/任务间共享同一实例
 """
 
 from datetime import datetime
@@ -36,7 +37,7 @@ class TimeWindow(BaseModel):
     
     定义风险计算的时间窗口参数
     """
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
     type: str = Field(
         ...,
@@ -67,7 +68,7 @@ class Thresholds(BaseModel):
     
     validator在ProductCreate层面根据operator验证
     """
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
     tier1: Decimal = Field(..., description="一级阈值")
     tier2: Decimal = Field(..., description="二级阈值")
@@ -80,7 +81,7 @@ class Calculation(BaseModel):
     
     定义如何聚合和比较天气数据
     """
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
     aggregation: str = Field(
         ...,
@@ -109,7 +110,7 @@ class RiskRules(BaseModel):
     - 只用于 risk_events 触发
     - 不包含赔付金额信息
     """
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
     time_window: TimeWindow = Field(..., description="时间窗口配置")
     thresholds: Thresholds = Field(..., description="阈值配置")
@@ -123,7 +124,7 @@ class RiskRules(BaseModel):
 
 class PayoutPercentages(BaseModel):
     """赔付百分比配置"""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
     tier1: Decimal = Field(..., ge=0, le=100, description="一级赔付百分比 (%)")
     tier2: Decimal = Field(..., ge=0, le=100, description="二级赔付百分比 (%)")
@@ -154,7 +155,7 @@ class PayoutRules(BaseModel):
     - 赔付频次限制按 policy.region_timezone 判断
     - predicted 不生成正式 claims
     """
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
     frequency_limit: str = Field(
         ...,
@@ -6,7 +6,7 @@ Risk Event Schemas
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -47,3 +47,63 @@ class RiskEventResponse(RiskEventBase):
     id: str
     product_version: str
     created_at: datetime
+
+
+class RiskEventPage(BaseModel):
+    """风险事件分页结果(keyset)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    items: List[RiskEventResponse] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="下一页游标(不透明), 无更多数据时为空")
+
+
+class RiskEventBatch(BaseModel):
+    """风险事件批量查询结果(按请求顺序)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    items: List[RiskEventResponse] = Field(default_factory=list)
+    missing: List[str] = Field(default_factory=list, description="不存在的ID")
+
+
+class RiskEpisodeResponse(BaseModel):
+    """风险事件段(连续触发窗口合并)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: str
+    region_code: str
+    product_id: str
+    product_version: str
+    weather_type: WeatherType
+    data_type: DataType
+    prediction_run_id: Optional[str] = None
+    start_at: datetime = Field(..., description="首个触发窗口结束时刻(UTC)")
+    end_at: datetime = Field(..., description="末个触发窗口结束时刻(UTC)")
+    peak_at: datetime = Field(..., description="最严重窗口时刻(UTC)")
+    peak_tier: int = Field(..., ge=1, le=3)
+    peak_value: Decimal
+    threshold_value: Decimal
+    window_count: int = Field(..., ge=1, description="合并的触发窗口数")
+
+
+class RiskEventAggregate(BaseModel):
+    """风险事件聚合指标(数据库侧 GROUP BY)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    event_count: int = Field(..., ge=0, description="事件数量")
+    tier1_count: int = Field(0, ge=0, description="Tier 1 事件数量")
+    tier2_count: int = Field(0, ge=0, description="Tier 2 事件数量")
+    tier3_count: int = Field(0, ge=0, description="Tier 3 事件数量")
+    max_tier_level: Optional[int] = Field(None, ge=1, le=3, description="最高风险等级")
+    max_trigger_value: Optional[Decimal] = Field(None, description="最大触发值")
+
+
+class RiskEventBucket(RiskEventAggregate):
+    """按时间桶的风险事件聚合(桶边界按 region_timezone 对齐)"""
+    
+    bucket_start: datetime = Field(..., description="桶起始时间(UTC)")
+
+
+class RiskEventRegionAggregate(RiskEventAggregate):
+    """按区域的风险事件聚合"""
+    
+    region_code: str = Field(..., description="区域代码")
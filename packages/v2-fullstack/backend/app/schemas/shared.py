@@ -167,6 +167,12 @@ class SharedDimensions(BaseModel):
         description="区域时区(如Asia/Shanghai,用于业务边界对齐)",
         examples=["Asia/Shanghai", "America/New_York"]
     )
+    max_points: Optional[int] = Field(
+        None,
+        ge=10,
+        le=20000,
+        description="时间序列点数预算(超出时服务端降采样; 一旦使用必须入缓存key)"
+    )
     
     @field_validator("prediction_run_id")
     @classmethod
@@ -180,17 +186,26 @@ class SharedDimensions(BaseModel):
                 raise ValueError("prediction_run_id must be None when data_type is historical")
         return v
     
+    def resolved_timezone(self) -> str:
+        """区域时区: 显式 region_timezone, 否则按区域代码映射"""
+        # 延迟导入: app.utils.time_utils 依赖 app.schemas 包
+        from app.utils.time_utils import get_timezone_for_region
+
+        return self.region_timezone or get_timezone_for_region(self.region_code)
+
     def to_cache_key(self) -> str:
         """
         生成缓存key
         
         硬规则:
         - 至少包含: region_scope, region_code, time_range, data_type, weather_type, access_mode
+        - 时区决定自然日边界, 按解析后的时区入key(未显式指定与显式默认值共用条目)
         - predicted场景额外包含: prediction_run_id
         """
         parts = [
             f"region:{self.region_scope.value}:{self.region_code}",
             f"time:{self.time_range.start.isoformat()}:{self.time_range.end.isoformat()}",
+            f"tz:{self.resolved_timezone()}",
             f"dtype:{self.data_type.value}",
             f"weather:{self.weather_type.value}",
             f"mode:{self.access_mode.value}",
@@ -202,6 +217,9 @@ class SharedDimensions(BaseModel):
         if self.data_type == DataType.PREDICTED and self.prediction_run_id:
             parts.append(f"run:{self.prediction_run_id}")
         
+        if self.max_points:
+            parts.append(f"points:{self.max_points}")
+        
         return "|".join(parts)
 
 
@@ -298,6 +316,19 @@ class AggregationData(BaseModel):
         None,
         description="展示标签(可选)"
     )
+    metric: Optional[str] = Field(
+        None,
+        description="指标名(如claim_amount_total), Mode裁剪按指标名生效",
+        examples=["policy_amount_total", "claim_amount_total", "risk_event_count"]
+    )
+    dimension_value: Optional[str] = Field(
+        None,
+        description="聚合维度取值(如aggregation_key=region_code时的区域代码)"
+    )
+    rank: Optional[int] = Field(
+        None,
+        description="TopN排名(从1开始)"
+    )
 
 
 class LegendMeta(BaseModel):
@@ -395,6 +426,29 @@ class DataProductResponse(BaseModel):
     )
 
 
+# ============================================================================
+# Batch Lookup (批量按ID查询)
+# ============================================================================
+
+# 单次 batchGet 最多 id 数(一条 = ANY(:ids) 查询)
+MAX_BATCH_GET_IDS = 200
+
+
+class BatchGetRequest(BaseModel):
+    """
+    批量按ID查询请求
+    
+    - 结果按 ids 顺序返回, 重复 id 只返回一次
+    - 不存在的 id 放入响应 missing, 不报 404
+    """
+    ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_GET_IDS,
+        description=f"ID列表(最多{MAX_BATCH_GET_IDS}个)"
+    )
+
+
 # ============================================================================
 # Observability (可观测性)
 # ============================================================================
@@ -455,6 +509,10 @@ class ResponseMeta(BaseModel):
         None,
         description="缓存key(用于排障)"
     )
+    stale_age_seconds: Optional[float] = Field(
+        None,
+        description="返回过期缓存(后台重建中)时已超出新鲜期(软TTL)的秒数; 新鲜响应为None"
+    )
     warnings: Optional[List[str]] = Field(
         None,
         description="警告信息(如数据不完整、降级处理等)"
@@ -0,0 +1,72 @@
+"""
+Spatial Aggregation Schemas
+
+H3 单元 → 父单元 / 区域 的空间聚合请求与结果, 以及地图叠加层瓦片
+
+Reference:
+- docs/v2/v2实施细则/07-天气数据表与Weather-Service-细则.md
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.shared import DataType, WeatherType
+from app.schemas.time import TimeGranularity
+from app.schemas.weather import WeatherStatsBucket
+
+
+class SpatialAggregationRequest(BaseModel):
+    """空间聚合请求(按 H3 单元聚合 weather_data)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    weather_type: WeatherType
+    start_time: datetime
+    end_time: datetime
+    data_type: DataType
+    prediction_run_id: Optional[str] = None
+    granularity: TimeGranularity = Field(
+        TimeGranularity.HOUR,
+        description="时间桶粒度(按 region_timezone 自然边界)"
+    )
+    region_timezone: str = Field("Asia/Shanghai", description="分桶时区")
+    province_code: Optional[str] = Field(None, description="可选: 限定省级区域")
+
+
+class SpatialStatsBucket(WeatherStatsBucket):
+    """空间聚合结果(一个分组 × 一个时间桶)"""
+    
+    group_key: str = Field(..., description="父单元索引或区域代码")
+
+
+class OverlayLayer(str, Enum):
+    """瓦片要素粒度(随 zoom 变化)"""
+    PROVINCE = "province"
+    DISTRICT = "district"
+    CELL = "cell"
+
+
+class OverlayTile(BaseModel):
+    """
+    地图叠加层瓦片(列式紧凑格式)
+
+    keys / weather_avg / weather_max / risk_tier 同下标为同一要素;
+    区域层的值只统计落在本瓦片内的单元
+    """
+    model_config = ConfigDict(from_attributes=True)
+    
+    zoom: int
+    x: int
+    y: int
+    weather_type: WeatherType
+    data_type: DataType
+    prediction_run_id: Optional[str] = None
+    granularity: TimeGranularity
+    bucket_start: datetime = Field(..., description="时间桶起点(UTC)")
+    layer: OverlayLayer
+    keys: List[str] = Field(default_factory=list, description="区域代码或H3单元索引")
+    weather_avg: List[float] = Field(default_factory=list)
+    weather_max: List[float] = Field(default_factory=list)
+    risk_tier: List[int] = Field(default_factory=list, description="风险强度(0-3)")
@@ -9,7 +9,7 @@ Reference:
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -41,6 +41,18 @@ class WeatherQueryRequest(BaseModel):
     prediction_run_id: Optional[str] = None
 
 
+class WeatherMultiRegionQueryRequest(BaseModel):
+    """多区域天气数据查询请求(单次往返)"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    region_codes: List[str] = Field(..., min_length=1, description="区域代码列表")
+    weather_type: WeatherType
+    start_time: datetime
+    end_time: datetime
+    data_type: DataType
+    prediction_run_id: Optional[str] = None
+
+
 class WeatherStats(BaseModel):
     """天气统计"""
     model_config = ConfigDict(from_attributes=True)
@@ -50,3 +62,9 @@ class WeatherStats(BaseModel):
     max: Optional[Decimal] = None
     min: Optional[Decimal] = None
     count: int = Field(..., description="数据点数量")
+
+
+class WeatherStatsBucket(WeatherStats):
+    """按时间桶的天气统计(桶边界按 region_timezone 对齐)"""
+    
+    bucket_start: datetime = Field(..., description="桶起始时间(UTC)")
@@ -0,0 +1,199 @@
+"""
+Seed H3 Cell Mappings
+
+从 weather_data 已有的 (h3_index, region_code) 生成:
+- h3_cell_regions: 单元 → 省(region_code) / 区县(可选 CSV)
+- h3_cell_parents: 单元 → 各级父单元
+- 单元中心点瓦片坐标(OVERLAY_BASE_ZOOM, 地图叠加层瓦片用)
+
+依赖:
+- h3 (可选依赖, 仅本脚本需要; 查询侧只读映射表)
+
+Usage:
+    python -m app.seeds.seed_h3_cells [--parents 5,6,7] [--district-csv path]
+
+    district CSV 列: h3_index,district_code
+"""
+
+import argparse
+import asyncio
+import csv
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base
+from app.models.h3_cell import H3CellParent, H3CellRegion
+from app.models.weather import WeatherData
+from app.utils.map_tiles import latlng_to_tile
+
+try:
+    import h3
+except ImportError:  # pragma: no cover - 可选依赖
+    h3 = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARENT_RESOLUTIONS = (5, 6, 7)
+INSERT_CHUNK_SIZE = 1000
+
+
+def build_cell_mappings(
+    cells: Iterable[Tuple[str, str]],
+    parent_resolutions: Sequence[int],
+    h3_module,
+    district_by_cell: Optional[Dict[str, str]] = None,
+) -> Tuple[List[dict], List[dict]]:
+    """
+    生成映射行
+
+    Args:
+        cells: (h3_index, province_code)
+        parent_resolutions: 需要预计算的父分辨率(高于单元分辨率的会跳过)
+        h3_module: h3 库(需提供 get_resolution / cell_to_parent / cell_to_latlng)
+        district_by_cell: 可选 单元 → 区县代码
+
+    Returns:
+        (region_rows, parent_rows)
+    """
+    district_by_cell = district_by_cell or {}
+    region_rows: List[dict] = []
+    parent_rows: List[dict] = []
+    seen = set()
+
+    for h3_index, province_code in cells:
+        if h3_index in seen:
+            continue
+        seen.add(h3_index)
+
+        resolution = h3_module.get_resolution(h3_index)
+        tile_x, tile_y = latlng_to_tile(*h3_module.cell_to_latlng(h3_index))
+        region_rows.append(
+            {
+                "h3_index": h3_index,
+                "resolution": resolution,
+                "province_code": province_code,
+                "district_code": district_by_cell.get(h3_index),
+                "tile_x": tile_x,
+                "tile_y": tile_y,
+            }
+        )
+        for parent_resolution in parent_resolutions:
+            if parent_resolution > resolution:
+                continue
+            parent_rows.append(
+                {
+                    "h3_index": h3_index,
+                    "parent_resolution": parent_resolution,
+                    "parent_index": h3_module.cell_to_parent(h3_index, parent_resolution),
+                }
+            )
+
+    return region_rows, parent_rows
+
+
+def _load_district_csv(path: Optional[str]) -> Dict[str, str]:
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {row["h3_index"]: row["district_code"] for row in csv.DictReader(f)}
+
+
+async def seed_h3_cells(
+    session: AsyncSession,
+    parent_resolutions: Sequence[int] = DEFAULT_PARENT_RESOLUTIONS,
+    district_csv: Optional[str] = None,
+) -> Tuple[int, int]:
+    """从 weather_data 生成映射表(幂等, 重复执行覆盖)"""
+    if h3 is None:
+        raise RuntimeError("h3 is not installed. Install it with `pip install h3`.")
+
+    result = await session.execute(
+        select(WeatherData.h3_index, WeatherData.region_code)
+        .where(WeatherData.h3_index.is_not(None))
+        .distinct()
+    )
+    region_rows, parent_rows = build_cell_mappings(
+        result.all(),
+        parent_resolutions,
+        h3,
+        _load_district_csv(district_csv),
+    )
+    logger.info(
+        f"Seeding {len(region_rows)} cells, {len(parent_rows)} parent mappings"
+    )
+
+    for start in range(0, len(region_rows), INSERT_CHUNK_SIZE):
+        stmt = insert(H3CellRegion).values(region_rows[start:start + INSERT_CHUNK_SIZE])
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[H3CellRegion.h3_index],
+                set_={
+                    "resolution": stmt.excluded.resolution,
+                    "province_code": stmt.excluded.province_code,
+                    "district_code": stmt.excluded.district_code,
+                    "tile_x": stmt.excluded.tile_x,
+                    "tile_y": stmt.excluded.tile_y,
+                },
+            )
+        )
+    for start in range(0, len(parent_rows), INSERT_CHUNK_SIZE):
+        stmt = insert(H3CellParent).values(parent_rows[start:start + INSERT_CHUNK_SIZE])
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[H3CellParent.h3_index, H3CellParent.parent_resolution],
+                set_={"parent_index": stmt.excluded.parent_index},
+            )
+        )
+
+    await session.commit()
+    logger.info("✅ H3 cell mappings seeded successfully")
+    return len(region_rows), len(parent_rows)
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Seed H3 cell mapping tables")
+    parser.add_argument(
+        "--parents",
+        default=",".join(str(r) for r in DEFAULT_PARENT_RESOLUTIONS),
+        help="父分辨率列表, 逗号分隔",
+    )
+    parser.add_argument("--district-csv", default=None, help="单元→区县映射CSV")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError(
+            "DATABASE_URL is not set. Please set it in your environment or .env file."
+        )
+
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async_session = sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+    async with async_session() as session:
+        await seed_h3_cells(
+            session,
+            parent_resolutions=[int(r) for r in args.parents.split(",") if r],
+            district_csv=args.district_csv,
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
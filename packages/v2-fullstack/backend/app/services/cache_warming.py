@@ -0,0 +1,180 @@
+"""
+Data Product Cache Warming (数据产品缓存预热)
+
+职责:
+- 风险事件/理赔计算任务提交后, 枚举受影响的数据产品缓存键并在后台重建,
+  避免失效后的首个看板请求承担完整构建成本
+- 每日预设时间区间滚动后, 按有效保单组合预热新区间
+
+枚举口径(与前端默认请求一致, 否则预热的键不会被命中):
+- 区域: 受影响区域及其上级区域(仅 province / district 两级, 国家级无对应 region_scope)
+- 产品: 受影响产品 + 未指定产品(聚合所有产品)
+- 时间: 预设区间 PRESET_DAYS, 终点为下一个 UTC 零点(缓存键含精确起止时间, 须确定性对齐)
+- Mode: 全部 AccessMode; 数据产品: 批量接口支持的 L0 / Overlays / L1
+- 只预热 historical(predicted 按批次请求, 无固定键)
+
+硬规则:
+- 复用批量执行器: 同键去重、并发上限 WARM_CONCURRENCY、逐项失败只记录
+- 新鲜条目直接跳过; 宽限期内的旧条目同步重建(serve_stale=False)
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import (
+    AccessMode,
+    DataType,
+    RegionScope,
+    SharedDimensions,
+    TimeRange,
+    WeatherType,
+)
+from app.services.data_product_batch import BATCH_BUILDERS, DataProductBatchService
+from app.services.data_product_cache import build_cache_key, region_lineage
+from app.services.policy_portfolio import policy_portfolio
+from app.services.product_service import product_service
+
+logger = logging.getLogger(__name__)
+
+# 标准预设区间(天), 与前端 TimeRangePresets.last{7,30,90}Days 保持一致
+PRESET_DAYS: Tuple[int, ...] = (7, 30, 90)
+WARM_CONCURRENCY = int(os.getenv("DATA_PRODUCT_WARM_CONCURRENCY", "2"))
+
+# 区域代码段数 → region_scope(CN-GD → province, CN-GD-SZ → district)
+_SCOPE_BY_DEPTH: Dict[int, RegionScope] = {
+    2: RegionScope.PROVINCE,
+    3: RegionScope.DISTRICT,
+}
+
+
+@dataclass(frozen=True)
+class WarmTarget:
+    """预热目标(计算任务写入的区域 + 产品)"""
+
+    region_code: str
+    product_id: str
+    weather_type: WeatherType
+
+
+@dataclass
+class WarmReport:
+    """预热结果统计"""
+
+    keys: int = 0
+    warmed: int = 0
+    failed: int = 0
+
+
+def preset_time_ranges(now: Optional[datetime] = None) -> List[TimeRange]:
+    """预设时间区间: [终点 - N 天, 下一个 UTC 零点)"""
+    now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    end = datetime(now.year, now.month, now.day, tzinfo=timezone.utc) + timedelta(days=1)
+    return [TimeRange(start=end - timedelta(days=days), end=end) for days in PRESET_DAYS]
+
+
+def region_scope_for(region_code: str) -> Optional[RegionScope]:
+    return _SCOPE_BY_DEPTH.get(len(region_code.split("-")))
+
+
+def warm_items(
+    targets: Iterable[WarmTarget],
+    *,
+    now: Optional[datetime] = None,
+    product_types: Optional[Sequence[DataProductType]] = None,
+) -> List[Tuple[DataProductType, SharedDimensions]]:
+    """
+    枚举预热项(按缓存键去重, 顺序稳定)
+
+    Returns:
+        (数据产品, 维度) 列表(product_types 默认为批量接口支持的全部数据产品)
+    """
+    product_types = product_types or tuple(BATCH_BUILDERS)
+    time_ranges = preset_time_ranges(now)
+    items: Dict[str, Tuple[DataProductType, SharedDimensions]] = {}
+    for target in targets:
+        for region_code in region_lineage(target.region_code):
+            region_scope = region_scope_for(region_code)
+            if region_scope is None:
+                continue
+            for product_id in (target.product_id, None):
+                for time_range in time_ranges:
+                    for access_mode in AccessMode:
+                        dimensions = SharedDimensions(
+                            region_scope=region_scope,
+                            region_code=region_code,
+                            time_range=time_range,
+                            data_type=DataType.HISTORICAL,
+                            weather_type=target.weather_type,
+                            access_mode=access_mode,
+                            product_id=product_id,
+                        )
+                        for product_type in product_types:
+                            items.setdefault(
+                                build_cache_key(product_type, dimensions),
+                                (product_type, dimensions),
+                            )
+    return list(items.values())
+
+
+class CacheWarmingService:
+    """数据产品缓存预热"""
+
+    def __init__(self, concurrency: int = WARM_CONCURRENCY):
+        self.executor = DataProductBatchService(concurrency=concurrency, serve_stale=False)
+
+    async def warm(
+        self,
+        targets: Iterable[WarmTarget],
+        *,
+        now: Optional[datetime] = None,
+    ) -> WarmReport:
+        """重建目标对应的缓存键(已新鲜的键由缓存直接命中, 不重复构建, 同样计入 warmed)"""
+        items = warm_items(targets, now=now)
+        outcomes = await self.executor.run(items)
+        report = WarmReport(keys=len(items))
+        for outcome in outcomes:
+            if outcome.status_code == 200:
+                report.warmed += 1
+                continue
+            report.failed += 1
+            logger.warning(
+                "Data product warm-up failed",
+                extra={
+                    "data_product": outcome.data_product.value,
+                    "cache_key": outcome.dimensions.to_cache_key(),
+                    "error": outcome.error,
+                },
+            )
+        return report
+
+    async def portfolio_targets(
+        self,
+        session: AsyncSession,
+        *,
+        now: Optional[datetime] = None,
+    ) -> List[WarmTarget]:
+        """有效保单组合中与最长预设区间重叠的 (区域, 产品)"""
+        longest = preset_time_ranges(now)[-1]
+        await policy_portfolio.ensure_fresh(session)
+        pairs = sorted(
+            {
+                (policy.coverage_region, policy.product_id)
+                for policy in policy_portfolio.overlapping(None, longest.start, longest.end)
+            }
+        )
+        targets: List[WarmTarget] = []
+        for region_code, product_id in pairs:
+            product = await product_service.get_by_id(session, product_id)
+            if product is None:
+                continue
+            targets.append(WarmTarget(region_code, product_id, product.weather_type))
+        return targets
+
+
+cache_warming_service = CacheWarmingService()
@@ -5,6 +5,7 @@ Claim Service
 - 理赔CRUD
 - 统计查询 (用于L0/L1数据产品)
 - Mode裁剪 (敏感字段/金额)
+- 同事务维护 claim_daily_summary (统计读汇总表)
 
 Reference:
 - docs/v2/v2实施细则/30-理赔表与Claim-Service-细则.md
@@ -16,15 +17,29 @@ Reference:
 
 import logging
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from sqlalchemy import func, select
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import Select, String, any_, bindparam, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.claim import Claim as ClaimModel
-from app.schemas.claim import Claim, ClaimCreate, ClaimFilter, ClaimStats, ClaimUpdate
+from app.schemas.claim import (
+    Claim,
+    ClaimCreate,
+    ClaimBatch,
+    ClaimFilter,
+    ClaimPage,
+    ClaimStats,
+    ClaimUpdate,
+)
 from app.schemas.shared import AccessMode, DataType
+from app.services.data_product_cache import data_product_cache
+from app.services.data_versions import data_version_service
+from app.services.loader_profiles import SCALAR_ONLY, refresh_columns
+from app.services.stats_summary import ClaimFact, stats_summary_service
+from app.utils.batch_lookup import normalize_batch_ids, order_by_request
+from app.utils.pagination import decode_keyset_cursor, encode_keyset_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -61,8 +76,12 @@ class ClaimService:
         )
         
         session.add(model)
+        await stats_summary_service.apply_claim_changes(
+            session, added=[ClaimFact.of(claim_create)]
+        )
         await session.commit()
-        await session.refresh(model)
+        await self._invalidate_data_products([claim_create])
+        await refresh_columns(session, model)
         
         return self._model_to_schema(model)
 
@@ -103,11 +122,21 @@ class ClaimService:
         stmt = insert(ClaimModel).values(values)
         stmt = stmt.on_conflict_do_nothing(
             index_elements=["policy_id", "triggered_at", "tier_level"]
+        ).returning(
+            ClaimModel.region_code,
+            ClaimModel.product_id,
+            ClaimModel.triggered_at,
+            ClaimModel.status,
+            ClaimModel.payout_amount,
         )
 
+        # 只有实际插入的行(冲突跳过的不返回)计入汇总
         result = await session.execute(stmt)
+        inserted = [ClaimFact.of(row) for row in result.all()]
+        await stats_summary_service.apply_claim_changes(session, added=inserted)
         await session.commit()
-        return int(result.rowcount or 0)
+        await self._invalidate_data_products(inserted)
+        return len(inserted)
     
     async def update(
         self,
@@ -115,22 +144,34 @@ class ClaimService:
         claim_id: str,
         claim_update: ClaimUpdate,
     ) -> Optional[Claim]:
-        """更新理赔记录"""
+        """更新理赔记录(行锁: 并发更新按序计算汇总增量, 不会重复扣减同一旧值)"""
         result = await session.execute(
-            select(ClaimModel).where(ClaimModel.id == claim_id)
+            select(ClaimModel)
+            .where(ClaimModel.id == claim_id)
+            .options(*SCALAR_ONLY)
+            .with_for_update()
+            .execution_options(populate_existing=True)
         )
         model = result.scalar_one_or_none()
         
         if not model:
             return None
         
+        before = ClaimFact.of(model)
         if claim_update.status is not None:
             model.status = claim_update.status
         if claim_update.payout_amount is not None:
             model.payout_amount = claim_update.payout_amount
         
+        after = ClaimFact.of(model)
+        if after != before:
+            await stats_summary_service.apply_claim_changes(
+                session, added=[after], removed=[before]
+            )
         await session.commit()
-        await session.refresh(model)
+        if after != before:
+            await self._invalidate_data_products([after])
+        await refresh_columns(session, model)
         
         return self._model_to_schema(model)
     
@@ -139,9 +180,12 @@ class ClaimService:
         session: AsyncSession,
         claim_id: str,
     ) -> bool:
-        """删除理赔记录"""
+        """删除理赔记录(行锁: 并发删除只扣减一次汇总)"""
         result = await session.execute(
-            select(ClaimModel).where(ClaimModel.id == claim_id)
+            select(ClaimModel)
+            .where(ClaimModel.id == claim_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
         )
         model = result.scalar_one_or_none()
         
@@ -149,7 +193,11 @@ class ClaimService:
             return False
         
         await session.delete(model)
+        await stats_summary_service.apply_claim_changes(
+            session, removed=[ClaimFact.of(model)]
+        )
         await session.commit()
+        await self._invalidate_data_products([model])
         
         return True
     
@@ -161,7 +209,7 @@ class ClaimService:
     ) -> Optional[Claim]:
         """获取理赔详情"""
         result = await session.execute(
-            select(ClaimModel).where(ClaimModel.id == claim_id)
+            select(ClaimModel).where(ClaimModel.id == claim_id).options(*SCALAR_ONLY)
         )
         model = result.scalar_one_or_none()
         
@@ -171,32 +219,51 @@ class ClaimService:
         claim = self._model_to_schema(model)
         return self._apply_mode_pruning(claim, access_mode)
     
-    async def list_by_policy(
+    async def get_by_ids(
         self,
         session: AsyncSession,
-        policy_id: str,
+        claim_ids: Sequence[str],
         access_mode: AccessMode = AccessMode.DEMO_PUBLIC
-    ) -> List[Claim]:
-        """按保单查询理赔"""
+    ) -> ClaimBatch:
+        """
+        批量获取理赔(单条 = ANY 查询, 按请求顺序返回)
+        
+        Raises:
+            ValueError: ids 为空或超过上限
+        """
+        ids = normalize_batch_ids(claim_ids)
         result = await session.execute(
             select(ClaimModel)
-            .where(ClaimModel.policy_id == policy_id)
-            .order_by(ClaimModel.triggered_at.desc())
+            .where(ClaimModel.id == any_(bindparam("ids", ids, type_=ARRAY(String))))
+            .options(*SCALAR_ONLY)
         )
-        models = list(result.scalars().all())
-        
-        return [
-            self._apply_mode_pruning(self._model_to_schema(m), access_mode)
-            for m in models
-        ]
+        found = {
+            m.id: self._apply_mode_pruning(self._model_to_schema(m), access_mode)
+            for m in result.scalars().all()
+        }
+        items, missing = order_by_request(ids, found)
+        return ClaimBatch(items=items, missing=missing)
+    
+    async def list_by_policy(
+        self,
+        session: AsyncSession,
+        policy_id: str,
+        access_mode: AccessMode = AccessMode.DEMO_PUBLIC,
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> ClaimPage:
+        """按保单查询理赔(keyset 分页)"""
+        query = select(ClaimModel).where(ClaimModel.policy_id == policy_id)
+        return await self._fetch_page(session, query, limit, cursor, access_mode)
     
     async def list_by_filter(
         self,
         session: AsyncSession,
         filter: ClaimFilter,
         access_mode: AccessMode = AccessMode.DEMO_PUBLIC
-    ) -> List[Claim]:
-        """按条件查询理赔"""
+    ) -> ClaimPage:
+        """按条件查询理赔(keyset 分页)"""
         query = select(ClaimModel)
         
         if filter.policy_id:
@@ -214,15 +281,51 @@ class ClaimService:
         if filter.end_time:
             query = query.where(ClaimModel.triggered_at <= filter.end_time)
         
-        query = query.order_by(ClaimModel.triggered_at.desc()).limit(filter.limit)
+        return await self._fetch_page(
+            session, query, filter.limit, filter.cursor, access_mode
+        )
+    
+    async def _fetch_page(
+        self,
+        session: AsyncSession,
+        query: Select,
+        limit: int,
+        cursor: Optional[str],
+        access_mode: AccessMode,
+    ) -> ClaimPage:
+        """
+        按 (triggered_at DESC, id DESC) keyset 分页, 每页只读 limit + 1 行
+        
+        Raises:
+            ValueError: 游标非法
+        """
+        if cursor:
+            after_time, after_id = decode_keyset_cursor(cursor)
+            query = query.where(
+                tuple_(ClaimModel.triggered_at, ClaimModel.id)
+                < tuple_(literal(after_time), literal(after_id))
+            )
+        query = (
+            query.options(*SCALAR_ONLY)
+            .order_by(ClaimModel.triggered_at.desc(), ClaimModel.id.desc())
+            .limit(limit + 1)
+        )
         
         result = await session.execute(query)
         models = list(result.scalars().all())
         
-        return [
-            self._apply_mode_pruning(self._model_to_schema(m), access_mode)
-            for m in models
-        ]
+        next_cursor = None
+        if len(models) > limit:
+            models = models[:limit]
+            next_cursor = encode_keyset_cursor(models[-1].triggered_at, models[-1].id)
+        
+        return ClaimPage(
+            items=[
+                self._apply_mode_pruning(self._model_to_schema(m), access_mode)
+                for m in models
+            ],
+            next_cursor=next_cursor,
+        )
     
     async def get_stats(
         self,
@@ -231,23 +334,16 @@ class ClaimService:
         product_id: Optional[str] = None,
         access_mode: AccessMode = AccessMode.DEMO_PUBLIC
     ) -> ClaimStats:
-        """获取理赔统计"""
-        query = select(
-            func.count(ClaimModel.id).label("count"),
-            func.sum(ClaimModel.payout_amount).label("total_amount")
-        ).where(ClaimModel.status != "voided")
-        
-        if region_code:
-            query = query.where(ClaimModel.region_code == region_code)
-        if product_id:
-            query = query.where(ClaimModel.product_id == product_id)
-        
-        result = await session.execute(query)
-        row = result.first()
+        """获取理赔统计(读 claim_daily_summary, 不扫描 claims)"""
+        claim_count, total_amount = await stats_summary_service.claim_totals(
+            session,
+            region_code=region_code,
+            product_id=product_id,
+        )
         
         stats = ClaimStats(
-            claim_count=row.count or 0,
-            payout_amount_sum=row.total_amount
+            claim_count=claim_count,
+            payout_amount_sum=total_amount
         )
         
         # Mode裁剪
@@ -292,6 +388,18 @@ class ClaimService:
         
         return claim
     
+    async def _invalidate_data_products(self, facts: Sequence) -> None:
+        """理赔事实已提交: 失效相关区域/产品的数据产品缓存, 递增数据版本"""
+        if facts:
+            region_codes = {fact.region_code for fact in facts}
+            product_ids = {fact.product_id for fact in facts}
+            await data_product_cache.invalidate_facts(region_codes=region_codes, product_ids=product_ids)
+            await data_version_service.bump_facts(
+                region_codes=region_codes,
+                product_ids=product_ids,
+                data_type=DataType.HISTORICAL,
+            )
+    
     def _assert_historical(self, data_type: DataType) -> None:
         if data_type != DataType.HISTORICAL:
             raise ValueError("predicted not allowed for claims")
@@ -5,6 +5,7 @@ Risk Calculator (风险计算引擎)
 - 时间窗口聚合(hourly/daily/weekly/monthly)
 - 阈值比较(tier1/2/3判断)
 - 扩展窗口计算
+- 连续触发窗口合并为风险事件段(episode)
 
 Reference:
 - docs/v2/v2实施细则/08-Risk-Calculator-细则.md
@@ -23,9 +24,9 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import List, Optional, Sequence
+from typing import List, Optional, Sequence, Tuple
 
-from app.schemas.product import RiskRules
+from app.schemas.product import RiskRules, TimeWindow
 from app.schemas.shared import DataType, WeatherType
 from app.schemas.weather import WeatherDataPoint
 from app.utils.time_utils import (
@@ -58,6 +59,30 @@ class RiskEvent:
     prediction_run_id: Optional[str] = None
 
 
+@dataclass(frozen=True, slots=True)
+class RiskEpisode:
+    """
+    风险事件段 (连续触发窗口的合并结果)
+
+    - start_at/end_at: 首/末个触发窗口的结束时刻(与 RiskEvent.timestamp 同口径)
+    - peak_*: 最严重窗口(tier 最高; 同 tier 取按 operator 最极端的值)
+    """
+
+    start_at: datetime
+    end_at: datetime
+    peak_at: datetime
+    peak_tier: int
+    peak_value: Decimal
+    threshold_value: Decimal
+    window_count: int
+    region_code: str
+    weather_type: WeatherType
+    product_id: str
+    product_version: str
+    data_type: DataType
+    prediction_run_id: Optional[str] = None
+
+
 class RiskCalculator:
     """
     风险计算引擎
@@ -157,6 +182,124 @@ class RiskCalculator:
 
         return risk_events
 
+    def compact_episodes(
+        self,
+        events: Sequence[RiskEvent],
+        risk_rules: RiskRules,
+        region_timezone: str,
+    ) -> List[RiskEpisode]:
+        """
+        将连续触发窗口合并为事件段
+
+        相邻判定: 同一序列(区域/产品/版本/天气/数据类型/批次)内, 后一窗口结束时刻
+        与前一窗口相差不超过一个步长(step)。窗口未触发或数据缺失都会拉大间隔, 从而断段。
+
+        Args:
+            events: 风险事件(计算结果或已落库事件, 顺序不限)
+            risk_rules: 风险规则(取 time_window 步长与 operator)
+            region_timezone: 区域时区(monthly 步长按自然月判定)
+
+        Returns:
+            按 (序列, start_at) 排序的事件段
+        """
+        time_window = risk_rules.time_window
+        operator = risk_rules.calculation.operator
+        ordered = sorted(events, key=lambda e: (self._series_key(e), self._ensure_utc(e.timestamp)))
+
+        episodes: List[RiskEpisode] = []
+        current: Optional[dict] = None
+        for event in ordered:
+            at = self._ensure_utc(event.timestamp)
+            if (
+                current is not None
+                and current["key"] == self._series_key(event)
+                and self._is_adjacent(current["end_at"], at, time_window, region_timezone)
+            ):
+                if at != current["end_at"]:
+                    current["window_count"] += 1
+                    current["end_at"] = at
+                if self._is_more_severe(event, current["peak"], operator):
+                    current["peak"] = event
+                continue
+
+            if current is not None:
+                episodes.append(self._close_episode(current))
+            current = {
+                "key": self._series_key(event),
+                "start_at": at,
+                "end_at": at,
+                "window_count": 1,
+                "peak": event,
+            }
+
+        if current is not None:
+            episodes.append(self._close_episode(current))
+        return episodes
+
+    def adjacency_gap(self, time_window: TimeWindow) -> timedelta:
+        """相邻窗口的最大间隔上界(monthly 按 31 天/月估算, 供查询扩边)"""
+        step = max(time_window.step or 1, 1)
+        if time_window.type == "hourly":
+            return timedelta(hours=step)
+        if time_window.type == "daily":
+            return timedelta(days=step)
+        if time_window.type == "weekly":
+            return timedelta(weeks=step)
+        if time_window.type == "monthly":
+            return timedelta(days=31 * step)
+        raise ValueError(f"Unknown window_type: {time_window.type}")
+
+    def _is_adjacent(
+        self,
+        previous: datetime,
+        current: datetime,
+        time_window: TimeWindow,
+        region_timezone: str,
+    ) -> bool:
+        if time_window.type == "monthly":
+            step = max(time_window.step or 1, 1)
+            last_local = utc_to_region_tz(previous, region_timezone)
+            current_local = utc_to_region_tz(current, region_timezone)
+            months = (current_local.year - last_local.year) * 12 + current_local.month - last_local.month
+            return months <= step
+        return current - previous <= self.adjacency_gap(time_window)
+
+    def _is_more_severe(self, candidate: RiskEvent, peak: RiskEvent, operator: str) -> bool:
+        if candidate.tier_level != peak.tier_level:
+            return candidate.tier_level > peak.tier_level
+        if operator in (">", ">="):
+            return candidate.trigger_value > peak.trigger_value
+        return candidate.trigger_value < peak.trigger_value
+
+    def _close_episode(self, state: dict) -> RiskEpisode:
+        peak = state["peak"]
+        return RiskEpisode(
+            start_at=state["start_at"],
+            end_at=state["end_at"],
+            peak_at=self._ensure_utc(peak.timestamp),
+            peak_tier=peak.tier_level,
+            peak_value=peak.trigger_value,
+            threshold_value=peak.threshold_value,
+            window_count=state["window_count"],
+            region_code=peak.region_code,
+            weather_type=WeatherType(peak.weather_type),
+            product_id=peak.product_id,
+            product_version=peak.product_version,
+            data_type=DataType(peak.data_type),
+            prediction_run_id=peak.prediction_run_id,
+        )
+
+    @staticmethod
+    def _series_key(event: RiskEvent) -> Tuple[str, str, str, str, str, str]:
+        return (
+            event.region_code,
+            event.product_id,
+            event.product_version,
+            WeatherType(event.weather_type).value,
+            DataType(event.data_type).value,
+            event.prediction_run_id or "",
+        )
+
     def _validate_weather_series(self, data: Sequence[WeatherDataPoint], risk_rules: RiskRules) -> None:
         """验证天气序列的一致性（纯计算模块的输入硬校验）"""
         if not data:
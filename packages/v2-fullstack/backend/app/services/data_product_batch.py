@@ -0,0 +1,137 @@
+"""
+Data Product Batch Service (批量数据产品)
+
+职责:
+- 一次请求并发构建多个数据产品(L0/Overlays/L1), 结果按请求顺序返回, 单项失败逐项报告
+- 同一批次内相同 (数据产品, 维度) 的项只构建一次; 跨请求由缓存与单飞合并
+- 按各项 Mode 裁剪计划拼接响应, 每项只序列化一次
+
+说明:
+- AsyncSession 不能被并发协程共享: 各项由服务自行从同一连接池取会话;
+  产品查询走 product_service 的进程内缓存, 批次内各项共享
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import DataProductResponse, SharedDimensions
+from app.services.data_product_cache import build_cache_key
+from app.services.data_products_service import (
+    DataProductBuilder,
+    build_data_product,
+    l0_dashboard_service,
+    l1_intelligence_service,
+    map_overlays_service,
+)
+from app.utils.access_control import compile_pruning_plan
+
+logger = logging.getLogger(__name__)
+
+BATCH_CONCURRENCY = int(os.getenv("DATA_PRODUCT_BATCH_CONCURRENCY", "4"))
+
+BATCH_BUILDERS: Dict[DataProductType, DataProductBuilder] = {
+    DataProductType.L0_DASHBOARD: l0_dashboard_service.build_response,
+    DataProductType.MAP_OVERLAYS: map_overlays_service.build_response,
+    DataProductType.L1_REGION_INTELLIGENCE: l1_intelligence_service.build_response,
+}
+
+
+@dataclass
+class BatchItemOutcome:
+    """单项执行结果"""
+
+    data_product: DataProductType
+    dimensions: SharedDimensions
+    response: Optional[DataProductResponse] = None
+    status_code: int = 200
+    error: Optional[str] = None
+
+    def to_json(self) -> str:
+        """单项 JSON(data 按该项 Mode 裁剪计划序列化)"""
+        data = (
+            compile_pruning_plan(self.dimensions.access_mode, self.data_product).to_json(
+                self.response
+            )
+            if self.response is not None
+            else "null"
+        )
+        envelope = json.dumps(
+            {
+                "data_product": self.data_product.value,
+                "status_code": self.status_code,
+                "error": self.error,
+            }
+        )
+        return f'{envelope[:-1]}, "data": {data}}}'
+
+
+class DataProductBatchService:
+    """批量数据产品执行器"""
+
+    def __init__(self, concurrency: int = BATCH_CONCURRENCY, *, serve_stale: bool = True):
+        self.concurrency = max(concurrency, 1)
+        self.serve_stale = serve_stale
+
+    async def run(
+        self, items: Sequence[Tuple[DataProductType, SharedDimensions]]
+    ) -> List[BatchItemOutcome]:
+        """
+        并发执行批量请求(同批次并发数不超过 concurrency)
+
+        Returns:
+            与 items 顺序一致的结果
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: Dict[str, "asyncio.Task[BatchItemOutcome]"] = {}
+        ordered: List["asyncio.Task[BatchItemOutcome]"] = []
+        for product_type, dimensions in items:
+            key = build_cache_key(product_type, dimensions)
+            if key not in tasks:
+                tasks[key] = asyncio.ensure_future(
+                    self._run_item(semaphore, product_type, dimensions)
+                )
+            ordered.append(tasks[key])
+        await asyncio.gather(*tasks.values())
+        return [task.result() for task in ordered]
+
+    async def _run_item(
+        self,
+        semaphore: asyncio.Semaphore,
+        product_type: DataProductType,
+        dimensions: SharedDimensions,
+    ) -> BatchItemOutcome:
+        outcome = BatchItemOutcome(data_product=product_type, dimensions=dimensions)
+        builder = BATCH_BUILDERS.get(product_type)
+        if builder is None:
+            outcome.status_code = 400
+            outcome.error = f"Data product '{product_type.value}' is not supported in batch"
+            return outcome
+        try:
+            async with semaphore:
+                outcome.response = await build_data_product(
+                    product_type, dimensions, builder, serve_stale=self.serve_stale
+                )
+        except ValueError as exc:
+            outcome.status_code = 400
+            outcome.error = str(exc)
+        except Exception:
+            logger.exception(
+                "Data product batch item failed",
+                extra={"data_product": product_type.value, "cache_key": dimensions.to_cache_key()},
+            )
+            outcome.status_code = 500
+            outcome.error = "Internal error"
+        return outcome
+
+    @staticmethod
+    def to_json(outcomes: Sequence[BatchItemOutcome]) -> str:
+        """拼接批量响应 JSON(DataProductBatchResponse 结构)"""
+        return '{"results": [' + ", ".join(outcome.to_json() for outcome in outcomes) + "]}"
+
+
+data_product_batch_service = DataProductBatchService()
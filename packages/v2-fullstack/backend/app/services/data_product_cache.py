@@ -0,0 +1,411 @@
+"""
+Data Product Cache (数据产品响应缓存)
+
+职责:
+- 缓存 /data-products/* 裁剪后的响应(按 数据产品 + SharedDimensions.to_cache_key 分键)
+- 两级: 进程内 LRU(存模型实例) + Redis(存 JSON, 跨进程共享)
+- historical / predicted 分别设置 TTL(新鲜期)与过期宽限期(stale-while-revalidate):
+  新鲜期内直接命中; 宽限期内返回旧响应并由调用方后台重建; 超过宽限期(硬过期)视为未命中
+- 按标签失效: region(含上级区域) / product / prediction_run_id,
+  事实写入提交后由写路径调用 invalidate_facts;
+  跨区域排名的数据产品(CROSS_REGION_PRODUCTS)另打国家级根区域标签, 任一区域写入都失效
+
+硬规则:
+- 只缓存裁剪后的响应: access_mode 属于缓存键, 不同 Mode 永不共享条目;
+  Redis 存按 Mode 裁剪计划序列化的 JSON(put(body=...)), 本地存类型化实例, 出口统一经裁剪计划序列化
+- 缓存实例只读: 命中时调用方只能 model_copy 后修改 meta
+- 构建期间发生的失效会使该次写入作废(见 mark/put), 避免把失效前读到的旧事实写回缓存
+- Redis 不可用时退化为进程内缓存(其他进程的本地条目由 TTL 兜底);
+  Redis 访问走 redis.asyncio(lookup/put/invalidate_facts 需 await), 故障后短暂退避不再逐请求重试
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import DataProductResponse, DataType, SharedDimensions
+from app.services.redis_clients import (
+    REDIS_CACHE_URL,
+    AsyncRedisHandle,
+    async_client_factory,
+    sync_client_factory,
+)
+
+logger = logging.getLogger(__name__)
+
+HISTORICAL_TTL_SECONDS = float(os.getenv("DATA_PRODUCT_CACHE_HISTORICAL_TTL_SECONDS", "1800"))
+PREDICTED_TTL_SECONDS = float(os.getenv("DATA_PRODUCT_CACHE_PREDICTED_TTL_SECONDS", "300"))
+HISTORICAL_STALE_SECONDS = float(os.getenv("DATA_PRODUCT_CACHE_HISTORICAL_STALE_SECONDS", "900"))
+PREDICTED_STALE_SECONDS = float(os.getenv("DATA_PRODUCT_CACHE_PREDICTED_STALE_SECONDS", "0"))
+MAX_LOCAL_ENTRIES = int(os.getenv("DATA_PRODUCT_CACHE_MAX_ENTRIES", "512"))
+INVALIDATION_CHANNEL = "data-product-cache:invalidate"
+
+KEY_PREFIX = "dp:v1"
+TAG_PREFIX = "dp-tag:v1"
+ALL_PRODUCTS_TAG = "product:*"
+
+# 跨区域排名的数据产品(L0 TopN 覆盖全部省份): 任一区域的事实写入都会改变结果,
+# 条目同时依赖国家级根区域(写路径的失效/版本递增本就包含根区域)
+CROSS_REGION_PRODUCTS = frozenset({DataProductType.L0_DASHBOARD})
+
+
+def build_cache_key(product_type: DataProductType, dimensions: SharedDimensions) -> str:
+    """缓存键: 数据产品 + 统一维度键"""
+    return f"{KEY_PREFIX}:{product_type.value}:{dimensions.to_cache_key()}"
+
+
+def region_lineage(region_code: str) -> List[str]:
+    """区域及其上级区域(CN-GD-SZ → CN-GD-SZ, CN-GD, CN)"""
+    parts = region_code.split("-")
+    return ["-".join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+
+def dependency_regions(
+    product_type: DataProductType, dimensions: SharedDimensions
+) -> List[str]:
+    """条目依赖的区域: 所选区域; 跨区域排名的数据产品另加国家级根区域"""
+    regions = [dimensions.region_code]
+    root = region_lineage(dimensions.region_code)[-1]
+    if product_type in CROSS_REGION_PRODUCTS and root != dimensions.region_code:
+        regions.append(root)
+    return regions
+
+
+def dimension_tags(
+    product_type: DataProductType, dimensions: SharedDimensions
+) -> FrozenSet[str]:
+    """缓存条目的标签(未指定产品的条目聚合了所有产品, 打 product:*)"""
+    tags = {f"region:{code}" for code in dependency_regions(product_type, dimensions)}
+    tags.add(f"product:{dimensions.product_id}" if dimensions.product_id else ALL_PRODUCTS_TAG)
+    if dimensions.data_type == DataType.PREDICTED and dimensions.prediction_run_id:
+        tags.add(f"run:{dimensions.prediction_run_id}")
+    return frozenset(tags)
+
+
+def fact_tags(
+    *,
+    region_codes: Iterable[str] = (),
+    product_ids: Iterable[str] = (),
+    prediction_run_ids: Iterable[str] = (),
+) -> FrozenSet[str]:
+    """
+    事实变更对应的失效标签
+
+    - 区域变更同时失效上级区域(省级条目聚合了区县事实)
+    - 产品变更同时失效 product:* (未指定产品的条目)
+    """
+    tags = set()
+    for region_code in region_codes:
+        tags.update(f"region:{code}" for code in region_lineage(region_code))
+    for product_id in product_ids:
+        tags.add(f"product:{product_id}")
+        tags.add(ALL_PRODUCTS_TAG)
+    tags.update(f"run:{run_id}" for run_id in prediction_run_ids if run_id)
+    return frozenset(tags)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    response: DataProductResponse
+    tags: FrozenSet[str]
+    stale_at: float
+    expires_at: float
+
+
+@dataclass(frozen=True)
+class CacheHit:
+    """缓存命中(stale=True 表示已过新鲜期、仍在宽限期内; stale_age_seconds 为超出新鲜期的秒数)"""
+    response: DataProductResponse
+    stale: bool
+    stale_age_seconds: Optional[float] = None
+
+
+class DataProductCache:
+    """两级数据产品响应缓存(线程安全: pub/sub 监听线程与请求并发访问)"""
+
+    def __init__(
+        self,
+        *,
+        historical_ttl_seconds: float = HISTORICAL_TTL_SECONDS,
+        predicted_ttl_seconds: float = PREDICTED_TTL_SECONDS,
+        historical_stale_seconds: float = HISTORICAL_STALE_SECONDS,
+        predicted_stale_seconds: float = PREDICTED_STALE_SECONDS,
+        max_entries: int = MAX_LOCAL_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+        redis_factory: Optional[Callable[[], aioredis.Redis]] = None,
+        listener_factory: Optional[Callable[[], redis.Redis]] = None,
+    ):
+        self.historical_ttl_seconds = historical_ttl_seconds
+        self.predicted_ttl_seconds = predicted_ttl_seconds
+        self.historical_stale_seconds = historical_stale_seconds
+        self.predicted_stale_seconds = predicted_stale_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._redis = AsyncRedisHandle(redis_factory or async_client_factory(REDIS_CACHE_URL))
+        self._listener_factory = listener_factory or sync_client_factory(REDIS_CACHE_URL)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # 失效序号: 每次失效 +1, 并记录每个标签最近一次失效时的序号
+        self._sequence = 0
+        self._tag_invalidated_at: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def ttl_for(self, data_type: DataType) -> float:
+        if data_type == DataType.PREDICTED:
+            return self.predicted_ttl_seconds
+        return self.historical_ttl_seconds
+
+    def stale_seconds_for(self, data_type: DataType) -> float:
+        if data_type == DataType.PREDICTED:
+            return self.predicted_stale_seconds
+        return self.historical_stale_seconds
+
+    async def get(self, key: str) -> Optional[DataProductResponse]:
+        """只读取新鲜条目; 未命中/已过新鲜期返回 None"""
+        hit = await self.lookup(key)
+        if hit is None or hit.stale:
+            return None
+        return hit.response
+
+    async def lookup(self, key: str) -> Optional[CacheHit]:
+        """读取缓存(含宽限期内的旧条目): 先本地, 再 Redis(命中后回填本地)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                now = self._clock()
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    if entry.stale_at > now:
+                        return CacheHit(response=entry.response, stale=False)
+                    return CacheHit(
+                        response=entry.response,
+                        stale=True,
+                        stale_age_seconds=now - entry.stale_at,
+                    )
+                del self._entries[key]
+
+        try:
+            pipe = self._redis.client().pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            pipe.smembers(f"{key}:tags")
+            raw, ttl_ms, tags = await pipe.execute()
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning(
+                    "Data product cache read failed", extra={"key": key, "error": str(exc)}
+                )
+            return None
+        if raw is None:
+            return None
+
+        response = DataProductResponse.model_validate_json(raw)
+        if not ttl_ms or ttl_ms <= 0:
+            # 无剩余 TTL 信息: 无法推算超出新鲜期多久
+            return CacheHit(response=response, stale=True, stale_age_seconds=0.0)
+        # Redis 过期时间 = 新鲜期 + 宽限期; 剩余时间减去宽限期即剩余新鲜期
+        remaining = ttl_ms / 1000
+        fresh_remaining = remaining - self.stale_seconds_for(response.legend.data_type)
+        # 回填本地时保留负的剩余新鲜期: 本地命中仍能算出超出新鲜期多久
+        with self._lock:
+            self._store_local(key, response, frozenset(tags or ()), fresh_remaining, remaining)
+        if fresh_remaining > 0:
+            return CacheHit(response=response, stale=False)
+        return CacheHit(response=response, stale=True, stale_age_seconds=-fresh_remaining)
+
+    def mark(self) -> int:
+        """构建前取失效序号, 写入时传给 put(since=...)"""
+        with self._lock:
+            return self._sequence
+
+    async def put(
+        self,
+        key: str,
+        response: DataProductResponse,
+        *,
+        tags: FrozenSet[str],
+        ttl_seconds: float,
+        stale_seconds: float = 0.0,
+        since: Optional[int] = None,
+        body: Optional[str] = None,
+    ) -> bool:
+        """
+        写入两级缓存
+
+        Args:
+            body: Redis 中存放的 JSON(默认 response.model_dump_json());
+                管线传入按 Mode 裁剪计划序列化的结果, 策略外字段不落 Redis
+            ttl_seconds: 新鲜期
+            stale_seconds: 新鲜期之后的宽限期(可返回旧响应)
+            since: mark() 返回的序号; 其后任一标签被失效则放弃写入
+
+        Returns:
+            是否写入
+        """
+        with self._lock:
+            if since is not None and any(
+                self._tag_invalidated_at.get(tag, -1) > since for tag in tags
+            ):
+                logger.debug("Data product cache write skipped (invalidated)", extra={"key": key})
+                return False
+            self._store_local(key, response, tags, ttl_seconds, ttl_seconds + stale_seconds)
+
+        ttl_ms = max(int((ttl_seconds + stale_seconds) * 1000), 1)
+        try:
+            pipe = self._redis.client().pipeline(transaction=True)
+            pipe.set(key, body if body is not None else response.model_dump_json(), px=ttl_ms)
+            pipe.delete(f"{key}:tags")
+            pipe.sadd(f"{key}:tags", *tags)
+            pipe.pexpire(f"{key}:tags", ttl_ms)
+            for tag in tags:
+                tag_key = f"{TAG_PREFIX}:{tag}"
+                pipe.sadd(tag_key, key)
+                pipe.pexpire(tag_key, max(ttl_ms, self._max_ttl_ms()))
+            await pipe.execute()
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning(
+                    "Data product cache write failed", extra={"key": key, "error": str(exc)}
+                )
+        return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """本进程失效命中任一标签的条目, 返回失效条目数"""
+        tags = frozenset(tags)
+        if not tags:
+            return 0
+        with self._lock:
+            self._sequence += 1
+            for tag in tags:
+                self._tag_invalidated_at[tag] = self._sequence
+            stale = [key for key, entry in self._entries.items() if entry.tags & tags]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    async def invalidate_facts(
+        self,
+        *,
+        region_codes: Iterable[str] = (),
+        product_ids: Iterable[str] = (),
+        prediction_run_ids: Iterable[str] = (),
+    ) -> None:
+        """
+        事实变更后失效(写路径在 commit 之后调用)
+
+        本进程立即失效; Redis 中按标签删除条目, 并广播给其他进程(失败仅告警)
+        """
+        tags = fact_tags(
+            region_codes=region_codes,
+            product_ids=product_ids,
+            prediction_run_ids=prediction_run_ids,
+        )
+        if not tags:
+            return
+        self.invalidate(tags)
+        try:
+            client = self._redis.client()
+            tag_keys = [f"{TAG_PREFIX}:{tag}" for tag in sorted(tags)]
+            pipe = client.pipeline(transaction=False)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            keys = set().union(*await pipe.execute())
+            pipe = client.pipeline(transaction=True)
+            if keys:
+                pipe.delete(*keys, *(f"{key}:tags" for key in keys))
+            pipe.delete(*tag_keys)
+            pipe.publish(INVALIDATION_CHANNEL, json.dumps({"tags": sorted(tags)}))
+            await pipe.execute()
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning(
+                    "Data product cache invalidation failed",
+                    extra={"tags": sorted(tags), "error": str(exc)},
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def handle_message(self, message: dict) -> None:
+        """pub/sub 消息处理(监听线程回调)"""
+        try:
+            tags = json.loads(message["data"])["tags"]
+        except (KeyError, TypeError, ValueError):
+            logger.warning(
+                "Malformed data product cache invalidation message",
+                extra={"payload": message.get("data")},
+            )
+            return
+        self.invalidate(tags)
+
+    def start_listener(self) -> None:
+        """启动 pub/sub 监听线程(幂等; Redis 不可用时仅告警, 依赖 TTL 兜底)"""
+        if self._listener is not None:
+            return
+        try:
+            pubsub = self._listener_factory().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: self.handle_message})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=self._on_listener_error,
+            )
+        except redis.exceptions.RedisError as exc:
+            logger.warning(
+                "Data product cache listener not started, falling back to TTL",
+                extra={"error": str(exc)},
+            )
+
+    def stop_listener(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.stop()
+        self._listener = None
+
+    def _on_listener_error(self, exc: Exception, pubsub, thread) -> None:
+        # 监听断开期间可能漏掉失效消息: 清空本地缓存后退出, 由 TTL/下一次启动恢复
+        logger.warning("Data product cache listener stopped", extra={"error": str(exc)})
+        self.clear()
+        thread.stop()
+        self._listener = None
+
+    def _store_local(
+        self,
+        key: str,
+        response: DataProductResponse,
+        tags: FrozenSet[str],
+        fresh_seconds: float,
+        hard_seconds: float,
+    ) -> None:
+        now = self._clock()
+        self._entries[key] = _Entry(
+            response=response,
+            tags=tags,
+            stale_at=now + fresh_seconds,
+            expires_at=now + hard_seconds,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _max_ttl_ms(self) -> int:
+        return int(
+            max(
+                self.historical_ttl_seconds + self.historical_stale_seconds,
+                self.predicted_ttl_seconds + self.predicted_stale_seconds,
+            )
+            * 1000
+        )
+
+
+data_product_cache = DataProductCache()
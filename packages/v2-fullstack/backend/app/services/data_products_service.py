@@ -1,26 +1,59 @@
 """
 Data Products Services (L0/L1/Overlays) - MVP framework.
 
-Phase 1/2: return schema-correct responses with explicit capability flags,
-without claims facts (claims_available=false).
+L0 is served from the daily summary cubes (see kpi_cube); L1 returns the
+weather timeline, downsampled server-side to the requested point budget.
+Overlays remain a Phase 1/2 skeleton (tiles: overlay_tiles). Claims lanes are
+still flagged claims_available=false outside L0.
+
+All routes go through build_data_product: cache lookup → single-flight build
+(build → Mode pruning → cache write); stale entries are served while a
+background rebuild refreshes them. Cached responses are post-pruning, so
+meta.cached=True never implies a different disclosure level than a fresh build.
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+import logging
+from datetime import date, datetime, timezone
 from decimal import Decimal
-from typing import List
+from functools import partial
+from typing import AsyncContextManager, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_sessionmaker
+from app.schemas.access_control import DataProductType
 from app.schemas.shared import (
+    AccessMode,
     AggregationData,
     DataProductResponse,
+    DataType,
     LegendMeta,
     ResponseMeta,
     SeriesData,
     SharedDimensions,
     TraceContext,
+    WeatherType,
 )
+from app.schemas.weather import WeatherQueryRequest
+from app.services.data_product_cache import (
+    build_cache_key,
+    data_product_cache,
+    dimension_tags,
+)
+from app.services.kpi_cube import KpiCubeSlice, RegionKpi, kpi_cube_service, top_provinces
+from app.services.product_service import product_service
+from app.services.single_flight import data_product_flight
+from app.services.weather_service import weather_service
+from app.utils.access_control import AccessControlManager
+from app.utils.downsampling import DownsamplingMethod, downsample_indices
+from app.utils.time_utils import utc_to_region_tz
 
+logger = logging.getLogger(__name__)
 
 CLAIMS_UNAVAILABLE_REASON = "not_implemented_until_phase_3"
 
@@ -55,7 +88,7 @@ def _build_legend(dimensions: SharedDimensions, *, unit: str, description: str)
         unit=unit,
         prediction_run_id=dimensions.prediction_run_id,
         description=description,
-        region_timezone=dimensions.region_timezone,
+        region_timezone=dimensions.resolved_timezone(),
         claims_available=False,
         claims_unavailable_reason=CLAIMS_UNAVAILABLE_REASON,
         claims_series_status="disabled",
@@ -63,21 +96,90 @@ def _build_legend(dimensions: SharedDimensions, *, unit: str, description: str)
 
 
 class L0DashboardService:
-    """L0 Dashboard Data Product (MVP skeleton)."""
+    """
+    L0 Dashboard Data Product (KPI + TopN 省份 Pareto)
 
-    def build_response(self, dimensions: SharedDimensions) -> DataProductResponse:
-        warnings = [
-            "L0 Dashboard is in framework-only mode (no persisted facts yet).",
-            f"claims_available=false: {CLAIMS_UNAVAILABLE_REASON}",
-        ]
+    数据来自日汇总立方体(见 kpi_cube), 每次构建最多 3 条按区域 GROUP BY 的汇总查询:
+    - KPI: 所选区域(含下级区域)合计, aggregation_key="total"
+    - 风险事件: 所选区域按等级计数, aggregation_key="tier_level"(仅 historical)
+    - TopN: 跨省份排名, aggregation_key="region_code", 按赔付金额/保额降序
+      (结果依赖全部省份: 缓存标签与 ETag 作用域含国家级根区域, 见 CROSS_REGION_PRODUCTS)
+    """
+
+    TOP_N = 10
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncContextManager[AsyncSession]]] = None,
+    ):
+        # 自行开会话: 后台重建(stale-while-revalidate)时请求会话已关闭
+        self._session_factory = session_factory
+
+    async def build_response(self, dimensions: SharedDimensions) -> DataProductResponse:
+        historical = dimensions.data_type == DataType.HISTORICAL
+        start_date, end_date = local_date_range(dimensions)
+
+        session_factory = self._session_factory or get_sessionmaker()
+        async with session_factory() as session:
+            cube = await kpi_cube_service.load(
+                session,
+                start_date=start_date,
+                end_date=end_date,
+                weather_type=dimensions.weather_type.value,
+                product_id=dimensions.product_id,
+                include_claims=historical,
+                include_risk_events=historical,
+            )
+        return self.assemble(dimensions, cube)
+
+    def assemble(self, dimensions: SharedDimensions, cube: KpiCubeSlice) -> DataProductResponse:
+        """立方体结果 → 响应(不做 Mode 裁剪, 由管线统一处理)"""
+        historical = dimensions.data_type == DataType.HISTORICAL
+        warnings: List[str] = []
         legend = _build_legend(
             dimensions,
             unit="CNY",
-            description="L0 KPI/Pareto skeleton response (Phase 1/2).",
+            description=(
+                "L0 KPI/TopN from daily summary cubes; time range rounded to whole "
+                "local days in the region timezone."
+            ),
         )
+        if historical:
+            legend = legend.model_copy(
+                update={
+                    "claims_available": True,
+                    "claims_unavailable_reason": None,
+                    "claims_series_status": None,
+                }
+            )
+        else:
+            warnings.append(
+                "predicted L0 only reports in-force policies; claims and risk events "
+                "are summarised for historical data only."
+            )
 
-        # No facts yet; return empty aggregations.
-        aggregations: List[AggregationData] = []
+        kpi = cube.rollup(dimensions.region_code)
+        aggregations = _kpi_aggregations(kpi, "total", None, include_claims=historical)
+        if historical:
+            aggregations.extend(
+                AggregationData(
+                    aggregation_key="tier_level",
+                    aggregation_method="count",
+                    value=kpi.risk_events.get(tier, 0),
+                    metric="risk_event_count",
+                    dimension_value=str(tier),
+                )
+                for tier in (1, 2, 3)
+            )
+        for rank, (province, province_kpi) in enumerate(
+            top_provinces(cube.by_province(), self.TOP_N), start=1
+        ):
+            aggregations.extend(
+                _kpi_aggregations(
+                    province_kpi, "region_code", province,
+                    include_claims=historical, rank=rank,
+                )
+            )
 
         return DataProductResponse(
             aggregations=aggregations,
@@ -86,8 +188,50 @@ class L0DashboardService:
         )
 
 
+def local_date_range(dimensions: SharedDimensions) -> Tuple[date, date]:
+    """time_range → 区域时区本地日闭区间"""
+    tz_name = dimensions.resolved_timezone()
+    return (
+        utc_to_region_tz(dimensions.time_range.start, tz_name).date(),
+        utc_to_region_tz(dimensions.time_range.end, tz_name).date(),
+    )
+
+
+def _kpi_aggregations(
+    kpi: RegionKpi,
+    aggregation_key: str,
+    dimension_value: Optional[str],
+    *,
+    include_claims: bool,
+    rank: Optional[int] = None,
+) -> List[AggregationData]:
+    metrics: List[Tuple[str, str, object, Optional[str]]] = [
+        ("policy_count", "count", kpi.policy_count, None),
+        ("policy_amount_total", "sum", kpi.policy_amount_total, "CNY"),
+    ]
+    if include_claims:
+        metrics += [
+            ("claim_count", "count", kpi.claim_count, None),
+            ("claim_amount_total", "sum", kpi.claim_amount_total, "CNY"),
+        ]
+        if kpi.claim_rate is not None:
+            metrics.append(("claim_rate", "ratio", kpi.claim_rate, None))
+    return [
+        AggregationData(
+            aggregation_key=aggregation_key,
+            aggregation_method=method,
+            value=value,
+            unit=unit,
+            metric=metric,
+            dimension_value=dimension_value,
+            rank=rank,
+        )
+        for metric, method, value, unit in metrics
+    ]
+
+
 class MapOverlaysService:
-    """Map Overlays Data Product (MVP skeleton)."""
+    """Map Overlays Data Product (MVP skeleton; map tiles are served by overlay_tiles)."""
 
     def build_response(self, dimensions: SharedDimensions) -> DataProductResponse:
         warnings = [
@@ -108,27 +252,216 @@ class MapOverlaysService:
 
 
 class L1RegionIntelligenceService:
-    """L1 Region Intelligence Data Product (MVP skeleton)."""
+    """
+    L1 Region Intelligence Data Product (Timeline 天气泳道)
 
-    def build_response(self, dimensions: SharedDimensions) -> DataProductResponse:
-        warnings = [
-            "L1 Intelligence is in framework-only mode (no persisted facts yet).",
-            f"claims_available=false: {CLAIMS_UNAVAILABLE_REASON}",
-        ]
-        legend = _build_legend(
-            dimensions,
-            unit="mixed",
-            description="L1 Overview/Timeline skeleton response (Phase 1/2).",
+    - 天气序列列式整段拉取(array_agg), 超过 max_points 时服务端降采样:
+      降雨用 min/max 包络(保峰值), 其他天气类型用 LTTB
+    - 指定产品时按其风险阈值保留穿越点, 风险标记与曲线对齐
+    """
+
+    DEFAULT_MAX_POINTS = 2000
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncContextManager[AsyncSession]]] = None,
+    ):
+        self._session_factory = session_factory
+
+    async def build_response(self, dimensions: SharedDimensions) -> DataProductResponse:
+        request = WeatherQueryRequest(
+            region_code=dimensions.region_code,
+            weather_type=dimensions.weather_type,
+            start_time=dimensions.time_range.start,
+            end_time=dimensions.time_range.end,
+            data_type=dimensions.data_type,
+            prediction_run_id=dimensions.prediction_run_id,
+        )
+        session_factory = self._session_factory or get_sessionmaker()
+        async with session_factory() as session:
+            timestamps, values, unit = await weather_service.query_series_columns(
+                session, request
+            )
+            thresholds = await self._thresholds(session, dimensions)
+        return self.assemble(dimensions, timestamps, values, unit=unit, thresholds=thresholds)
+
+    def assemble(
+        self,
+        dimensions: SharedDimensions,
+        timestamps: List[datetime],
+        values: List[Decimal],
+        *,
+        unit: Optional[str],
+        thresholds: Optional[Dict[str, Decimal]] = None,
+    ) -> DataProductResponse:
+        """列式序列 → 响应(按 max_points 降采样)"""
+        max_points = dimensions.max_points or self.DEFAULT_MAX_POINTS
+        method = (
+            DownsamplingMethod.MIN_MAX
+            if dimensions.weather_type == WeatherType.RAINFALL
+            else DownsamplingMethod.LTTB
+        )
+        indices = downsample_indices(
+            [ts.timestamp() for ts in timestamps],
+            [float(value) for value in values],
+            max_points,
+            method=method,
+            thresholds=[float(value) for value in (thresholds or {}).values()],
         )
 
+        warnings = [f"claims_available=false: {CLAIMS_UNAVAILABLE_REASON}"]
+        if len(indices) < len(timestamps):
+            description = (
+                f"Weather series downsampled ({method.value}) from {len(timestamps)} "
+                f"to {len(indices)} points; threshold crossings kept."
+            )
+        else:
+            description = f"Weather series at full resolution ({len(timestamps)} points)."
+        series: List[SeriesData] = []
+        if timestamps:
+            series.append(
+                SeriesData(
+                    timestamps=[timestamps[i] for i in indices],
+                    values=[values[i] for i in indices],
+                    unit=unit or "unitless",
+                )
+            )
+        else:
+            warnings.append("No weather data in the requested range.")
+
+        legend = _build_legend(dimensions, unit=unit or "unitless", description=description)
+        if thresholds:
+            legend = legend.model_copy(update={"thresholds": thresholds})
         return DataProductResponse(
-            series=[],
+            series=series,
             events=[],
             aggregations=[],
             legend=legend,
             meta=_build_meta(dimensions, warnings),
         )
 
+    async def _thresholds(
+        self, session: AsyncSession, dimensions: SharedDimensions
+    ) -> Optional[Dict[str, Decimal]]:
+        """产品风险阈值(未指定产品或天气类型不一致时为 None)"""
+        if not dimensions.product_id:
+            return None
+        product = await product_service.get_by_id(
+            session, dimensions.product_id, access_mode=AccessMode.ADMIN_INTERNAL
+        )
+        if product is None or product.risk_rules.weather_type != dimensions.weather_type:
+            return None
+        thresholds = product.risk_rules.thresholds
+        return {"tier1": thresholds.tier1, "tier2": thresholds.tier2, "tier3": thresholds.tier3}
+
+
+DataProductBuilder = Callable[
+    [SharedDimensions], Union[DataProductResponse, Awaitable[DataProductResponse]]
+]
+
+
+async def build_data_product(
+    product_type: DataProductType,
+    dimensions: SharedDimensions,
+    builder: DataProductBuilder,
+    *,
+    serve_stale: bool = True,
+) -> DataProductResponse:
+    """
+    数据产品统一管线: 缓存 → 单飞构建(构建 → Mode 裁剪 → 写缓存)
+
+    返回的响应须经 compile_pruning_plan(mode, product_type).to_json 输出(策略外字段在序列化时排除)
+
+    - 新鲜命中/复用其他请求的构建结果: 返回共享响应的浅拷贝,
+      meta 换成本次请求的 trace_context 并标记 cached=True
+    - 宽限期内的旧条目(stale-while-revalidate): 立即返回旧响应(带 stale_age_seconds),
+      同时在后台单飞重建; 硬过期后按未命中同步构建
+    - serve_stale=False(缓存预热): 旧条目按未命中同步重建, 不依赖调用方事件循环存活
+    """
+    key = build_cache_key(product_type, dimensions)
+
+    async def _build() -> DataProductResponse:
+        since = data_product_cache.mark()
+        response = builder(dimensions)
+        if inspect.isawaitable(response):
+            response = await response
+
+        ac_manager = AccessControlManager(
+            mode=dimensions.access_mode,
+            data_product=product_type,
+            trace_context=response.meta.trace_context,
+        )
+        pruned = ac_manager.prune_data_product(response)
+        await data_product_cache.put(
+            key,
+            pruned,
+            tags=dimension_tags(product_type, dimensions),
+            ttl_seconds=data_product_cache.ttl_for(dimensions.data_type),
+            stale_seconds=data_product_cache.stale_seconds_for(dimensions.data_type),
+            since=since,
+            body=ac_manager.plan.to_json(pruned),
+        )
+        return pruned
+
+    hit = await data_product_cache.lookup(key)
+    if hit is not None and (serve_stale or not hit.stale):
+        if hit.stale:
+            _schedule_revalidation(key, _build)
+            return _serve_shared(
+                hit.response, dimensions, stale_age_seconds=hit.stale_age_seconds
+            )
+        return _serve_shared(hit.response, dimensions)
+
+    response, shared = await data_product_flight.run(
+        key, _build, lookup=partial(data_product_cache.get, key)
+    )
+    return _serve_shared(response, dimensions) if shared else response
+
+
+# 进行中的后台重建(按缓存键; 同时是任务的强引用, 事件循环只持有弱引用)
+_revalidations: Dict[str, "asyncio.Task[object]"] = {}
+
+
+def _schedule_revalidation(
+    key: str, build: Callable[[], Awaitable[DataProductResponse]]
+) -> None:
+    """后台重建旧条目; 本进程同 key 只调度一次, 跨进程由单飞租约合并"""
+    if key in _revalidations or data_product_flight.in_flight(key):
+        return
+    task = asyncio.create_task(
+        data_product_flight.run(key, build, lookup=partial(data_product_cache.get, key))
+    )
+    _revalidations[key] = task
+    task.add_done_callback(partial(_on_revalidated, key))
+
+
+def _on_revalidated(key: str, task: "asyncio.Task[object]") -> None:
+    _revalidations.pop(key, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(
+            "Data product revalidation failed",
+            extra={"cache_key": key, "error": str(task.exception())},
+        )
+
+
+def _serve_shared(
+    response: DataProductResponse,
+    dimensions: SharedDimensions,
+    *,
+    stale_age_seconds: Optional[float] = None,
+) -> DataProductResponse:
+    """共享响应的浅拷贝; stale_age_seconds 为旧条目超出新鲜期的秒数(按缓存时钟), 新鲜响应为 None"""
+    now = datetime.now(timezone.utc)
+    meta = response.meta.model_copy(
+        update={
+            "trace_context": _build_trace_context(dimensions),
+            "cached": True,
+            "stale_age_seconds": stale_age_seconds,
+            "response_at": now,
+        }
+    )
+    return response.model_copy(update={"meta": meta})
+
 
 l0_dashboard_service = L0DashboardService()
 map_overlays_service = MapOverlaysService()
@@ -0,0 +1,292 @@
+"""
+Data Versions (数据版本号与条件请求 ETag)
+
+职责:
+- 按 (区域, 产品, data_type, 预测批次) 维护单调递增的数据版本号, 由风险事件/理赔/天气写入递增
+- 由 缓存键 + 版本号 生成 ETag, 路由在任何查询/序列化之前用它应答 If-None-Match(304)
+
+版本作用域(VersionScope):
+- 事实: (区域, 产品 | *, data_type, run); 区域变更同时递增上级区域, 产品变更同时递增 *
+- 天气: (区域, weather:<天气类型>, data_type, run)
+- 与 data_type 无关的事实(保单): data_type=any
+- 产品定义: (*, 产品 | *, any, -)
+- 一个请求读取上述 4 个作用域(一次 MGET), 任一变化 → ETag 变化
+- 跨区域排名的数据产品(L0 TopN)另读取国家级根区域的事实作用域, 任一区域写入都会使其变化
+
+单调性:
+- 版本号取自 Redis 全局序号(首次创建时以当前微秒时间为起点), 每次递增都写入更大的序号;
+  Redis 清空后序号从更晚的时间重新起步, 不会与旧 ETag 中的版本号重合
+- 缺失的作用域键在读取时用新序号补齐(SET NX), 因此"缺失"永远不会与旧版本相等
+
+硬规则:
+- 写路径在 commit 之后递增(与 data_product_cache.invalidate_facts 同一时机), 失败仅告警
+- Redis 不可用时不生成 ETag(不返回 304), 按正常请求处理
+- Redis 访问走 redis.asyncio(etag/bump 需 await), 与数据产品缓存共用 REDIS_CACHE_URL 与故障退避
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import redis
+import redis.asyncio as aioredis
+
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import DataType, SharedDimensions
+from app.services.data_product_cache import dependency_regions, region_lineage
+from app.services.redis_clients import REDIS_CACHE_URL, AsyncRedisHandle, async_client_factory
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "dv:v1"
+SEQUENCE_KEY = f"{KEY_PREFIX}:seq"
+ANY = "*"
+ANY_DATA_TYPE = "any"
+NO_RUN = "-"
+
+
+@dataclass(frozen=True)
+class VersionScope:
+    """版本作用域"""
+
+    region_code: str
+    subject: str  # 产品ID / * / weather:<天气类型>
+    data_type: str = ANY_DATA_TYPE
+    prediction_run_id: str = NO_RUN
+
+    @property
+    def key(self) -> str:
+        return (
+            f"{KEY_PREFIX}:{self.data_type}:{self.prediction_run_id}"
+            f":{self.region_code}:{self.subject}"
+        )
+
+
+def weather_subject(weather_type: str) -> str:
+    return f"weather:{weather_type}"
+
+
+def fact_scopes(
+    *,
+    region_codes: Iterable[str],
+    product_ids: Iterable[str],
+    data_type: Optional[DataType] = None,
+    prediction_run_id: Optional[str] = None,
+) -> List[VersionScope]:
+    """
+    事实写入影响的作用域(区域含上级区域, 产品含 *)
+
+    Args:
+        data_type: None 表示与 data_type 无关的事实(如保单)
+    """
+    subjects = sorted(set(product_ids)) + [ANY]
+    return sorted(
+        {
+            VersionScope(
+                region_code=code,
+                subject=subject,
+                data_type=data_type.value if data_type else ANY_DATA_TYPE,
+                prediction_run_id=prediction_run_id or NO_RUN,
+            )
+            for region_code in region_codes
+            for code in region_lineage(region_code)
+            for subject in subjects
+        },
+        key=lambda scope: scope.key,
+    )
+
+
+def weather_scopes(
+    *,
+    region_codes: Iterable[str],
+    weather_type: str,
+    data_type: DataType,
+    prediction_run_id: Optional[str] = None,
+) -> List[VersionScope]:
+    """天气写入影响的作用域(区域含上级区域)"""
+    return sorted(
+        {
+            VersionScope(
+                region_code=code,
+                subject=weather_subject(weather_type),
+                data_type=data_type.value,
+                prediction_run_id=prediction_run_id or NO_RUN,
+            )
+            for region_code in region_codes
+            for code in region_lineage(region_code)
+        },
+        key=lambda scope: scope.key,
+    )
+
+
+def product_scopes(product_ids: Iterable[str]) -> List[VersionScope]:
+    """产品定义变更影响的作用域(全区域)"""
+    subjects = sorted(set(product_ids))
+    return [VersionScope(region_code=ANY, subject=subject) for subject in subjects + [ANY]]
+
+
+def request_scopes(
+    *,
+    region_code: str,
+    product_id: Optional[str],
+    weather_type: str,
+    data_type: DataType,
+    prediction_run_id: Optional[str] = None,
+) -> List[VersionScope]:
+    """一个请求依赖的作用域(事实 / 类型无关事实 / 天气 / 产品定义)"""
+    subject = product_id or ANY
+    run = prediction_run_id or NO_RUN
+    return [
+        VersionScope(region_code, subject, data_type.value, run),
+        VersionScope(region_code, subject),
+        VersionScope(region_code, weather_subject(weather_type), data_type.value, run),
+        VersionScope(ANY, subject),
+    ]
+
+
+def dimension_scopes(
+    product_type: DataProductType, dimensions: SharedDimensions
+) -> List[VersionScope]:
+    scopes = request_scopes(
+        region_code=dimensions.region_code,
+        product_id=dimensions.product_id,
+        weather_type=dimensions.weather_type.value,
+        data_type=dimensions.data_type,
+        prediction_run_id=dimensions.prediction_run_id,
+    )
+    subject = dimensions.product_id or ANY
+    run = dimensions.prediction_run_id or NO_RUN
+    for region_code in dependency_regions(product_type, dimensions)[1:]:
+        scopes += [
+            VersionScope(region_code, subject, dimensions.data_type.value, run),
+            VersionScope(region_code, subject),
+        ]
+    return scopes
+
+
+def if_none_match(header: Optional[str], etag: Optional[str]) -> bool:
+    """If-None-Match 是否命中(弱比较, 支持多值与 *)"""
+    if not header or not etag:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+class DataVersionService:
+    """数据版本号(Redis 存储)"""
+
+    def __init__(
+        self,
+        *,
+        redis_factory: Optional[Callable[[], aioredis.Redis]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._redis = AsyncRedisHandle(redis_factory or async_client_factory(REDIS_CACHE_URL))
+        self._clock = clock
+
+    async def bump(self, scopes: Sequence[VersionScope]) -> Optional[int]:
+        """
+        递增作用域版本(写路径 commit 之后调用)
+
+        Returns:
+            新版本号; Redis 不可用时为 None(仅告警)
+        """
+        if not scopes:
+            return None
+        try:
+            version = await self._next_sequence()
+            await self._redis.client().mset({scope.key: version for scope in scopes})
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning(
+                    "Data version bump failed",
+                    extra={"scopes": [scope.key for scope in scopes], "error": str(exc)},
+                )
+            return None
+        return version
+
+    async def bump_facts(
+        self,
+        *,
+        region_codes: Iterable[str],
+        product_ids: Iterable[str],
+        data_type: Optional[DataType] = None,
+        prediction_run_id: Optional[str] = None,
+    ) -> Optional[int]:
+        return await self.bump(
+            fact_scopes(
+                region_codes=region_codes,
+                product_ids=product_ids,
+                data_type=data_type,
+                prediction_run_id=prediction_run_id,
+            )
+        )
+
+    async def bump_weather(
+        self,
+        *,
+        region_codes: Iterable[str],
+        weather_type: str,
+        data_type: DataType,
+        prediction_run_id: Optional[str] = None,
+    ) -> Optional[int]:
+        return await self.bump(
+            weather_scopes(
+                region_codes=region_codes,
+                weather_type=weather_type,
+                data_type=data_type,
+                prediction_run_id=prediction_run_id,
+            )
+        )
+
+    async def bump_products(self, product_ids: Iterable[str]) -> Optional[int]:
+        return await self.bump(product_scopes(product_ids))
+
+    async def versions(self, scopes: Sequence[VersionScope]) -> Optional[List[str]]:
+        """
+        读取作用域版本(一次 MGET; 缺失的键以新序号补齐)
+
+        Returns:
+            与 scopes 对应的版本号; Redis 不可用时为 None
+        """
+        keys = [scope.key for scope in scopes]
+        try:
+            client = self._redis.client()
+            values = await client.mget(keys)
+            missing = [key for key, value in zip(keys, values) if value is None]
+            if missing:
+                version = await self._next_sequence()
+                pipe = client.pipeline(transaction=False)
+                for key in missing:
+                    pipe.set(key, version, nx=True)
+                await pipe.execute()
+                values = await client.mget(keys)
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning("Data version read failed", extra={"error": str(exc)})
+            return None
+        return [str(value) for value in values]
+
+    async def etag(self, cache_key: str, scopes: Sequence[VersionScope]) -> Optional[str]:
+        """弱 ETag: 缓存键 + 作用域版本(响应中的 trace/时间戳不参与, 数据一致即可复用)"""
+        versions = await self.versions(scopes)
+        if versions is None:
+            return None
+        digest = hashlib.sha256(f"{cache_key}|{'.'.join(versions)}".encode()).hexdigest()
+        return f'W/"{digest[:32]}"'
+
+    async def _next_sequence(self) -> int:
+        pipe = self._redis.client().pipeline(transaction=True)
+        pipe.set(SEQUENCE_KEY, int(self._clock() * 1_000_000), nx=True)
+        pipe.incr(SEQUENCE_KEY)
+        return int((await pipe.execute())[-1])
+
+
+data_version_service = DataVersionService()
+
+
+def etag_headers(etag: Optional[str]) -> Dict[str, str]:
+    """条件请求响应头(无 ETag 时为空)"""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"} if etag else {}
@@ -0,0 +1,244 @@
+"""
+KPI Cube Service (L0 Dashboard 预聚合立方体查询)
+
+职责:
+- 从日汇总表(claim/policy/risk_event_daily_summary)按本地日范围读取区域级 KPI
+- 在内存中按省份/所选区域上卷, 供 L0 KPI 与 TopN(Pareto) 使用
+
+口径:
+- 立方体维度: 区域 × 产品 × 天气类型 × 本地日(见 app/models/stats_summary.py)
+- 时间范围按整本地日取整: [start 所在本地日, end 所在本地日](end 为闭区间)
+- claims/policies 的天气类型经 products.weather_type 关联; 风险事件汇总自带 weather_type
+- 理赔/风险事件按发生日落入范围; 保单为在保保单: 保障期间(本地日)与范围重叠且 active
+- 理赔排除 voided; 风险事件只有 historical
+
+硬规则:
+- 只读汇总表, 不回退扫描事实表; 查询代价只与区域数 × 天数相关, 与事实量无关
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.models.product import Product as ProductModel
+from app.models.stats_summary import (
+    ClaimDailySummary,
+    PolicyDailySummary,
+    RiskEventDailySummary,
+)
+from app.services.stats_summary import POLICY_ACTIVE
+
+CLAIM_EXCLUDED_STATUS = "voided"
+
+
+def province_of(region_code: str) -> str:
+    """区域代码所属省份(如 CN-GD-GZ → CN-GD)"""
+    return "-".join(region_code.split("-")[:2])
+
+
+def region_contains(scope_code: str, region_code: str) -> bool:
+    """region_code 是否为 scope_code 本身或其下级区域"""
+    return region_code == scope_code or region_code.startswith(f"{scope_code}-")
+
+
+@dataclass
+class RegionKpi:
+    """单个区域(或上卷后)的 KPI"""
+
+    policy_count: int = 0
+    policy_amount_total: Decimal = Decimal("0")
+    claim_count: int = 0
+    claim_amount_total: Decimal = Decimal("0")
+    risk_events: Dict[int, int] = field(default_factory=dict)  # tier_level → 事件数
+
+    @property
+    def claim_rate(self) -> Optional[float]:
+        """理赔数 / 在保保单数; 无保单时为 None"""
+        if not self.policy_count:
+            return None
+        return round(self.claim_count / self.policy_count, 4)
+
+    def add(self, other: "RegionKpi") -> None:
+        self.policy_count += other.policy_count
+        self.policy_amount_total += other.policy_amount_total
+        self.claim_count += other.claim_count
+        self.claim_amount_total += other.claim_amount_total
+        for tier, count in other.risk_events.items():
+            self.risk_events[tier] = self.risk_events.get(tier, 0) + count
+
+
+@dataclass
+class KpiCubeSlice:
+    """一次立方体查询的结果(按汇总表 region_code)"""
+
+    by_region: Dict[str, RegionKpi] = field(default_factory=dict)
+
+    def region(self, region_code: str) -> RegionKpi:
+        return self.by_region.setdefault(region_code, RegionKpi())
+
+    def rollup(self, scope_code: str) -> RegionKpi:
+        """所选区域(含下级区域)的合计"""
+        total = RegionKpi()
+        for region_code, kpi in self.by_region.items():
+            if region_contains(scope_code, region_code):
+                total.add(kpi)
+        return total
+
+    def by_province(self) -> Dict[str, RegionKpi]:
+        """按省份上卷"""
+        provinces: Dict[str, RegionKpi] = {}
+        for region_code, kpi in self.by_region.items():
+            provinces.setdefault(province_of(region_code), RegionKpi()).add(kpi)
+        return provinces
+
+
+class KpiCubeService:
+    """KPI 立方体查询"""
+
+    async def load(
+        self,
+        session: AsyncSession,
+        *,
+        start_date: date,
+        end_date: date,
+        weather_type: str,
+        product_id: Optional[str] = None,
+        include_claims: bool = True,
+        include_risk_events: bool = True,
+    ) -> KpiCubeSlice:
+        """
+        读取本地日范围内全部区域的 KPI(最多 3 条 GROUP BY region_code 查询)
+
+        Args:
+            start_date/end_date: 本地日闭区间
+            include_claims/include_risk_events: predicted 场景不读理赔与风险事件
+        """
+        result = KpiCubeSlice()
+
+        rows = await session.execute(
+            self.policy_query(start_date, end_date, weather_type, product_id)
+        )
+        for region_code, count, amount in rows.all():
+            kpi = result.region(region_code)
+            kpi.policy_count += int(count or 0)
+            kpi.policy_amount_total += Decimal(amount or 0)
+
+        if include_claims:
+            rows = await session.execute(
+                self.claim_query(start_date, end_date, weather_type, product_id)
+            )
+            for region_code, count, amount in rows.all():
+                kpi = result.region(region_code)
+                kpi.claim_count += int(count or 0)
+                kpi.claim_amount_total += Decimal(amount or 0)
+
+        if include_risk_events:
+            rows = await session.execute(
+                self.risk_event_query(start_date, end_date, weather_type, product_id)
+            )
+            for region_code, tier_level, count in rows.all():
+                tiers = result.region(region_code).risk_events
+                tiers[int(tier_level)] = tiers.get(int(tier_level), 0) + int(count or 0)
+
+        return result
+
+    def policy_query(
+        self,
+        start_date: date,
+        end_date: date,
+        weather_type: str,
+        product_id: Optional[str],
+    ) -> Select:
+        """在保保单: 保障开始日 <= 范围终点 且 保障结束日 >= 范围起点"""
+        table = PolicyDailySummary
+        query = (
+            select(
+                table.region_code,
+                func.sum(table.policy_count),
+                func.sum(table.coverage_amount_sum),
+            )
+            .where(
+                table.local_date <= end_date,
+                table.end_local_date >= start_date,
+                table.status == POLICY_ACTIVE,
+            )
+            .group_by(table.region_code)
+        )
+        return _filter_products(query, table.product_id, weather_type, product_id)
+
+    def claim_query(
+        self,
+        start_date: date,
+        end_date: date,
+        weather_type: str,
+        product_id: Optional[str],
+    ) -> Select:
+        table = ClaimDailySummary
+        query = (
+            select(
+                table.region_code,
+                func.sum(table.claim_count),
+                func.sum(table.payout_amount_sum),
+            )
+            .where(
+                table.local_date.between(start_date, end_date),
+                table.status != CLAIM_EXCLUDED_STATUS,
+            )
+            .group_by(table.region_code)
+        )
+        return _filter_products(query, table.product_id, weather_type, product_id)
+
+    def risk_event_query(
+        self,
+        start_date: date,
+        end_date: date,
+        weather_type: str,
+        product_id: Optional[str],
+    ) -> Select:
+        table = RiskEventDailySummary
+        query = (
+            select(table.region_code, table.tier_level, func.sum(table.event_count))
+            .where(
+                table.local_date.between(start_date, end_date),
+                table.weather_type == weather_type,
+            )
+            .group_by(table.region_code, table.tier_level)
+        )
+        if product_id:
+            query = query.where(table.product_id == product_id)
+        return query
+
+
+def _filter_products(
+    query: Select,
+    product_column,
+    weather_type: str,
+    product_id: Optional[str],
+) -> Select:
+    """claims/policies 汇总无天气列: 经 products 取该天气类型的产品集合"""
+    if product_id:
+        query = query.where(product_column == product_id)
+    return query.where(
+        product_column.in_(
+            select(ProductModel.id).where(ProductModel.weather_type == weather_type)
+        )
+    )
+
+
+def top_provinces(
+    provinces: Dict[str, RegionKpi], limit: int
+) -> List[Tuple[str, RegionKpi]]:
+    """按赔付金额、保额降序取前 limit 个省份(同值按代码排序, 保证结果稳定)"""
+    ranked = sorted(
+        provinces.items(),
+        key=lambda item: (-item[1].claim_amount_total, -item[1].policy_amount_total, item[0]),
+    )
+    return ranked[:limit]
+
+
+kpi_cube_service = KpiCubeService()
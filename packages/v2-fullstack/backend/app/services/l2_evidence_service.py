@@ -2,7 +2,7 @@
 L2 Evidence Service
 
 职责:
-- 组装风险事件、理赔、天气证据
+- 组装风险事件(或事件段)、理赔、天气证据
 - Mode裁剪敏感字段
 - 按需加载(不预取)
 
@@ -13,7 +13,7 @@ Reference:
 import hashlib
 import json
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import List, Optional
 
 from sqlalchemy import select
@@ -25,12 +25,14 @@ from app.schemas.l2_evidence import (
     L2EvidenceRequest,
     L2EvidenceMeta,
     L2EvidenceResponse,
+    L2RiskEpisode,
     L2RiskEvent,
     L2Summary,
     L2WeatherEvidence,
 )
 from app.schemas.shared import AccessMode, DataType
 from app.schemas.weather import WeatherQueryRequest
+from app.services.risk_episode_service import risk_episode_service
 from app.services.risk_service import risk_service
 from app.services.product_service import product_service
 from app.services.weather_service import weather_service
@@ -56,8 +58,13 @@ class L2EvidenceService:
             data_product=DataProductType.L2_EVIDENCE,
         )
 
-        # 查询风险事件
-        risk_events = await self._query_risk_events(session, request)
+        # 查询风险事件 / 事件段(聚焦单个风险事件时仍返回原始窗口)
+        risk_events: List[L2RiskEvent] = []
+        risk_episodes: Optional[List[L2RiskEpisode]] = None
+        if request.risk_view == "episodes" and request.focus_type != "risk_event":
+            risk_episodes = await self._query_risk_episodes(session, request)
+        else:
+            risk_events = await self._query_risk_events(session, request)
 
         # 查询理赔 (只查historical)
         claims: List[L2Claim] = []
@@ -65,17 +72,19 @@ class L2EvidenceService:
             claims = await self._query_claims(session, request)
 
         # 计算摘要
-        summary = self._build_summary(risk_events, claims, access_mode)
+        summary = self._build_summary(risk_events, claims, access_mode, risk_episodes)
 
         # Mode裁剪/粒度控制
         if manager.should_force_aggregation() and not manager.should_allow_detail():
             pruned_risk_events: List[L2RiskEvent] = []
+            pruned_risk_episodes: List[L2RiskEpisode] = []
             pruned_claims: List[L2Claim] = []
             weather_evidence: List[L2WeatherEvidence] = []
         else:
             pruned_risk_events = [
                 self._prune_risk_event(e, access_mode) for e in risk_events
             ]
+            pruned_risk_episodes = risk_episodes or []
             pruned_claims = [
                 self._prune_claim(c, access_mode) for c in claims
             ]
@@ -84,6 +93,7 @@ class L2EvidenceService:
                 request,
                 risk_events,
                 claims,
+                risk_episodes or [],
             )
 
         meta = await self._build_meta(session, request)
@@ -91,6 +101,7 @@ class L2EvidenceService:
             meta=meta,
             summary=summary,
             risk_events=pruned_risk_events,
+            risk_episodes=pruned_risk_episodes,
             claims=pruned_claims,
             weather_evidence=weather_evidence,
             map_ref={"region_code": request.region_code},
@@ -108,12 +119,16 @@ class L2EvidenceService:
         request: L2EvidenceRequest
     ) -> List[L2RiskEvent]:
         """查询风险事件"""
+        offset = request.cursor or 0
+        limit = request.page_size
+
         if request.focus_type == "risk_event" and request.focus_id:
             event = await risk_service.get_by_id(session, request.focus_id)
             if not event:
                 return []
-            events = [event]
+            events = [event][offset: offset + limit]
         else:
+            # 分页在数据库侧完成, 不加载整个时间窗
             events = await risk_service.query_events(
                 session,
                 region_code=request.region_code,
@@ -123,12 +138,10 @@ class L2EvidenceService:
                 time_range_end=request.time_range.end,
                 prediction_run_id=request.prediction_run_id,
                 product_id=request.product_id,
+                offset=offset,
+                limit=limit,
             )
 
-        offset = request.cursor or 0
-        limit = request.page_size
-        events = events[offset: offset + limit]
-
         return [
             L2RiskEvent(
                 id=e.id,
@@ -143,6 +156,41 @@ class L2EvidenceService:
             for e in events
         ]
     
+    async def _query_risk_episodes(
+        self,
+        session: AsyncSession,
+        request: L2EvidenceRequest
+    ) -> List[L2RiskEpisode]:
+        """查询风险事件段(分页单位为事件段)"""
+        episodes = await risk_episode_service.query_episodes(
+            session,
+            region_code=request.region_code,
+            weather_type=request.weather_type,
+            data_type=request.data_type,
+            time_range_start=request.time_range.start,
+            time_range_end=request.time_range.end,
+            prediction_run_id=request.prediction_run_id,
+            product_id=request.product_id,
+            offset=request.cursor or 0,
+            limit=request.page_size,
+        )
+        return [
+            L2RiskEpisode(
+                id=e.id,
+                start_at=e.start_at,
+                end_at=e.end_at,
+                peak_at=e.peak_at,
+                peak_tier=e.peak_tier,
+                peak_value=e.peak_value,
+                threshold_value=e.threshold_value,
+                window_count=e.window_count,
+                weather_type=e.weather_type,
+                data_type=e.data_type,
+                prediction_run_id=e.prediction_run_id,
+            )
+            for e in episodes
+        ]
+    
     async def _query_claims(
         self,
         session: AsyncSession,
@@ -185,13 +233,23 @@ class L2EvidenceService:
         self,
         risk_events: List[L2RiskEvent],
         claims: List[L2Claim],
-        access_mode: AccessMode
+        access_mode: AccessMode,
+        risk_episodes: Optional[List[L2RiskEpisode]] = None,
     ) -> L2Summary:
-        """构建摘要"""
+        """构建摘要(事件段视图下 risk_event_count 为合并前的窗口数)"""
         total_payout = None
         if claims and access_mode != AccessMode.DEMO_PUBLIC:
             total_payout = sum(c.payout_amount for c in claims if c.payout_amount)
         
+        if risk_episodes is not None:
+            return L2Summary(
+                risk_event_count=sum(e.window_count for e in risk_episodes),
+                claim_count=len(claims),
+                total_payout=total_payout,
+                max_tier=max((e.peak_tier for e in risk_episodes), default=0),
+                episode_count=len(risk_episodes),
+            )
+        
         max_tier = max((e.tier_level for e in risk_events), default=0)
         
         return L2Summary(
@@ -230,8 +288,9 @@ class L2EvidenceService:
         request: L2EvidenceRequest,
         risk_events: List[L2RiskEvent],
         claims: List[L2Claim],
+        risk_episodes: List[L2RiskEpisode],
     ) -> List[L2WeatherEvidence]:
-        anchor = self._resolve_anchor_time(request, risk_events, claims)
+        anchor = self._resolve_anchor_time(request, risk_events, claims, risk_episodes)
         if not anchor:
             return []
 
@@ -261,6 +320,7 @@ class L2EvidenceService:
         request: L2EvidenceRequest,
         risk_events: List[L2RiskEvent],
         claims: List[L2Claim],
+        risk_episodes: List[L2RiskEpisode],
     ) -> Optional[datetime]:
         if request.focus_type == "risk_event" and request.focus_id:
             for event in risk_events:
@@ -274,6 +334,8 @@ class L2EvidenceService:
             return request.cursor_time_utc
         if risk_events:
             return risk_events[0].timestamp
+        if risk_episodes:
+            return risk_episodes[0].peak_at
         if claims:
             return claims[0].triggered_at
         return None
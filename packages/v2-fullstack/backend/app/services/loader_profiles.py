@@ -0,0 +1,34 @@
+"""
+ORM Loader Profiles (关系加载策略)
+
+模型关系默认声明为 lazy="selectin": 加载一个实体会隐式追加 SELECT
+(例如加载 Product 会连带加载其全部 policies/risk_events/claims)。
+服务方法必须显式选择加载策略:
+
+- SCALAR_ONLY: 读/改路径只用标量列; 关系一律不加载, 误访问直接报错(raiseload)
+- with_relationships(...): 显式预加载指定关系(selectin), 其余关系仍 raiseload
+- refresh_columns(): 提交后只刷新列属性, 避免 session.refresh 触发关系预加载
+
+注意: session.delete() 需要关系状态做级联/置空判断, 删除路径不使用 SCALAR_ONLY。
+"""
+
+from typing import Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.attributes import QueryableAttribute
+from sqlalchemy.orm.interfaces import LoaderOption
+
+SCALAR_ONLY: Tuple[LoaderOption, ...] = (raiseload("*"),)
+
+
+def with_relationships(*relationships: QueryableAttribute) -> Tuple[LoaderOption, ...]:
+    """显式预加载指定关系, 其余关系 raiseload"""
+    return tuple(selectinload(rel) for rel in relationships) + SCALAR_ONLY
+
+
+async def refresh_columns(session: AsyncSession, model: object) -> None:
+    """只刷新列属性(不触发关系加载)"""
+    attribute_names = [attr.key for attr in inspect(type(model)).column_attrs]
+    await session.refresh(model, attribute_names=attribute_names)
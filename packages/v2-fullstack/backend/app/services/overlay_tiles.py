@@ -0,0 +1,547 @@
+"""
+Overlay Tile Service (地图叠加层瓦片)
+
+职责:
+- 预计算: weather_data × h3_cell_regions × risk_events → overlay_cell_buckets
+  (每个 H3 单元 × 时间桶的天气均值/最大值与风险强度, 一条 INSERT ... SELECT)
+- 出瓦片: 按 (zoom, x, y, 时间桶) 读取预计算表, zoom 越小要素越粗:
+  省份 → 区县 → H3 单元; 瓦片为列式紧凑 JSON, ETag 为内容摘要
+- 缓存: 进程内 LRU + Redis; 预计算写入后按时间桶失效
+
+硬规则:
+- 时间桶统一按 OVERLAY_TIMEZONE 自然边界(跨省瓦片只能有一种分桶口径)
+- 瓦片读路径只查预计算表, 不扫描 weather_data / risk_events
+- 其他进程的本地条目不接收失效广播, 最多滞后 LOCAL_TTL_SECONDS; Redis 条目随预计算立即失效
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import Text, and_, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable, Select
+
+from app.models.h3_cell import H3CellRegion
+from app.models.overlay import OverlayCellBucket
+from app.models.risk_event import RiskEvent as RiskEventModel
+from app.models.weather import WeatherData as WeatherModel
+from app.schemas.shared import DataType, WeatherType
+from app.schemas.spatial import OverlayLayer, OverlayTile
+from app.schemas.time import TimeGranularity
+from app.services.redis_clients import REDIS_CACHE_URL, AsyncRedisHandle, async_client_factory
+from app.utils.map_tiles import base_tile_span
+from app.utils.sql_buckets import local_bucket, local_bucket_start, next_local_bucket_start
+
+logger = logging.getLogger(__name__)
+
+OVERLAY_TIMEZONE = os.getenv("OVERLAY_TIMEZONE", "Asia/Shanghai")
+PROVINCE_MAX_ZOOM = 5
+DISTRICT_MAX_ZOOM = 8
+
+HISTORICAL_TTL_SECONDS = float(os.getenv("OVERLAY_TILE_HISTORICAL_TTL_SECONDS", "3600"))
+PREDICTED_TTL_SECONDS = float(os.getenv("OVERLAY_TILE_PREDICTED_TTL_SECONDS", "300"))
+LOCAL_TTL_SECONDS = float(os.getenv("OVERLAY_TILE_LOCAL_TTL_SECONDS", "30"))
+MAX_LOCAL_ENTRIES = int(os.getenv("OVERLAY_TILE_CACHE_MAX_ENTRIES", "4096"))
+
+KEY_PREFIX = "ovt:v1"
+TAG_PREFIX = "ovt-tag:v1"
+
+
+def series_key(data_type: DataType, prediction_run_id: Optional[str]) -> str:
+    """预计算序列键: historical / predicted:{run_id}"""
+    if data_type == DataType.PREDICTED:
+        return f"predicted:{prediction_run_id}"
+    return DataType.HISTORICAL.value
+
+
+def layer_for_zoom(zoom: int) -> OverlayLayer:
+    if zoom <= PROVINCE_MAX_ZOOM:
+        return OverlayLayer.PROVINCE
+    if zoom <= DISTRICT_MAX_ZOOM:
+        return OverlayLayer.DISTRICT
+    return OverlayLayer.CELL
+
+
+@dataclass(frozen=True)
+class TileBucket:
+    """一个叠加层序列的一个时间桶(bucket_start 已对齐)"""
+
+    weather_type: WeatherType
+    data_type: DataType
+    prediction_run_id: Optional[str]
+    granularity: TimeGranularity
+    bucket_start: datetime
+
+    @property
+    def series_key(self) -> str:
+        return series_key(self.data_type, self.prediction_run_id)
+
+    @property
+    def tag(self) -> str:
+        return ":".join(
+            [
+                self.weather_type.value,
+                self.series_key,
+                self.granularity.value,
+                self.bucket_start.isoformat(),
+            ]
+        )
+
+    def tile_key(self, zoom: int, x: int, y: int) -> str:
+        return f"{KEY_PREFIX}:{self.tag}:{zoom}/{x}/{y}"
+
+
+@dataclass(frozen=True)
+class EncodedTile:
+    """序列化后的瓦片(body 为 JSON, etag 为内容摘要, 内容不变则 ETag 不变)"""
+
+    etag: str
+    body: str
+
+    @classmethod
+    def encode(cls, tile: OverlayTile) -> "EncodedTile":
+        body = tile.model_dump_json()
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]
+        return cls(etag=f'"{digest}"', body=body)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    tile: EncodedTile
+    tag: str
+    expires_at: float
+
+
+class OverlayTileCache:
+    """两级瓦片缓存(线程安全)"""
+
+    def __init__(
+        self,
+        *,
+        historical_ttl_seconds: float = HISTORICAL_TTL_SECONDS,
+        predicted_ttl_seconds: float = PREDICTED_TTL_SECONDS,
+        local_ttl_seconds: float = LOCAL_TTL_SECONDS,
+        max_entries: int = MAX_LOCAL_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+        redis_factory: Optional[Callable[[], aioredis.Redis]] = None,
+    ):
+        self.historical_ttl_seconds = historical_ttl_seconds
+        self.predicted_ttl_seconds = predicted_ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._redis = AsyncRedisHandle(redis_factory or async_client_factory(REDIS_CACHE_URL))
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, data_type: DataType) -> float:
+        if data_type == DataType.PREDICTED:
+            return self.predicted_ttl_seconds
+        return self.historical_ttl_seconds
+
+    async def get(self, key: str) -> Optional[EncodedTile]:
+        """先本地, 再 Redis(命中后回填本地)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    return entry.tile
+                del self._entries[key]
+
+        try:
+            cached = await self._redis.client().hgetall(key)
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning(
+                    "Overlay tile cache read failed", extra={"key": key, "error": str(exc)}
+                )
+            return None
+        if not cached or "etag" not in cached or "body" not in cached:
+            return None
+
+        tile = EncodedTile(etag=cached["etag"], body=cached["body"])
+        with self._lock:
+            self._store_local(key, tile, cached.get("tag", ""), self.local_ttl_seconds)
+        return tile
+
+    async def put(self, key: str, tile: EncodedTile, *, tag: str, ttl_seconds: float) -> None:
+        with self._lock:
+            self._store_local(key, tile, tag, min(ttl_seconds, self.local_ttl_seconds))
+
+        ttl_ms = max(int(ttl_seconds * 1000), 1)
+        tag_key = f"{TAG_PREFIX}:{tag}"
+        try:
+            pipe = self._redis.client().pipeline(transaction=True)
+            pipe.hset(key, mapping={"etag": tile.etag, "body": tile.body, "tag": tag})
+            pipe.pexpire(key, ttl_ms)
+            pipe.sadd(tag_key, key)
+            pipe.pexpire(tag_key, ttl_ms)
+            await pipe.execute()
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning(
+                    "Overlay tile cache write failed", extra={"key": key, "error": str(exc)}
+                )
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """失效时间桶的全部瓦片(本进程立即生效, Redis 按标签集合删除)"""
+        tags = frozenset(tags)
+        if not tags:
+            return
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.tag in tags]
+            for key in stale:
+                del self._entries[key]
+        try:
+            client = self._redis.client()
+            tag_keys = [f"{TAG_PREFIX}:{tag}" for tag in sorted(tags)]
+            pipe = client.pipeline(transaction=False)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            keys = set().union(*await pipe.execute())
+            pipe = client.pipeline(transaction=True)
+            if keys:
+                pipe.delete(*keys)
+            pipe.delete(*tag_keys)
+            await pipe.execute()
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning(
+                    "Overlay tile cache invalidation failed",
+                    extra={"tags": sorted(tags), "error": str(exc)},
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store_local(self, key: str, tile: EncodedTile, tag: str, ttl_seconds: float) -> None:
+        self._entries[key] = _Entry(tile=tile, tag=tag, expires_at=self._clock() + ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class OverlayTileService:
+    """叠加层预计算 + 瓦片服务"""
+
+    def __init__(
+        self,
+        cache: Optional[OverlayTileCache] = None,
+        *,
+        region_timezone: str = OVERLAY_TIMEZONE,
+    ):
+        self.cache = cache or OverlayTileCache()
+        self.region_timezone = region_timezone
+
+    def bucket(
+        self,
+        *,
+        weather_type: WeatherType,
+        data_type: DataType,
+        prediction_run_id: Optional[str],
+        granularity: TimeGranularity,
+        bucket_start: datetime,
+    ) -> TileBucket:
+        """
+        构造时间桶(bucket_start 对齐到所在桶起点)
+
+        Raises:
+            ValueError: predicted 缺 prediction_run_id / historical 带 prediction_run_id
+        """
+        _validate_series(data_type, prediction_run_id)
+        return TileBucket(
+            weather_type=weather_type,
+            data_type=data_type,
+            prediction_run_id=prediction_run_id,
+            granularity=granularity,
+            bucket_start=local_bucket_start(bucket_start, granularity, self.region_timezone),
+        )
+
+    async def get_tile(
+        self,
+        session: AsyncSession,
+        bucket: TileBucket,
+        zoom: int,
+        x: int,
+        y: int,
+    ) -> EncodedTile:
+        """读缓存, 未命中则从预计算表构建并写缓存"""
+        key = bucket.tile_key(zoom, x, y)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        tile = EncodedTile.encode(await self.build_tile(session, bucket, zoom, x, y))
+        await self.cache.put(
+            key, tile, tag=bucket.tag, ttl_seconds=self.cache.ttl_for(bucket.data_type)
+        )
+        return tile
+
+    async def build_tile(
+        self,
+        session: AsyncSession,
+        bucket: TileBucket,
+        zoom: int,
+        x: int,
+        y: int,
+    ) -> OverlayTile:
+        layer = layer_for_zoom(zoom)
+        result = await session.execute(self.tile_query(bucket, zoom, x, y))
+        rows = result.all()
+        return OverlayTile(
+            zoom=zoom,
+            x=x,
+            y=y,
+            weather_type=bucket.weather_type,
+            data_type=bucket.data_type,
+            prediction_run_id=bucket.prediction_run_id,
+            granularity=bucket.granularity,
+            bucket_start=bucket.bucket_start,
+            layer=layer,
+            keys=[row[0] for row in rows],
+            weather_avg=[round(float(row[1]), 2) for row in rows],
+            weather_max=[float(row[2]) for row in rows],
+            risk_tier=[int(row[3]) for row in rows],
+        )
+
+    def tile_query(self, bucket: TileBucket, zoom: int, x: int, y: int) -> Select:
+        """
+        瓦片查询(预计算表 base zoom 坐标范围扫描)
+
+        Raises:
+            ValueError: 瓦片坐标无效
+        """
+        x_min, x_max, y_min, y_max = base_tile_span(zoom, x, y)
+        table = OverlayCellBucket
+        filters = (
+            table.weather_type == bucket.weather_type.value,
+            table.series_key == bucket.series_key,
+            table.granularity == bucket.granularity.value,
+            table.bucket_start == bucket.bucket_start,
+            table.tile_x.between(x_min, x_max),
+            table.tile_y.between(y_min, y_max),
+        )
+
+        layer = layer_for_zoom(zoom)
+        if layer == OverlayLayer.CELL:
+            return (
+                select(table.h3_index, table.weather_avg, table.weather_max, table.risk_tier)
+                .where(*filters)
+                .order_by(table.h3_index)
+            )
+
+        if layer == OverlayLayer.PROVINCE:
+            group_column = table.province_code
+        else:
+            group_column = func.coalesce(table.district_code, table.province_code)
+        return (
+            select(
+                group_column,
+                func.avg(table.weather_avg),
+                func.max(table.weather_max),
+                func.max(table.risk_tier),
+            )
+            .where(*filters)
+            .group_by(group_column)
+            .order_by(group_column)
+        )
+
+    async def precompute(
+        self,
+        session: AsyncSession,
+        *,
+        weather_type: WeatherType,
+        data_type: DataType,
+        prediction_run_id: Optional[str],
+        granularity: TimeGranularity,
+        start: datetime,
+        end: datetime,
+    ) -> List[TileBucket]:
+        """
+        重算 [start, end] 覆盖的全部时间桶(不提交; 提交后调用 invalidate)
+
+        Returns:
+            重算的时间桶
+        """
+        _validate_series(data_type, prediction_run_id)
+        buckets = self._buckets_between(
+            weather_type, data_type, prediction_run_id, granularity, start, end
+        )
+        if not buckets:
+            return []
+        window_end = next_local_bucket_start(
+            buckets[-1].bucket_start, granularity, self.region_timezone
+        )
+        for statement in self.precompute_statements(
+            weather_type=weather_type,
+            data_type=data_type,
+            prediction_run_id=prediction_run_id,
+            granularity=granularity,
+            window_start=buckets[0].bucket_start,
+            window_end=window_end,
+        ):
+            await session.execute(statement)
+        logger.info(
+            "Overlay buckets precomputed",
+            extra={
+                "weather_type": weather_type.value,
+                "series_key": series_key(data_type, prediction_run_id),
+                "granularity": granularity.value,
+                "bucket_count": len(buckets),
+            },
+        )
+        return buckets
+
+    async def invalidate(self, buckets: Iterable[TileBucket]) -> None:
+        await self.cache.invalidate(bucket.tag for bucket in buckets)
+
+    def precompute_statements(
+        self,
+        *,
+        weather_type: WeatherType,
+        data_type: DataType,
+        prediction_run_id: Optional[str],
+        granularity: TimeGranularity,
+        window_start: datetime,
+        window_end: datetime,
+    ) -> List[Executable]:
+        """清空窗口内的时间桶 + INSERT ... SELECT(窗口为桶对齐的 [start, end))"""
+        series = series_key(data_type, prediction_run_id)
+        table = OverlayCellBucket
+        clear = delete(table).where(
+            table.weather_type == weather_type.value,
+            table.series_key == series,
+            table.granularity == granularity.value,
+            table.bucket_start >= window_start,
+            table.bucket_start < window_end,
+        )
+
+        weather_bucket = local_bucket(WeatherModel.timestamp, granularity, self.region_timezone)
+        weather = (
+            select(
+                WeatherModel.h3_index.label("h3_index"),
+                weather_bucket.label("bucket_start"),
+                func.avg(WeatherModel.value).label("weather_avg"),
+                func.max(WeatherModel.value).label("weather_max"),
+            )
+            .where(
+                WeatherModel.h3_index.is_not(None),
+                WeatherModel.weather_type == weather_type.value,
+                WeatherModel.data_type == data_type.value,
+                WeatherModel.timestamp >= window_start,
+                WeatherModel.timestamp < window_end,
+            )
+            .group_by(WeatherModel.h3_index, weather_bucket)
+        )
+        risk_bucket = local_bucket(RiskEventModel.timestamp, granularity, self.region_timezone)
+        risk = (
+            select(
+                RiskEventModel.region_code.label("region_code"),
+                risk_bucket.label("bucket_start"),
+                func.max(RiskEventModel.tier_level).label("tier"),
+            )
+            .where(
+                RiskEventModel.weather_type == weather_type.value,
+                RiskEventModel.data_type == data_type.value,
+                RiskEventModel.timestamp >= window_start,
+                RiskEventModel.timestamp < window_end,
+            )
+            .group_by(RiskEventModel.region_code, risk_bucket)
+        )
+        if data_type == DataType.PREDICTED:
+            weather = weather.where(WeatherModel.prediction_run_id == prediction_run_id)
+            risk = risk.where(RiskEventModel.prediction_run_id == prediction_run_id)
+        weather = weather.subquery("weather")
+        district_risk = risk.subquery("district_risk")
+        province_risk = risk.subquery("province_risk")
+
+        cells = (
+            select(
+                literal(weather_type.value, Text),
+                literal(series, Text),
+                literal(granularity.value, Text),
+                weather.c.bucket_start,
+                weather.c.h3_index,
+                H3CellRegion.province_code,
+                H3CellRegion.district_code,
+                H3CellRegion.tile_x,
+                H3CellRegion.tile_y,
+                func.round(weather.c.weather_avg, 2),
+                weather.c.weather_max,
+                # greatest 忽略 NULL: 区县/省份任一有事件即取较高等级
+                func.coalesce(func.greatest(district_risk.c.tier, province_risk.c.tier), 0),
+                func.now(),
+            )
+            .select_from(weather)
+            .join(H3CellRegion, H3CellRegion.h3_index == weather.c.h3_index)
+            .outerjoin(
+                district_risk,
+                and_(
+                    district_risk.c.region_code == H3CellRegion.district_code,
+                    district_risk.c.bucket_start == weather.c.bucket_start,
+                ),
+            )
+            .outerjoin(
+                province_risk,
+                and_(
+                    province_risk.c.region_code == H3CellRegion.province_code,
+                    province_risk.c.bucket_start == weather.c.bucket_start,
+                ),
+            )
+            .where(H3CellRegion.tile_x.is_not(None), H3CellRegion.tile_y.is_not(None))
+        )
+        fill = insert(table).from_select(
+            ["weather_type", "series_key", "granularity", "bucket_start", "h3_index",
+             "province_code", "district_code", "tile_x", "tile_y",
+             "weather_avg", "weather_max", "risk_tier", "computed_at"],
+            cells,
+        )
+        return [clear, fill]
+
+    def _buckets_between(
+        self,
+        weather_type: WeatherType,
+        data_type: DataType,
+        prediction_run_id: Optional[str],
+        granularity: TimeGranularity,
+        start: datetime,
+        end: datetime,
+    ) -> List[TileBucket]:
+        if end < start:
+            raise ValueError("end must not be earlier than start")
+        buckets: List[TileBucket] = []
+        current = local_bucket_start(start, granularity, self.region_timezone)
+        while current <= end:
+            buckets.append(
+                TileBucket(
+                    weather_type=weather_type,
+                    data_type=data_type,
+                    prediction_run_id=prediction_run_id,
+                    granularity=granularity,
+                    bucket_start=current,
+                )
+            )
+            current = next_local_bucket_start(current, granularity, self.region_timezone)
+        return buckets
+
+
+def _validate_series(data_type: DataType, prediction_run_id: Optional[str]) -> None:
+    if data_type == DataType.PREDICTED and not prediction_run_id:
+        raise ValueError("prediction_run_id required for predicted data")
+    if data_type == DataType.HISTORICAL and prediction_run_id is not None:
+        raise ValueError("prediction_run_id must be null for historical")
+
+
+overlay_tile_service = OverlayTileService()
@@ -0,0 +1,339 @@
+"""
+Policy Portfolio Index (进程内保单组合快照)
+
+职责:
+- 按 region → product → timezone 分组缓存有效保单的最小快照
+- 每组以保障区间 [coverage_start, coverage_end] 建居中区间树(节点内为有序数组),
+  回答 "哪些保单在 T 时刻覆盖区域 R" / "哪些保单与窗口 [a, b] 重叠"
+- 首次使用时全量加载; 之后按 updated_at 水位增量刷新, 只重建变更的分组
+
+硬规则:
+- 快照只用于扇出/筛选, 下游计算仍按 policy_id 读取完整保单
+- 硬删除不会推进 updated_at: 本进程删除通过 discard() 同步,
+  其他进程依赖 FULL_RELOAD_SECONDS 周期性全量重载兜底
+- 时间一律 UTC(业务边界对齐交给下游按 timezone 处理)
+"""
+
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.policy import Policy as PolicyModel
+
+logger = logging.getLogger(__name__)
+
+# 距上次刷新超过该秒数才查询增量
+REFRESH_INTERVAL_SECONDS = 30.0
+# 周期性全量重载(兜底硬删除/越过水位的迟到提交)
+FULL_RELOAD_SECONDS = 3600.0
+# 增量水位回看窗口: 覆盖事务提交晚于 updated_at 的行
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+
+@dataclass(frozen=True)
+class PolicySnapshot:
+    """保单快照(扇出/筛选所需的最小字段集)"""
+    id: str
+    product_id: str
+    coverage_region: str
+    timezone: str
+    coverage_start: datetime
+    coverage_end: datetime
+    coverage_amount: Decimal
+
+
+class _IntervalNode:
+    """居中区间树节点: 跨越 center 的区间分别按 start / end 升序存放"""
+
+    __slots__ = ("center", "by_start", "starts", "by_end", "ends", "left", "right")
+
+    def __init__(self, intervals: Sequence[PolicySnapshot]):
+        points = sorted(
+            point for item in intervals for point in (item.coverage_start, item.coverage_end)
+        )
+        self.center = points[len(points) // 2]
+
+        left, right, here = [], [], []
+        for item in intervals:
+            if item.coverage_end < self.center:
+                left.append(item)
+            elif item.coverage_start > self.center:
+                right.append(item)
+            else:
+                here.append(item)
+
+        self.by_start = sorted(here, key=lambda p: (p.coverage_start, p.id))
+        self.starts = [p.coverage_start for p in self.by_start]
+        self.by_end = sorted(here, key=lambda p: (p.coverage_end, p.id))
+        self.ends = [p.coverage_end for p in self.by_end]
+        self.left = _IntervalNode(left) if left else None
+        self.right = _IntervalNode(right) if right else None
+
+
+class IntervalTree:
+    """静态区间树(闭区间), 构建 O(n log n), 查询 O(log n + k)"""
+
+    def __init__(self, intervals: Iterable[PolicySnapshot]):
+        items = list(intervals)
+        self.size = len(items)
+        self._root = _IntervalNode(items) if items else None
+
+    def overlapping(self, start: datetime, end: datetime) -> List[PolicySnapshot]:
+        """返回与 [start, end] 相交的区间(start == end 即单点查询)"""
+        found: List[PolicySnapshot] = []
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            if end < node.center:
+                # 节点区间都覆盖 center > end, 只需 coverage_start <= end
+                found.extend(node.by_start[:bisect.bisect_right(node.starts, end)])
+                if node.left:
+                    stack.append(node.left)
+            elif start > node.center:
+                # 节点区间都始于 center < start, 只需 coverage_end >= start
+                found.extend(node.by_end[bisect.bisect_left(node.ends, start):])
+                if node.right:
+                    stack.append(node.right)
+            else:
+                found.extend(node.by_start)
+                if node.left:
+                    stack.append(node.left)
+                if node.right:
+                    stack.append(node.right)
+        return found
+
+    def covering(self, at: datetime) -> List[PolicySnapshot]:
+        return self.overlapping(at, at)
+
+
+GroupKey = Tuple[str, str, str]  # (region_code, product_id, timezone)
+
+
+class PolicyPortfolioIndex:
+    """保单组合快照索引(惰性加载 + updated_at 增量刷新)"""
+
+    def __init__(
+        self,
+        *,
+        refresh_interval: float = REFRESH_INTERVAL_SECONDS,
+        full_reload_interval: float = FULL_RELOAD_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.refresh_interval = refresh_interval
+        self.full_reload_interval = full_reload_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._policies: Dict[str, PolicySnapshot] = {}
+        self._members: Dict[GroupKey, Dict[str, PolicySnapshot]] = {}
+        # region → (product_id, timezone) → IntervalTree
+        self._groups: Dict[str, Dict[Tuple[str, str], IntervalTree]] = {}
+        self._watermark: Optional[datetime] = None
+        self._loaded_at: Optional[float] = None
+        self._refreshed_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    async def ensure_fresh(self, session: AsyncSession) -> None:
+        """按需加载/刷新(首次全量, 之后增量, 超过 full_reload_interval 全量重载)"""
+        now = self._clock()
+        if self._loaded_at is None or now - self._loaded_at >= self.full_reload_interval:
+            await self.load(session)
+        elif now - self._refreshed_at >= self.refresh_interval:
+            await self.refresh(session)
+
+    async def load(self, session: AsyncSession) -> None:
+        """全量加载有效保单"""
+        result = await session.execute(
+            select(*self._columns()).where(PolicyModel.is_active.is_(True))
+        )
+        rows = result.all()
+
+        policies = {row.id: self._row_to_snapshot(row) for row in rows}
+        members: Dict[GroupKey, Dict[str, PolicySnapshot]] = {}
+        for snapshot in policies.values():
+            members.setdefault(self._group_key(snapshot), {})[snapshot.id] = snapshot
+
+        with self._lock:
+            self._policies = policies
+            self._members = members
+            self._groups = {}
+            self._rebuild_groups(set(members))
+            self._watermark = max((row.updated_at for row in rows), default=None)
+            self._loaded_at = self._refreshed_at = self._clock()
+
+        logger.info(
+            "Policy portfolio loaded",
+            extra={"policy_count": len(policies), "group_count": len(members)},
+        )
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """
+        增量刷新: 读取 updated_at >= 水位 - WATERMARK_OVERLAP 的保单(含失效保单)
+
+        Returns:
+            变更的保单数
+        """
+        if self._watermark is None:
+            query = select(*self._columns())
+        else:
+            query = select(*self._columns()).where(
+                PolicyModel.updated_at >= self._watermark - WATERMARK_OVERLAP
+            )
+        result = await session.execute(query)
+        rows = result.all()
+
+        changed = 0
+        with self._lock:
+            touched: Set[GroupKey] = set()
+            for row in rows:
+                if self._watermark is None or row.updated_at > self._watermark:
+                    self._watermark = row.updated_at
+                snapshot = self._row_to_snapshot(row)
+                previous = self._policies.get(row.id)
+                if row.is_active:
+                    if previous == snapshot:
+                        continue
+                    touched |= self._put(snapshot)
+                elif previous is None:
+                    continue
+                else:
+                    touched |= self._pop(row.id)
+                changed += 1
+            self._rebuild_groups(touched)
+            self._refreshed_at = self._clock()
+
+        if changed:
+            logger.info(
+                "Policy portfolio refreshed",
+                extra={"changed": changed, "policy_count": len(self._policies)},
+            )
+        return changed
+
+    def upsert(self, snapshot: PolicySnapshot) -> None:
+        """写路径同步(本进程立即可见)"""
+        with self._lock:
+            self._rebuild_groups(self._put(snapshot))
+
+    def discard(self, policy_id: str) -> None:
+        """写路径同步(失效/删除)"""
+        with self._lock:
+            self._rebuild_groups(self._pop(policy_id))
+
+    def covering(
+        self,
+        region_code: str,
+        at: datetime,
+        *,
+        product_id: Optional[str] = None,
+    ) -> List[PolicySnapshot]:
+        """T 时刻覆盖区域 R 的有效保单(按 id 排序)"""
+        return self.overlapping(region_code, at, at, product_id=product_id)
+
+    def overlapping(
+        self,
+        region_code: Optional[str],
+        start: datetime,
+        end: datetime,
+        *,
+        product_id: Optional[str] = None,
+    ) -> List[PolicySnapshot]:
+        """保障区间与 [start, end] 相交的有效保单(按 id 排序)"""
+        found: List[PolicySnapshot] = []
+        for tree in self._select_groups(region_code, product_id):
+            found.extend(tree.overlapping(start, end))
+        return sorted(found, key=lambda p: p.id)
+
+    def _select_groups(
+        self,
+        region_code: Optional[str],
+        product_id: Optional[str],
+    ) -> List[IntervalTree]:
+        groups = self._groups
+        if region_code is None:
+            by_region = [item for region in groups.values() for item in region.items()]
+        else:
+            by_region = list(groups.get(region_code, {}).items())
+        return [
+            tree
+            for (product, _tz), tree in by_region
+            if product_id is None or product == product_id
+        ]
+
+    def _put(self, snapshot: PolicySnapshot) -> Set[GroupKey]:
+        """写入快照, 返回受影响的分组(调用方持锁)"""
+        touched = self._pop(snapshot.id)
+        key = self._group_key(snapshot)
+        self._policies[snapshot.id] = snapshot
+        self._members.setdefault(key, {})[snapshot.id] = snapshot
+        touched.add(key)
+        return touched
+
+    def _pop(self, policy_id: str) -> Set[GroupKey]:
+        """移除快照, 返回受影响的分组(调用方持锁)"""
+        previous = self._policies.pop(policy_id, None)
+        if previous is None:
+            return set()
+        key = self._group_key(previous)
+        self._members.get(key, {}).pop(policy_id, None)
+        return {key}
+
+    def _rebuild_groups(self, keys: Set[GroupKey]) -> None:
+        if not keys:
+            return
+        groups = dict(self._groups)
+        for key in keys:
+            region, product, tz_name = key
+            region_groups = groups[region] = dict(groups.get(region, {}))
+            items = self._members.get(key)
+            if items:
+                region_groups[(product, tz_name)] = IntervalTree(items.values())
+            else:
+                self._members.pop(key, None)
+                region_groups.pop((product, tz_name), None)
+                if not region_groups:
+                    del groups[region]
+        # 整体替换引用(写时复制), 读路径无需加锁
+        self._groups = groups
+
+    @staticmethod
+    def _group_key(snapshot: PolicySnapshot) -> GroupKey:
+        return (snapshot.coverage_region, snapshot.product_id, snapshot.timezone)
+
+    @staticmethod
+    def _columns() -> tuple:
+        return (
+            PolicyModel.id,
+            PolicyModel.product_id,
+            PolicyModel.coverage_region,
+            PolicyModel.timezone,
+            PolicyModel.coverage_start,
+            PolicyModel.coverage_end,
+            PolicyModel.coverage_amount,
+            PolicyModel.is_active,
+            PolicyModel.updated_at,
+        )
+
+    @staticmethod
+    def _row_to_snapshot(row) -> PolicySnapshot:
+        return PolicySnapshot(
+            id=row.id,
+            product_id=row.product_id,
+            coverage_region=row.coverage_region,
+            timezone=row.timezone,
+            coverage_start=row.coverage_start,
+            coverage_end=row.coverage_end,
+            coverage_amount=row.coverage_amount,
+        )
+
+
+policy_portfolio = PolicyPortfolioIndex()
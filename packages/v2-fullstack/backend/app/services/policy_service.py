@@ -5,6 +5,8 @@ Policy Service
 - 保单CRUD
 - 统计查询 (用于L0/L1数据产品)
 - Mode裁剪 (敏感字段/金额)
+- 写路径同步进程内保单组合索引(policy_portfolio)
+- 同事务维护 policy_daily_summary (统计读汇总表)
 
 Reference:
 - docs/v2/v2实施细则/06-保单表与Policy-Service-细则.md
@@ -12,14 +14,21 @@ Reference:
 
 import logging
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.policy import Policy as PolicyModel
-from app.schemas.policy import Policy, PolicyCreate, PolicyStats, PolicyUpdate
+from app.schemas.policy import Policy, PolicyBatch, PolicyCreate, PolicyStats, PolicyUpdate
 from app.schemas.shared import AccessMode
+from app.services.data_product_cache import data_product_cache
+from app.services.data_versions import data_version_service
+from app.services.loader_profiles import SCALAR_ONLY, refresh_columns
+from app.services.policy_portfolio import PolicySnapshot, policy_portfolio
+from app.services.stats_summary import PolicyFact, stats_summary_service
+from app.utils.batch_lookup import normalize_batch_ids, order_by_request
 
 logger = logging.getLogger(__name__)
 
@@ -46,8 +55,13 @@ class PolicyService:
             is_active=payload.is_active,
         )
         session.add(model)
+        await stats_summary_service.apply_policy_changes(
+            session, added=[PolicyFact.of(payload)]
+        )
         await session.commit()
-        await session.refresh(model)
+        await self._invalidate_data_products(model)
+        await refresh_columns(session, model)
+        self._sync_portfolio(model)
         return self._model_to_schema(model)
     
     async def update(
@@ -56,14 +70,19 @@ class PolicyService:
         policy_id: str,
         payload: PolicyUpdate,
     ) -> Optional[Policy]:
-        """更新保单"""
+        """更新保单(行锁: 并发更新按序计算汇总增量, 不会重复扣减同一旧值)"""
         result = await session.execute(
-            select(PolicyModel).where(PolicyModel.id == policy_id)
+            select(PolicyModel)
+            .where(PolicyModel.id == policy_id)
+            .options(*SCALAR_ONLY)
+            .with_for_update()
+            .execution_options(populate_existing=True)
         )
         model = result.scalar_one_or_none()
         if not model:
             return None
         
+        before = PolicyFact.of(model)
         if payload.coverage_amount is not None:
             model.coverage_amount = payload.coverage_amount
         if payload.coverage_end is not None:
@@ -73,8 +92,16 @@ class PolicyService:
         if payload.is_active is not None:
             model.is_active = payload.is_active
         
+        after = PolicyFact.of(model)
+        if after != before:
+            await stats_summary_service.apply_policy_changes(
+                session, added=[after], removed=[before]
+            )
         await session.commit()
-        await session.refresh(model)
+        if after != before:
+            await self._invalidate_data_products(model)
+        await refresh_columns(session, model)
+        self._sync_portfolio(model)
         return self._model_to_schema(model)
     
     async def delete(
@@ -82,15 +109,23 @@ class PolicyService:
         session: AsyncSession,
         policy_id: str,
     ) -> bool:
-        """删除保单"""
+        """删除保单(行锁: 并发删除只扣减一次汇总)"""
         result = await session.execute(
-            select(PolicyModel).where(PolicyModel.id == policy_id)
+            select(PolicyModel)
+            .where(PolicyModel.id == policy_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
         )
         model = result.scalar_one_or_none()
         if not model:
             return False
         await session.delete(model)
+        await stats_summary_service.apply_policy_changes(
+            session, removed=[PolicyFact.of(model)]
+        )
         await session.commit()
+        await self._invalidate_data_products(model)
+        policy_portfolio.discard(policy_id)
         return True
     
     async def get_by_id(
@@ -101,7 +136,7 @@ class PolicyService:
     ) -> Optional[Policy]:
         """获取保单详情"""
         result = await session.execute(
-            select(PolicyModel).where(PolicyModel.id == policy_id)
+            select(PolicyModel).where(PolicyModel.id == policy_id).options(*SCALAR_ONLY)
         )
         model = result.scalar_one_or_none()
         
@@ -111,6 +146,31 @@ class PolicyService:
         policy = self._model_to_schema(model)
         return self._apply_mode_pruning(policy, access_mode)
     
+    async def get_by_ids(
+        self,
+        session: AsyncSession,
+        policy_ids: Sequence[str],
+        access_mode: AccessMode = AccessMode.DEMO_PUBLIC
+    ) -> PolicyBatch:
+        """
+        批量获取保单(单条 = ANY 查询, 按请求顺序返回)
+        
+        Raises:
+            ValueError: ids 为空或超过上限
+        """
+        ids = normalize_batch_ids(policy_ids)
+        result = await session.execute(
+            select(PolicyModel)
+            .where(PolicyModel.id == any_(bindparam("ids", ids, type_=ARRAY(String))))
+            .options(*SCALAR_ONLY)
+        )
+        found = {
+            m.id: self._apply_mode_pruning(self._model_to_schema(m), access_mode)
+            for m in result.scalars().all()
+        }
+        items, missing = order_by_request(ids, found)
+        return PolicyBatch(items=items, missing=missing)
+    
     async def list_by_region(
         self,
         session: AsyncSession,
@@ -122,6 +182,7 @@ class PolicyService:
             select(PolicyModel)
             .where(PolicyModel.coverage_region == region_code)
             .where(PolicyModel.is_active == True)
+            .options(*SCALAR_ONLY)
         )
         models = list(result.scalars().all())
         
@@ -141,7 +202,7 @@ class PolicyService:
         access_mode: AccessMode = AccessMode.DEMO_PUBLIC,
     ) -> List[Policy]:
         """按条件查询保单"""
-        query = select(PolicyModel)
+        query = select(PolicyModel).options(*SCALAR_ONLY)
         
         if region_code:
             query = query.where(PolicyModel.coverage_region == region_code)
@@ -167,23 +228,16 @@ class PolicyService:
         product_id: Optional[str] = None,
         access_mode: AccessMode = AccessMode.DEMO_PUBLIC
     ) -> PolicyStats:
-        """获取保单统计"""
-        query = select(
-            func.count(PolicyModel.id).label("count"),
-            func.sum(PolicyModel.coverage_amount).label("total_amount")
-        ).where(PolicyModel.is_active == True)
-        
-        if region_code:
-            query = query.where(PolicyModel.coverage_region == region_code)
-        if product_id:
-            query = query.where(PolicyModel.product_id == product_id)
-        
-        result = await session.execute(query)
-        row = result.first()
+        """获取保单统计(读 policy_daily_summary, 不扫描 policies)"""
+        policy_count, total_amount = await stats_summary_service.policy_totals(
+            session,
+            region_code=region_code,
+            product_id=product_id,
+        )
         
         stats = PolicyStats(
-            policy_count=row.count or 0,
-            coverage_amount_sum=row.total_amount
+            policy_count=policy_count,
+            coverage_amount_sum=total_amount
         )
         
         # Mode裁剪
@@ -209,6 +263,33 @@ class PolicyService:
             updated_at=model.updated_at,
         )
     
+    async def _invalidate_data_products(self, model: PolicyModel) -> None:
+        """保单事实已提交: 失效承保区域/产品的数据产品缓存, 递增数据版本(与 data_type 无关)"""
+        await data_product_cache.invalidate_facts(
+            region_codes=[model.coverage_region],
+            product_ids=[model.product_id],
+        )
+        await data_version_service.bump_facts(
+            region_codes=[model.coverage_region], product_ids=[model.product_id]
+        )
+    
+    def _sync_portfolio(self, model: PolicyModel) -> None:
+        """写后同步组合索引(其他进程由 updated_at 增量刷新)"""
+        if not model.is_active:
+            policy_portfolio.discard(model.id)
+            return
+        policy_portfolio.upsert(
+            PolicySnapshot(
+                id=model.id,
+                product_id=model.product_id,
+                coverage_region=model.coverage_region,
+                timezone=model.timezone,
+                coverage_start=model.coverage_start,
+                coverage_end=model.coverage_end,
+                coverage_amount=model.coverage_amount,
+            )
+        )
+    
     def _apply_mode_pruning(self, policy: Policy, mode: AccessMode) -> Policy:
         """应用Mode裁剪"""
         if mode == AccessMode.DEMO_PUBLIC:
@@ -0,0 +1,201 @@
+"""
+Product Cache (进程内产品缓存)
+
+职责:
+- 缓存已校验的 Product(RiskRules/PayoutRules 只做一次 model_validate)
+- 条目按 (product_id, version) 存放, product_id → 当前 version 单独索引
+- TTL 兜底 + Redis pub/sub 广播失效(create/update 后发布)
+
+硬规则:
+- 缓存对象只读: 规则模型为 frozen, 调用方拿到的是浅拷贝,
+  Mode 裁剪必须在拷贝上进行(model_copy), 不能修改缓存实例
+- Redis 不可用时只影响跨进程失效(本进程仍立即失效, 其他进程由 TTL 兜底)
+- 读库期间发生的失效会使该次写入作废(见 mark/put), 避免把失效前读到的旧行写回缓存
+- 发布走 redis.asyncio(publish_invalidation 需 await, 不阻塞事件循环); 监听线程使用同步客户端
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from app.schemas.product import Product
+from app.services.redis_clients import (
+    REDIS_URL,
+    AsyncRedisHandle,
+    async_client_factory,
+    sync_client_factory,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "300"))
+INVALIDATION_CHANNEL = "product-cache:invalidate"
+
+
+@dataclass(frozen=True)
+class _Entry:
+    product: Product
+    expires_at: float
+
+
+class ProductCache:
+    """进程内产品缓存(线程安全: pub/sub 监听线程与请求/任务并发访问)"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        redis_factory: Optional[Callable[[], aioredis.Redis]] = None,
+        listener_factory: Optional[Callable[[], redis.Redis]] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._redis = AsyncRedisHandle(redis_factory or async_client_factory(REDIS_URL))
+        self._listener_factory = listener_factory or sync_client_factory(REDIS_URL)
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._current_version: Dict[str, str] = {}
+        # 失效序号: 每次失效递增, 记录各产品(及全量清空)最近一次失效的序号
+        self._sequence = 0
+        self._invalidated_at: Dict[str, int] = {}
+        self._cleared_at = -1
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def get(self, product_id: str, version: Optional[str] = None) -> Optional[Product]:
+        """
+        读取缓存(未命中/过期返回 None)
+
+        Args:
+            version: 不传则取当前版本
+        """
+        with self._lock:
+            version = version or self._current_version.get(product_id)
+            if version is None:
+                return None
+            entry = self._entries.get((product_id, version))
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                self._drop(product_id)
+                return None
+            return entry.product.model_copy()
+
+    def mark(self) -> int:
+        """读库前取失效序号, 写入时传给 put(since=...)"""
+        with self._lock:
+            return self._sequence
+
+    def put(self, product: Product, *, since: Optional[int] = None) -> bool:
+        """
+        写入缓存并设为该产品的当前版本(覆盖旧版本条目)
+
+        Args:
+            since: mark() 返回的序号; 其后该产品被失效(或缓存被清空)则放弃写入
+
+        Returns:
+            是否写入
+        """
+        with self._lock:
+            if since is not None and (
+                self._invalidated_at.get(product.id, -1) > since or self._cleared_at > since
+            ):
+                logger.debug(
+                    "Product cache write skipped (invalidated)", extra={"product_id": product.id}
+                )
+                return False
+            self._drop(product.id)
+            self._entries[(product.id, product.version)] = _Entry(
+                product=product.model_copy(),
+                expires_at=self._clock() + self.ttl_seconds,
+            )
+            self._current_version[product.id] = product.version
+        return True
+
+    def invalidate(self, product_id: str) -> None:
+        """本进程失效(该产品所有版本)"""
+        with self._lock:
+            self._sequence += 1
+            self._invalidated_at[product_id] = self._sequence
+            self._drop(product_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._cleared_at = self._sequence
+            self._invalidated_at.clear()
+            self._entries.clear()
+            self._current_version.clear()
+
+    async def publish_invalidation(self, product_id: str, version: Optional[str]) -> None:
+        """本进程立即失效, 并通过 Redis 广播给其他进程(失败仅告警)"""
+        self.invalidate(product_id)
+        message = json.dumps({"product_id": product_id, "version": version})
+        try:
+            await self._redis.client().publish(INVALIDATION_CHANNEL, message)
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning(
+                    "Product cache invalidation broadcast failed",
+                    extra={"product_id": product_id, "version": version, "error": str(exc)},
+                )
+
+    def handle_message(self, message: dict) -> None:
+        """pub/sub 消息处理(监听线程回调)"""
+        try:
+            payload = json.loads(message["data"])
+            product_id = payload["product_id"]
+        except (KeyError, TypeError, ValueError):
+            logger.warning(
+                "Malformed product cache invalidation message",
+                extra={"payload": message.get("data")},
+            )
+            return
+        self.invalidate(product_id)
+        logger.debug(
+            "Product cache invalidated by broadcast",
+            extra={"product_id": product_id, "version": payload.get("version")},
+        )
+
+    def start_listener(self) -> None:
+        """启动 pub/sub 监听线程(幂等; Redis 不可用时仅告警, 依赖 TTL 兜底)"""
+        if self._listener is not None:
+            return
+        try:
+            pubsub = self._listener_factory().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: self.handle_message})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=self._on_listener_error,
+            )
+        except redis.exceptions.RedisError as exc:
+            logger.warning(
+                "Product cache listener not started, falling back to TTL",
+                extra={"error": str(exc)},
+            )
+
+    def stop_listener(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.stop()
+        self._listener = None
+
+    def _on_listener_error(self, exc: Exception, pubsub, thread) -> None:
+        # 监听断开期间可能漏掉失效消息: 清空本地缓存后退出, 由 TTL/下一次启动恢复
+        logger.warning("Product cache listener stopped", extra={"error": str(exc)})
+        self.clear()
+        thread.stop()
+        self._listener = None
+
+    def _drop(self, product_id: str) -> None:
+        version = self._current_version.pop(product_id, None)
+        if version is not None:
+            self._entries.pop((product_id, version), None)
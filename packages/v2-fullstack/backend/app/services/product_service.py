@@ -6,6 +6,7 @@ Product Service (产品服务)
 - 提供产品列表查询 (支持按weather_type过滤)
 - 应用Access Mode裁剪 (payoutRules可能被裁剪)
 - 验证规则一致性 (weather_type, thresholds)
+- 进程内缓存已校验的产品(见 product_cache), create/update 后广播失效
 
 Reference:
 - docs/v2/v2实施细则/05-产品表与Product-Service-细则.md
@@ -35,6 +36,10 @@ from app.schemas.product import (
     ProductUpdate,
 )
 from app.schemas.shared import AccessMode, WeatherType
+from app.services.loader_profiles import SCALAR_ONLY, refresh_columns
+from app.services.data_product_cache import data_product_cache
+from app.services.data_versions import data_version_service
+from app.services.product_cache import ProductCache
 from app.utils.access_control import AccessControlManager
 
 logger = logging.getLogger(__name__)
@@ -46,6 +51,9 @@ class ProductService:
     
     提供产品配置的CRUD操作和查询
     """
+
+    def __init__(self, cache: Optional[ProductCache] = None):
+        self.cache = cache if cache is not None else ProductCache()
     
     async def get_by_id(
         self,
@@ -64,18 +72,24 @@ class ProductService:
         Returns:
             产品对象，如果不存在则返回None
         """
-        result = await session.execute(
-            select(ProductModel).where(ProductModel.id == product_id)
-        )
-        product_model = result.scalar_one_or_none()
-        
-        if not product_model:
-            return None
+        product = self.cache.get(product_id)
+        cached = product is not None
         
-        # 转换为Pydantic对象
-        product = self._model_to_schema(product_model)
+        if not cached:
+            since = self.cache.mark()
+            result = await session.execute(
+                select(ProductModel).where(ProductModel.id == product_id).options(*SCALAR_ONLY)
+            )
+            product_model = result.scalar_one_or_none()
+            
+            if not product_model:
+                return None
+            
+            # 转换为Pydantic对象(规则只在未命中时校验一次)
+            product = self._model_to_schema(product_model)
+            self.cache.put(product, since=since)
         
-        # 应用Mode裁剪
+        # 应用Mode裁剪(返回新对象, 不修改缓存实例)
         product = self._apply_mode_pruning(product, access_mode)
         
         logger.info(
@@ -84,6 +98,7 @@ class ProductService:
                 "product_id": product_id,
                 "access_mode": access_mode.value,
                 "payout_rules_included": product.payout_rules is not None,
+                "cached": cached,
             }
         )
         
@@ -107,7 +122,7 @@ class ProductService:
             产品列表响应
         """
         # 构建查询
-        query = select(ProductModel)
+        query = select(ProductModel).options(*SCALAR_ONLY)
         
         # 应用过滤
         if filter.weather_type:
@@ -182,7 +197,10 @@ class ProductService:
         
         session.add(product_model)
         await session.commit()
-        await session.refresh(product_model)
+        await refresh_columns(session, product_model)
+        await self.cache.publish_invalidation(product_model.id, product_model.version)
+        await data_product_cache.invalidate_facts(product_ids=[product_model.id])
+        await data_version_service.bump_products([product_model.id])
         
         logger.info(
             f"Product created: {product_model.id}",
@@ -213,7 +231,7 @@ class ProductService:
             更新后的产品，如果不存在则返回None
         """
         result = await session.execute(
-            select(ProductModel).where(ProductModel.id == product_id)
+            select(ProductModel).where(ProductModel.id == product_id).options(*SCALAR_ONLY)
         )
         product_model = result.scalar_one_or_none()
         
@@ -230,7 +248,10 @@ class ProductService:
                 setattr(product_model, field, value)
         
         await session.commit()
-        await session.refresh(product_model)
+        await refresh_columns(session, product_model)
+        await self.cache.publish_invalidation(product_id, product_model.version)
+        await data_product_cache.invalidate_facts(product_ids=[product_id])
+        await data_version_service.bump_products([product_id])
         
         logger.info(
             f"Product updated: {product_id}",
@@ -287,7 +308,7 @@ class ProductService:
         access_mode: AccessMode
     ) -> Product:
         """
-        应用Mode裁剪
+        应用Mode裁剪(返回拷贝, 入参可能是缓存实例)
         
         规则:
         - Demo/Public: payoutRules 可能被裁剪或设为None
@@ -296,7 +317,7 @@ class ProductService:
         """
         if access_mode == AccessMode.DEMO_PUBLIC:
             # Demo/Public: 不返回 payoutRules
-            product.payout_rules = None
+            product = product.model_copy(update={"payout_rules": None})
             logger.debug(
                 f"PayoutRules pruned for Demo/Public mode",
                 extra={
@@ -0,0 +1,106 @@
+"""
+Redis Clients (缓存 / 租约 / 版本号共用的 Redis 连接)
+
+职责:
+- 各用途的连接 URL 显式配置(默认值写死, 不从 REDIS_URL 推导 db 号)
+- 请求/写路径统一使用 redis.asyncio 客户端, 不阻塞事件循环
+- 失败退避: 连接失败/超时后 FAILURE_BACKOFF_SECONDS 内直接跳过 Redis,
+  故障期间不在每个请求上重复等待连接超时
+
+说明:
+- 异步连接绑定创建它的事件循环; Celery 任务每次 asyncio.run 都是新循环,
+  因此客户端随当前事件循环重建(旧循环已关闭, 其连接随之废弃)
+- pub/sub 监听线程(start_listener)仍使用同步客户端, 在独立线程内阻塞, 不影响事件循环
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_LOCK_URL = os.getenv("REDIS_LOCK_URL", "redis://localhost:6379/2")
+REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL", "redis://localhost:6379/3")
+
+SOCKET_TIMEOUT_SECONDS = float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "1"))
+FAILURE_BACKOFF_SECONDS = float(os.getenv("REDIS_FAILURE_BACKOFF_SECONDS", "5"))
+
+# 触发退避的错误(命令级错误如 ResponseError 不代表 Redis 不可用)
+_OUTAGE_ERRORS = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)
+
+
+class RedisUnavailable(redis.exceptions.ConnectionError):
+    """退避期内跳过 Redis(调用方按 RedisError 统一处理)"""
+
+
+def async_client_factory(url: str) -> Callable[[], aioredis.Redis]:
+    return lambda: aioredis.Redis.from_url(
+        url,
+        decode_responses=True,
+        socket_connect_timeout=SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=SOCKET_TIMEOUT_SECONDS,
+    )
+
+
+def sync_client_factory(url: str) -> Callable[[], redis.Redis]:
+    """同步客户端(仅用于 pub/sub 监听线程)"""
+    return lambda: redis.Redis.from_url(
+        url,
+        decode_responses=True,
+        socket_connect_timeout=SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=SOCKET_TIMEOUT_SECONDS,
+    )
+
+
+class AsyncRedisHandle:
+    """按事件循环惰性创建的异步客户端 + 失败退避"""
+
+    def __init__(
+        self,
+        factory: Callable[[], aioredis.Redis],
+        *,
+        backoff_seconds: float = FAILURE_BACKOFF_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._factory = factory
+        self.backoff_seconds = backoff_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[aioredis.Redis] = None
+        self._unavailable_until = 0.0
+
+    def client(self) -> aioredis.Redis:
+        """
+        当前事件循环的客户端
+
+        Raises:
+            RedisUnavailable: 退避期内
+        """
+        if self._clock() < self._unavailable_until:
+            raise RedisUnavailable("redis unavailable (backing off)")
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._loop is not loop:
+                self._loop, self._client = loop, self._factory()
+            return self._client
+
+    def record_failure(self, exc: Exception) -> bool:
+        """
+        记录失败(连接失败/超时进入退避)
+
+        Returns:
+            是否需要告警(退避期内被跳过的调用不重复告警)
+        """
+        if isinstance(exc, RedisUnavailable):
+            return False
+        if isinstance(exc, _OUTAGE_ERRORS):
+            self._unavailable_until = self._clock() + self.backoff_seconds
+        return True
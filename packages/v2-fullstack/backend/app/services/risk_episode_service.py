@@ -0,0 +1,205 @@
+"""
+Risk Episode Service (风险事件段)
+
+职责:
+- 写路径: 风险事件落库后, 以已落库 risk_events 为准重建受影响时间段内的事件段
+  (合并逻辑在 RiskCalculator.compact_episodes, 本服务只负责读写)
+- 读路径: 按窗口重叠查询事件段, 供 L2/L1 替代逐窗口的 risk_events
+
+硬规则:
+- 事件段是 risk_events 的派生数据; 重建总以事实为准, 可重复执行
+- 同一序列(产品/区域/天气)的重建以事务级 advisory lock 串行化, 避免相邻时间段并发重建互相覆盖
+- predicted 规则与 risk_events 一致(见 RiskService.validate_run_binding)
+"""
+
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.risk_episode import RiskEventEpisode as EpisodeModel
+from app.models.risk_event import RiskEvent as RiskEventModel
+from app.schemas.product import RiskRules
+from app.schemas.risk_event import RiskEpisodeResponse
+from app.schemas.shared import DataType, WeatherType
+from app.services.compute.risk_calculator import RiskEpisode, risk_calculator
+from app.services.risk_service import EVENT_COLUMNS, risk_service
+
+logger = logging.getLogger(__name__)
+
+
+def build_episode_id(episode: RiskEpisode) -> str:
+    """可复现的事件段ID(序列 + start_at)"""
+    raw = "|".join(
+        [
+            episode.product_id,
+            episode.product_version,
+            episode.region_code,
+            episode.weather_type.value,
+            episode.data_type.value,
+            episode.prediction_run_id or "null",
+            episode.start_at.astimezone(timezone.utc).isoformat(),
+        ]
+    )
+    return f"rep_{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]}"
+
+
+class RiskEpisodeService:
+    """风险事件段服务"""
+
+    async def rebuild_historical(
+        self,
+        session: AsyncSession,
+        *,
+        product_id: str,
+        region_code: str,
+        risk_rules: RiskRules,
+        region_timezone: str,
+        time_range_start: datetime,
+        time_range_end: datetime,
+    ) -> int:
+        """
+        重建与 [time_range_start, time_range_end] 重叠或相邻的 historical 事件段(不提交)
+
+        已有事件段与窗口相交时整体纳入重建范围, 保证跨任务窗口的连续触发合并为同一段。
+
+        Returns:
+            重建后的事件段数
+        """
+        weather_type = risk_rules.weather_type.value
+        gap = risk_calculator.adjacency_gap(risk_rules.time_window)
+        start = self._ensure_utc(time_range_start) - gap
+        end = self._ensure_utc(time_range_end) + gap
+
+        await session.execute(
+            select(
+                func.pg_advisory_xact_lock(
+                    func.hashtext(f"risk_episodes:{product_id}:{region_code}:{weather_type}")
+                )
+            )
+        )
+
+        series = (
+            EpisodeModel.product_id == product_id,
+            EpisodeModel.region_code == region_code,
+            EpisodeModel.weather_type == weather_type,
+            EpisodeModel.data_type == DataType.HISTORICAL.value,
+        )
+        bounds = await session.execute(
+            select(func.min(EpisodeModel.start_at), func.max(EpisodeModel.end_at)).where(
+                *series, EpisodeModel.start_at <= end, EpisodeModel.end_at >= start
+            )
+        )
+        existing_start, existing_end = bounds.one()
+        span_start = min(start, existing_start) if existing_start else start
+        span_end = max(end, existing_end) if existing_end else end
+
+        # 带分区键(data_type + timestamp 范围), 只扫描命中的月分区
+        result = await session.execute(
+            select(*EVENT_COLUMNS).where(
+                RiskEventModel.product_id == product_id,
+                RiskEventModel.region_code == region_code,
+                RiskEventModel.weather_type == weather_type,
+                RiskEventModel.data_type == DataType.HISTORICAL.value,
+                RiskEventModel.prediction_run_id.is_(None),
+                RiskEventModel.timestamp >= span_start,
+                RiskEventModel.timestamp <= span_end,
+            )
+        )
+        events = [risk_service._row_to_response(row) for row in result.all()]
+        episodes = risk_calculator.compact_episodes(events, risk_rules, region_timezone)
+
+        await session.execute(
+            delete(EpisodeModel).where(
+                *series, EpisodeModel.start_at <= span_end, EpisodeModel.end_at >= span_start
+            )
+        )
+        if episodes:
+            await session.execute(
+                insert(EpisodeModel).values([self._episode_row(e) for e in episodes])
+            )
+
+        logger.info(
+            "Risk episodes rebuilt",
+            extra={
+                "product_id": product_id,
+                "region_code": region_code,
+                "span_start": span_start.isoformat(),
+                "span_end": span_end.isoformat(),
+                "window_count": len(events),
+                "episode_count": len(episodes),
+            },
+        )
+        return len(episodes)
+
+    async def query_episodes(
+        self,
+        session: AsyncSession,
+        *,
+        region_code: str,
+        weather_type: WeatherType,
+        data_type: DataType,
+        time_range_start: datetime,
+        time_range_end: datetime,
+        prediction_run_id: Optional[str] = None,
+        product_id: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[RiskEpisodeResponse]:
+        """
+        查询与 time_range 重叠的事件段(按 start_at 升序)
+
+        事件段整体返回, start_at/end_at 可能超出 time_range。
+        """
+        risk_service.validate_run_binding(data_type, prediction_run_id)
+        query = select(EpisodeModel).where(
+            EpisodeModel.region_code == region_code,
+            EpisodeModel.weather_type == weather_type.value,
+            EpisodeModel.data_type == data_type.value,
+            EpisodeModel.start_at <= self._ensure_utc(time_range_end),
+            EpisodeModel.end_at >= self._ensure_utc(time_range_start),
+        )
+        if data_type == DataType.PREDICTED:
+            query = query.where(EpisodeModel.prediction_run_id == prediction_run_id)
+        if product_id:
+            query = query.where(EpisodeModel.product_id == product_id)
+
+        query = query.order_by(EpisodeModel.start_at, EpisodeModel.id)
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = await session.execute(query)
+        return [RiskEpisodeResponse.model_validate(m) for m in result.scalars().all()]
+
+    def _episode_row(self, episode: RiskEpisode) -> dict:
+        return {
+            "id": build_episode_id(episode),
+            "region_code": episode.region_code,
+            "product_id": episode.product_id,
+            "product_version": episode.product_version,
+            "weather_type": episode.weather_type.value,
+            "data_type": episode.data_type.value,
+            "prediction_run_id": episode.prediction_run_id,
+            "start_at": episode.start_at,
+            "end_at": episode.end_at,
+            "peak_at": episode.peak_at,
+            "peak_tier": episode.peak_tier,
+            "peak_value": episode.peak_value,
+            "threshold_value": episode.threshold_value,
+            "window_count": episode.window_count,
+            "created_at": datetime.now(timezone.utc),
+        }
+
+    def _ensure_utc(self, dt: datetime) -> datetime:
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
+
+
+risk_episode_service = RiskEpisodeService()
@@ -5,6 +5,8 @@ This service is the backend "single source of truth" for persisted risk events.
 It provides query primitives that are:
 - prediction_run aware (no batch mixing)
 - time_range clipped (caller supplies display window)
+- keyset paginated on (timestamp, id) or streamed for exports
+- aggregated in Postgres (GROUP BY local time bucket / region) for timelines & KPIs
 
 Note: CPU-bound risk calculations are handled by Risk Calculator + tasks (Step 08/15).
 """
@@ -13,17 +15,68 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, String, any_, bindparam, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 from app.models.risk_event import RiskEvent as RiskEventModel
-from app.schemas.risk_event import RiskEventCreate, RiskEventResponse
+from app.schemas.risk_event import (
+    RiskEventBatch,
+    RiskEventBucket,
+    RiskEventCreate,
+    RiskEventPage,
+    RiskEventRegionAggregate,
+    RiskEventResponse,
+)
 from app.schemas.shared import DataType, WeatherType
+from app.schemas.time import TimeGranularity
+from app.services.data_product_cache import data_product_cache
+from app.services.data_versions import data_version_service
+from app.services.loader_profiles import SCALAR_ONLY, refresh_columns
+from app.services.stats_summary import RiskEventFact, stats_summary_service
+from app.utils.batch_lookup import normalize_batch_ids, order_by_request
+from app.utils.pagination import decode_keyset_cursor, encode_keyset_cursor
+from app.utils.sql_buckets import local_bucket
+from app.utils.time_utils import get_timezone_for_region
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+
+# 批量写入每条 INSERT 的行数: 12 列 x 2000 行 = 24000 参数, 低于 asyncpg 上限 32767
+INSERT_CHUNK_SIZE = 2000
+
+# 读路径只取标量列, 跳过 ORM 实体构造与 identity map
+EVENT_COLUMNS = (
+    RiskEventModel.id,
+    RiskEventModel.timestamp,
+    RiskEventModel.region_code,
+    RiskEventModel.product_id,
+    RiskEventModel.product_version,
+    RiskEventModel.weather_type,
+    RiskEventModel.tier_level,
+    RiskEventModel.trigger_value,
+    RiskEventModel.threshold_value,
+    RiskEventModel.data_type,
+    RiskEventModel.prediction_run_id,
+    RiskEventModel.created_at,
+)
+
+# 聚合指标列(顺序与 _aggregate_fields 对应)
+AGGREGATE_COLUMNS = (
+    func.count().label("event_count"),
+    func.count().filter(RiskEventModel.tier_level == 1).label("tier1_count"),
+    func.count().filter(RiskEventModel.tier_level == 2).label("tier2_count"),
+    func.count().filter(RiskEventModel.tier_level == 3).label("tier3_count"),
+    func.max(RiskEventModel.tier_level).label("max_tier_level"),
+    func.max(RiskEventModel.trigger_value).label("max_trigger_value"),
+)
+
 
 class RiskService:
     """风险事件服务（查询为主，计算另见 Step 08/15）。"""
@@ -35,7 +88,9 @@ class RiskService:
     ) -> Optional[RiskEventResponse]:
         """按ID获取风险事件"""
         result = await session.execute(
-            select(RiskEventModel).where(RiskEventModel.id == event_id)
+            select(RiskEventModel)
+            .where(RiskEventModel.id == event_id)
+            .options(*SCALAR_ONLY)
         )
         model = result.scalar_one_or_none()
         if not model:
@@ -55,6 +110,26 @@ class RiskService:
             created_at=model.created_at,
         )
 
+    async def get_by_ids(
+        self,
+        session: AsyncSession,
+        event_ids: Sequence[str],
+    ) -> RiskEventBatch:
+        """
+        批量获取风险事件（单条 = ANY 查询, 按请求顺序返回）。
+
+        id 为主键前导列, 各分区按主键索引探测, 无需时间范围。
+        """
+        ids = normalize_batch_ids(event_ids)
+        result = await session.execute(
+            select(*EVENT_COLUMNS).where(
+                RiskEventModel.id == any_(bindparam("ids", ids, type_=ARRAY(String)))
+            )
+        )
+        found = {row.id: self._row_to_response(row) for row in result.all()}
+        items, missing = order_by_request(ids, found)
+        return RiskEventBatch(items=items, missing=missing)
+
     async def query_events(
         self,
         session: AsyncSession,
@@ -66,6 +141,8 @@ class RiskService:
         time_range_end: datetime,
         prediction_run_id: Optional[str] = None,
         product_id: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
     ) -> List[RiskEventResponse]:
         """
         查询风险事件（严格按 time_range 裁剪）。
@@ -73,31 +150,25 @@ class RiskService:
         predicted 规则：
         - predicted 必须带 prediction_run_id
         - historical 必须不带 prediction_run_id
-        """
-        start = self._ensure_utc(time_range_start)
-        end = self._ensure_utc(time_range_end)
-
-        if data_type == DataType.PREDICTED and not prediction_run_id:
-            raise ValueError("prediction_run_id required for predicted")
-        if data_type == DataType.HISTORICAL and prediction_run_id is not None:
-            raise ValueError("prediction_run_id must be null for historical")
 
-        query = select(RiskEventModel).where(
-            RiskEventModel.region_code == region_code,
-            RiskEventModel.weather_type == weather_type.value,
-            RiskEventModel.data_type == data_type.value,
-            RiskEventModel.timestamp >= start,
-            RiskEventModel.timestamp <= end,
+        offset/limit 在数据库侧生效; 大范围翻页请用 query_events_page。
+        """
+        query = self._build_events_query(
+            region_code=region_code,
+            weather_type=weather_type,
+            data_type=data_type,
+            time_range_start=time_range_start,
+            time_range_end=time_range_end,
+            prediction_run_id=prediction_run_id,
+            product_id=product_id,
         )
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
 
-        if data_type == DataType.PREDICTED:
-            query = query.where(RiskEventModel.prediction_run_id == prediction_run_id)
-
-        if product_id:
-            query = query.where(RiskEventModel.product_id == product_id)
-
-        result = await session.execute(query.order_by(RiskEventModel.timestamp))
-        models = list(result.scalars().all())
+        result = await session.execute(query)
+        events = [self._row_to_response(row) for row in result.all()]
 
         logger.info(
             "Risk events queried",
@@ -106,27 +177,296 @@ class RiskService:
                 "weather_type": weather_type.value,
                 "data_type": data_type.value,
                 "prediction_run_id": prediction_run_id,
-                "count": len(models),
+                "count": len(events),
             },
         )
 
+        return events
+
+    async def query_events_page(
+        self,
+        session: AsyncSession,
+        *,
+        region_code: str,
+        weather_type: WeatherType,
+        data_type: DataType,
+        time_range_start: datetime,
+        time_range_end: datetime,
+        prediction_run_id: Optional[str] = None,
+        product_id: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> RiskEventPage:
+        """
+        Keyset 分页查询（按 (timestamp, id) 升序）。
+
+        - cursor 为上一页返回的 next_cursor（不透明）
+        - 每页只读取 page_size + 1 行, 与总行数/页码无关
+        """
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+
+        query = self._build_events_query(
+            region_code=region_code,
+            weather_type=weather_type,
+            data_type=data_type,
+            time_range_start=time_range_start,
+            time_range_end=time_range_end,
+            prediction_run_id=prediction_run_id,
+            product_id=product_id,
+        )
+        if cursor:
+            after_time, after_id = decode_keyset_cursor(cursor)
+            query = query.where(
+                tuple_(RiskEventModel.timestamp, RiskEventModel.id)
+                > tuple_(literal(after_time), literal(after_id))
+            )
+
+        result = await session.execute(query.limit(page_size + 1))
+        rows = result.all()
+
+        items = [self._row_to_response(row) for row in rows[:page_size]]
+        next_cursor = None
+        if len(rows) > page_size:
+            last = items[-1]
+            next_cursor = encode_keyset_cursor(last.timestamp, last.id)
+        return RiskEventPage(items=items, next_cursor=next_cursor)
+
+    async def stream_events(
+        self,
+        session: AsyncSession,
+        *,
+        region_code: str,
+        weather_type: WeatherType,
+        data_type: DataType,
+        time_range_start: datetime,
+        time_range_end: datetime,
+        prediction_run_id: Optional[str] = None,
+        product_id: Optional[str] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[RiskEventResponse]:
+        """
+        流式读取风险事件（导出用, 服务端游标分批拉取, 内存占用与总行数无关）。
+
+        注意: 调用方需保证迭代期间 session 存活。
+        """
+        query = self._build_events_query(
+            region_code=region_code,
+            weather_type=weather_type,
+            data_type=data_type,
+            time_range_start=time_range_start,
+            time_range_end=time_range_end,
+            prediction_run_id=prediction_run_id,
+            product_id=product_id,
+        )
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield self._row_to_response(row)
+
+    async def aggregate_by_bucket(
+        self,
+        session: AsyncSession,
+        *,
+        region_code: str,
+        weather_type: WeatherType,
+        data_type: DataType,
+        time_range_start: datetime,
+        time_range_end: datetime,
+        granularity: TimeGranularity = TimeGranularity.DAY,
+        region_timezone: Optional[str] = None,
+        prediction_run_id: Optional[str] = None,
+        product_id: Optional[str] = None,
+    ) -> List[RiskEventBucket]:
+        """
+        按时间桶聚合风险事件（一次 GROUP BY 查询）。
+
+        - 桶边界按 region_timezone 自然边界(默认取 region_code 对应时区)
+        - 窗口仍按 time_range(UTC) 裁剪, 首尾桶可能不完整
+        - 只返回有事件的桶, 按 bucket_start 升序
+        """
+        tz_name = region_timezone or get_timezone_for_region(region_code)
+        bucket = local_bucket(RiskEventModel.timestamp, granularity, tz_name).label(
+            "bucket_start"
+        )
+        query = select(bucket, *AGGREGATE_COLUMNS).where(
+            RiskEventModel.region_code == region_code,
+            *self._event_filters(
+                weather_type=weather_type,
+                data_type=data_type,
+                time_range_start=time_range_start,
+                time_range_end=time_range_end,
+                prediction_run_id=prediction_run_id,
+                product_id=product_id,
+            ),
+        )
+
+        result = await session.execute(query.group_by(bucket).order_by(bucket))
         return [
-            RiskEventResponse(
-                id=m.id,
-                timestamp=m.timestamp,
-                region_code=m.region_code,
-                product_id=m.product_id,
-                product_version=m.product_version,
-                weather_type=WeatherType(m.weather_type),
-                tier_level=m.tier_level,
-                trigger_value=m.trigger_value,
-                threshold_value=m.threshold_value,
-                data_type=DataType(m.data_type),
-                prediction_run_id=m.prediction_run_id,
-                created_at=m.created_at,
+            RiskEventBucket(bucket_start=row.bucket_start, **self._aggregate_fields(row))
+            for row in result.all()
+        ]
+
+    async def aggregate_by_region(
+        self,
+        session: AsyncSession,
+        *,
+        region_codes: Sequence[str],
+        weather_type: WeatherType,
+        data_type: DataType,
+        time_range_start: datetime,
+        time_range_end: datetime,
+        prediction_run_id: Optional[str] = None,
+        product_id: Optional[str] = None,
+    ) -> List[RiskEventRegionAggregate]:
+        """
+        按区域聚合风险事件（一次 GROUP BY 查询, region_code = ANY(:region_codes)）。
+
+        返回所有请求区域(按请求顺序), 无事件的区域计数为 0。
+        """
+        region_codes = list(dict.fromkeys(region_codes))
+        if not region_codes:
+            raise ValueError("region_codes must not be empty")
+
+        query = select(RiskEventModel.region_code, *AGGREGATE_COLUMNS).where(
+            RiskEventModel.region_code == any_(
+                bindparam("region_codes", region_codes, type_=ARRAY(String))
+            ),
+            *self._event_filters(
+                weather_type=weather_type,
+                data_type=data_type,
+                time_range_start=time_range_start,
+                time_range_end=time_range_end,
+                prediction_run_id=prediction_run_id,
+                product_id=product_id,
+            ),
+        )
+
+        result = await session.execute(query.group_by(RiskEventModel.region_code))
+        by_region = {row.region_code: self._aggregate_fields(row) for row in result.all()}
+        return [
+            RiskEventRegionAggregate(
+                region_code=code,
+                **by_region.get(code, {"event_count": 0}),
             )
-            for m in models
+            for code in region_codes
+        ]
+
+    def validate_run_binding(
+        self,
+        data_type: DataType,
+        prediction_run_id: Optional[str],
+    ) -> None:
+        """predicted 必须带 prediction_run_id, historical 必须不带"""
+        if data_type == DataType.PREDICTED and not prediction_run_id:
+            raise ValueError("prediction_run_id required for predicted")
+        if data_type == DataType.HISTORICAL and prediction_run_id is not None:
+            raise ValueError("prediction_run_id must be null for historical")
+
+    def _build_events_query(
+        self,
+        *,
+        region_code: str,
+        weather_type: WeatherType,
+        data_type: DataType,
+        time_range_start: datetime,
+        time_range_end: datetime,
+        prediction_run_id: Optional[str],
+        product_id: Optional[str],
+    ) -> Select:
+        """列查询(不经 ORM 实体/identity map), 按 (timestamp, id) 排序"""
+        query = select(*EVENT_COLUMNS).where(
+            RiskEventModel.region_code == region_code,
+            *self._event_filters(
+                weather_type=weather_type,
+                data_type=data_type,
+                time_range_start=time_range_start,
+                time_range_end=time_range_end,
+                prediction_run_id=prediction_run_id,
+                product_id=product_id,
+            ),
+        )
+        return query.order_by(RiskEventModel.timestamp, RiskEventModel.id)
+
+    def _event_filters(
+        self,
+        *,
+        weather_type: WeatherType,
+        data_type: DataType,
+        time_range_start: datetime,
+        time_range_end: datetime,
+        prediction_run_id: Optional[str],
+        product_id: Optional[str],
+    ) -> List[ColumnElement]:
+        """区域以外的公共过滤条件(含分区键 data_type + timestamp 范围)"""
+        self.validate_run_binding(data_type, prediction_run_id)
+        filters: List[ColumnElement] = [
+            RiskEventModel.weather_type == weather_type.value,
+            RiskEventModel.data_type == data_type.value,
+            RiskEventModel.timestamp >= self._ensure_utc(time_range_start),
+            RiskEventModel.timestamp <= self._ensure_utc(time_range_end),
         ]
+        if data_type == DataType.PREDICTED:
+            filters.append(RiskEventModel.prediction_run_id == prediction_run_id)
+        if product_id:
+            filters.append(RiskEventModel.product_id == product_id)
+        return filters
+
+    def _aggregate_fields(self, row: Row) -> dict:
+        return {
+            "event_count": int(row.event_count),
+            "tier1_count": int(row.tier1_count),
+            "tier2_count": int(row.tier2_count),
+            "tier3_count": int(row.tier3_count),
+            "max_tier_level": row.max_tier_level,
+            "max_trigger_value": row.max_trigger_value,
+        }
+
+    async def _apply_summary(self, session: AsyncSession, events: Sequence) -> None:
+        """historical 事件计入 KPI 立方体(与事实写入同一事务)"""
+        await stats_summary_service.apply_risk_event_changes(
+            session,
+            added=[
+                RiskEventFact.of(event)
+                for event in events
+                if event.data_type == DataType.HISTORICAL
+            ],
+        )
+
+    async def _invalidate_data_products(self, payloads: Sequence[RiskEventCreate]) -> None:
+        """风险事件已提交: 失效相关区域/产品/预测批次的数据产品缓存, 递增数据版本"""
+        await data_product_cache.invalidate_facts(
+            region_codes={item.region_code for item in payloads},
+            product_ids={item.product_id for item in payloads},
+            prediction_run_ids={
+                item.prediction_run_id for item in payloads if item.prediction_run_id
+            },
+        )
+        groups: Dict[Tuple[DataType, Optional[str]], List[RiskEventCreate]] = {}
+        for item in payloads:
+            groups.setdefault((item.data_type, item.prediction_run_id), []).append(item)
+        for (data_type, prediction_run_id), items in groups.items():
+            await data_version_service.bump_facts(
+                region_codes={item.region_code for item in items},
+                product_ids={item.product_id for item in items},
+                data_type=data_type,
+                prediction_run_id=prediction_run_id,
+            )
+
+    def _row_to_response(self, row: Row) -> RiskEventResponse:
+        return RiskEventResponse(
+            id=row.id,
+            timestamp=row.timestamp,
+            region_code=row.region_code,
+            product_id=row.product_id,
+            product_version=row.product_version,
+            weather_type=WeatherType(row.weather_type),
+            tier_level=row.tier_level,
+            trigger_value=row.trigger_value,
+            threshold_value=row.threshold_value,
+            data_type=DataType(row.data_type),
+            prediction_run_id=row.prediction_run_id,
+            created_at=row.created_at,
+        )
     
     async def create(
         self,
@@ -148,8 +488,10 @@ class RiskService:
             prediction_run_id=payload.prediction_run_id,
         )
         session.add(model)
+        await self._apply_summary(session, [payload])
         await session.commit()
-        await session.refresh(model)
+        await self._invalidate_data_products([payload])
+        await refresh_columns(session, model)
         return RiskEventResponse(
             id=model.id,
             timestamp=model.timestamp,
@@ -170,44 +512,53 @@ class RiskService:
         session: AsyncSession,
         payloads: List[RiskEventCreate],
     ) -> List[RiskEventResponse]:
-        """批量创建风险事件（内部写入）"""
-        models = [
-            RiskEventModel(
-                id=item.id,
-                timestamp=item.timestamp,
-                region_code=item.region_code,
-                product_id=item.product_id,
-                product_version=item.product_version,
-                weather_type=item.weather_type.value,
-                tier_level=item.tier_level,
-                trigger_value=item.trigger_value,
-                threshold_value=item.threshold_value,
-                data_type=item.data_type.value,
-                prediction_run_id=item.prediction_run_id,
-            )
+        """
+        批量创建风险事件（内部写入）。
+
+        - 按 INSERT_CHUNK_SIZE 分块 INSERT ... RETURNING, 往返次数 = ceil(N / chunk)
+        - 直接由 RETURNING 行构造响应, 不经 ORM 实体/refresh
+        - 全部分块在同一事务内, 最后一次性提交
+        """
+        if not payloads:
+            return []
+
+        created_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": item.id,
+                "timestamp": item.timestamp,
+                "region_code": item.region_code,
+                "product_id": item.product_id,
+                "product_version": item.product_version,
+                "weather_type": item.weather_type.value,
+                "tier_level": item.tier_level,
+                "trigger_value": item.trigger_value,
+                "threshold_value": item.threshold_value,
+                "data_type": item.data_type.value,
+                "prediction_run_id": item.prediction_run_id,
+                "created_at": created_at,
+            }
             for item in payloads
         ]
-        session.add_all(models)
-        await session.commit()
-        for model in models:
-            await session.refresh(model)
-        return [
-            RiskEventResponse(
-                id=m.id,
-                timestamp=m.timestamp,
-                region_code=m.region_code,
-                product_id=m.product_id,
-                product_version=m.product_version,
-                weather_type=WeatherType(m.weather_type),
-                tier_level=m.tier_level,
-                trigger_value=m.trigger_value,
-                threshold_value=m.threshold_value,
-                data_type=DataType(m.data_type),
-                prediction_run_id=m.prediction_run_id,
-                created_at=m.created_at,
+
+        events: List[RiskEventResponse] = []
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            stmt = (
+                insert(RiskEventModel)
+                .values(rows[start:start + INSERT_CHUNK_SIZE])
+                .returning(*EVENT_COLUMNS)
             )
-            for m in models
-        ]
+            result = await session.execute(stmt)
+            events.extend(self._row_to_response(row) for row in result.all())
+        await self._apply_summary(session, events)
+        await session.commit()
+        await self._invalidate_data_products(payloads)
+
+        logger.info(
+            "Risk events batch created",
+            extra={"count": len(events), "chunks": -(-len(rows) // INSERT_CHUNK_SIZE)},
+        )
+        return events
 
     def _ensure_utc(self, dt: datetime) -> datetime:
         if dt.tzinfo is None:
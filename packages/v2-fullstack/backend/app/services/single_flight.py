@@ -0,0 +1,195 @@
+"""
+Single Flight (并发构建合并)
+
+职责:
+- 同一 key 的并发构建只执行一次, 其余请求等待同一结果
+  - 进程内: asyncio Future(同一事件循环内的并发请求)
+  - 跨进程: Redis 短租约; 未拿到租约的进程轮询结果缓存, 等待持有者写入
+- 计数: leader / 进程内合并 / 跨进程合并 / 等待超时, 供内部接口观测
+
+硬规则:
+- 租约只是合并手段, 不是互斥保证: 租约过期/Redis 不可用/等待超时都会退化为本进程自行构建
+- 租约与轮询走 redis.asyncio(asyncio Lock), 不阻塞事件循环; Redis 故障后短暂退避
+- leader 失败时异常传给等待者; leader 被取消时等待者自行重试, 不继承取消
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+import redis
+import redis.asyncio as aioredis
+from redis.asyncio.lock import Lock
+
+from app.services.redis_clients import REDIS_LOCK_URL, AsyncRedisHandle, async_client_factory
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LEASE_SECONDS = float(os.getenv("DATA_PRODUCT_FLIGHT_LEASE_SECONDS", "10"))
+POLL_INTERVAL_SECONDS = float(os.getenv("DATA_PRODUCT_FLIGHT_POLL_SECONDS", "0.1"))
+
+LEADER = "leader"
+COALESCED_LOCAL = "coalesced_local"
+COALESCED_REMOTE = "coalesced_remote"
+LEASE_WAIT_TIMEOUT = "lease_wait_timeout"
+
+
+class FlightStats:
+    """单飞计数(进程内累计)"""
+
+    def __init__(self) -> None:
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                name: self._counts[name]
+                for name in (LEADER, COALESCED_LOCAL, COALESCED_REMOTE, LEASE_WAIT_TIMEOUT)
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+class SingleFlight(Generic[T]):
+    """按 key 合并并发构建"""
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        lease_seconds: float = LEASE_SECONDS,
+        poll_interval_seconds: float = POLL_INTERVAL_SECONDS,
+        redis_factory: Optional[Callable[[], aioredis.Redis]] = None,
+    ):
+        self.namespace = namespace
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._redis = AsyncRedisHandle(redis_factory or async_client_factory(REDIS_LOCK_URL))
+        self._inflight: Dict[str, "asyncio.Future[T]"] = {}
+        self.stats = FlightStats()
+
+    def in_flight(self, key: str) -> bool:
+        """本进程是否已有该 key 的构建在进行"""
+        return key in self._inflight
+
+    async def run(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        *,
+        lookup: Callable[[], Awaitable[Optional[T]]],
+    ) -> Tuple[T, bool]:
+        """
+        执行或加入 key 的构建
+
+        Args:
+            compute: 实际构建(负责写结果缓存)
+            lookup: 读结果缓存, 用于等待其他进程的构建结果
+
+        Returns:
+            (结果, 是否来自其他请求的构建)
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # 本请求自身被取消
+                return await self.run(key, compute, lookup=lookup)
+            self.stats.record(COALESCED_LOCAL)
+            return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result, shared = await self._lead(key, compute, lookup)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # 没有等待者时避免 "exception was never retrieved"
+            raise
+        else:
+            future.set_result(result)
+            return result, shared
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _lead(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        lookup: Callable[[], Awaitable[Optional[T]]],
+    ) -> Tuple[T, bool]:
+        lease_key = f"{self.namespace}:{key}"
+        acquired, lease = await self._try_lease(lease_key)
+        if not acquired:
+            result = await self._wait_remote(lease_key, lookup)
+            if result is not None:
+                self.stats.record(COALESCED_REMOTE)
+                return result, True
+            self.stats.record(LEASE_WAIT_TIMEOUT)
+            logger.info("Single flight wait gave up, building locally", extra={"key": key})
+
+        self.stats.record(LEADER)
+        try:
+            return await compute(), False
+        finally:
+            if lease is not None:
+                try:
+                    await lease.release()
+                except redis.exceptions.RedisError:
+                    pass  # 租约已过期/Redis 不可用, 由 TTL 回收
+
+    async def _try_lease(self, lease_key: str) -> Tuple[bool, Optional[Lock]]:
+        """(是否可构建, 租约); Redis 不可用时直接构建且无租约"""
+        try:
+            lease = self._redis.client().lock(lease_key, timeout=self.lease_seconds)
+            if await lease.acquire(blocking=False):
+                return True, lease
+            return False, None
+        except redis.exceptions.RedisError as exc:
+            if self._redis.record_failure(exc):
+                logger.warning(
+                    "Single flight lease unavailable",
+                    extra={"lease_key": lease_key, "error": str(exc)},
+                )
+            return True, None
+
+    async def _wait_remote(
+        self,
+        lease_key: str,
+        lookup: Callable[[], Awaitable[Optional[T]]],
+    ) -> Optional[T]:
+        """等待租约持有者写入结果; 租约释放/过期仍无结果时返回 None"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lease_seconds
+        while loop.time() < deadline:
+            await asyncio.sleep(self.poll_interval_seconds)
+            result = await lookup()
+            if result is not None:
+                return result
+            try:
+                if not await self._redis.client().exists(lease_key):
+                    return await lookup()
+            except redis.exceptions.RedisError as exc:
+                self._redis.record_failure(exc)
+                return None
+        return None
+
+
+data_product_flight: SingleFlight = SingleFlight("dp-flight:v1")
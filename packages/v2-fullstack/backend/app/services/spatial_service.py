@@ -0,0 +1,149 @@
+"""
+Spatial Aggregation Service (H3 空间聚合)
+
+职责:
+- weather_data 按 H3 父单元聚合(h3_cell_parents)
+- weather_data 按省/区县聚合(h3_cell_regions)
+- 时间桶按 region_timezone 自然边界(与 WeatherService.query_stats_series 口径一致)
+
+聚合在数据库内完成(JOIN + GROUP BY), 不拉取逐单元序列到 Python。
+
+Reference:
+- docs/v2/v2实施细则/07-天气数据表与Weather-Service-细则.md
+"""
+
+import logging
+from typing import List
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.h3_cell import H3CellParent, H3CellRegion
+from app.models.weather import WeatherData as WeatherModel
+from app.schemas.shared import DataType, RegionScope
+from app.schemas.spatial import SpatialAggregationRequest, SpatialStatsBucket
+from app.utils.sql_buckets import local_bucket
+
+logger = logging.getLogger(__name__)
+
+# H3 合法分辨率范围
+H3_MIN_RESOLUTION = 0
+H3_MAX_RESOLUTION = 15
+
+
+class SpatialAggregationService:
+    """H3 空间聚合服务"""
+
+    async def aggregate_by_parent_cell(
+        self,
+        session: AsyncSession,
+        request: SpatialAggregationRequest,
+        *,
+        parent_resolution: int,
+    ) -> List[SpatialStatsBucket]:
+        """按父单元(parent_resolution)聚合"""
+        if not H3_MIN_RESOLUTION <= parent_resolution <= H3_MAX_RESOLUTION:
+            raise ValueError(f"invalid parent_resolution: {parent_resolution}")
+
+        query = self._build_query(request, H3CellParent.parent_index).join(
+            H3CellParent,
+            and_(
+                H3CellParent.h3_index == WeatherModel.h3_index,
+                H3CellParent.parent_resolution == parent_resolution,
+            ),
+        )
+        if request.province_code:
+            query = query.join(
+                H3CellRegion, H3CellRegion.h3_index == WeatherModel.h3_index
+            ).where(H3CellRegion.province_code == request.province_code)
+
+        return await self._execute(session, query)
+
+    async def aggregate_by_region(
+        self,
+        session: AsyncSession,
+        request: SpatialAggregationRequest,
+        *,
+        region_scope: RegionScope,
+    ) -> List[SpatialStatsBucket]:
+        """按省/区县区域代码聚合"""
+        if region_scope == RegionScope.PROVINCE:
+            group_column = H3CellRegion.province_code
+        else:
+            group_column = H3CellRegion.district_code
+
+        query = self._build_query(request, group_column).join(
+            H3CellRegion, H3CellRegion.h3_index == WeatherModel.h3_index
+        )
+        if region_scope == RegionScope.DISTRICT:
+            query = query.where(H3CellRegion.district_code.is_not(None))
+        if request.province_code:
+            query = query.where(H3CellRegion.province_code == request.province_code)
+
+        return await self._execute(session, query)
+
+    def _build_query(
+        self,
+        request: SpatialAggregationRequest,
+        group_column: ColumnElement,
+    ) -> Select:
+        if request.data_type == DataType.PREDICTED and not request.prediction_run_id:
+            raise ValueError("prediction_run_id required for predicted data")
+        if request.data_type == DataType.HISTORICAL and request.prediction_run_id is not None:
+            raise ValueError("prediction_run_id must be null for historical")
+
+        bucket = local_bucket(
+            WeatherModel.timestamp, request.granularity, request.region_timezone
+        ).label("bucket_start")
+        group_key = group_column.label("group_key")
+
+        query = (
+            select(
+                group_key,
+                bucket,
+                func.sum(WeatherModel.value),
+                func.avg(WeatherModel.value),
+                func.max(WeatherModel.value),
+                func.min(WeatherModel.value),
+                func.count(),
+            )
+            .select_from(WeatherModel)
+            .where(
+                WeatherModel.h3_index.is_not(None),
+                WeatherModel.weather_type == request.weather_type.value,
+                WeatherModel.data_type == request.data_type.value,
+                WeatherModel.timestamp >= request.start_time,
+                WeatherModel.timestamp <= request.end_time,
+            )
+            .group_by(group_column, bucket)
+            .order_by(group_column, bucket)
+        )
+        if request.data_type == DataType.PREDICTED:
+            query = query.where(WeatherModel.prediction_run_id == request.prediction_run_id)
+        return query
+
+    async def _execute(
+        self,
+        session: AsyncSession,
+        query: Select,
+    ) -> List[SpatialStatsBucket]:
+        result = await session.execute(query)
+        buckets = [
+            SpatialStatsBucket(
+                group_key=row[0],
+                bucket_start=row[1],
+                sum=row[2],
+                avg=row[3],
+                max=row[4],
+                min=row[5],
+                count=int(row[6]),
+            )
+            for row in result.all()
+        ]
+        logger.info("Spatial aggregation queried", extra={"bucket_count": len(buckets)})
+        return buckets
+
+
+spatial_service = SpatialAggregationService()
@@ -0,0 +1,434 @@
+"""
+Stats Summary Service (理赔/保单/风险事件 日汇总维护)
+
+职责:
+- 写路径增量: 调用方传入变更前/后的事实快照, 合并为按键的增量后一次 upsert
+  (与事实写入同一事务, 由调用方 commit)
+- 读路径: 汇总表 SUM, 替代事实表全表 COUNT/SUM(L0 立方体查询见 kpi_cube)
+- 对账: 锁汇总表后按事实表全量重建
+
+硬规则:
+- 汇总键口径与 app/models/stats_summary.py 一致, 增量与重建必须使用同一口径
+- 重建期间以 SHARE ROW EXCLUSIVE 锁住汇总表: 并发写路径的增量 upsert 排队到重建提交之后,
+  重建快照只包含已提交的事实, 不会重复/遗漏
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import Date, String, Text, case, cast, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+from app.models.claim import Claim as ClaimModel
+from app.models.policy import Policy as PolicyModel
+from app.models.risk_event import RiskEvent as RiskEventModel
+from app.models.stats_summary import (
+    ClaimDailySummary,
+    PolicyDailySummary,
+    RiskEventDailySummary,
+)
+from app.utils.time_utils import get_timezone_for_region, utc_to_region_tz
+
+logger = logging.getLogger(__name__)
+
+POLICY_ACTIVE = "active"
+POLICY_INACTIVE = "inactive"
+
+SummaryKey = Tuple[str, str, date, str]  # (region_code, product_id, local_date, status)
+# (region_code, product_id, local_date, end_local_date, status)
+PolicySummaryKey = Tuple[str, str, date, date, str]
+# (region_code, product_id, weather_type, local_date, tier_level)
+RiskSummaryKey = Tuple[str, str, str, date, int]
+
+# 汇总表主键列(与 *Fact.key 的元素顺序一致)
+CLAIM_KEY_COLUMNS = ("region_code", "product_id", "local_date", "status")
+POLICY_KEY_COLUMNS = ("region_code", "product_id", "local_date", "end_local_date", "status")
+
+
+@dataclass(frozen=True)
+class ClaimFact:
+    """参与汇总的理赔字段快照"""
+    region_code: str
+    product_id: str
+    triggered_at: datetime
+    status: str
+    payout_amount: Decimal
+
+    @classmethod
+    def of(cls, source) -> "ClaimFact":
+        return cls(
+            region_code=source.region_code,
+            product_id=source.product_id,
+            triggered_at=source.triggered_at,
+            status=source.status,
+            payout_amount=source.payout_amount,
+        )
+
+    @property
+    def key(self) -> SummaryKey:
+        tz_name = get_timezone_for_region(self.region_code)
+        local_date = utc_to_region_tz(self.triggered_at, tz_name).date()
+        return (self.region_code, self.product_id, local_date, self.status)
+
+
+@dataclass(frozen=True)
+class PolicyFact:
+    """参与汇总的保单字段快照"""
+    coverage_region: str
+    product_id: str
+    timezone: str
+    coverage_start: datetime
+    coverage_end: datetime
+    is_active: bool
+    coverage_amount: Decimal
+
+    @classmethod
+    def of(cls, source) -> "PolicyFact":
+        return cls(
+            coverage_region=source.coverage_region,
+            product_id=source.product_id,
+            timezone=source.timezone,
+            coverage_start=source.coverage_start,
+            coverage_end=source.coverage_end,
+            is_active=bool(source.is_active),
+            coverage_amount=source.coverage_amount,
+        )
+
+    @property
+    def key(self) -> PolicySummaryKey:
+        local_date = utc_to_region_tz(self.coverage_start, self.timezone).date()
+        end_local_date = utc_to_region_tz(self.coverage_end, self.timezone).date()
+        status = POLICY_ACTIVE if self.is_active else POLICY_INACTIVE
+        return (self.coverage_region, self.product_id, local_date, end_local_date, status)
+
+
+@dataclass(frozen=True)
+class RiskEventFact:
+    """参与汇总的风险事件字段快照(仅 historical)"""
+    region_code: str
+    product_id: str
+    weather_type: str
+    timestamp: datetime
+    tier_level: int
+
+    @classmethod
+    def of(cls, source) -> "RiskEventFact":
+        weather_type = source.weather_type
+        return cls(
+            region_code=source.region_code,
+            product_id=source.product_id,
+            weather_type=getattr(weather_type, "value", weather_type),
+            timestamp=source.timestamp,
+            tier_level=source.tier_level,
+        )
+
+    @property
+    def key(self) -> RiskSummaryKey:
+        tz_name = get_timezone_for_region(self.region_code)
+        local_date = utc_to_region_tz(self.timestamp, tz_name).date()
+        return (self.region_code, self.product_id, self.weather_type, local_date, self.tier_level)
+
+
+def _merge_deltas(
+    added: Iterable,
+    removed: Iterable,
+    amount_field: str,
+) -> Dict[tuple, Tuple[int, Decimal]]:
+    deltas: Dict[tuple, Tuple[int, Decimal]] = {}
+    for sign, facts in ((1, added), (-1, removed)):
+        for fact in facts:
+            count, amount = deltas.get(fact.key, (0, Decimal("0")))
+            deltas[fact.key] = (count + sign, amount + sign * getattr(fact, amount_field))
+    return {key: value for key, value in deltas.items() if value != (0, Decimal("0"))}
+
+
+class StatsSummaryService:
+    """理赔/保单日汇总服务"""
+
+    async def apply_claim_changes(
+        self,
+        session: AsyncSession,
+        *,
+        added: Iterable[ClaimFact] = (),
+        removed: Iterable[ClaimFact] = (),
+    ) -> int:
+        """累加理赔增量(不提交), 返回受影响的汇总键数"""
+        deltas = _merge_deltas(added, removed, "payout_amount")
+        if deltas:
+            await session.execute(
+                self._upsert(
+                    ClaimDailySummary, CLAIM_KEY_COLUMNS, "claim_count", "payout_amount_sum", deltas
+                )
+            )
+        return len(deltas)
+
+    async def apply_policy_changes(
+        self,
+        session: AsyncSession,
+        *,
+        added: Iterable[PolicyFact] = (),
+        removed: Iterable[PolicyFact] = (),
+    ) -> int:
+        """累加保单增量(不提交), 返回受影响的汇总键数"""
+        deltas = _merge_deltas(added, removed, "coverage_amount")
+        if deltas:
+            await session.execute(
+                self._upsert(
+                    PolicyDailySummary,
+                    POLICY_KEY_COLUMNS,
+                    "policy_count",
+                    "coverage_amount_sum",
+                    deltas,
+                )
+            )
+        return len(deltas)
+
+    async def apply_risk_event_changes(
+        self,
+        session: AsyncSession,
+        *,
+        added: Iterable[RiskEventFact] = (),
+        removed: Iterable[RiskEventFact] = (),
+    ) -> int:
+        """累加风险事件计数增量(不提交), 返回受影响的汇总键数"""
+        deltas: Dict[RiskSummaryKey, int] = {}
+        for sign, facts in ((1, added), (-1, removed)):
+            for fact in facts:
+                deltas[fact.key] = deltas.get(fact.key, 0) + sign
+        rows = [
+            {
+                "region_code": region_code,
+                "product_id": product_id,
+                "weather_type": weather_type,
+                "local_date": local_date,
+                "tier_level": tier_level,
+                "event_count": count,
+            }
+            for (region_code, product_id, weather_type, local_date, tier_level), count in sorted(
+                deltas.items()
+            )
+            if count
+        ]
+        if not rows:
+            return 0
+        # 排序后写入: 并发事务按相同顺序加行锁, 避免死锁
+        stmt = insert(RiskEventDailySummary).values(rows)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    "region_code", "product_id", "weather_type", "local_date", "tier_level"
+                ],
+                set_={
+                    "event_count": RiskEventDailySummary.event_count + stmt.excluded.event_count,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+        return len(rows)
+
+    async def claim_totals(
+        self,
+        session: AsyncSession,
+        *,
+        region_code: Optional[str] = None,
+        product_id: Optional[str] = None,
+        exclude_status: str = "voided",
+    ) -> Tuple[int, Optional[Decimal]]:
+        """理赔数量/金额合计(排除 exclude_status)"""
+        query = select(
+            func.sum(ClaimDailySummary.claim_count),
+            func.sum(ClaimDailySummary.payout_amount_sum),
+        ).where(ClaimDailySummary.status != exclude_status)
+        if region_code:
+            query = query.where(ClaimDailySummary.region_code == region_code)
+        if product_id:
+            query = query.where(ClaimDailySummary.product_id == product_id)
+
+        row = (await session.execute(query)).one()
+        return int(row[0] or 0), row[1]
+
+    async def policy_totals(
+        self,
+        session: AsyncSession,
+        *,
+        region_code: Optional[str] = None,
+        product_id: Optional[str] = None,
+    ) -> Tuple[int, Optional[Decimal]]:
+        """有效保单数量/保额合计"""
+        query = select(
+            func.sum(PolicyDailySummary.policy_count),
+            func.sum(PolicyDailySummary.coverage_amount_sum),
+        ).where(PolicyDailySummary.status == POLICY_ACTIVE)
+        if region_code:
+            query = query.where(PolicyDailySummary.region_code == region_code)
+        if product_id:
+            query = query.where(PolicyDailySummary.product_id == product_id)
+
+        row = (await session.execute(query)).one()
+        return int(row[0] or 0), row[1]
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """按事实表全量重建全部汇总表(不提交)"""
+        await session.execute(
+            text(
+                "LOCK TABLE claim_daily_summary, policy_daily_summary, risk_event_daily_summary "
+                "IN SHARE ROW EXCLUSIVE MODE"
+            )
+        )
+        regions = await session.execute(select(ClaimModel.region_code).distinct())
+        for statement in build_rebuild_statements(regions.scalars().all()):
+            await session.execute(statement)
+        risk_regions = await session.execute(
+            select(RiskEventModel.region_code)
+            .where(RiskEventModel.data_type == "historical")
+            .distinct()
+        )
+        for statement in build_risk_rebuild_statements(risk_regions.scalars().all()):
+            await session.execute(statement)
+        logger.info("Stats summaries rebuilt from facts")
+
+    def _upsert(
+        self,
+        model,
+        key_columns: Tuple[str, ...],
+        count_column: str,
+        amount_column: str,
+        deltas: Dict[tuple, Tuple[int, Decimal]],
+    ) -> Executable:
+        rows = [
+            {**dict(zip(key_columns, key)), count_column: count, amount_column: amount}
+            for key, (count, amount) in sorted(deltas.items())
+        ]
+        # 排序后写入: 并发事务按相同顺序加行锁, 避免死锁
+        stmt = insert(model).values(rows)
+        table = model.__table__
+        return stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={
+                count_column: table.c[count_column] + stmt.excluded[count_column],
+                amount_column: table.c[amount_column] + stmt.excluded[amount_column],
+                "updated_at": func.now(),
+            },
+        )
+
+
+def build_rebuild_statements(claim_region_codes: Iterable[str]) -> list:
+    """
+    生成重建语句(清空 + INSERT ... SELECT GROUP BY)
+
+    claims 按区域分别取时区(get_timezone_for_region), 与增量口径一致;
+    policies 使用保单自身 timezone 列。
+    """
+    claims = build_claim_rebuild_statements(claim_region_codes)
+    policies = build_policy_rebuild_statements()
+    # 先清空两表再回填(语句顺序: DELETE x2 → claims → policies)
+    return [claims[0], policies[0], *claims[1:], *policies[1:]]
+
+
+def build_claim_rebuild_statements(claim_region_codes: Iterable[str]) -> list:
+    """理赔日汇总的重建语句(按区域取时区)"""
+    statements: list = [delete(ClaimDailySummary)]
+
+    for region_code in sorted(set(claim_region_codes)):
+        tz_name = get_timezone_for_region(region_code)
+        # 字面量内联: SELECT 与 GROUP BY 表达式必须完全相同
+        tz_literal = literal(tz_name, Text, literal_execute=True)
+        local_date = cast(func.timezone(tz_literal, ClaimModel.triggered_at), Date)
+        grouped = (
+            select(
+                ClaimModel.region_code,
+                ClaimModel.product_id,
+                local_date,
+                ClaimModel.status,
+                func.count(),
+                func.coalesce(func.sum(ClaimModel.payout_amount), 0),
+                func.now(),
+            )
+            .where(ClaimModel.region_code == region_code)
+            .group_by(ClaimModel.region_code, ClaimModel.product_id, local_date, ClaimModel.status)
+        )
+        statements.append(
+            insert(ClaimDailySummary).from_select(
+                ["region_code", "product_id", "local_date", "status",
+                 "claim_count", "payout_amount_sum", "updated_at"],
+                grouped,
+            )
+        )
+
+    return statements
+
+
+def build_policy_rebuild_statements() -> list:
+    """保单日汇总的重建语句(保障开始/结束日按保单自身 timezone 列)"""
+    statements: list = [delete(PolicyDailySummary)]
+    policy_date = cast(func.timezone(PolicyModel.timezone, PolicyModel.coverage_start), Date)
+    end_date = cast(func.timezone(PolicyModel.timezone, PolicyModel.coverage_end), Date)
+    status_expr = case(
+        (PolicyModel.is_active == True, literal(POLICY_ACTIVE, String, literal_execute=True)),  # noqa: E712
+        else_=literal(POLICY_INACTIVE, String, literal_execute=True),
+    )
+    grouped_policies = select(
+        PolicyModel.coverage_region,
+        PolicyModel.product_id,
+        policy_date,
+        end_date,
+        status_expr,
+        func.count(),
+        func.coalesce(func.sum(PolicyModel.coverage_amount), 0),
+        func.now(),
+    ).group_by(
+        PolicyModel.coverage_region, PolicyModel.product_id, policy_date, end_date, status_expr
+    )
+    statements.append(
+        insert(PolicyDailySummary).from_select(
+            [*POLICY_KEY_COLUMNS, "policy_count", "coverage_amount_sum", "updated_at"],
+            grouped_policies,
+        )
+    )
+    return statements
+
+
+def build_risk_rebuild_statements(region_codes: Iterable[str]) -> list:
+    """生成风险事件日汇总的重建语句(按区域取时区, 与增量口径一致; 只统计 historical)"""
+    statements: list = [delete(RiskEventDailySummary)]
+    for region_code in sorted(set(region_codes)):
+        tz_literal = literal(get_timezone_for_region(region_code), Text, literal_execute=True)
+        local_date = cast(func.timezone(tz_literal, RiskEventModel.timestamp), Date)
+        grouped = (
+            select(
+                RiskEventModel.region_code,
+                RiskEventModel.product_id,
+                RiskEventModel.weather_type,
+                local_date,
+                RiskEventModel.tier_level,
+                func.count(),
+                func.now(),
+            )
+            .where(
+                RiskEventModel.region_code == region_code,
+                RiskEventModel.data_type == "historical",
+            )
+            .group_by(
+                RiskEventModel.region_code,
+                RiskEventModel.product_id,
+                RiskEventModel.weather_type,
+                local_date,
+                RiskEventModel.tier_level,
+            )
+        )
+        statements.append(
+            insert(RiskEventDailySummary).from_select(
+                ["region_code", "product_id", "weather_type", "local_date",
+                 "tier_level", "event_count", "updated_at"],
+                grouped,
+            )
+        )
+    return statements
+
+
+stats_summary_service = StatsSummaryService()
@@ -3,25 +3,45 @@ Weather Service
 
 职责:
 - 查询天气数据(historical/predicted)
-- 统计聚合
+- 多区域批量查询(单次往返, region_code = ANY(:codes))
+- 列式整段查询(array_agg, 供降采样)
+- 统计聚合(单窗口 / 按 region_timezone 分桶的多窗口)
 - 支持扩展窗口查询
+- 紧凑存储(weather_daily_packed)读取, 解包后与 weather_data 口径一致
 
 Reference:
 - docs/v2/v2实施细则/07-天气数据表与Weather-Service-细则.md
 """
 
 import logging
-from typing import List
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import func, select
+from sqlalchemy import String, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.weather import WeatherData as WeatherModel
-from app.schemas.weather import WeatherDataPoint, WeatherQueryRequest, WeatherStats
+from app.models.weather_packed import WeatherDailyPacked
 from app.schemas.shared import DataType
+from app.schemas.time import TimeGranularity
+from app.schemas.weather import (
+    WeatherDataPoint,
+    WeatherMultiRegionQueryRequest,
+    WeatherQueryRequest,
+    WeatherStats,
+    WeatherStatsBucket,
+)
+from app.utils.sql_buckets import local_bucket
+from app.utils.time_utils import get_timezone_for_region, utc_to_region_tz
+from app.utils.weather_packing import SLOT_SECONDS, unpack_values
 
 logger = logging.getLogger(__name__)
 
+# 多区域流式查询每批拉取行数
+MULTI_REGION_YIELD_PER = 2000
+
 
 class WeatherService:
     """天气数据服务"""
@@ -54,6 +74,151 @@ class WeatherService:
         
         return [self._model_to_schema(m) for m in models]
 
+    async def query_series_columns(
+        self,
+        session: AsyncSession,
+        request: WeatherQueryRequest,
+    ) -> Tuple[List[datetime], List[Decimal], Optional[str]]:
+        """
+        列式查询时间序列: 数据库内 array_agg 成一行, 返回 (timestamps, values, unit)
+
+        用于长区间(降采样前)的整段拉取, 不构造逐点对象
+        """
+        if request.data_type == DataType.PREDICTED and not request.prediction_run_id:
+            raise ValueError("prediction_run_id required for predicted data")
+
+        query = select(
+            func.array_agg(aggregate_order_by(WeatherModel.timestamp, WeatherModel.timestamp)),
+            func.array_agg(aggregate_order_by(WeatherModel.value, WeatherModel.timestamp)),
+            func.min(WeatherModel.unit),
+        ).where(
+            WeatherModel.region_code == request.region_code,
+            WeatherModel.weather_type == request.weather_type.value,
+            WeatherModel.data_type == request.data_type.value,
+            WeatherModel.timestamp >= request.start_time,
+            WeatherModel.timestamp <= request.end_time,
+        )
+        if request.data_type == DataType.PREDICTED:
+            query = query.where(WeatherModel.prediction_run_id == request.prediction_run_id)
+
+        timestamps, values, unit = (await session.execute(query)).one()
+        return list(timestamps or []), list(values or []), unit
+
+    async def query_time_series_multi(
+        self,
+        session: AsyncSession,
+        request: WeatherMultiRegionQueryRequest,
+    ) -> Dict[str, List[WeatherDataPoint]]:
+        """
+        多区域时间序列查询(一次往返)
+
+        - region_code = ANY(:region_codes): 单个数组参数, 语句形态与区域数量无关
+        - ORDER BY (region_code, timestamp), 流式读取并按区域拆分
+        - 返回所有请求区域(无数据的区域为空列表)
+        """
+        if request.data_type == DataType.PREDICTED and not request.prediction_run_id:
+            raise ValueError("prediction_run_id required for predicted data")
+
+        region_codes = list(dict.fromkeys(request.region_codes))
+        query = select(
+            WeatherModel.timestamp,
+            WeatherModel.region_code,
+            WeatherModel.weather_type,
+            WeatherModel.value,
+            WeatherModel.unit,
+            WeatherModel.data_type,
+            WeatherModel.prediction_run_id,
+        ).where(
+            WeatherModel.region_code == any_(
+                bindparam("region_codes", region_codes, type_=ARRAY(String))
+            ),
+            WeatherModel.weather_type == request.weather_type.value,
+            WeatherModel.data_type == request.data_type.value,
+            WeatherModel.timestamp >= request.start_time,
+            WeatherModel.timestamp <= request.end_time,
+        )
+
+        if request.data_type == DataType.PREDICTED:
+            query = query.where(
+                WeatherModel.prediction_run_id == request.prediction_run_id
+            )
+
+        query = query.order_by(
+            WeatherModel.region_code, WeatherModel.timestamp
+        ).execution_options(yield_per=MULTI_REGION_YIELD_PER)
+
+        series: Dict[str, List[WeatherDataPoint]] = {code: [] for code in region_codes}
+        result = await session.stream(query)
+        async for row in result:
+            series[row.region_code].append(WeatherDataPoint(**row._mapping))
+
+        logger.info(
+            "Multi-region weather queried",
+            extra={
+                "region_count": len(region_codes),
+                "weather_type": request.weather_type.value,
+                "data_type": request.data_type.value,
+                "row_count": sum(len(points) for points in series.values()),
+            },
+        )
+        return series
+
+    async def query_time_series_packed(
+        self,
+        session: AsyncSession,
+        request: WeatherQueryRequest,
+        *,
+        region_timezone: Optional[str] = None,
+    ) -> List[WeatherDataPoint]:
+        """
+        从 weather_daily_packed 查询时间序列(返回口径同 query_time_series)
+
+        - 按 region_timezone 自然日取行, 解包后再按 start/end(UTC) 精确裁剪
+        - 无效槽位(位图为0)不输出
+        """
+        if request.data_type == DataType.PREDICTED and not request.prediction_run_id:
+            raise ValueError("prediction_run_id required for predicted data")
+
+        tz_name = region_timezone or get_timezone_for_region(request.region_code)
+        query = select(WeatherDailyPacked).where(
+            WeatherDailyPacked.region_code == request.region_code,
+            WeatherDailyPacked.weather_type == request.weather_type.value,
+            WeatherDailyPacked.data_type == request.data_type.value,
+            WeatherDailyPacked.region_timezone == tz_name,
+            WeatherDailyPacked.local_date >= utc_to_region_tz(request.start_time, tz_name).date(),
+            WeatherDailyPacked.local_date <= utc_to_region_tz(request.end_time, tz_name).date(),
+        )
+        if request.data_type == DataType.PREDICTED:
+            query = query.where(
+                WeatherDailyPacked.prediction_run_id == request.prediction_run_id
+            )
+        else:
+            query = query.where(WeatherDailyPacked.prediction_run_id.is_(None))
+
+        result = await session.execute(query.order_by(WeatherDailyPacked.local_date))
+
+        points: List[WeatherDataPoint] = []
+        for row in result.scalars().all():
+            slots = unpack_values(row.packed_values, row.validity, row.slot_count, row.scale)
+            for index, value in enumerate(slots):
+                if value is None:
+                    continue
+                timestamp = row.day_start + timedelta(seconds=index * SLOT_SECONDS)
+                if timestamp < request.start_time or timestamp > request.end_time:
+                    continue
+                points.append(
+                    WeatherDataPoint(
+                        timestamp=timestamp,
+                        region_code=row.region_code,
+                        weather_type=row.weather_type,
+                        value=value,
+                        unit=row.unit,
+                        data_type=row.data_type,
+                        prediction_run_id=row.prediction_run_id,
+                    )
+                )
+        return points
+
     async def query_stats(
         self,
         session: AsyncSession,
@@ -96,6 +261,63 @@ class WeatherService:
             count=int(row[4]),
         )
     
+    async def query_stats_series(
+        self,
+        session: AsyncSession,
+        request: WeatherQueryRequest,
+        *,
+        granularity: TimeGranularity,
+        region_timezone: Optional[str] = None,
+    ) -> List[WeatherStatsBucket]:
+        """
+        按时间桶查询聚合统计(一次 GROUP BY 查询, 替代逐窗口 query_stats)。
+
+        注意：
+        - 桶边界按 region_timezone 自然边界(默认取 region_code 对应时区),
+          day 与 align_to_natural_day_start 一致
+        - 窗口仍按 request.start_time/end_time（UTC）裁剪, 首尾桶可能不完整
+        - 只返回有数据的桶, 按 bucket_start 升序
+        """
+        if request.data_type == DataType.PREDICTED and not request.prediction_run_id:
+            raise ValueError("prediction_run_id required for predicted data")
+
+        tz_name = region_timezone or get_timezone_for_region(request.region_code)
+        bucket = local_bucket(WeatherModel.timestamp, granularity, tz_name).label(
+            "bucket_start"
+        )
+
+        query = select(
+            bucket,
+            func.sum(WeatherModel.value),
+            func.avg(WeatherModel.value),
+            func.max(WeatherModel.value),
+            func.min(WeatherModel.value),
+            func.count(),
+        ).where(
+            WeatherModel.region_code == request.region_code,
+            WeatherModel.weather_type == request.weather_type.value,
+            WeatherModel.data_type == request.data_type.value,
+            WeatherModel.timestamp >= request.start_time,
+            WeatherModel.timestamp <= request.end_time,
+        )
+
+        if request.data_type == DataType.PREDICTED:
+            query = query.where(WeatherModel.prediction_run_id == request.prediction_run_id)
+
+        result = await session.execute(query.group_by(bucket).order_by(bucket))
+
+        return [
+            WeatherStatsBucket(
+                bucket_start=row[0],
+                sum=row[1],
+                avg=row[2],
+                max=row[3],
+                min=row[4],
+                count=int(row[5]),
+            )
+            for row in result.all()
+        ]
+    
     def _model_to_schema(self, model: WeatherModel) -> WeatherDataPoint:
         """转换模型到Schema"""
         return WeatherDataPoint(
@@ -0,0 +1,70 @@
+"""
+Cache Warming Celery Tasks
+
+预热数据产品缓存, 见 app/services/cache_warming.py
+
+触发:
+- 风险事件 / 理赔计算任务提交新结果后, 预热受影响区域 + 产品的预设区间
+- 每日 UTC 零点预设区间滚动后, 按有效保单组合逐个 (区域, 产品) 扇出预热
+
+硬规则:
+- 预热失败只记录, 不重试(下一个请求按未命中正常构建)
+"""
+
+import asyncio
+import logging
+
+from app.celery_app import celery_app
+from app.db import get_sessionmaker
+from app.schemas.shared import WeatherType
+from app.services.cache_warming import WarmTarget, cache_warming_service
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def warm_data_products_task(region_code: str, product_id: str, weather_type: str):
+    """
+    预热单个 (区域, 产品) 的数据产品缓存
+
+    Args:
+        region_code: 写入结果的区域(上级区域一并预热)
+        product_id: 产品ID(未指定产品的聚合条目一并预热)
+        weather_type: 产品天气类型
+    """
+    target = WarmTarget(region_code, product_id, WeatherType(weather_type))
+    report = asyncio.run(cache_warming_service.warm([target]))
+    logger.info(
+        "Data product cache warmed",
+        extra={
+            "region_code": region_code,
+            "product_id": product_id,
+            "keys": report.keys,
+            "failed": report.failed,
+        },
+    )
+    return {
+        "status": "completed",
+        "region_code": region_code,
+        "product_id": product_id,
+        "keys": report.keys,
+        "warmed": report.warmed,
+        "failed": report.failed,
+    }
+
+
+@celery_app.task
+def warm_daily_presets_task():
+    """每日: 按有效保单组合扇出预热(新的预设区间)"""
+
+    async def _targets():
+        session_maker = get_sessionmaker()
+        async with session_maker() as session:
+            return await cache_warming_service.portfolio_targets(session)
+
+    targets = asyncio.run(_targets())
+    for target in targets:
+        warm_data_products_task.delay(
+            target.region_code, target.product_id, target.weather_type.value
+        )
+    return {"status": "scheduled", "targets": len(targets)}
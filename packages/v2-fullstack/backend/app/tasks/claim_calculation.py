@@ -22,18 +22,18 @@ from datetime import datetime, timezone
 from typing import Generator, Optional
 
 import redis
-from sqlalchemy import select
 
 from app.celery_app import celery_app
 from app.db import get_sessionmaker
-from app.models.policy import Policy as PolicyModel
 from app.schemas.claim import ClaimCreate
 from app.schemas.shared import AccessMode, DataType
 from app.services.claim_service import claim_service
 from app.services.compute.claim_calculator import RiskEventInput, claim_calculator
+from app.services.policy_portfolio import policy_portfolio
 from app.services.policy_service import policy_service
 from app.services.product_service import product_service
 from app.services.risk_service import risk_service
+from app.tasks.cache_warming import warm_data_products_task
 
 logger = logging.getLogger(__name__)
 
@@ -212,6 +212,11 @@ async def _calculate_claims_for_policy_async(
             payloads,
             data_type=DataType.HISTORICAL,
         )
+        if inserted_count:
+            # batch_create 已提交并失效缓存: 预热保障区域 + 产品的预设区间
+            warm_data_products_task.delay(
+                policy.coverage_region, product_id_final, product.weather_type.value
+            )
 
         return {
             "status": "completed",
@@ -317,15 +322,15 @@ def calculate_claims_batch_task(
 
     session_maker = get_sessionmaker()
     async def _dispatch() -> dict:
+        # 组合索引按 updated_at 增量刷新, 只扇出保障期与结算窗口相交的有效保单
         async with session_maker() as session:
-            query = select(PolicyModel).where(PolicyModel.is_active == True)
-            if region_code:
-                query = query.where(PolicyModel.coverage_region == region_code)
-            if product_id:
-                query = query.where(PolicyModel.product_id == product_id)
-
-            result = await session.execute(query.order_by(PolicyModel.id))
-            policies = list(result.scalars().all())
+            await policy_portfolio.ensure_fresh(session)
+        policies = policy_portfolio.overlapping(
+            region_code,
+            start_dt,
+            end_dt,
+            product_id=product_id,
+        )
 
         for policy in policies:
             calculate_claims_for_policy_task.delay(
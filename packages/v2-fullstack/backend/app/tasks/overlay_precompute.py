@@ -0,0 +1,113 @@
+"""
+Overlay Precompute Celery Tasks
+
+维护地图叠加层预计算表(overlay_cell_buckets), 见 app/services/overlay_tiles.py
+
+触发:
+- 风险事件计算任务写入新事件后, 重算对应天气类型/时间范围的日桶
+- 每小时重算最近的历史日桶(新到的天气观测)
+
+硬规则:
+- 重算按时间桶整体替换, 幂等; 提交后再失效瓦片缓存
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.celery_app import celery_app
+from app.db import get_sessionmaker
+from app.schemas.shared import DataType, WeatherType
+from app.schemas.time import TimeGranularity
+from app.services.overlay_tiles import overlay_tile_service
+
+logger = logging.getLogger(__name__)
+
+RECENT_LOOKBACK = timedelta(days=2)
+
+
+def _parse_utc_datetime(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+async def _precompute_async(
+    *,
+    weather_type: WeatherType,
+    data_type: DataType,
+    prediction_run_id: Optional[str],
+    granularity: TimeGranularity,
+    start: datetime,
+    end: datetime,
+) -> int:
+    session_maker = get_sessionmaker()
+    async with session_maker() as session:
+        buckets = await overlay_tile_service.precompute(
+            session,
+            weather_type=weather_type,
+            data_type=data_type,
+            prediction_run_id=prediction_run_id,
+            granularity=granularity,
+            start=start,
+            end=end,
+        )
+        await session.commit()
+    await overlay_tile_service.invalidate(buckets)
+    return len(buckets)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def precompute_overlays_task(
+    self,
+    weather_type: str,
+    time_range_start: str,
+    time_range_end: str,
+    data_type: str = DataType.HISTORICAL.value,
+    prediction_run_id: Optional[str] = None,
+    granularity: str = TimeGranularity.DAY.value,
+):
+    """
+    重算叠加层时间桶
+
+    Args:
+        weather_type: 天气类型
+        time_range_start/time_range_end: UTC ISO, 覆盖到的时间桶整体重算
+        prediction_run_id: predicted 必填
+    """
+    try:
+        bucket_count = asyncio.run(
+            _precompute_async(
+                weather_type=WeatherType(weather_type),
+                data_type=DataType(data_type),
+                prediction_run_id=prediction_run_id,
+                granularity=TimeGranularity(granularity),
+                start=_parse_utc_datetime(time_range_start),
+                end=_parse_utc_datetime(time_range_end),
+            )
+        )
+    except Exception as exc:
+        logger.exception(
+            "Overlay precompute failed",
+            extra={"weather_type": weather_type, "data_type": data_type},
+        )
+        raise exc
+
+    return {
+        "status": "completed",
+        "weather_type": weather_type,
+        "data_type": data_type,
+        "buckets": bucket_count,
+    }
+
+
+@celery_app.task
+def precompute_recent_overlays_task():
+    """每小时: 重算全部天气类型最近 RECENT_LOOKBACK 的历史日桶"""
+    end = datetime.now(timezone.utc)
+    start = end - RECENT_LOOKBACK
+    for weather_type in WeatherType:
+        precompute_overlays_task.delay(weather_type.value, start.isoformat(), end.isoformat())
+    return {"status": "scheduled", "weather_types": [w.value for w in WeatherType]}
@@ -0,0 +1,53 @@
+"""
+Partition Maintenance Celery Tasks
+
+定期预建 weather_data / risk_events 的未来月分区
+
+硬规则:
+- 必须在数据写入前建好对应月分区; 落入 DEFAULT 分区的月份无法再直接拆出
+- DDL 幂等(IF NOT EXISTS), 重复执行安全
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from app.celery_app import celery_app
+from app.db import get_engine
+from app.models.partitioning import DEFAULT_MONTHS_AHEAD, ensure_partitions
+
+logger = logging.getLogger(__name__)
+
+
+async def _ensure_partitions_async(months_ahead: int) -> int:
+    engine = get_engine()
+    async with engine.begin() as conn:
+        statements = await conn.run_sync(
+            lambda sync_conn: ensure_partitions(sync_conn, months_ahead=months_ahead)
+        )
+    return len(statements)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def ensure_partitions_task(self, months_ahead: Optional[int] = None):
+    """
+    预建当月及未来 months_ahead 个月的分区
+
+    Args:
+        months_ahead: 预建月数(默认 DEFAULT_MONTHS_AHEAD)
+    """
+    months = DEFAULT_MONTHS_AHEAD if months_ahead is None else months_ahead
+    try:
+        executed = asyncio.run(_ensure_partitions_async(months))
+    except Exception as exc:
+        logger.exception(
+            "Partition maintenance failed",
+            extra={"months_ahead": months},
+        )
+        raise exc
+
+    return {
+        "status": "completed",
+        "months_ahead": months,
+        "statements_executed": executed,
+    }
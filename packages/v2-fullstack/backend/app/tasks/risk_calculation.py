@@ -27,8 +27,11 @@ from app.schemas.time import TimeRangeUTC, TimeWindowType
 from app.schemas.weather import WeatherQueryRequest
 from app.services.compute.risk_calculator import risk_calculator
 from app.services.product_service import product_service
+from app.services.risk_episode_service import risk_episode_service
 from app.services.risk_service import risk_service
 from app.services.weather_service import weather_service
+from app.tasks.cache_warming import warm_data_products_task
+from app.tasks.overlay_precompute import precompute_overlays_task
 from app.utils.time_utils import calculate_extended_range, get_timezone_for_region
 
 logger = logging.getLogger(__name__)
@@ -213,22 +216,49 @@ async def _calculate_risk_events_async(
 
         existing_ids = set()
         if payloads:
+            # 带上分区键(data_type + timestamp 范围), 只扫描命中的月分区
             result = await session.execute(
                 select(RiskEventModel.id).where(
-                    RiskEventModel.id.in_([payload.id for payload in payloads])
+                    RiskEventModel.data_type == DataType.HISTORICAL.value,
+                    RiskEventModel.timestamp >= min(item.timestamp for item in payloads),
+                    RiskEventModel.timestamp <= max(item.timestamp for item in payloads),
+                    RiskEventModel.id.in_([payload.id for payload in payloads]),
                 )
             )
             existing_ids = set(result.scalars().all())
 
         new_payloads = [item for item in payloads if item.id not in existing_ids]
+        episodes_written = 0
         if new_payloads:
             await risk_service.batch_create(session, new_payloads)
+            # 事件段由已落库事实重建(含与相邻任务窗口的拼接), 单独事务提交
+            episodes_written = await risk_episode_service.rebuild_historical(
+                session,
+                product_id=product_id,
+                region_code=region_code,
+                risk_rules=product.risk_rules,
+                region_timezone=region_timezone,
+                time_range_start=time_range.start,
+                time_range_end=time_range.end,
+            )
+            await session.commit()
+            # 风险强度变化: 重算叠加层对应日桶(独立任务, 失败不影响本任务结果)
+            precompute_overlays_task.delay(
+                product.risk_rules.weather_type.value,
+                time_range.start.isoformat(),
+                time_range.end.isoformat(),
+            )
+            # 缓存已在提交后失效: 预热受影响区域 + 产品的预设区间
+            warm_data_products_task.delay(
+                region_code, product_id, product.risk_rules.weather_type.value
+            )
 
         return {
             "status": "completed",
             "events_calculated": len(payloads),
             "events_written": len(new_payloads),
             "events_skipped": len(existing_ids),
+            "episodes_written": episodes_written,
             "product_id": product_id,
             "region_code": region_code,
             "trace_id": trace_id,
@@ -0,0 +1,38 @@
+"""
+Stats Reconciliation Celery Tasks
+
+按事实表(claims/policies)全量重建日汇总表, 修正增量维护的漂移
+(绕过 Service 的批量 SQL 写入、手工修数等)
+
+硬规则:
+- 重建与写路径增量互斥(汇总表锁), 单事务提交
+- 幂等, 重复执行安全
+"""
+
+import asyncio
+import logging
+
+from app.celery_app import celery_app
+from app.db import get_sessionmaker
+from app.services.stats_summary import stats_summary_service
+
+logger = logging.getLogger(__name__)
+
+
+async def _reconcile_async() -> None:
+    session_maker = get_sessionmaker()
+    async with session_maker() as session:
+        await stats_summary_service.rebuild(session)
+        await session.commit()
+
+
+@celery_app.task(bind=True, max_retries=3)
+def reconcile_stats_summaries_task(self):
+    """从事实表重建 claim_daily_summary / policy_daily_summary"""
+    try:
+        asyncio.run(_reconcile_async())
+    except Exception as exc:
+        logger.exception("Stats summary reconciliation failed")
+        raise exc
+
+    return {"status": "completed"}
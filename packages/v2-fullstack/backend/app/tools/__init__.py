@@ -0,0 +1 @@
+"""运维工具(回填/基准测试), 以 python -m app.tools.<name> 运行"""
@@ -0,0 +1,230 @@
+"""
+Backfill weather_daily_packed from weather_data
+
+按 (region, weather_type, data_type, prediction_run_id) 流式读取 weather_data,
+按 region_timezone 自然日打包后 upsert(幂等, 可重复执行)。
+
+硬规则:
+- 只写完整自然日: 读取范围向两侧各扩 1 天, 只输出本地日期落在 [start, end] 内的行,
+  避免边界处的部分日覆盖已有的完整日
+
+Usage:
+    python -m app.tools.backfill_weather_packed --start 2025-01-01T00:00:00Z --end 2025-02-01T00:00:00Z [--region CN-GD]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.weather import WeatherData
+from app.models.weather_packed import WeatherDailyPacked
+from app.schemas.shared import DataType
+from app.services.data_versions import data_version_service
+from app.utils.time_utils import get_timezone_for_region, utc_to_region_tz
+from app.utils.weather_packing import (
+    VALUE_SCALE,
+    group_into_local_days,
+    local_day_slots,
+    pack_values,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPSERT_CHUNK_SIZE = 500
+STREAM_YIELD_PER = 5000
+
+HISTORICAL_WHERE = text("data_type = 'historical' AND prediction_run_id IS NULL")
+PREDICTED_WHERE = text("prediction_run_id IS NOT NULL")
+
+
+def build_packed_rows(
+    *,
+    region_code: str,
+    weather_type: str,
+    data_type: str,
+    prediction_run_id: Optional[str],
+    unit: str,
+    points: Sequence[tuple],
+    start: datetime,
+    end: datetime,
+) -> List[dict]:
+    """一个序列的小时点 → 紧凑行(只保留本地日期在 [start, end] 内的自然日)"""
+    region_timezone = get_timezone_for_region(region_code)
+    first_day = utc_to_region_tz(start, region_timezone).date()
+    last_day = utc_to_region_tz(end, region_timezone).date()
+    now = datetime.now(timezone.utc)
+
+    rows = []
+    for local_date, slots in sorted(group_into_local_days(points, region_timezone).items()):
+        if local_date < first_day or local_date > last_day:
+            continue
+        day_start, slot_count = local_day_slots(local_date, region_timezone)
+        values, validity = pack_values(slots, VALUE_SCALE)
+        rows.append(
+            {
+                "region_code": region_code,
+                "weather_type": weather_type,
+                "data_type": data_type,
+                "prediction_run_id": prediction_run_id,
+                "local_date": local_date,
+                "region_timezone": region_timezone,
+                "day_start": day_start,
+                "slot_count": slot_count,
+                "unit": unit,
+                "scale": VALUE_SCALE,
+                "packed_values": values,
+                "validity": validity,
+                "updated_at": now,
+            }
+        )
+    return rows
+
+
+async def _upsert(session: AsyncSession, rows: List[dict]) -> None:
+    historical = [row for row in rows if row["prediction_run_id"] is None]
+    predicted = [row for row in rows if row["prediction_run_id"] is not None]
+    batches = [
+        (historical, ["region_code", "weather_type", "local_date"], HISTORICAL_WHERE),
+        (predicted, ["prediction_run_id", "region_code", "weather_type", "local_date"], PREDICTED_WHERE),
+    ]
+    for batch, index_elements, index_where in batches:
+        for offset in range(0, len(batch), UPSERT_CHUNK_SIZE):
+            stmt = insert(WeatherDailyPacked).values(batch[offset:offset + UPSERT_CHUNK_SIZE])
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=index_elements,
+                    index_where=index_where,
+                    set_={
+                        "region_timezone": stmt.excluded.region_timezone,
+                        "day_start": stmt.excluded.day_start,
+                        "slot_count": stmt.excluded.slot_count,
+                        "unit": stmt.excluded.unit,
+                        "scale": stmt.excluded.scale,
+                        "packed_values": stmt.excluded.packed_values,
+                        "validity": stmt.excluded.validity,
+                        "updated_at": stmt.excluded.updated_at,
+                    },
+                )
+            )
+
+
+async def backfill_weather_packed(
+    session: AsyncSession,
+    *,
+    start: datetime,
+    end: datetime,
+    region_codes: Optional[Sequence[str]] = None,
+) -> Dict[str, int]:
+    """回填 [start, end] 内的完整自然日"""
+    query = select(
+        WeatherData.region_code,
+        WeatherData.weather_type,
+        WeatherData.data_type,
+        WeatherData.prediction_run_id,
+        WeatherData.unit,
+        WeatherData.timestamp,
+        WeatherData.value,
+    ).where(
+        WeatherData.timestamp >= start - timedelta(days=1),
+        WeatherData.timestamp < end + timedelta(days=1),
+    )
+    if region_codes:
+        query = query.where(WeatherData.region_code.in_(list(region_codes)))
+    query = query.order_by(
+        WeatherData.region_code,
+        WeatherData.weather_type,
+        WeatherData.data_type,
+        WeatherData.prediction_run_id,
+        WeatherData.timestamp,
+    ).execution_options(yield_per=STREAM_YIELD_PER)
+
+    stats = {"series": 0, "source_rows": 0, "packed_rows": 0}
+    # (weather_type, data_type, prediction_run_id) → 区域; 提交后递增天气数据版本
+    touched: Dict[tuple, set] = {}
+
+    async def flush(key: tuple, group: List[tuple]) -> None:
+        packed = build_packed_rows(
+            region_code=key[0],
+            weather_type=key[1],
+            data_type=key[2],
+            prediction_run_id=key[3],
+            unit=group[0][4],
+            points=[(row[5], row[6]) for row in group],
+            start=start,
+            end=end,
+        )
+        await _upsert(session, packed)
+        touched.setdefault((key[1], key[2], key[3]), set()).add(key[0])
+        stats["series"] += 1
+        stats["source_rows"] += len(group)
+        stats["packed_rows"] += len(packed)
+
+    # 流式按序列切分(已按序列键排序), 内存中只保留一个序列
+    current_key: Optional[tuple] = None
+    group: List[tuple] = []
+    result = await session.stream(query)
+    async for row in result:
+        key = (row[0], row[1], row[2], row[3])
+        if key != current_key and group:
+            await flush(current_key, group)
+            group = []
+        current_key = key
+        group.append(tuple(row))
+    if group:
+        await flush(current_key, group)
+
+    await session.commit()
+    for (weather_type, data_type, prediction_run_id), regions in touched.items():
+        await data_version_service.bump_weather(
+            region_codes=regions,
+            weather_type=weather_type,
+            data_type=DataType(data_type),
+            prediction_run_id=prediction_run_id,
+        )
+    logger.info("Packed weather backfill finished", extra=stats)
+    return stats
+
+
+def _parse_utc(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Backfill weather_daily_packed")
+    parser.add_argument("--start", required=True, help="起始时间(UTC ISO)")
+    parser.add_argument("--end", required=True, help="结束时间(UTC ISO)")
+    parser.add_argument("--region", action="append", default=None, help="区域代码(可重复)")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError(
+            "DATABASE_URL is not set. Please set it in your environment or .env file."
+        )
+
+    engine = create_async_engine(database_url)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        stats = await backfill_weather_packed(
+            session,
+            start=_parse_utc(args.start),
+            end=_parse_utc(args.end),
+            region_codes=args.region,
+        )
+    await engine.dispose()
+    print(stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
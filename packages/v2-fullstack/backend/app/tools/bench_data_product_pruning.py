@@ -0,0 +1,165 @@
+"""
+Benchmark: 数据产品 Mode 裁剪(dict 往返 vs 类型化裁剪计划)
+
+对比两条路径从"构建好的响应"到"响应字节"的耗时:
+- roundtrip: model_dump → prune_data(逐条 dict 裁剪) → model_validate,
+  再按 FastAPI response_model 的方式 dump + validate + 序列化(旧路径)
+- typed: AccessControlManager.prune_data_product(类型化) → plan.to_json(单次序列化)
+
+输出各路径耗时中位数、响应字节数, 并校验两条路径裁剪后的数据一致。
+数据为合成的大 series/events 载荷, 不依赖数据库。
+
+Usage:
+    python -m app.tools.bench_data_product_pruning [--points 50000] [--events 20000] \
+        [--mode demo_public] [--product l1_region_intelligence] [--repeat 10]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import (
+    AccessMode,
+    DataProductResponse,
+    DataType,
+    EventData,
+    LegendMeta,
+    ResponseMeta,
+    SeriesData,
+    TraceContext,
+)
+from app.utils.access_control import DATA_PRODUCT_SECTIONS, AccessControlManager
+
+
+def build_payload(points: int, events: int) -> DataProductResponse:
+    """合成 L1 风格的大响应: 一条长 series + 大量风险事件"""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    timestamps = [start + timedelta(hours=i) for i in range(points)]
+    return DataProductResponse(
+        series=[
+            SeriesData(
+                timestamps=timestamps,
+                values=[round((i % 97) * 0.5, 2) for i in range(points)],
+                unit="mm",
+            )
+        ],
+        events=[
+            EventData(
+                event_id=f"evt-{i}",
+                timestamp=start + timedelta(minutes=i),
+                event_type="risk",
+                tier_level=i % 3 + 1,
+                trigger_value=Decimal("120.5"),
+                threshold_value=Decimal("100"),
+                data_type=DataType.HISTORICAL,
+                rule_version="v1",
+            )
+            for i in range(events)
+        ],
+        legend=LegendMeta(data_type=DataType.HISTORICAL, weather_type="rainfall", unit="mm"),
+        meta=ResponseMeta(
+            trace_context=TraceContext(trace_id="bench", access_mode=AccessMode.DEMO_PUBLIC)
+        ),
+    )
+
+
+def roundtrip_path(manager: AccessControlManager, response: DataProductResponse) -> str:
+    """旧路径: dict 裁剪 + 两次 validate"""
+    payload = response.model_dump()
+    for section, item_model in DATA_PRODUCT_SECTIONS.items():
+        items = payload.get(section)
+        if not items:
+            continue
+        required = [
+            name for name, field in item_model.model_fields.items() if field.is_required()
+        ]
+        pruned = manager.prune_data(items)[0]
+        payload[section] = [
+            {**kept, **{name: item[name] for name in required}}
+            for kept, item in zip(pruned, items)
+        ]
+    pruned_response = DataProductResponse.model_validate(payload)
+    # FastAPI response_model: 先 dump 再按模型校验, 最后序列化
+    validated = DataProductResponse.model_validate(pruned_response.model_dump())
+    return validated.model_dump_json()
+
+
+def typed_path(manager: AccessControlManager, response: DataProductResponse) -> str:
+    """新路径: 类型化裁剪 + 单次序列化"""
+    return manager.plan.to_json(manager.prune_data_product(response))
+
+
+def _timed(repeat: int, fn) -> tuple:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def _strip_nulls(value):
+    if isinstance(value, dict):
+        return {k: _strip_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_strip_nulls(v) for v in value]
+    return value
+
+
+def run_benchmark(
+    mode: AccessMode, product: DataProductType, points: int, events: int, repeat: int
+) -> dict:
+    response = build_payload(points, events)
+    manager = AccessControlManager(mode, product)
+
+    roundtrip_ms, roundtrip_body = _timed(repeat, lambda: roundtrip_path(manager, response))
+    typed_ms, typed_body = _timed(repeat, lambda: typed_path(manager, response))
+
+    # 旧路径把被裁剪字段输出为 null, 新路径直接排除; 去掉 null 后比较
+    matches = _strip_nulls(json.loads(roundtrip_body)) == _strip_nulls(json.loads(typed_body))
+    return {
+        "payload": {
+            "points": points,
+            "events": events,
+            "mode": mode.value,
+            "product": product.value,
+        },
+        "roundtrip": {"median_ms": round(roundtrip_ms, 2), "bytes": len(roundtrip_body)},
+        "typed": {"median_ms": round(typed_ms, 2), "bytes": len(typed_body)},
+        "result": {
+            "speedup": round(roundtrip_ms / typed_ms, 2) if typed_ms else None,
+            "results_match": matches,
+        },
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Benchmark data product pruning paths")
+    parser.add_argument("--points", type=int, default=50000)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--mode", default=AccessMode.DEMO_PUBLIC.value)
+    parser.add_argument("--product", default=DataProductType.L1_REGION_INTELLIGENCE.value)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        AccessMode(args.mode),
+        DataProductType(args.product),
+        args.points,
+        args.events,
+        args.repeat,
+    )
+    for section, values in report.items():
+        print(section)
+        for key, value in values.items():
+            print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
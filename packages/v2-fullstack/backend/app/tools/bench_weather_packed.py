@@ -0,0 +1,113 @@
+"""
+Benchmark: weather_data vs weather_daily_packed
+
+输出:
+- 存储: 两种格式的总占用(含索引/TOAST; weather_data 汇总全部分区)与行数
+- 扫描: 同一查询窗口下 query_time_series 与 query_time_series_packed 的耗时中位数
+- 校验: 两条读路径返回的数据点必须一致
+
+Usage:
+    python -m app.tools.bench_weather_packed --region CN-GD --weather-type rainfall \
+        --start 2025-01-01T00:00:00Z --end 2025-04-01T00:00:00Z [--repeat 20]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.schemas.shared import DataType, WeatherType
+from app.schemas.weather import WeatherQueryRequest
+from app.services.weather_service import weather_service
+
+STORAGE_SQL = {
+    "weather_data": (
+        "SELECT coalesce(sum(pg_total_relation_size(relid)), 0) "
+        "FROM pg_partition_tree('weather_data')"
+    ),
+    "weather_daily_packed": "SELECT pg_total_relation_size('weather_daily_packed')",
+}
+
+
+def _parse_utc(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+async def _timed(repeat: int, fn) -> tuple:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+async def run_benchmark(session: AsyncSession, request: WeatherQueryRequest, repeat: int) -> dict:
+    report = {}
+    for table, sql in STORAGE_SQL.items():
+        size = (await session.execute(text(sql))).scalar_one()
+        rows = (await session.execute(text(f"SELECT count(*) FROM {table}"))).scalar_one()
+        report[table] = {"total_bytes": int(size), "rows": int(rows)}
+
+    row_ms, row_points = await _timed(
+        repeat, lambda: weather_service.query_time_series(session, request)
+    )
+    packed_ms, packed_points = await _timed(
+        repeat, lambda: weather_service.query_time_series_packed(session, request)
+    )
+    report["scan"] = {
+        "points": len(row_points),
+        "weather_data_median_ms": round(row_ms, 2),
+        "packed_median_ms": round(packed_ms, 2),
+        "results_match": [(p.timestamp, p.value) for p in row_points]
+        == [(p.timestamp, p.value) for p in packed_points],
+    }
+    return report
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Benchmark packed weather storage")
+    parser.add_argument("--region", required=True)
+    parser.add_argument("--weather-type", default=WeatherType.RAINFALL.value)
+    parser.add_argument("--start", required=True, help="起始时间(UTC ISO)")
+    parser.add_argument("--end", required=True, help="结束时间(UTC ISO)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError(
+            "DATABASE_URL is not set. Please set it in your environment or .env file."
+        )
+
+    request = WeatherQueryRequest(
+        region_code=args.region,
+        weather_type=WeatherType(args.weather_type),
+        start_time=_parse_utc(args.start),
+        end_time=_parse_utc(args.end),
+        data_type=DataType.HISTORICAL,
+    )
+
+    engine = create_async_engine(database_url)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        report = await run_benchmark(session, request, args.repeat)
+    await engine.dispose()
+
+    for section, values in report.items():
+        print(section)
+        for key, value in values.items():
+            print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
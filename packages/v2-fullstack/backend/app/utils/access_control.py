@@ -8,8 +8,12 @@ Reference:
 """
 
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from pydantic import BaseModel
 
 from app.schemas.access_control import (
     DataProductType,
@@ -19,10 +23,113 @@ from app.schemas.access_control import (
     UnauthorizedAccessResponse,
     UnauthorizedAccessStrategy,
 )
-from app.schemas.shared import AccessMode, TraceContext
+from app.schemas.shared import (
+    AccessMode,
+    AggregationData,
+    DataProductResponse,
+    EventData,
+    SeriesData,
+    TraceContext,
+)
 
 logger = logging.getLogger(__name__)
 
+# DataProductResponse 中参与字段裁剪的数据区; legend/meta 是信封, 不参与裁剪
+DATA_PRODUCT_SECTIONS = {
+    "series": SeriesData,
+    "events": EventData,
+    "aggregations": AggregationData,
+}
+
+
+@dataclass(frozen=True)
+class SectionPruningPlan:
+    """
+    单个数据区的预编译裁剪计划
+
+    - excluded: 策略外的可选字段, 序列化时排除
+    - masked: 允许但需脱敏的可选字段 (字段名, 脱敏规则), 在内存中改写
+    - 条目 DTO 的必填字段属于结构字段, 不进入 excluded/masked
+    """
+
+    excluded: FrozenSet[str]
+    masked: Tuple[Tuple[str, str], ...]
+
+    def mask_item(self, item: BaseModel) -> BaseModel:
+        """脱敏单个条目(浅拷贝, 不做 dump/validate); 无需脱敏时原样返回"""
+        update = {}
+        for name, rule in self.masked:
+            value = getattr(item, name)
+            if value is not None:
+                update[name] = FieldPruner._mask_value(value, rule)
+        return item.model_copy(update=update) if update else item
+
+
+@dataclass(frozen=True)
+class DataProductPruningPlan:
+    """
+    数据产品的预编译裁剪计划(按 Mode × 数据产品编译一次, 见 compile_pruning_plan)
+
+    裁剪分两步, 均作用于类型化模型(不做 model_dump/model_validate 往返):
+    - 内存: 带 metric 的聚合条目按指标名裁剪/区间化, 需脱敏字段改写(AccessControlManager
+      .prune_data_product); 只涉及少量条目
+    - 序列化: serialization_exclude 给出 model_dump_json 的 exclude, 策略外字段不输出;
+      逐条排除在 pydantic-core 中完成, 大 series/events 不再逐条走 Python
+    出口(HTTP 响应、Redis 缓存)一律经 to_json 序列化, 每个响应只序列化一次
+    """
+
+    mode: AccessMode
+    data_product: DataProductType
+    sections: Dict[str, SectionPruningPlan]
+
+    def serialization_exclude(self, response: DataProductResponse) -> Dict[str, Any]:
+        """model_dump_json 的 exclude 参数(带 metric 的聚合条目整条保留)"""
+        exclude: Dict[str, Any] = {}
+        for section, plan in self.sections.items():
+            items = getattr(response, section)
+            if not items or not plan.excluded:
+                continue
+            if section == "aggregations":
+                per_item = {
+                    index: plan.excluded for index, item in enumerate(items) if not item.metric
+                }
+                if per_item:
+                    exclude[section] = per_item
+            else:
+                exclude[section] = {"__all__": plan.excluded}
+        return exclude
+
+    def to_json(self, response: DataProductResponse) -> str:
+        """按计划序列化响应(单次序列化)"""
+        return response.model_dump_json(exclude=self.serialization_exclude(response))
+
+
+@lru_cache(maxsize=None)
+def compile_pruning_plan(
+    mode: AccessMode, data_product: DataProductType
+) -> DataProductPruningPlan:
+    """
+    编译 Mode × 数据产品的裁剪计划(策略为静态注册表, 结果进程内缓存)
+
+    无策略时按最严默认策略编译: 只保留条目 DTO 的必填字段
+    """
+    rule = PruningPolicyRegistry.get_policy_or_default(mode, data_product).field_pruning
+    sections: Dict[str, SectionPruningPlan] = {}
+    for section, item_model in DATA_PRODUCT_SECTIONS.items():
+        optional = [
+            name for name, field in item_model.model_fields.items() if not field.is_required()
+        ]
+        excluded = frozenset(name for name in optional if not rule.is_field_allowed(name))
+        sections[section] = SectionPruningPlan(
+            excluded=excluded,
+            masked=tuple(
+                (name, rule.should_mask_field(name))
+                for name in optional
+                if name not in excluded and rule.should_mask_field(name)
+            ),
+        )
+    return DataProductPruningPlan(mode=mode, data_product=data_product, sections=sections)
+
 
 class AccessControlManager:
     """
@@ -55,6 +162,7 @@ class AccessControlManager:
         
         # 获取裁剪策略
         self.policy = PruningPolicyRegistry.get_policy_or_default(mode, data_product)
+        self.plan = compile_pruning_plan(mode, data_product)
         
         # 记录策略获取
         self._log_policy_fetch()
@@ -101,6 +209,60 @@ class AccessControlManager:
         
         return pruned_data, pruned_fields if record_pruned_fields else None
     
+    def prune_data_product(self, response: DataProductResponse) -> DataProductResponse:
+        """
+        裁剪数据产品响应(类型化路径, 不做 model_dump/model_validate 往返)
+        
+        只裁剪数据区(series/events/aggregations)的条目:
+        - 带 metric 的聚合条目按指标名裁剪: 不允许的指标整条移除, 需区间化的指标
+          value 取区间下界、label 给出区间
+        - 其他条目的策略外字段在序列化时排除(self.plan.to_json), 需脱敏字段在此改写;
+          条目 DTO 的必填字段属于结构字段, 始终保留
+        
+        Returns:
+            裁剪后的新响应(不修改入参; 未变化的条目与入参共享), 须经 self.plan.to_json 输出
+        """
+        update: Dict[str, Any] = {}
+        pruned_fields = set()
+        for section, plan in self.plan.sections.items():
+            items = getattr(response, section)
+            if not items:
+                continue
+            pruned_fields.update(plan.excluded)
+            if section == "aggregations":
+                items = self._prune_metrics(items)
+            if plan.masked:
+                items = [
+                    item if getattr(item, "metric", None) else plan.mask_item(item)
+                    for item in items
+                ]
+            if items is not getattr(response, section):
+                update[section] = items
+        if pruned_fields:
+            self._log_data_pruning(sorted(pruned_fields))
+        return response.model_copy(update=update)
+    
+    def _prune_metrics(self, items: List[AggregationData]) -> List[AggregationData]:
+        """按指标名裁剪聚合条目(metric 为空的条目原样返回)"""
+        rule = self.policy.field_pruning
+        kept: List[AggregationData] = []
+        dropped = set()
+        for item in items:
+            metric = item.metric
+            if not metric:
+                kept.append(item)
+                continue
+            if not rule.is_field_allowed(metric):
+                dropped.add(metric)
+                continue
+            if rule.should_mask_field(metric) == "range":
+                lower, upper = FieldPruner.range_bounds(item.value)
+                item = item.model_copy(update={"value": lower, "label": f"[{lower}, {upper})"})
+            kept.append(item)
+        if dropped:
+            self._log_data_pruning(sorted(dropped))
+        return kept
+    
     def check_capability(self, capability: str) -> UnauthorizedAccessResponse:
         """
         检查能力权限
@@ -0,0 +1,36 @@
+"""
+批量按ID查询工具 (batchGet)
+
+硬规则:
+- 单次最多 MAX_BATCH_GET_IDS 个不同 id, 超出抛 ValueError(路由层转 400)
+- 结果按请求顺序返回, 重复 id 只保留首次出现
+- 不存在的 id 进入 missing, 由调用方决定如何展示
+"""
+
+from typing import List, Mapping, Sequence, Tuple, TypeVar
+
+from app.schemas.shared import MAX_BATCH_GET_IDS
+
+T = TypeVar("T")
+
+
+def normalize_batch_ids(ids: Sequence[str]) -> List[str]:
+    """
+    去重(保持首次出现顺序)并校验数量
+
+    Raises:
+        ValueError: 为空或超过 MAX_BATCH_GET_IDS
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    if not unique_ids:
+        raise ValueError("ids must not be empty")
+    if len(unique_ids) > MAX_BATCH_GET_IDS:
+        raise ValueError(f"at most {MAX_BATCH_GET_IDS} ids per batch")
+    return unique_ids
+
+
+def order_by_request(ids: Sequence[str], found: Mapping[str, T]) -> Tuple[List[T], List[str]]:
+    """按请求顺序排列查询结果, 返回 (items, missing)"""
+    items = [found[item_id] for item_id in ids if item_id in found]
+    missing = [item_id for item_id in ids if item_id not in found]
+    return items, missing
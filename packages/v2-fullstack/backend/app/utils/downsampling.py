@@ -0,0 +1,122 @@
+"""
+时间序列降采样 (L1 Timeline 天气泳道)
+
+算法(均返回保留点的下标, 升序):
+- LTTB (Largest-Triangle-Three-Buckets): 保持视觉形态, 适合连续量(温度/风速)
+- min/max 包络: 每桶保留最小值与最大值, 峰值不丢, 适合尖峰型序列(降雨)
+
+硬规则:
+- 首尾点始终保留
+- 阈值穿越点(穿越前后两点)始终保留, 风险标记与曲线对齐; 必保点超过预算时以正确性优先
+- 输入为列式数组(x 为 epoch 秒, y 为数值), 不构造逐点对象
+"""
+
+from enum import Enum
+from typing import Iterable, List, Sequence
+
+MIN_LTTB_POINTS = 3
+
+
+class DownsamplingMethod(str, Enum):
+    LTTB = "lttb"
+    MIN_MAX = "min_max"
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """LTTB 选点(threshold ≥ 3; 点数不超过 threshold 时原样返回)"""
+    n = len(xs)
+    if threshold >= n or n <= MIN_LTTB_POINTS:
+        return list(range(n))
+    threshold = max(threshold, MIN_LTTB_POINTS)
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # 下一个桶的平均点
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        # 当前桶内与 (a, avg) 构成最大三角形的点
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def min_max_indices(ys: Sequence[float], max_points: int) -> List[int]:
+    """min/max 包络选点: 首尾 + 每桶最小/最大值(最多 max_points 个点)"""
+    n = len(ys)
+    if max_points >= n or n <= 2:
+        return list(range(n))
+    buckets = max((max_points - 2) // 2, 1)
+    interior = n - 2
+    selected = {0, n - 1}
+    for b in range(buckets):
+        start = 1 + b * interior // buckets
+        end = 1 + (b + 1) * interior // buckets
+        if start >= end:
+            continue
+        low = high = start
+        for j in range(start + 1, end):
+            if ys[j] < ys[low]:
+                low = j
+            elif ys[j] > ys[high]:
+                high = j
+        selected.update((low, high))
+    return sorted(selected)
+
+
+def threshold_crossing_indices(ys: Sequence[float], thresholds: Iterable[float]) -> List[int]:
+    """穿越任一阈值(由 < t 变为 ≥ t 或相反)的前后两点"""
+    levels = sorted(set(thresholds))
+    if not levels:
+        return []
+    selected = set()
+    for i in range(1, len(ys)):
+        prev, cur = ys[i - 1], ys[i]
+        low, high = (prev, cur) if prev <= cur else (cur, prev)
+        if any(low < t <= high for t in levels):
+            selected.update((i - 1, i))
+    return sorted(selected)
+
+
+def downsample_indices(
+    xs: Sequence[float],
+    ys: Sequence[float],
+    max_points: int,
+    *,
+    method: DownsamplingMethod = DownsamplingMethod.LTTB,
+    thresholds: Iterable[float] = (),
+) -> List[int]:
+    """
+    降采样到 max_points 以内(必保点除外), 返回保留点下标
+
+    Raises:
+        ValueError: xs/ys 长度不一致或 max_points < 3
+    """
+    if len(xs) != len(ys):
+        raise ValueError("xs and ys must have the same length")
+    if max_points < MIN_LTTB_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_LTTB_POINTS}")
+    if len(xs) <= max_points:
+        return list(range(len(xs)))
+
+    keep = threshold_crossing_indices(ys, thresholds)
+    budget = max(max_points - len(keep), MIN_LTTB_POINTS)
+    if method == DownsamplingMethod.MIN_MAX:
+        picked = min_max_indices(ys, budget)
+    else:
+        picked = lttb_indices(xs, ys, budget)
+    return sorted(set(picked).union(keep))
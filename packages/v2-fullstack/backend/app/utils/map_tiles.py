@@ -0,0 +1,48 @@
+"""
+Web Mercator 瓦片坐标工具 (slippy map: zoom/x/y)
+
+用途:
+- H3 单元中心点 → OVERLAY_BASE_ZOOM 下的瓦片坐标(seed 时预计算, 存 h3_cell_regions)
+- 任意 zoom ≤ OVERLAY_BASE_ZOOM 的瓦片 → base zoom 下的坐标范围(整数移位, 查询侧无需地理计算)
+
+硬规则:
+- 纬度按 Web Mercator 有效范围(±85.05112878°)截断
+- zoom 超过 OVERLAY_BASE_ZOOM 的瓦片没有更细的数据, 由前端放大 base zoom 瓦片
+"""
+
+import math
+from typing import Tuple
+
+OVERLAY_BASE_ZOOM = 12
+MAX_MERCATOR_LATITUDE = 85.05112878
+
+
+def latlng_to_tile(lat: float, lng: float, zoom: int = OVERLAY_BASE_ZOOM) -> Tuple[int, int]:
+    """经纬度 → (x, y) 瓦片坐标"""
+    n = 1 << zoom
+    lat = max(-MAX_MERCATOR_LATITUDE, min(MAX_MERCATOR_LATITUDE, lat))
+    lat_rad = math.radians(lat)
+    x = int((lng + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def validate_tile(zoom: int, x: int, y: int) -> None:
+    """
+    校验瓦片坐标
+
+    Raises:
+        ValueError: zoom 超出 [0, OVERLAY_BASE_ZOOM] 或 x/y 越界
+    """
+    if not 0 <= zoom <= OVERLAY_BASE_ZOOM:
+        raise ValueError(f"zoom must be between 0 and {OVERLAY_BASE_ZOOM}: {zoom}")
+    n = 1 << zoom
+    if not (0 <= x < n and 0 <= y < n):
+        raise ValueError(f"tile out of range at zoom {zoom}: ({x}, {y})")
+
+
+def base_tile_span(zoom: int, x: int, y: int) -> Tuple[int, int, int, int]:
+    """瓦片在 base zoom 下覆盖的 (x_min, x_max, y_min, y_max), 闭区间"""
+    validate_tile(zoom, x, y)
+    shift = OVERLAY_BASE_ZOOM - zoom
+    return x << shift, ((x + 1) << shift) - 1, y << shift, ((y + 1) << shift) - 1
@@ -0,0 +1,53 @@
+"""
+Keyset 分页游标工具
+
+游标为不透明字符串(urlsafe base64 JSON), 内容为上一页最后一行的排序键:
+- t: 排序时间(UTC ISO)
+- id: 主键(同一时间点的并列决胜)
+
+硬规则:
+- 调用方不得解析游标内容; 格式变更通过 v 字段区分
+- 非法游标统一抛 ValueError(路由层转 400)
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from typing import Tuple
+
+CURSOR_VERSION = 1
+
+
+def encode_keyset_cursor(sort_time: datetime, row_id: str) -> str:
+    """编码 (时间, id) 游标"""
+    if sort_time.tzinfo is None:
+        sort_time = sort_time.replace(tzinfo=timezone.utc)
+    payload = {
+        "v": CURSOR_VERSION,
+        "t": sort_time.astimezone(timezone.utc).isoformat(),
+        "id": row_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_keyset_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    解码游标
+
+    Raises:
+        ValueError: 游标非法
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload.get("v") != CURSOR_VERSION:
+            raise ValueError("unsupported cursor version")
+        sort_time = datetime.fromisoformat(payload["t"])
+        row_id = payload["id"]
+    except (ValueError, KeyError, TypeError, AttributeError, binascii.Error, UnicodeEncodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(row_id, str) or sort_time.tzinfo is None:
+        raise ValueError("invalid cursor")
+    return sort_time, row_id
@@ -0,0 +1,89 @@
+"""
+SQL 时间分桶工具 (按 region_timezone 自然边界)
+
+SQL 侧: date_trunc(field, ts, tz) (PostgreSQL 12+)
+- 在 tz 本地时间截断, 返回 TIMESTAMPTZ(UTC 存储)
+- day 边界与 align_to_natural_day_start 一致; month 与 align_to_natural_month_start 一致
+- week 为 ISO 周(周一 00:00 起始)
+
+Python 侧: local_bucket_start() 与 SQL 口径一致, 用于补齐空桶/测试比对
+
+硬规则:
+- field/tz 以字面量内联(literal_execute), 保证 SELECT 与 GROUP BY 表达式完全相同
+- tz 必须先通过 validate_timezone 校验
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, literal
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.schemas.time import TimeGranularity
+from app.utils.time_utils import (
+    align_to_natural_day_start,
+    align_to_natural_month_start,
+    region_tz_to_utc,
+    utc_to_region_tz,
+    validate_timezone,
+)
+
+
+def local_bucket(
+    column: ColumnElement,
+    granularity: TimeGranularity,
+    region_timezone: str,
+) -> ColumnElement:
+    """
+    生成按 region_timezone 截断的分桶表达式
+
+    Raises:
+        ValueError: 时区无效
+    """
+    if not validate_timezone(region_timezone):
+        raise ValueError(f"invalid region_timezone: {region_timezone}")
+    return func.date_trunc(
+        literal(granularity.value, literal_execute=True),
+        column,
+        literal(region_timezone, literal_execute=True),
+    )
+
+
+def local_bucket_start(
+    utc_time: datetime,
+    granularity: TimeGranularity,
+    region_timezone: str,
+) -> datetime:
+    """Python 侧分桶起点(UTC), 与 local_bucket 口径一致"""
+    if granularity == TimeGranularity.DAY:
+        return align_to_natural_day_start(utc_time, region_timezone)
+    if granularity == TimeGranularity.MONTH:
+        return align_to_natural_month_start(utc_time, region_timezone)
+
+    region_time = utc_to_region_tz(utc_time, region_timezone)
+    if granularity == TimeGranularity.HOUR:
+        region_start = region_time.replace(minute=0, second=0, microsecond=0)
+    else:
+        region_start = (region_time - timedelta(days=region_time.weekday())).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+    return region_tz_to_utc(region_start, region_timezone)
+
+
+# 跨过一个桶(含夏令时 23/25 小时日)但不跨过两个桶的步长, 再对齐到桶起点
+_NEXT_BUCKET_STEP = {
+    TimeGranularity.HOUR: timedelta(hours=1),
+    TimeGranularity.DAY: timedelta(hours=36),
+    TimeGranularity.WEEK: timedelta(days=7, hours=12),
+    TimeGranularity.MONTH: timedelta(days=32),
+}
+
+
+def next_local_bucket_start(
+    bucket_start: datetime,
+    granularity: TimeGranularity,
+    region_timezone: str,
+) -> datetime:
+    """下一个桶的起点(UTC); bucket_start 须为 local_bucket_start 的结果"""
+    return local_bucket_start(
+        bucket_start + _NEXT_BUCKET_STEP[granularity], granularity, region_timezone
+    )
@@ -0,0 +1,90 @@
+"""
+天气序列紧凑存储编解码 (weather_daily_packed)
+
+格式(每行 = 一个区域 × 天气类型 × 批次 × region_timezone 自然日):
+- 槽位: 自 day_start(本地 00:00 对应的 UTC) 起每小时一个, slot_count = 当日小时数(DST 日 23/25)
+- packed_values: 小端 int64 数组, 值 = round(value × 10^scale)  (Numeric(10,2) 无损)
+- validity: 位图, bit i = 1 表示槽位 i 有值(LSB first)
+
+硬规则:
+- 只接受整点数据(与 weather_data 小时粒度一致), 非整点直接报错而不是静默丢弃
+"""
+
+import struct
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.utils.time_utils import region_tz_to_utc, utc_to_region_tz
+
+VALUE_SCALE = 2
+SLOT_SECONDS = 3600
+
+ValueSlots = List[Optional[Decimal]]
+
+
+def local_day_slots(local_date: date, region_timezone: str) -> Tuple[datetime, int]:
+    """返回 (本地自然日起点UTC, 当日小时槽位数)"""
+    day_start = region_tz_to_utc(datetime.combine(local_date, time()), region_timezone)
+    next_start = region_tz_to_utc(
+        datetime.combine(local_date + timedelta(days=1), time()), region_timezone
+    )
+    return day_start, int((next_start - day_start).total_seconds()) // SLOT_SECONDS
+
+
+def pack_values(values: Sequence[Optional[Decimal]], scale: int = VALUE_SCALE) -> Tuple[bytes, bytes]:
+    """编码槽位数组 → (values, validity)"""
+    factor = Decimal(10) ** scale
+    ints = [
+        0 if value is None
+        else int((Decimal(value) * factor).to_integral_value(rounding=ROUND_HALF_UP))
+        for value in values
+    ]
+    bitmap = bytearray((len(values) + 7) // 8)
+    for index, value in enumerate(values):
+        if value is not None:
+            bitmap[index >> 3] |= 1 << (index & 7)
+    return struct.pack(f"<{len(ints)}q", *ints), bytes(bitmap)
+
+
+def unpack_values(
+    packed: bytes,
+    validity: bytes,
+    slot_count: int,
+    scale: int = VALUE_SCALE,
+) -> ValueSlots:
+    """解码 (values, validity) → 槽位数组(无值为 None)"""
+    if len(packed) != slot_count * 8 or len(validity) != (slot_count + 7) // 8:
+        raise ValueError("packed weather row does not match slot_count")
+    ints = struct.unpack(f"<{slot_count}q", packed)
+    return [
+        Decimal(ints[index]).scaleb(-scale)
+        if validity[index >> 3] & (1 << (index & 7))
+        else None
+        for index in range(slot_count)
+    ]
+
+
+def group_into_local_days(
+    points: Iterable[Tuple[datetime, Decimal]],
+    region_timezone: str,
+) -> Dict[date, ValueSlots]:
+    """
+    将小时点 (timestamp UTC, value) 按 region_timezone 自然日装入槽位
+
+    Raises:
+        ValueError: 非整点时间
+    """
+    days: Dict[date, ValueSlots] = {}
+    day_starts: Dict[date, datetime] = {}
+    for timestamp, value in points:
+        local_date = utc_to_region_tz(timestamp, region_timezone).date()
+        if local_date not in days:
+            day_start, slot_count = local_day_slots(local_date, region_timezone)
+            days[local_date] = [None] * slot_count
+            day_starts[local_date] = day_start
+        offset = (timestamp - day_starts[local_date]).total_seconds()
+        if offset % SLOT_SECONDS:
+            raise ValueError(f"weather timestamp is not hour aligned: {timestamp.isoformat()}")
+        days[local_date][int(offset) // SLOT_SECONDS] = value
+    return days
@@ -0,0 +1,71 @@
+"""
+共享测试工具
+
+语句计数(锁定每个端点/服务方法发出的 SQL 条数):
+- query_recorder: 记录 session.execute/stream 的 AsyncMock 会话(无数据库)
+- count_statements(): 监听真实引擎的 before_cursor_execute(需要数据库)
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator, List
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryRecorder:
+    """记录经由 AsyncSession 发出的语句; 每条语句返回空结果"""
+
+    def __init__(self) -> None:
+        self.statements: List[object] = []
+        self.session = AsyncMock()
+        self.session.execute.side_effect = self._record
+        self.session.stream.side_effect = self._record
+
+    async def _record(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        result = Mock()
+        result.all.return_value = []
+        result.scalars.return_value.all.return_value = []
+        result.scalar_one_or_none.return_value = None
+        result.__aiter__ = lambda _self: iter_empty()
+        return result
+
+    def assert_count(self, expected: int) -> None:
+        assert len(self.statements) == expected, (
+            f"expected {expected} statements, got {len(self.statements)}: "
+            + "; ".join(str(s).splitlines()[0] for s in self.statements)
+        )
+
+
+async def _empty():
+    if False:  # pragma: no cover
+        yield
+
+
+def iter_empty():
+    return _empty().__aiter__()
+
+
+@pytest.fixture
+def query_recorder() -> QueryRecorder:
+    return QueryRecorder()
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Iterator[List[str]]:
+    """统计真实引擎上执行的 SQL(异步引擎传 engine.sync_engine)"""
+    statements: List[str] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
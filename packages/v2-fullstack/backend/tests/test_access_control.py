@@ -4,6 +4,8 @@
 Reference: docs/v2/v2实施细则/02-Access-Mode裁剪基线-细则.md
 """
 
+import json
+from datetime import datetime, timezone
 from decimal import Decimal
 
 import pytest
@@ -18,10 +20,21 @@ from app.schemas.access_control import (
     PruningPolicyRegistry,
     UnauthorizedAccessStrategy,
 )
-from app.schemas.shared import AccessMode
+from app.schemas.shared import (
+    AccessMode,
+    AggregationData,
+    DataProductResponse,
+    DataType,
+    EventData,
+    LegendMeta,
+    ResponseMeta,
+    TraceContext,
+    WeatherType,
+)
 from app.utils.access_control import (
     AccessControlManager,
     check_capability_permission,
+    compile_pruning_plan,
     prune_response_data,
 )
 
@@ -411,3 +424,84 @@ class TestSecurityValidation:
         # Demo/Public下，L0和L2都不应该允许明细(或强制聚合)
         assert not manager_l0.should_allow_detail() or manager_l0.should_force_aggregation()
         assert not manager_l2.should_allow_detail() or manager_l2.should_force_aggregation()
+
+
+class TestTypedDataProductPruning:
+    """类型化裁剪计划: 不做 dump/validate 往返, 策略外字段在序列化时排除"""
+
+    @staticmethod
+    def _response(**sections):
+        return DataProductResponse(
+            **sections,
+            legend=LegendMeta(
+                data_type=DataType.HISTORICAL, weather_type=WeatherType.RAINFALL, unit="mm"
+            ),
+            meta=ResponseMeta(
+                trace_context=TraceContext(trace_id="t", access_mode=AccessMode.DEMO_PUBLIC),
+                response_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            ),
+        )
+
+    def test_plan_is_compiled_once_per_mode_and_product(self):
+        plan = compile_pruning_plan(AccessMode.DEMO_PUBLIC, DataProductType.L1_REGION_INTELLIGENCE)
+
+        assert plan is compile_pruning_plan(
+            AccessMode.DEMO_PUBLIC, DataProductType.L1_REGION_INTELLIGENCE
+        )
+        # 无策略 → 最严默认: 可选字段全部排除, 必填字段不在排除集中
+        assert {"tier_level", "trigger_value", "amount"} <= plan.sections["events"].excluded
+        assert "event_id" not in plan.sections["events"].excluded
+
+    def test_events_pruned_at_serialization_without_mutating_input(self):
+        event = EventData(
+            event_id="evt-1",
+            timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            event_type="claim",
+            amount=Decimal("12345"),
+            data_type=DataType.HISTORICAL,
+        )
+        response = self._response(events=[event])
+        manager = AccessControlManager(
+            mode=AccessMode.DEMO_PUBLIC, data_product=DataProductType.L1_REGION_INTELLIGENCE
+        )
+
+        pruned = manager.prune_data_product(response)
+        payload = json.loads(manager.plan.to_json(pruned))
+
+        assert payload["events"] == [
+            {
+                "event_id": "evt-1",
+                "timestamp": "2025-01-01T00:00:00Z",
+                "event_type": "claim",
+                "data_type": "historical",
+            }
+        ]
+        assert response.events[0].amount == Decimal("12345")
+
+    def test_metric_aggregations_keep_their_fields_when_serialized(self):
+        response = self._response(
+            aggregations=[
+                AggregationData(
+                    aggregation_key="total",
+                    aggregation_method="sum",
+                    value=Decimal("12345"),
+                    metric="policy_amount_total",
+                ),
+                AggregationData(
+                    aggregation_key="region_code",
+                    aggregation_method="sum",
+                    value=1,
+                    label="internal-only",
+                ),
+            ]
+        )
+        manager = AccessControlManager(
+            mode=AccessMode.DEMO_PUBLIC, data_product=DataProductType.L0_DASHBOARD
+        )
+
+        payload = json.loads(manager.plan.to_json(manager.prune_data_product(response)))
+        metric, plain = payload["aggregations"]
+
+        assert metric["metric"] == "policy_amount_total"
+        assert metric["label"].startswith("[")
+        assert "label" not in plain
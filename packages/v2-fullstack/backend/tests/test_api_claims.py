@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 
 from app.api.deps import get_access_mode, get_session
 from app.api.v1 import claims
+from app.schemas.claim import ClaimPage
 from app.schemas.shared import AccessMode
 from app.services.claim_service import claim_service
 
@@ -27,7 +28,7 @@ def _build_client(access_mode: AccessMode) -> TestClient:
 
 def test_list_claims_calls_service(monkeypatch):
     client = _build_client(AccessMode.DEMO_PUBLIC)
-    mock = AsyncMock(return_value=[])
+    mock = AsyncMock(return_value=ClaimPage(items=[]))
     monkeypatch.setattr(claim_service, "list_by_filter", mock)
 
     response = client.get("/api/v1/claims")
@@ -49,7 +50,7 @@ def test_get_claim_returns_404(monkeypatch):
 
 def test_list_claims_by_policy(monkeypatch):
     client = _build_client(AccessMode.DEMO_PUBLIC)
-    mock = AsyncMock(return_value=[])
+    mock = AsyncMock(return_value=ClaimPage(items=[]))
     monkeypatch.setattr(claim_service, "list_by_policy", mock)
 
     response = client.get("/api/v1/policies/pol-001/claims")
@@ -57,6 +58,30 @@ def test_list_claims_by_policy(monkeypatch):
     assert response.status_code == 200
     assert response.json() == []
     assert mock.await_count == 1
+    assert "x-next-cursor" not in response.headers
+
+
+def test_list_claims_returns_next_cursor_header(monkeypatch):
+    client = _build_client(AccessMode.DEMO_PUBLIC)
+    mock = AsyncMock(return_value=ClaimPage(items=[], next_cursor="abc"))
+    monkeypatch.setattr(claim_service, "list_by_policy", mock)
+
+    response = client.get("/api/v1/policies/pol-001/claims?limit=20&cursor=prev")
+
+    assert response.status_code == 200
+    assert response.headers["X-Next-Cursor"] == "abc"
+    assert mock.await_args.kwargs == {"limit": 20, "cursor": "prev"}
+
+
+def test_list_claims_invalid_cursor_returns_400(monkeypatch):
+    client = _build_client(AccessMode.DEMO_PUBLIC)
+    monkeypatch.setattr(
+        claim_service, "list_by_filter", AsyncMock(side_effect=ValueError("invalid cursor"))
+    )
+
+    response = client.get("/api/v1/claims?cursor=garbage")
+
+    assert response.status_code == 400
 
 
 def test_get_claim_stats(monkeypatch):
@@ -68,3 +93,23 @@ def test_get_claim_stats(monkeypatch):
 
     assert response.status_code == 200
     assert response.json()["claim_count"] == 0
+
+
+def test_next_cursor_header_is_exposed_to_browsers(monkeypatch):
+    from app.main import app
+
+    app.dependency_overrides[get_session] = _override_get_session
+    app.dependency_overrides[get_access_mode] = lambda: AccessMode.DEMO_PUBLIC
+    monkeypatch.setattr(
+        claim_service, "list_by_policy", AsyncMock(return_value=ClaimPage(items=[]))
+    )
+    try:
+        response = TestClient(app).get(
+            "/api/v1/policies/pol-001/claims",
+            headers={"Origin": "http://localhost:5173"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    exposed = response.headers["access-control-expose-headers"].split(",")
+    assert claims.NEXT_CURSOR_HEADER in [header.strip() for header in exposed]
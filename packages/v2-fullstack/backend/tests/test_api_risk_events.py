@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from unittest.mock import AsyncMock
 
 from fastapi import FastAPI
@@ -108,3 +109,126 @@ def test_get_risk_event_calls_service(monkeypatch):
     assert response.status_code == 200
     assert response.json()["id"] == "evt-001"
     assert mock.await_count == 1
+
+
+_LIST_PARAMS = {
+    "region_code": "CN-GD",
+    "weather_type": "rainfall",
+    "data_type": "historical",
+    "time_range_start": "2025-01-01T00:00:00Z",
+    "time_range_end": "2025-01-02T00:00:00Z",
+}
+
+
+def test_page_risk_events_is_not_shadowed_by_event_id(monkeypatch):
+    client = _build_client()
+    mock = AsyncMock(return_value={"items": [], "next_cursor": None})
+    monkeypatch.setattr(risk_service, "query_events_page", mock)
+    get_by_id = AsyncMock(return_value=None)
+    monkeypatch.setattr(risk_service, "get_by_id", get_by_id)
+
+    response = client.get("/api/v1/risk-events/page", params={**_LIST_PARAMS, "page_size": 50})
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+    assert mock.await_args.kwargs["page_size"] == 50
+    assert get_by_id.await_count == 0
+
+
+def test_page_risk_events_invalid_cursor_returns_400():
+    client = _build_client()
+    response = client.get("/api/v1/risk-events/page", params={**_LIST_PARAMS, "cursor": "bogus"})
+    assert response.status_code == 400
+
+
+def test_export_risk_events_streams_ndjson(monkeypatch):
+    from app.api.v1 import risk_events as risk_events_module
+    from app.schemas.risk_event import RiskEventResponse
+
+    class _SessionContext:
+        async def __aenter__(self):
+            return AsyncMock()
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(
+        risk_events_module, "get_sessionmaker", lambda: (lambda: _SessionContext())
+    )
+
+    async def _stream(session, **kwargs):
+        for event_id in ("evt-1", "evt-2"):
+            yield RiskEventResponse(
+                id=event_id,
+                timestamp="2025-01-01T00:00:00Z",
+                region_code="CN-GD",
+                product_id="daily_rainfall",
+                product_version="v1.0.0",
+                weather_type="rainfall",
+                tier_level=1,
+                trigger_value="10.00",
+                threshold_value="5.00",
+                data_type="historical",
+                prediction_run_id=None,
+                created_at="2025-01-01T00:00:00Z",
+            )
+
+    monkeypatch.setattr(risk_service, "stream_events", _stream)
+    client = _build_client()
+
+    response = client.get("/api/v1/risk-events/export", params=_LIST_PARAMS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == ["evt-1", "evt-2"]
+
+
+def test_export_risk_events_validates_before_streaming():
+    client = _build_client()
+    response = client.get(
+        "/api/v1/risk-events/export",
+        params={**_LIST_PARAMS, "data_type": "predicted"},
+    )
+    assert response.status_code == 400
+
+
+def test_timeline_route_passes_granularity(monkeypatch):
+    client = _build_client()
+    mock = AsyncMock(return_value=[])
+    monkeypatch.setattr(risk_service, "aggregate_by_bucket", mock)
+    get_by_id = AsyncMock(return_value=None)
+    monkeypatch.setattr(risk_service, "get_by_id", get_by_id)
+
+    response = client.get(
+        "/api/v1/risk-events/timeline",
+        params={**_LIST_PARAMS, "granularity": "week"},
+    )
+
+    assert response.status_code == 200
+    assert mock.await_args.kwargs["granularity"].value == "week"
+    assert get_by_id.await_count == 0
+
+
+def test_timeline_route_invalid_timezone_returns_400():
+    client = _build_client()
+    response = client.get(
+        "/api/v1/risk-events/timeline",
+        params={**_LIST_PARAMS, "region_timezone": "Mars/Base"},
+    )
+    assert response.status_code == 400
+
+
+def test_by_region_route_accepts_repeated_region_codes(monkeypatch):
+    client = _build_client()
+    mock = AsyncMock(return_value=[])
+    monkeypatch.setattr(risk_service, "aggregate_by_region", mock)
+
+    params = {k: v for k, v in _LIST_PARAMS.items() if k != "region_code"}
+    response = client.get(
+        "/api/v1/risk-events/by-region",
+        params=[*params.items(), ("region_codes", "CN-GD"), ("region_codes", "CN-ZJ")],
+    )
+
+    assert response.status_code == 200
+    assert mock.await_args.kwargs["region_codes"] == ["CN-GD", "CN-ZJ"]
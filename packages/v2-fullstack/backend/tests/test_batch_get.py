@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api.deps import get_access_mode, get_session
+from app.api.v1 import claims, policies, risk_events
+from app.schemas.shared import MAX_BATCH_GET_IDS, AccessMode
+from app.services.claim_service import ClaimService
+from app.services.policy_service import PolicyService
+from app.services.risk_service import RiskService
+from app.utils.batch_lookup import normalize_batch_ids, order_by_request
+
+AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _policy_row(policy_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=policy_id,
+        policy_number=f"NO-{policy_id}",
+        product_id="daily_rainfall",
+        coverage_region="CN-GD",
+        coverage_amount=Decimal("123456.00"),
+        timezone="Asia/Shanghai",
+        coverage_start=AT,
+        coverage_end=AT + timedelta(days=30),
+        holder_name="张三",
+        is_active=True,
+        created_at=AT,
+        updated_at=AT,
+    )
+
+
+def _event_row(event_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=event_id,
+        timestamp=AT,
+        region_code="CN-GD",
+        product_id="daily_rainfall",
+        product_version="v1",
+        weather_type="rainfall",
+        tier_level=1,
+        trigger_value=Decimal("60"),
+        threshold_value=Decimal("50"),
+        data_type="historical",
+        prediction_run_id=None,
+        created_at=AT,
+    )
+
+
+def _session(*, scalars=None, rows=None) -> AsyncMock:
+    session = AsyncMock()
+    result = Mock()
+    result.scalars.return_value.all.return_value = scalars or []
+    result.all.return_value = rows or []
+    session.execute.return_value = result
+    return session
+
+
+def test_normalize_batch_ids_dedupes_and_enforces_limit():
+    assert normalize_batch_ids(["b", "a", "b"]) == ["b", "a"]
+    assert len(normalize_batch_ids(["x"] * (MAX_BATCH_GET_IDS + 5))) == 1
+    with pytest.raises(ValueError):
+        normalize_batch_ids([f"id-{i}" for i in range(MAX_BATCH_GET_IDS + 1)])
+    with pytest.raises(ValueError):
+        normalize_batch_ids([])
+
+
+def test_order_by_request_reports_missing():
+    items, missing = order_by_request(["c", "a", "z"], {"a": 1, "c": 3})
+    assert items == [3, 1]
+    assert missing == ["z"]
+
+
+@pytest.mark.asyncio
+async def test_policy_get_by_ids_one_query_request_order_and_pruning():
+    session = _session(scalars=[_policy_row("p1"), _policy_row("p3")])
+
+    batch = await PolicyService().get_by_ids(session, ["p3", "p2", "p1", "p3"])
+
+    session.execute.assert_awaited_once()
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "policies.id = ANY (%(ids)s::VARCHAR[])" in sql
+    assert [p.id for p in batch.items] == ["p3", "p1"]
+    assert batch.missing == ["p2"]
+    assert batch.items[0].holder_name == "张***"
+    assert batch.items[0].coverage_amount == Decimal("120000")
+
+
+@pytest.mark.asyncio
+async def test_claim_get_by_ids_binds_array_parameter():
+    session = _session()
+
+    batch = await ClaimService().get_by_ids(session, ["c2", "c1"], AccessMode.ADMIN_INTERNAL)
+
+    params = session.execute.call_args.args[0].compile(dialect=postgresql.dialect()).params
+    assert params["ids"] == ["c2", "c1"]
+    assert batch.items == []
+    assert batch.missing == ["c2", "c1"]
+
+
+@pytest.mark.asyncio
+async def test_risk_event_get_by_ids_reads_scalar_columns():
+    session = _session(rows=[_event_row("e2"), _event_row("e1")])
+
+    batch = await RiskService().get_by_ids(session, ["e1", "e2"])
+
+    session.execute.assert_awaited_once()
+    assert [e.id for e in batch.items] == ["e1", "e2"]
+    assert batch.missing == []
+
+
+def _build_client() -> TestClient:
+    app = FastAPI()
+    for module in (claims, policies, risk_events):
+        app.include_router(module.router, prefix="/api/v1")
+
+    async def _override_get_session():
+        yield _session(rows=[_event_row("e1")])
+
+    app.dependency_overrides[get_session] = _override_get_session
+    app.dependency_overrides[get_access_mode] = lambda: AccessMode.DEMO_PUBLIC
+    return TestClient(app)
+
+
+def test_batch_get_route_returns_items_and_missing():
+    client = _build_client()
+
+    response = client.post("/api/v1/risk-events:batchGet", json={"ids": ["e9", "e1"]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [e["id"] for e in body["items"]] == ["e1"]
+    assert body["missing"] == ["e9"]
+
+
+@pytest.mark.parametrize("path", ["/api/v1/claims:batchGet", "/api/v1/policies:batchGet"])
+def test_batch_get_routes_reject_oversized_requests(path):
+    client = _build_client()
+
+    too_many = {"ids": [f"id-{i}" for i in range(MAX_BATCH_GET_IDS + 1)]}
+
+    assert client.post(path, json=too_many).status_code == 422
+    assert client.post(path, json={"ids": []}).status_code == 422
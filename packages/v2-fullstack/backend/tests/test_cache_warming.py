@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import importlib
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import redis
+
+from app.celery_app import celery_app
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import AccessMode, RegionScope, WeatherType
+from app.services.cache_warming import (
+    CacheWarmingService,
+    WarmTarget,
+    preset_time_ranges,
+    warm_items,
+)
+from app.services.data_product_cache import DataProductCache
+from app.services.data_products_service import map_overlays_service
+from app.services.policy_portfolio import PolicyPortfolioIndex, PolicySnapshot
+from app.services.single_flight import SingleFlight
+
+# app.services 包把同名单例导出为属性, 这里需要的是模块本身
+data_products_module = importlib.import_module("app.services.data_products_service")
+batch_module = importlib.import_module("app.services.data_product_batch")
+warming_module = importlib.import_module("app.services.cache_warming")
+
+NOW = datetime(2025, 3, 10, 17, 30, tzinfo=timezone.utc)
+
+
+def _local_cache(**kwargs) -> DataProductCache:
+    return DataProductCache(
+        redis_factory=lambda: Mock(pipeline=Mock(side_effect=redis.ConnectionError)),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def builders(monkeypatch):
+    """只预热 Overlays, 记录每次实际构建的区域"""
+    calls = []
+
+    def _overlays(dimensions):
+        calls.append(dimensions.region_code)
+        if dimensions.region_code == "CN-ZJ":
+            raise ValueError("region not found")
+        return map_overlays_service.build_response(dimensions)
+
+    registry = {DataProductType.MAP_OVERLAYS: _overlays}
+    monkeypatch.setattr(batch_module, "BATCH_BUILDERS", registry)
+    monkeypatch.setattr(warming_module, "BATCH_BUILDERS", registry)
+    monkeypatch.setattr(
+        data_products_module,
+        "data_product_flight",
+        SingleFlight(
+            "test-flight",
+            redis_factory=lambda: Mock(lock=Mock(side_effect=redis.ConnectionError)),
+        ),
+    )
+    return calls
+
+
+def test_presets_end_at_next_utc_midnight():
+    ranges = preset_time_ranges(NOW)
+
+    assert {time_range.end for time_range in ranges} == {
+        datetime(2025, 3, 11, tzinfo=timezone.utc)
+    }
+    assert [(r.end - r.start).days for r in ranges] == [7, 30, 90]
+    # 同一天内任意时刻得到相同区间(缓存键确定)
+    assert preset_time_ranges(NOW.replace(hour=0, minute=0)) == ranges
+
+
+def test_warm_items_cover_lineage_products_presets_and_modes():
+    items = warm_items(
+        [
+            WarmTarget("CN-GD-SZ", "daily_rainfall", WeatherType.RAINFALL),
+            WarmTarget("CN-GD", "daily_rainfall", WeatherType.RAINFALL),
+        ],
+        now=NOW,
+    )
+
+    # (district + province) x (产品 + 未指定) x 3 预设 x 3 Mode x 3 数据产品, 去重后
+    assert len(items) == 2 * 2 * 3 * len(AccessMode) * 3
+    scopes = {(dims.region_code, dims.region_scope) for _, dims in items}
+    assert scopes == {
+        ("CN-GD-SZ", RegionScope.DISTRICT),
+        ("CN-GD", RegionScope.PROVINCE),
+    }
+    assert {dims.product_id for _, dims in items} == {"daily_rainfall", None}
+    assert {dims.access_mode for _, dims in items} == set(AccessMode)
+    assert {product_type for product_type, _ in items} == {
+        DataProductType.L0_DASHBOARD,
+        DataProductType.MAP_OVERLAYS,
+        DataProductType.L1_REGION_INTELLIGENCE,
+    }
+
+
+@pytest.mark.asyncio
+async def test_warm_builds_missing_keys_once_and_reports_failures(monkeypatch, builders):
+    monkeypatch.setattr(data_products_module, "data_product_cache", _local_cache())
+    service = CacheWarmingService(concurrency=2)
+    targets = [
+        WarmTarget("CN-GD", "daily_rainfall", WeatherType.RAINFALL),
+        WarmTarget("CN-ZJ", "daily_rainfall", WeatherType.RAINFALL),
+    ]
+    per_region = 2 * 3 * len(AccessMode)
+
+    first = await service.warm(targets, now=NOW)
+    second = await service.warm(targets, now=NOW)
+
+    assert (first.keys, first.warmed, first.failed) == (2 * per_region, per_region, per_region)
+    # 新鲜条目不重复构建(失败项不入缓存, 再次尝试)
+    assert second.warmed == per_region
+    assert builders.count("CN-GD") == per_region
+    assert builders.count("CN-ZJ") == 2 * per_region
+
+
+@pytest.mark.asyncio
+async def test_warm_rebuilds_stale_entries_synchronously(monkeypatch, builders):
+    # 条目写入即过新鲜期、仍在宽限期内
+    monkeypatch.setattr(
+        data_products_module,
+        "data_product_cache",
+        _local_cache(historical_ttl_seconds=0, historical_stale_seconds=600),
+    )
+    service = CacheWarmingService()
+    target = [WarmTarget("CN-GD", "daily_rainfall", WeatherType.RAINFALL)]
+
+    await service.warm(target, now=NOW)
+    await service.warm(target, now=NOW)
+
+    assert len(builders) == 2 * 2 * 3 * len(AccessMode)
+    assert not data_products_module._revalidations
+
+
+@pytest.mark.asyncio
+async def test_portfolio_targets_use_policies_overlapping_longest_preset(monkeypatch):
+    def _policy(policy_id, region, product, end):
+        return PolicySnapshot(
+            id=policy_id,
+            product_id=product,
+            coverage_region=region,
+            timezone="Asia/Shanghai",
+            coverage_start=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            coverage_end=end,
+            coverage_amount=Decimal("1000"),
+        )
+
+    portfolio = PolicyPortfolioIndex()
+    portfolio.ensure_fresh = AsyncMock()
+    active = NOW + timedelta(days=30)
+    for snapshot in (
+        _policy("p1", "CN-GD", "daily_rainfall", active),
+        _policy("p2", "CN-GD", "daily_rainfall", active),
+        _policy("p3", "CN-ZJ", "wind_product", active),
+        _policy("p4", "CN-FJ", "daily_rainfall", NOW - timedelta(days=120)),
+        _policy("p5", "CN-SH", "retired_product", active),
+    ):
+        portfolio.upsert(snapshot)
+    weather = {"daily_rainfall": WeatherType.RAINFALL, "wind_product": WeatherType.WIND}
+
+    async def _get_by_id(_session, product_id):
+        if product_id not in weather:
+            return None
+        return SimpleNamespace(weather_type=weather[product_id])
+
+    monkeypatch.setattr(warming_module, "policy_portfolio", portfolio)
+    monkeypatch.setattr(warming_module.product_service, "get_by_id", _get_by_id)
+
+    targets = await CacheWarmingService().portfolio_targets(AsyncMock(), now=NOW)
+
+    assert targets == [
+        WarmTarget("CN-GD", "daily_rainfall", WeatherType.RAINFALL),
+        WarmTarget("CN-ZJ", "wind_product", WeatherType.WIND),
+    ]
+
+
+def test_daily_warm_up_is_scheduled_after_presets_roll_over():
+    entry = celery_app.conf.beat_schedule["warm-data-product-presets-daily"]
+
+    assert entry["task"] == "app.tasks.cache_warming.warm_daily_presets_task"
+    assert "app.tasks.cache_warming" in celery_app.conf.include
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.claim import ClaimFilter
+from app.schemas.shared import AccessMode
+from app.services.claim_service import ClaimService
+from app.utils.pagination import decode_keyset_cursor, encode_keyset_cursor
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _claim_row(index: int) -> SimpleNamespace:
+    at = BASE - timedelta(hours=index)
+    return SimpleNamespace(
+        id=f"clm-{index:03d}",
+        policy_id="pol-001",
+        product_id="daily_rainfall",
+        risk_event_id=None,
+        region_code="CN-GD",
+        tier_level=1,
+        payout_percentage=Decimal("20.00"),
+        payout_amount=Decimal("1234.00"),
+        currency="CNY",
+        triggered_at=at,
+        period_start=None,
+        period_end=None,
+        status="computed",
+        product_version="v1",
+        rules_hash=None,
+        source="task",
+        created_at=at,
+        updated_at=at,
+    )
+
+
+def _session(rows) -> AsyncMock:
+    session = AsyncMock()
+    result = Mock()
+    result.scalars.return_value.all.return_value = rows
+    session.execute.return_value = result
+    return session
+
+
+def _sql(session: AsyncMock) -> str:
+    statement = session.execute.call_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_list_by_filter_reads_one_extra_row_and_returns_cursor():
+    session = _session([_claim_row(i) for i in range(3)])
+
+    page = await ClaimService().list_by_filter(
+        session, ClaimFilter(status="computed", limit=2), AccessMode.ADMIN_INTERNAL
+    )
+
+    assert [c.id for c in page.items] == ["clm-000", "clm-001"]
+    assert decode_keyset_cursor(page.next_cursor) == (BASE - timedelta(hours=1), "clm-001")
+    sql = _sql(session)
+    assert "ORDER BY claims.triggered_at DESC, claims.id DESC" in sql
+    assert "LIMIT %(param_1)s" in sql
+    assert session.execute.call_args.args[0].compile().params["param_1"] == 3
+
+
+@pytest.mark.asyncio
+async def test_list_by_filter_last_page_has_no_cursor():
+    session = _session([_claim_row(0)])
+
+    page = await ClaimService().list_by_filter(session, ClaimFilter(limit=2))
+
+    assert len(page.items) == 1
+    assert page.next_cursor is None
+    assert page.items[0].payout_amount == Decimal("1200")  # Demo/Public 区间化
+
+
+@pytest.mark.asyncio
+async def test_cursor_seeks_past_previous_page():
+    session = _session([])
+    cursor = encode_keyset_cursor(BASE, "clm-009")
+
+    await ClaimService().list_by_policy(session, "pol-001", cursor=cursor, limit=10)
+
+    sql = _sql(session)
+    assert "claims.policy_id = %(policy_id_1)s" in sql
+    assert "(claims.triggered_at, claims.id) < (%(param_1)s, %(param_2)s)" in sql
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_raises_value_error():
+    session = _session([])
+
+    with pytest.raises(ValueError, match="invalid cursor"):
+        await ClaimService().list_by_filter(session, ClaimFilter(cursor="garbage!"))
+    session.execute.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# EXPLAIN: 常见筛选形态必须走对应复合索引, 且不出现 Sort 节点
+# ---------------------------------------------------------------------------
+
+_PLAN_CASES = [
+    (ClaimFilter(limit=50), "ix_claims_triggered_id"),
+    (ClaimFilter(policy_id="plan-pol-7", limit=50), "ix_claims_policy_triggered_id"),
+    (ClaimFilter(region_code="CN-ZJ", limit=50), "ix_claims_region_triggered_id"),
+    (
+        ClaimFilter(product_id="plan-product", status="paid", limit=50),
+        "ix_claims_product_status_triggered_id",
+    ),
+    (ClaimFilter(status="approved", tier_level=3, limit=50), "ix_claims_status_tier_triggered_id"),
+]
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="Requires database connection")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("claim_filter, index_name", _PLAN_CASES)
+@pytest.mark.parametrize("with_cursor", [False, True])
+async def test_claim_listing_plan_uses_listing_index(claim_filter, index_name, with_cursor):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.models import Base
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await _seed_plan_fixture(conn)
+
+        if with_cursor:
+            claim_filter = claim_filter.model_copy(
+                update={"cursor": encode_keyset_cursor(BASE, "clm-zzz")}
+            )
+        recorder = _session([])
+        await ClaimService().list_by_filter(recorder, claim_filter)
+        statement = recorder.execute.call_args.args[0]
+
+        async with engine.connect() as conn:
+            # 小样本下规划器倾向顺序扫描; 关闭后比较的是各索引路径的代价
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            await conn.exec_driver_sql("SET enable_bitmapscan = off")
+            compiled = statement.compile(
+                dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+            )
+            result = await conn.exec_driver_sql(f"EXPLAIN {compiled}")
+            plan = "\n".join(row[0] for row in result)
+            await conn.rollback()
+
+        assert index_name in plan, plan
+        assert "Sort" not in plan, plan
+    finally:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("DELETE FROM claims WHERE id LIKE 'plan-%'")
+            await conn.exec_driver_sql("DELETE FROM policies WHERE id LIKE 'plan-%'")
+            await conn.exec_driver_sql("DELETE FROM products WHERE id = 'plan-product'")
+        await engine.dispose()
+
+
+async def _seed_plan_fixture(conn) -> None:
+    await conn.exec_driver_sql(
+        "INSERT INTO products (id, name, type, weather_type, risk_rules, payout_rules, version) "
+        "VALUES ('plan-product', 'plan', 'daily', 'rainfall', '{}', '{}', 'v1') "
+        "ON CONFLICT DO NOTHING"
+    )
+    await conn.exec_driver_sql(
+        "INSERT INTO policies (id, policy_number, product_id, coverage_region, coverage_amount, "
+        "timezone, coverage_start, coverage_end, is_active, created_at, updated_at) "
+        "SELECT 'plan-pol-' || g, 'PLAN-' || g, 'plan-product', 'CN-GD', 10000, "
+        "'Asia/Shanghai', now() - interval '1 year', now() + interval '1 year', true, now(), now() "
+        "FROM generate_series(1, 20) AS g ON CONFLICT DO NOTHING"
+    )
+    await conn.exec_driver_sql(
+        "INSERT INTO claims (id, policy_id, product_id, region_code, tier_level, "
+        "payout_percentage, payout_amount, currency, triggered_at, status, product_version, "
+        "source, created_at, updated_at) "
+        "SELECT 'plan-' || g, 'plan-pol-' || (g % 20 + 1), 'plan-product', "
+        "(ARRAY['CN-GD','CN-ZJ','CN-JS'])[g % 3 + 1], g % 3 + 1, 20, 100, 'CNY', "
+        "timestamptz '2025-01-01' - g * interval '1 minute', "
+        "(ARRAY['computed','approved','paid','voided'])[g % 4 + 1], 'v1', 'task', now(), now() "
+        "FROM generate_series(1, 20000) AS g ON CONFLICT DO NOTHING"
+    )
+    await conn.exec_driver_sql("ANALYZE claims")
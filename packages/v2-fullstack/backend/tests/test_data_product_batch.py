@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import data_products
+from app.schemas.access_control import DataProductType
+from app.schemas.data_product_batch import DataProductBatchResponse
+from app.schemas.shared import (
+    AccessMode,
+    DataType,
+    RegionScope,
+    SharedDimensions,
+    TimeRange,
+    WeatherType,
+)
+from app.services.data_product_batch import DataProductBatchService
+from app.services.data_product_cache import DataProductCache
+from app.services.data_products_service import map_overlays_service
+from app.services.single_flight import SingleFlight
+
+# app.services 包把同名单例导出为属性, 这里需要的是模块本身
+data_products_module = importlib.import_module("app.services.data_products_service")
+batch_module = importlib.import_module("app.services.data_product_batch")
+
+
+def _dimensions(region_code: str = "CN-GD") -> SharedDimensions:
+    return SharedDimensions(
+        region_scope=RegionScope.PROVINCE,
+        region_code=region_code,
+        time_range=TimeRange(
+            start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            end=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        ),
+        data_type=DataType.HISTORICAL,
+        weather_type=WeatherType.RAINFALL,
+        access_mode=AccessMode.DEMO_PUBLIC,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _local_cache(monkeypatch):
+    cache = DataProductCache(
+        redis_factory=lambda: Mock(pipeline=Mock(side_effect=redis.ConnectionError))
+    )
+    monkeypatch.setattr(data_products_module, "data_product_cache", cache)
+    monkeypatch.setattr(
+        data_products_module,
+        "data_product_flight",
+        SingleFlight(
+            "test-flight",
+            redis_factory=lambda: Mock(lock=Mock(side_effect=redis.ConnectionError)),
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_keeps_order_dedupes_and_reports_item_errors(monkeypatch):
+    calls = []
+
+    def _overlays(dimensions):
+        calls.append(dimensions.region_code)
+        return map_overlays_service.build_response(dimensions)
+
+    def _invalid(dimensions):
+        raise ValueError("region not found")
+
+    monkeypatch.setattr(
+        batch_module,
+        "BATCH_BUILDERS",
+        {
+            DataProductType.MAP_OVERLAYS: _overlays,
+            DataProductType.L1_REGION_INTELLIGENCE: _invalid,
+        },
+    )
+
+    outcomes = await DataProductBatchService().run(
+        [
+            (DataProductType.MAP_OVERLAYS, _dimensions()),
+            (DataProductType.L1_REGION_INTELLIGENCE, _dimensions()),
+            (DataProductType.MAP_OVERLAYS, _dimensions()),
+            (DataProductType.L2_EVIDENCE, _dimensions()),
+            (DataProductType.MAP_OVERLAYS, _dimensions("CN-ZJ")),
+        ]
+    )
+
+    assert [outcome.status_code for outcome in outcomes] == [200, 400, 200, 400, 200]
+    assert outcomes[1].error == "region not found"
+    assert "not supported" in outcomes[3].error
+    assert calls == ["CN-GD", "CN-ZJ"]  # 同批次相同项只构建一次
+    assert outcomes[4].response.legend is not None
+
+
+@pytest.mark.asyncio
+async def test_batch_concurrency_is_bounded(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def _slow(dimensions):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return map_overlays_service.build_response(dimensions)
+
+    monkeypatch.setattr(batch_module, "BATCH_BUILDERS", {DataProductType.MAP_OVERLAYS: _slow})
+
+    outcomes = await DataProductBatchService(concurrency=2).run(
+        [(DataProductType.MAP_OVERLAYS, _dimensions(f"CN-R{i}")) for i in range(6)]
+    )
+
+    assert all(outcome.status_code == 200 for outcome in outcomes)
+    assert peak == 2
+
+
+def test_batch_route_returns_pruned_results_in_order(monkeypatch):
+    def _broken(dimensions):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(
+        batch_module,
+        "BATCH_BUILDERS",
+        {
+            DataProductType.MAP_OVERLAYS: map_overlays_service.build_response,
+            DataProductType.L0_DASHBOARD: _broken,
+        },
+    )
+    app = FastAPI()
+    app.include_router(data_products.router, prefix="/api/v1")
+    client = TestClient(app)
+    dimensions = _dimensions().model_dump(mode="json")
+
+    response = client.post(
+        "/api/v1/data-products/batch",
+        json={
+            "items": [
+                {"data_product": "l0_dashboard", "dimensions": dimensions},
+                {"data_product": "map_overlays", "dimensions": dimensions},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    body = DataProductBatchResponse.model_validate(response.json())
+    assert [result.data_product for result in body.results] == [
+        DataProductType.L0_DASHBOARD,
+        DataProductType.MAP_OVERLAYS,
+    ]
+    assert body.results[0].status_code == 500
+    assert body.results[0].error == "Internal error"
+    assert body.results[0].data is None
+    assert body.results[1].data.legend.weather_type == WeatherType.RAINFALL
+
+
+def test_batch_route_rejects_empty_and_oversized_batches():
+    app = FastAPI()
+    app.include_router(data_products.router, prefix="/api/v1")
+    client = TestClient(app)
+    item = {"data_product": "map_overlays", "dimensions": _dimensions().model_dump(mode="json")}
+
+    assert client.post("/api/v1/data-products/batch", json={"items": []}).status_code == 422
+    assert (
+        client.post("/api/v1/data-products/batch", json={"items": [item] * 11}).status_code
+        == 422
+    )
@@ -0,0 +1,477 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_session
+from app.api.v1 import data_products
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import (
+    AccessMode,
+    AggregationData,
+    DataType,
+    RegionScope,
+    SharedDimensions,
+    TimeRange,
+    WeatherType,
+)
+from app.services.data_product_cache import (
+    INVALIDATION_CHANNEL,
+    DataProductCache,
+    build_cache_key,
+    dimension_tags,
+)
+from app.services.data_products_service import build_data_product, map_overlays_service
+from app.services.redis_clients import AsyncRedisHandle, RedisUnavailable
+from app.services.single_flight import SingleFlight
+from app.utils.access_control import compile_pruning_plan
+
+# app.services 包把同名单例导出为属性, 这里需要的是模块本身
+data_products_module = importlib.import_module("app.services.data_products_service")
+claim_service_module = importlib.import_module("app.services.claim_service")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeRedis:
+    """只实现缓存用到的命令(缓存只经 pipeline 访问 Redis)"""
+
+    def __init__(self) -> None:
+        self.values = {}
+        self.sets = {}
+        self.published = []
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def pttl(self, key):
+        return 60_000 if key in self.values else -2
+
+    def set(self, key, value, px=None):
+        self.values[key] = value
+        return True
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def pexpire(self, key, ttl_ms):
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sets.pop(key, None)
+        return len(keys)
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+
+class _FakePipeline:
+    """redis.asyncio pipeline 语义: 命令排队(此处立即执行并收集结果), execute 需 await"""
+
+    def __init__(self, client: _FakeRedis) -> None:
+        self._client = client
+        self._results = []
+
+    def __getattr__(self, name):
+        command = getattr(self._client, name)
+
+        def _queued(*args, **kwargs):
+            self._results.append(command(*args, **kwargs))
+            return self
+
+        return _queued
+
+    async def execute(self):
+        return self._results
+
+
+def _unreachable() -> Mock:
+    return Mock(pipeline=Mock(side_effect=redis.exceptions.ConnectionError("down")))
+
+
+def _dimensions(
+    region_code: str = "CN-GD",
+    data_type: DataType = DataType.HISTORICAL,
+    product_id: str | None = None,
+) -> SharedDimensions:
+    return SharedDimensions(
+        region_scope=RegionScope.PROVINCE,
+        region_code=region_code,
+        time_range=TimeRange(
+            start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            end=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        ),
+        data_type=data_type,
+        weather_type=WeatherType.RAINFALL,
+        access_mode=AccessMode.DEMO_PUBLIC,
+        product_id=product_id,
+        prediction_run_id="run-2025-01-20-001" if data_type == DataType.PREDICTED else None,
+    )
+
+
+def _cache(clock=None, client=None) -> DataProductCache:
+    client = client or _FakeRedis()
+    return DataProductCache(
+        historical_ttl_seconds=600,
+        predicted_ttl_seconds=60,
+        historical_stale_seconds=0,
+        predicted_stale_seconds=0,
+        max_entries=8,
+        clock=clock or _Clock(),
+        redis_factory=lambda: client,
+    )
+
+
+async def _put(
+    cache: DataProductCache,
+    dimensions: SharedDimensions,
+    product_type: DataProductType = DataProductType.MAP_OVERLAYS,
+) -> str:
+    key = build_cache_key(product_type, dimensions)
+    await cache.put(
+        key,
+        map_overlays_service.build_response(dimensions),
+        tags=dimension_tags(product_type, dimensions),
+        ttl_seconds=cache.ttl_for(dimensions.data_type),
+    )
+    return key
+
+
+@pytest.mark.asyncio
+async def test_pipeline_builds_once_and_marks_hits_cached(monkeypatch):
+    monkeypatch.setattr(data_products_module, "data_product_cache", _cache())
+    builder = Mock(side_effect=map_overlays_service.build_response)
+    dimensions = _dimensions()
+
+    first = await build_data_product(DataProductType.L0_DASHBOARD, dimensions, builder)
+    second = await build_data_product(DataProductType.L0_DASHBOARD, dimensions, builder)
+
+    assert builder.call_count == 1
+    assert first.meta.cached is False
+    assert second.meta.cached is True
+    assert second.meta.trace_context.trace_id != first.meta.trace_context.trace_id
+    assert second.legend == first.legend
+
+
+@pytest.mark.asyncio
+async def test_pipeline_caches_post_pruning_response(monkeypatch):
+    client = _FakeRedis()
+    monkeypatch.setattr(data_products_module, "data_product_cache", _cache(client=client))
+
+    def _builder(dimensions):
+        response = map_overlays_service.build_response(dimensions)
+        response.aggregations = [
+            AggregationData(
+                aggregation_key="claim_amount_total",
+                aggregation_method="sum",
+                value=12345,
+                label="internal-only",
+            )
+        ]
+        return response
+
+    first = await build_data_product(DataProductType.L0_DASHBOARD, _dimensions(), _builder)
+    second = await build_data_product(DataProductType.L0_DASHBOARD, _dimensions(), _builder)
+
+    # 必填字段保留, 策略外的可选字段(label)在序列化时排除; Redis 中只有裁剪后的 JSON
+    plan = compile_pruning_plan(AccessMode.DEMO_PUBLIC, DataProductType.L0_DASHBOARD)
+    served = json.loads(plan.to_json(first))["aggregations"][0]
+    key = build_cache_key(DataProductType.L0_DASHBOARD, _dimensions())
+    stored = json.loads(client.values[key])["aggregations"][0]
+    assert served["value"] == 12345
+    assert "label" not in served
+    assert stored == served
+    assert second.aggregations == first.aggregations
+
+
+@pytest.mark.asyncio
+async def test_predicted_entries_use_shorter_ttl():
+    clock = _Clock()
+    cache = _cache(clock=clock, client=_unreachable())
+    historical = await _put(cache, _dimensions())
+    predicted = await _put(cache, _dimensions(data_type=DataType.PREDICTED))
+
+    clock.now = 61
+
+    assert await cache.get(predicted) is None
+    assert await cache.get(historical) is not None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_facts_covers_parent_region_and_all_product_entries():
+    cache = _cache()
+    province = await _put(cache, _dimensions("CN-GD"))
+    other_region = await _put(cache, _dimensions("CN-ZJ", product_id="other_product"))
+    product_entry = await _put(cache, _dimensions("CN-ZJ", product_id="daily_rainfall"))
+
+    await cache.invalidate_facts(region_codes=["CN-GD-SZ"], product_ids=["daily_rainfall"])
+
+    assert await cache.get(province) is None
+    assert await cache.get(product_entry) is None
+    assert await cache.get(other_region) is not None
+
+
+@pytest.mark.asyncio
+async def test_other_province_write_invalidates_cross_region_l0_entry():
+    cache = _cache()
+    dimensions = _dimensions("CN-GD", product_id="daily_rainfall")
+    l0 = await _put(cache, dimensions, DataProductType.L0_DASHBOARD)
+    overlays = await _put(cache, dimensions)
+
+    # L0 TopN 跨省排名: 浙江的写入改变广东请求的 TopN
+    await cache.invalidate_facts(region_codes=["CN-ZJ"], product_ids=["other_product"])
+
+    assert await cache.get(l0) is None
+    assert await cache.get(overlays) is not None
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_and_invalidation_broadcasts():
+    client = _FakeRedis()
+    writer, reader = _cache(client=client), _cache(client=client)
+    key = await _put(writer, _dimensions())
+
+    assert await reader.get(key) is not None  # 另一进程从 Redis 命中
+
+    await reader.invalidate_facts(region_codes=["CN-GD"])
+
+    assert key not in client.values
+    channel, message = client.published[-1]
+    assert channel == INVALIDATION_CHANNEL
+    writer.handle_message({"data": message})
+    assert await writer.get(key) is None
+    assert "region:CN-GD" in json.loads(message)["tags"]
+
+
+@pytest.mark.asyncio
+async def test_put_skipped_when_tags_invalidated_during_build():
+    cache = _cache()
+    dimensions = _dimensions()
+    key = build_cache_key(DataProductType.L0_DASHBOARD, dimensions)
+
+    since = cache.mark()
+    await cache.invalidate_facts(region_codes=["CN-GD"])
+    written = await cache.put(
+        key,
+        map_overlays_service.build_response(dimensions),
+        tags=dimension_tags(DataProductType.L0_DASHBOARD, dimensions),
+        ttl_seconds=600,
+        since=since,
+    )
+
+    assert written is False
+    assert await cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_put_after_completed_invalidation_is_written():
+    cache = _cache()
+    dimensions = _dimensions()
+
+    await cache.invalidate_facts(region_codes=["CN-GD"])
+    key = build_cache_key(DataProductType.MAP_OVERLAYS, dimensions)
+    written = await cache.put(
+        key,
+        map_overlays_service.build_response(dimensions),
+        tags=dimension_tags(DataProductType.MAP_OVERLAYS, dimensions),
+        ttl_seconds=600,
+        since=cache.mark(),
+    )
+
+    assert written is True
+    assert await cache.get(key) is not None
+
+
+@pytest.mark.asyncio
+async def test_local_tier_survives_redis_outage_and_evicts_lru():
+    client = _unreachable()
+    cache = _cache(client=client)
+    keys = [await _put(cache, _dimensions(f"CN-R{i}")) for i in range(9)]
+
+    assert await cache.get(keys[0]) is None
+    assert await cache.get(keys[-1]) is not None
+    # 首次失败后进入退避: 后续调用不再访问 Redis
+    assert client.pipeline.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_create_invalidates_after_commit(monkeypatch):
+    cache = Mock(invalidate_facts=AsyncMock())
+    monkeypatch.setattr(claim_service_module, "data_product_cache", cache)
+    monkeypatch.setattr(
+        claim_service_module.stats_summary_service, "apply_claim_changes", AsyncMock()
+    )
+    result = Mock()
+    result.all.return_value = [
+        Mock(
+            region_code="CN-GD-SZ",
+            product_id="daily_rainfall",
+            triggered_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            status="computed",
+            payout_amount=1,
+        )
+    ]
+    session = AsyncMock()
+    session.execute.return_value = result
+
+    await claim_service_module.ClaimService().batch_create(session, [Mock()])
+
+    session.commit.assert_awaited_once()
+    cache.invalidate_facts.assert_awaited_once_with(
+        region_codes={"CN-GD-SZ"}, product_ids={"daily_rainfall"}
+    )
+
+
+def test_data_product_route_prunes_and_reports_cache_state(monkeypatch):
+    monkeypatch.setattr(data_products_module, "data_product_cache", _cache())
+    app = FastAPI()
+    app.include_router(data_products.router, prefix="/api/v1")
+
+    async def _override_get_session():
+        yield AsyncMock()
+
+    app.dependency_overrides[get_session] = _override_get_session
+    client = TestClient(app)
+    body = _dimensions().model_dump(mode="json")
+
+    first = client.post("/api/v1/data-products/map-overlays", json=body)
+    second = client.post("/api/v1/data-products/map-overlays", json=body)
+
+    assert first.status_code == 200
+    assert first.json()["meta"]["cached"] is False
+    assert second.json()["meta"]["cached"] is True
+    assert second.json()["meta"]["cache_key"] == _dimensions().to_cache_key()
+
+
+def _swr_cache(clock: _Clock, client=None) -> DataProductCache:
+    return DataProductCache(
+        historical_ttl_seconds=60,
+        historical_stale_seconds=300,
+        clock=clock,
+        redis_factory=lambda: client or _unreachable(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_lookup_distinguishes_fresh_stale_and_hard_expired():
+    clock = _Clock()
+    cache = _swr_cache(clock)
+    dimensions = _dimensions()
+    key = build_cache_key(DataProductType.L0_DASHBOARD, dimensions)
+    await cache.put(
+        key,
+        map_overlays_service.build_response(dimensions),
+        tags=dimension_tags(DataProductType.L0_DASHBOARD, dimensions),
+        ttl_seconds=60,
+        stale_seconds=300,
+    )
+
+    assert (await cache.lookup(key)).stale is False
+    clock.now = 61
+    assert (await cache.lookup(key)).stale is True
+    assert await cache.get(key) is None  # get 只返回新鲜条目
+    clock.now = 361
+    assert await cache.lookup(key) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_freshness_accounts_for_stale_grace():
+    client = _FakeRedis()  # PTTL 固定返回 60s
+    key = await _put(_cache(client=client), _dimensions())
+
+    within_fresh = DataProductCache(historical_stale_seconds=30, redis_factory=lambda: client)
+    within_grace = DataProductCache(historical_stale_seconds=90, redis_factory=lambda: client)
+
+    assert (await within_fresh.lookup(key)).stale is False
+    assert (await within_grace.lookup(key)).stale_age_seconds == 30
+    backfilled = await within_grace.lookup(key)  # 本地回填条目
+    assert backfilled.stale is True
+    assert backfilled.stale_age_seconds == pytest.approx(30, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_immediately_and_rebuilt_in_background(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(data_products_module, "data_product_cache", _swr_cache(clock))
+    monkeypatch.setattr(
+        data_products_module,
+        "data_product_flight",
+        SingleFlight(
+            "test-flight",
+            redis_factory=lambda: Mock(lock=Mock(side_effect=redis.ConnectionError)),
+        ),
+    )
+    builder = Mock(side_effect=map_overlays_service.build_response)
+    dimensions = _dimensions()
+
+    first = await build_data_product(DataProductType.L0_DASHBOARD, dimensions, builder)
+    clock.now = 61
+    stale = await asyncio.gather(
+        *(build_data_product(DataProductType.L0_DASHBOARD, dimensions, builder) for _ in range(3))
+    )
+
+    assert all(r.meta.cached and r.meta.stale_age_seconds is not None for r in stale)
+    assert all(r.meta.stale_age_seconds == 1 for r in stale)  # 新鲜期 60s, 已过 1s
+    await asyncio.gather(*data_products_module._revalidations.values())
+    assert builder.call_count == 2  # 只调度一次后台重建
+
+    fresh = await build_data_product(DataProductType.L0_DASHBOARD, dimensions, builder)
+    assert fresh.meta.cached is True
+    assert fresh.meta.stale_age_seconds is None
+    assert first.meta.stale_age_seconds is None
+
+
+@pytest.mark.asyncio
+async def test_hard_expired_entry_is_rebuilt_synchronously(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(data_products_module, "data_product_cache", _swr_cache(clock))
+    builder = Mock(side_effect=map_overlays_service.build_response)
+
+    await build_data_product(DataProductType.L0_DASHBOARD, _dimensions(), builder)
+    clock.now = 400
+    response = await build_data_product(DataProductType.L0_DASHBOARD, _dimensions(), builder)
+
+    assert builder.call_count == 2
+    assert response.meta.cached is False
+    assert not data_products_module._revalidations
+
+
+@pytest.mark.asyncio
+async def test_redis_handle_backs_off_after_outage_then_retries():
+    clock = _Clock()
+    factory = Mock(return_value=Mock())
+    handle = AsyncRedisHandle(factory, backoff_seconds=5, clock=clock)
+
+    handle.client()
+    assert handle.record_failure(redis.exceptions.TimeoutError("slow")) is True
+    with pytest.raises(RedisUnavailable) as skipped:
+        handle.client()
+    assert handle.record_failure(skipped.value) is False  # 退避期内不重复告警
+
+    clock.now = 6
+    assert handle.client() is factory.return_value
+    assert factory.call_count == 1  # 同一事件循环复用客户端
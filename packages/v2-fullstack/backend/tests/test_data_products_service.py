@@ -8,6 +8,7 @@ from app.services.data_products_service import (
     l1_intelligence_service,
     map_overlays_service,
 )
+from app.services.kpi_cube import KpiCubeSlice
 
 
 def _dimensions(data_type: DataType) -> SharedDimensions:
@@ -26,8 +27,8 @@ def _dimensions(data_type: DataType) -> SharedDimensions:
     )
 
 
-def test_l0_dashboard_claims_unavailable_flag():
-    response = l0_dashboard_service.build_response(_dimensions(DataType.HISTORICAL))
+def test_l0_dashboard_predicted_claims_unavailable_flag():
+    response = l0_dashboard_service.assemble(_dimensions(DataType.PREDICTED), KpiCubeSlice())
     assert response.legend.claims_available is False
     assert response.legend.claims_unavailable_reason is not None
 
@@ -38,5 +39,7 @@ def test_overlays_predicted_binds_run_id():
 
 
 def test_l1_intelligence_has_region_timezone_meta():
-    response = l1_intelligence_service.build_response(_dimensions(DataType.HISTORICAL))
+    response = l1_intelligence_service.assemble(
+        _dimensions(DataType.HISTORICAL), [], [], unit=None
+    )
     assert response.legend.region_timezone == "Asia/Shanghai"
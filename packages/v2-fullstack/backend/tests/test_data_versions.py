@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_session
+from app.api.v1 import data_products
+from app.schemas.shared import (
+    AccessMode,
+    DataType,
+    RegionScope,
+    SharedDimensions,
+    TimeRange,
+    WeatherType,
+)
+from app.schemas.access_control import DataProductType
+from app.services.data_product_cache import DataProductCache
+from app.services.data_products_service import map_overlays_service
+from app.services.data_versions import (
+    DataVersionService,
+    dimension_scopes,
+    fact_scopes,
+    if_none_match,
+    product_scopes,
+)
+from app.services.single_flight import SingleFlight
+
+data_products_module = importlib.import_module("app.services.data_products_service")
+
+
+class _FakeRedis:
+    """只实现版本号用到的命令(redis.asyncio 语义: 直接命令需 await, pipeline 排队后 await execute)"""
+
+    def __init__(self) -> None:
+        self.values = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def set(self, key, value, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = str(value)
+        return True
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+    async def mset(self, mapping):
+        self.values.update({key: str(value) for key, value in mapping.items()})
+        return True
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+
+class _FakePipeline:
+    def __init__(self, client: _FakeRedis) -> None:
+        self._client = client
+        self._results = []
+
+    def __getattr__(self, name):
+        command = getattr(self._client, name)
+
+        def _queued(*args, **kwargs):
+            self._results.append(command(*args, **kwargs))
+            return self
+
+        return _queued
+
+    async def execute(self):
+        return self._results
+
+
+def _dimensions(
+    region_code: str = "CN-GD",
+    product_id: str | None = None,
+    data_type: DataType = DataType.HISTORICAL,
+) -> SharedDimensions:
+    return SharedDimensions(
+        region_scope=RegionScope.PROVINCE,
+        region_code=region_code,
+        time_range=TimeRange(
+            start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            end=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        ),
+        data_type=data_type,
+        weather_type=WeatherType.RAINFALL,
+        access_mode=AccessMode.DEMO_PUBLIC,
+        product_id=product_id,
+        prediction_run_id="run-2025-01-20-001" if data_type == DataType.PREDICTED else None,
+    )
+
+
+def _service(client=None, now: float = 1_700_000_000.0) -> DataVersionService:
+    client = client or _FakeRedis()
+    return DataVersionService(redis_factory=lambda: client, clock=lambda: now)
+
+
+def test_fact_writes_bump_parent_regions_and_all_products():
+    scopes = fact_scopes(
+        region_codes={"CN-GD-SZ"}, product_ids={"daily_rainfall"}, data_type=DataType.HISTORICAL
+    )
+
+    assert {(scope.region_code, scope.subject) for scope in scopes} == {
+        (code, subject)
+        for code in ("CN-GD-SZ", "CN-GD", "CN")
+        for subject in ("daily_rainfall", "*")
+    }
+
+
+@pytest.mark.asyncio
+async def test_etag_changes_only_when_a_dependent_scope_is_bumped():
+    service = _service()
+    dimensions = _dimensions()
+    scopes = dimension_scopes(DataProductType.MAP_OVERLAYS, dimensions)
+
+    first = await service.etag("key", scopes)
+    assert await service.etag("key", scopes) == first
+
+    # 其他区域/数据类型的写入不影响
+    await service.bump_facts(region_codes={"CN-ZJ"}, product_ids={"daily_rainfall"})
+    await service.bump_facts(
+        region_codes={"CN-GD"},
+        product_ids={"daily_rainfall"},
+        data_type=DataType.PREDICTED,
+        prediction_run_id="run-x",
+    )
+    assert await service.etag("key", scopes) == first
+
+    # 下级区域的理赔写入 → 省级请求的 ETag 变化
+    await service.bump_facts(
+        region_codes={"CN-GD-SZ"}, product_ids={"daily_rainfall"}, data_type=DataType.HISTORICAL
+    )
+    second = await service.etag("key", scopes)
+    assert second != first
+
+    await service.bump_weather(
+        region_codes={"CN-GD-GZ"}, weather_type="rainfall", data_type=DataType.HISTORICAL
+    )
+    third = await service.etag("key", scopes)
+    assert third != second
+
+    await service.bump(product_scopes(["daily_rainfall"]))
+    assert await service.etag("key", scopes) != third
+
+
+@pytest.mark.asyncio
+async def test_other_province_write_changes_cross_region_l0_etag():
+    service = _service()
+    dimensions = _dimensions(product_id="daily_rainfall")
+    l0_scopes = dimension_scopes(DataProductType.L0_DASHBOARD, dimensions)
+    overlay_scopes = dimension_scopes(DataProductType.MAP_OVERLAYS, dimensions)
+    l0 = await service.etag("l0", l0_scopes)
+    overlays = await service.etag("overlays", overlay_scopes)
+
+    # 浙江的理赔写入: 广东 L0 的 TopN(跨省排名)随之变化, 区域内数据产品不受影响
+    await service.bump_facts(
+        region_codes={"CN-ZJ"}, product_ids={"daily_rainfall"}, data_type=DataType.HISTORICAL
+    )
+
+    assert await service.etag("l0", l0_scopes) != l0
+    assert await service.etag("overlays", overlay_scopes) == overlays
+
+
+@pytest.mark.asyncio
+async def test_versions_stay_monotonic_after_redis_is_flushed():
+    client = _FakeRedis()
+    scopes = dimension_scopes(DataProductType.MAP_OVERLAYS, _dimensions())
+    before = _service(client, now=1_700_000_000.0)
+    await before.bump_facts(
+        region_codes={"CN-GD"}, product_ids={"p1"}, data_type=DataType.HISTORICAL
+    )
+    old_versions = await before.versions(scopes)
+
+    client.values.clear()
+    after = _service(client, now=1_700_000_060.0)
+
+    assert min(int(v) for v in (await after.versions(scopes))) > max(int(v) for v in old_versions)
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_disables_etag():
+    service = DataVersionService(
+        redis_factory=lambda: Mock(mget=AsyncMock(side_effect=redis.ConnectionError))
+    )
+
+    assert await service.etag("key", dimension_scopes(DataProductType.MAP_OVERLAYS, _dimensions())) is None
+    assert if_none_match('W/"abc"', None) is False
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert if_none_match('"abc", W/"def"', 'W/"def"')
+    assert if_none_match('"abc"', 'W/"abc"')
+    assert if_none_match("*", 'W/"abc"')
+    assert not if_none_match('W/"abc"', 'W/"def"')
+
+
+def test_route_answers_304_before_building(monkeypatch):
+    versions = _service()
+    monkeypatch.setattr(data_products, "data_version_service", versions)
+    monkeypatch.setattr(
+        data_products_module,
+        "data_product_cache",
+        DataProductCache(
+            redis_factory=lambda: Mock(pipeline=Mock(side_effect=redis.ConnectionError))
+        ),
+    )
+    monkeypatch.setattr(
+        data_products_module,
+        "data_product_flight",
+        SingleFlight(
+            "test-flight",
+            redis_factory=lambda: Mock(lock=Mock(side_effect=redis.ConnectionError)),
+        ),
+    )
+    builder = Mock(side_effect=map_overlays_service.build_response)
+    monkeypatch.setattr(data_products.map_overlays_service, "build_response", builder)
+
+    app = FastAPI()
+    app.include_router(data_products.router, prefix="/api/v1")
+
+    async def _override_get_session():
+        yield AsyncMock()
+
+    app.dependency_overrides[get_session] = _override_get_session
+    client = TestClient(app)
+    body = _dimensions().model_dump(mode="json")
+
+    first = client.post("/api/v1/data-products/map-overlays", json=body)
+    etag = first.headers["ETag"]
+    cached = client.post(
+        "/api/v1/data-products/map-overlays", json=body, headers={"If-None-Match": etag}
+    )
+    asyncio.run(
+        versions.bump_weather(
+            region_codes={"CN-GD"}, weather_type="rainfall", data_type=DataType.HISTORICAL
+        )
+    )
+    changed = client.post(
+        "/api/v1/data-products/map-overlays", json=body, headers={"If-None-Match": etag}
+    )
+
+    assert first.status_code == 200
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+    assert builder.call_count == 1
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
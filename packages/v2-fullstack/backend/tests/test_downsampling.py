@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.shared import (
+    AccessMode,
+    DataType,
+    RegionScope,
+    SharedDimensions,
+    TimeRange,
+    WeatherType,
+)
+from app.schemas.weather import WeatherQueryRequest
+from app.services.data_products_service import L1RegionIntelligenceService
+from app.services.weather_service import WeatherService
+from app.utils.downsampling import (
+    DownsamplingMethod,
+    downsample_indices,
+    lttb_indices,
+    min_max_indices,
+    threshold_crossing_indices,
+)
+
+
+def _wave(n: int):
+    xs = [float(i * 3600) for i in range(n)]
+    ys = [10 * math.sin(i / 50) + (40 if i == 777 else 0) for i in range(n)]
+    return xs, ys
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    xs, ys = _wave(5000)
+
+    indices = lttb_indices(xs, ys, 200)
+
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == 4999
+    assert indices == sorted(indices)
+    assert 777 in indices  # 尖峰是最大三角形
+
+
+def test_min_max_envelope_keeps_bucket_extremes():
+    ys = [0.0] * 1000
+    ys[123] = 50.0
+    ys[456] = -5.0
+
+    indices = min_max_indices(ys, 20)
+
+    assert len(indices) <= 20
+    assert {0, 123, 456, 999} <= set(indices)
+
+
+def test_threshold_crossings_keep_both_sides():
+    assert threshold_crossing_indices([1, 2, 6, 7, 3], [5]) == [1, 2, 3, 4]
+    assert threshold_crossing_indices([1, 2, 3], []) == []
+
+
+def test_downsample_preserves_crossings_beyond_budget():
+    xs, ys = _wave(5000)
+
+    indices = downsample_indices(
+        xs, ys, 100, method=DownsamplingMethod.LTTB, thresholds=[9.99]
+    )
+
+    crossings = threshold_crossing_indices(ys, [9.99])
+    assert crossings and set(crossings) <= set(indices)
+    assert len(indices) <= 100 + len(crossings)
+    assert downsample_indices(xs[:50], ys[:50], 100) == list(range(50))
+    with pytest.raises(ValueError):
+        downsample_indices(xs, ys[:10], 100)
+
+
+@pytest.mark.asyncio
+async def test_series_columns_query_aggregates_in_database():
+    session = AsyncMock()
+    result = Mock()
+    result.one.return_value = (None, None, None)
+    session.execute.return_value = result
+    request = WeatherQueryRequest(
+        region_code="CN-GD",
+        weather_type=WeatherType.RAINFALL,
+        start_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        end_time=datetime(2025, 12, 31, tzinfo=timezone.utc),
+        data_type=DataType.HISTORICAL,
+    )
+
+    columns = await WeatherService().query_series_columns(session, request)
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+
+    assert columns == ([], [], None)
+    assert "array_agg(weather_data.value ORDER BY weather_data.timestamp)" in sql
+
+
+def test_l1_downsamples_to_point_budget_and_exposes_thresholds():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    timestamps = [start + timedelta(hours=i) for i in range(24 * 365)]
+    values = [Decimal(str(round(60 + 50 * math.sin(i / 100), 2))) for i in range(len(timestamps))]
+    dimensions = SharedDimensions(
+        region_scope=RegionScope.PROVINCE,
+        region_code="CN-GD",
+        time_range=TimeRange(start=timestamps[0], end=timestamps[-1]),
+        data_type=DataType.HISTORICAL,
+        weather_type=WeatherType.WIND,
+        access_mode=AccessMode.ADMIN_INTERNAL,
+        max_points=500,
+    )
+    thresholds = {"tier1": Decimal("100"), "tier2": Decimal("105"), "tier3": Decimal("109")}
+
+    response = L1RegionIntelligenceService().assemble(
+        dimensions, timestamps, values, unit="km/h", thresholds=thresholds
+    )
+
+    series = response.series[0]
+    crossings = threshold_crossing_indices([float(v) for v in values], [100, 105, 109])
+    assert len(series.timestamps) <= 500 + len(crossings)
+    assert {timestamps[i] for i in crossings} <= set(series.timestamps)
+    assert series.timestamps[0] == timestamps[0] and series.timestamps[-1] == timestamps[-1]
+    assert response.legend.thresholds == thresholds
+    assert "downsampled (lttb)" in response.legend.description
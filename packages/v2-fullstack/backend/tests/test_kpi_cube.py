@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import (
+    AccessMode,
+    DataType,
+    RegionScope,
+    SharedDimensions,
+    TimeRange,
+    WeatherType,
+)
+from app.services.data_products_service import L0DashboardService, local_date_range
+from app.services.kpi_cube import KpiCubeService, KpiCubeSlice, RegionKpi
+from app.utils.access_control import AccessControlManager
+
+
+def _dimensions(**overrides) -> SharedDimensions:
+    values = dict(
+        region_scope=RegionScope.PROVINCE,
+        region_code="CN-GD",
+        time_range=TimeRange(
+            # 2024-12-31 17:00 UTC == 2025-01-01 01:00 Asia/Shanghai
+            start=datetime(2024, 12, 31, 17, tzinfo=timezone.utc),
+            end=datetime(2025, 1, 31, 15, 59, tzinfo=timezone.utc),
+        ),
+        data_type=DataType.HISTORICAL,
+        weather_type=WeatherType.RAINFALL,
+        access_mode=AccessMode.ADMIN_INTERNAL,
+    )
+    values.update(overrides)
+    return SharedDimensions(**values)
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _rows(rows) -> Mock:
+    result = Mock()
+    result.all.return_value = rows
+    return result
+
+
+def _cube() -> KpiCubeSlice:
+    cube = KpiCubeSlice()
+    cube.by_region = {
+        "CN-GD": RegionKpi(
+            policy_count=10,
+            policy_amount_total=Decimal("50000"),
+            claim_count=2,
+            claim_amount_total=Decimal("1200"),
+            risk_events={1: 4, 3: 1},
+        ),
+        "CN-GD-GZ": RegionKpi(policy_count=10, policy_amount_total=Decimal("50000")),
+        "CN-BJ": RegionKpi(
+            policy_count=5,
+            policy_amount_total=Decimal("20000"),
+            claim_count=1,
+            claim_amount_total=Decimal("3000"),
+        ),
+    }
+    return cube
+
+
+def _by_metric(response, aggregation_key: str, dimension_value=None) -> dict:
+    return {
+        item.metric: item
+        for item in response.aggregations
+        if item.aggregation_key == aggregation_key and item.dimension_value == dimension_value
+    }
+
+
+def test_local_date_range_rounds_to_region_days():
+    assert local_date_range(_dimensions()) == (date(2025, 1, 1), date(2025, 1, 31))
+
+
+def test_cube_queries_read_summaries_by_local_date():
+    service = KpiCubeService()
+    claims = _compile(
+        service.claim_query(date(2025, 1, 1), date(2025, 1, 31), "rainfall", "daily_rainfall")
+    )
+    risk = _compile(service.risk_event_query(date(2025, 1, 1), date(2025, 1, 31), "rainfall", None))
+
+    assert "FROM claim_daily_summary" in claims
+    assert "claim_daily_summary.local_date BETWEEN" in claims
+    assert "claim_daily_summary.status !=" in claims
+    assert "SELECT products.id" in claims  # 天气类型经产品关联
+    assert "FROM claims" not in claims
+    assert "GROUP BY claim_daily_summary.region_code" in claims
+    assert "risk_event_daily_summary.weather_type =" in risk
+    assert "GROUP BY risk_event_daily_summary.region_code, risk_event_daily_summary.tier_level" in risk
+
+
+def test_policy_query_counts_policies_in_force_during_range():
+    policies = _compile(
+        KpiCubeService().policy_query(date(2025, 1, 1), date(2025, 1, 31), "rainfall", None)
+    )
+
+    # 保障期间与范围重叠(而非范围内起保)
+    assert "policy_daily_summary.local_date <= %(local_date_1)s" in policies
+    assert "policy_daily_summary.end_local_date >= %(end_local_date_1)s" in policies
+    assert "BETWEEN" not in policies
+
+
+@pytest.mark.asyncio
+async def test_load_skips_claims_and_risk_events_when_not_requested():
+    session = AsyncMock()
+    session.execute.return_value = _rows([("CN-GD", 3, Decimal("900"))])
+
+    cube = await KpiCubeService().load(
+        session,
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 1, 31),
+        weather_type="rainfall",
+        include_claims=False,
+        include_risk_events=False,
+    )
+
+    assert session.execute.await_count == 1
+    assert cube.by_region["CN-GD"].policy_count == 3
+
+
+def test_rollup_includes_subregions_and_province_topn_ranks_by_payout():
+    response = L0DashboardService().assemble(_dimensions(), _cube())
+
+    total = _by_metric(response, "total")
+    assert total["policy_count"].value == 20
+    assert total["claim_count"].value == 2
+    assert total["claim_rate"].value == 0.1
+    tiers = {
+        item.dimension_value: item.value
+        for item in response.aggregations
+        if item.aggregation_key == "tier_level"
+    }
+    assert tiers == {"1": 4, "2": 0, "3": 1}
+
+    assert _by_metric(response, "region_code", "CN-BJ")["claim_amount_total"].rank == 1
+    assert _by_metric(response, "region_code", "CN-GD")["policy_amount_total"].value == Decimal("100000")
+    assert response.legend.claims_available is True
+
+
+@pytest.mark.asyncio
+async def test_build_response_opens_own_session():
+    session = AsyncMock()
+    session.execute.return_value = _rows([])
+
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    response = await L0DashboardService(session_factory=session_factory).build_response(
+        _dimensions(data_type=DataType.PREDICTED, prediction_run_id="run-1")
+    )
+
+    assert session.execute.await_count == 1  # predicted: 只读保单立方体
+    assert {item.metric for item in response.aggregations} == {"policy_count", "policy_amount_total"}
+    assert response.meta.warnings
+
+
+def test_demo_mode_masks_amounts_into_ranges():
+    dimensions = _dimensions(access_mode=AccessMode.DEMO_PUBLIC)
+    response = L0DashboardService().assemble(dimensions, _cube())
+    manager = AccessControlManager(
+        mode=AccessMode.DEMO_PUBLIC,
+        data_product=DataProductType.L0_DASHBOARD,
+        trace_context=response.meta.trace_context,
+    )
+
+    pruned = manager.prune_data_product(response)
+
+    amount = _by_metric(pruned, "total")["policy_amount_total"]
+    assert amount.label.startswith("[")
+    assert amount.value <= Decimal("100000")
+    assert _by_metric(pruned, "total")["policy_count"].value == 20
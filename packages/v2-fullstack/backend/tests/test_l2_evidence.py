@@ -146,3 +146,74 @@ async def test_l2_evidence_predicted_has_no_claims(monkeypatch):
     response = await service.get_evidence(AsyncMock(), request)
 
     assert response.claims == []
+
+
+@pytest.mark.asyncio
+async def test_l2_evidence_risk_events_paginate_in_database(monkeypatch):
+    from app.services import l2_evidence_service as module
+
+    service = L2EvidenceService()
+    request = _build_request(
+        data_type=DataType.HISTORICAL,
+        access_mode=AccessMode.ADMIN_INTERNAL,
+    ).model_copy(update={"cursor": 20, "page_size": 10})
+
+    query_events = AsyncMock(return_value=[])
+    monkeypatch.setattr(module.risk_service, "query_events", query_events)
+
+    events = await service._query_risk_events(AsyncMock(), request)
+
+    assert events == []
+    assert query_events.await_args.kwargs["offset"] == 20
+    assert query_events.await_args.kwargs["limit"] == 10
+
+
+@pytest.mark.asyncio
+async def test_l2_evidence_episode_view_reads_episodes(monkeypatch):
+    from app.services import l2_evidence_service as module
+    from app.schemas.risk_event import RiskEpisodeResponse
+
+    service = L2EvidenceService()
+    request = _build_request(
+        data_type=DataType.HISTORICAL,
+        access_mode=AccessMode.ADMIN_INTERNAL,
+    ).model_copy(update={"risk_view": "episodes"})
+    start = request.time_range.start
+
+    monkeypatch.setattr(service, "_build_meta", AsyncMock(return_value=_build_meta(request)))
+    monkeypatch.setattr(service, "_query_claims", AsyncMock(return_value=[]))
+    monkeypatch.setattr(service, "_build_weather_evidence", AsyncMock(return_value=[]))
+    monkeypatch.setattr(
+        service,
+        "_query_risk_events",
+        AsyncMock(side_effect=AssertionError("raw windows should not be read")),
+    )
+    query_episodes = AsyncMock(
+        return_value=[
+            RiskEpisodeResponse(
+                id="rep-1",
+                region_code="CN-GD",
+                product_id="daily_rainfall",
+                product_version="v1",
+                weather_type=WeatherType.RAINFALL,
+                data_type=DataType.HISTORICAL,
+                start_at=start,
+                end_at=start,
+                peak_at=start,
+                peak_tier=3,
+                peak_value=180,
+                threshold_value=150,
+                window_count=168,
+            )
+        ]
+    )
+    monkeypatch.setattr(module.risk_episode_service, "query_episodes", query_episodes)
+
+    response = await service.get_evidence(AsyncMock(), request)
+
+    assert response.risk_events == []
+    assert [e.id for e in response.risk_episodes] == ["rep-1"]
+    assert response.summary.risk_event_count == 168
+    assert response.summary.episode_count == 1
+    assert response.summary.max_tier == 3
+    assert query_episodes.await_args.kwargs["limit"] == 10
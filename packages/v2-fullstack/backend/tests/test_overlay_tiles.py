@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api.deps import get_session
+from app.api.v1 import data_products
+from app.schemas.shared import DataType, WeatherType
+from app.schemas.spatial import OverlayLayer
+from app.schemas.time import TimeGranularity
+from app.services.overlay_tiles import OverlayTileCache, OverlayTileService, layer_for_zoom
+from app.utils.map_tiles import base_tile_span, latlng_to_tile
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _service() -> OverlayTileService:
+    unreachable = Mock(
+        hgetall=Mock(side_effect=redis.exceptions.ConnectionError("down")),
+        pipeline=Mock(side_effect=redis.exceptions.ConnectionError("down")),
+    )
+    return OverlayTileService(OverlayTileCache(redis_factory=lambda: unreachable))
+
+
+def _bucket(service: OverlayTileService, **overrides):
+    values = dict(
+        weather_type=WeatherType.RAINFALL,
+        data_type=DataType.HISTORICAL,
+        prediction_run_id=None,
+        granularity=TimeGranularity.DAY,
+        bucket_start=datetime(2025, 1, 20, 17, 30, tzinfo=timezone.utc),  # 北京时间 01-21
+    )
+    values.update(overrides)
+    return service.bucket(**values)
+
+
+def _session(rows) -> AsyncMock:
+    session = AsyncMock()
+    result = Mock()
+    result.all.return_value = rows
+    session.execute.return_value = result
+    return session
+
+
+def test_tile_span_covers_base_zoom_children():
+    x, y = latlng_to_tile(23.13, 113.26)  # 广州, base zoom
+
+    x_min, x_max, y_min, y_max = base_tile_span(4, x >> 8, y >> 8)
+
+    assert x_min <= x <= x_max and y_min <= y <= y_max
+    assert x_max - x_min == 255
+    with pytest.raises(ValueError):
+        base_tile_span(4, 16, 0)
+
+
+def test_bucket_aligns_start_and_validates_series():
+    service = _service()
+
+    assert _bucket(service).bucket_start == datetime(2025, 1, 20, 16, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        _bucket(service, data_type=DataType.PREDICTED)
+
+
+@pytest.mark.parametrize(
+    "zoom, layer, expected",
+    [
+        (3, OverlayLayer.PROVINCE, "GROUP BY overlay_cell_buckets.province_code"),
+        (7, OverlayLayer.DISTRICT, "GROUP BY coalesce(overlay_cell_buckets.district_code"),
+        (10, OverlayLayer.CELL, "ORDER BY overlay_cell_buckets.h3_index"),
+    ],
+)
+def test_tile_query_coarsens_features_by_zoom(zoom, layer, expected):
+    service = _service()
+
+    sql = _compile(service.tile_query(_bucket(service), zoom, 0, 0))
+
+    assert layer_for_zoom(zoom) == layer
+    assert expected in sql
+    assert "overlay_cell_buckets.tile_x BETWEEN" in sql
+    assert "weather_data" not in sql
+
+
+def test_precompute_replaces_buckets_from_weather_and_risk_events():
+    service = _service()
+
+    clear, fill = service.precompute_statements(
+        weather_type=WeatherType.RAINFALL,
+        data_type=DataType.PREDICTED,
+        prediction_run_id="run-1",
+        granularity=TimeGranularity.DAY,
+        window_start=datetime(2025, 1, 20, 16, tzinfo=timezone.utc),
+        window_end=datetime(2025, 1, 22, 16, tzinfo=timezone.utc),
+    )
+    sql = _compile(fill)
+
+    assert "DELETE FROM overlay_cell_buckets" in _compile(clear)
+    assert sql.startswith("INSERT INTO overlay_cell_buckets")
+    assert "JOIN h3_cell_regions" in sql
+    assert "greatest(district_risk.tier, province_risk.tier)" in sql
+    assert "weather_data.prediction_run_id =" in sql
+    assert "risk_events.prediction_run_id =" in sql
+
+
+@pytest.mark.asyncio
+async def test_precompute_returns_every_bucket_in_range():
+    service = _service()
+    session = AsyncMock()
+
+    buckets = await service.precompute(
+        session,
+        weather_type=WeatherType.RAINFALL,
+        data_type=DataType.HISTORICAL,
+        prediction_run_id=None,
+        granularity=TimeGranularity.DAY,
+        start=datetime(2025, 1, 20, 17, tzinfo=timezone.utc),
+        end=datetime(2025, 1, 22, 1, tzinfo=timezone.utc),
+    )
+
+    assert [b.bucket_start.day for b in buckets] == [20, 21]  # 北京时间 01-21, 01-22
+    assert session.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_tile_builds_once_and_keeps_etag_stable():
+    service = _service()
+    session = _session([("CN-GD", Decimal("12.345"), Decimal("40.00"), 2)])
+    bucket = _bucket(service)
+
+    first = await service.get_tile(session, bucket, 3, 6, 3)
+    second = await service.get_tile(session, bucket, 3, 6, 3)
+
+    assert session.execute.await_count == 1
+    assert second == first
+    assert '"keys":["CN-GD"]' in first.body
+    assert '"weather_avg":[12.35]' in first.body
+
+    await service.invalidate([bucket])
+    rebuilt = await service.get_tile(session, bucket, 3, 6, 3)
+    assert session.execute.await_count == 2
+    assert rebuilt.etag == first.etag  # 内容未变, ETag 不变
+
+
+def test_tile_route_returns_304_for_matching_etag(monkeypatch):
+    service = _service()
+    monkeypatch.setattr(data_products, "overlay_tile_service", service)
+    app = FastAPI()
+    app.include_router(data_products.router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = lambda: _session([])
+    client = TestClient(app)
+    url = "/api/v1/data-products/map-overlays/tiles/3/6/3"
+    params = {"weather_type": "rainfall", "bucket_start": "2025-01-21T00:00:00Z"}
+
+    first = client.get(url, params=params)
+    assert first.status_code == 200
+    assert first.json()["layer"] == "province"
+
+    cached = client.get(url, params=params, headers={"If-None-Match": first.headers["ETag"]})
+    assert cached.status_code == 304
+
+    assert client.get("/api/v1/data-products/map-overlays/tiles/13/0/0", params=params).status_code == 400
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.utils.pagination import decode_keyset_cursor, encode_keyset_cursor
+
+
+def test_keyset_cursor_roundtrip_normalizes_to_utc():
+    local = datetime(2025, 1, 1, 8, tzinfo=timezone(timedelta(hours=8)))
+    cursor = encode_keyset_cursor(local, "re_abc")
+
+    sort_time, row_id = decode_keyset_cursor(cursor)
+
+    assert sort_time == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert row_id == "re_abc"
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "W10", "eyJ2IjoyfQ"])
+def test_decode_keyset_cursor_rejects_garbage(cursor):
+    with pytest.raises(ValueError, match="invalid cursor"):
+        decode_keyset_cursor(cursor)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.models.partitioning import (
+    add_months,
+    build_month_partition_ddl,
+    build_partition_ddl,
+    ensure_partitions,
+    iter_month_starts,
+    month_partition_name,
+    month_start,
+)
+from app.models.risk_event import RiskEvent as RiskEventModel
+from app.models.weather import WeatherData as WeatherModel
+from app.schemas.shared import DataType, WeatherType
+from app.schemas.weather import WeatherQueryRequest
+from app.services.risk_service import RiskService
+from app.services.weather_service import WeatherService
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def test_month_start_normalizes_to_utc():
+    # 2025-02-01 03:00 +08:00 == 2025-01-31 19:00 UTC → 一月分区
+    local = datetime.fromisoformat("2025-02-01T03:00:00+08:00")
+    assert month_start(local) == datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def test_add_months_rolls_over_year():
+    december = datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert add_months(december, 1) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert add_months(december, -12) == datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+
+def test_iter_month_starts_covers_range_inclusive():
+    months = iter_month_starts(
+        datetime(2025, 11, 15, tzinfo=timezone.utc),
+        datetime(2026, 1, 2, tzinfo=timezone.utc),
+    )
+    assert [(m.year, m.month) for m in months] == [(2025, 11), (2025, 12), (2026, 1)]
+
+
+def test_build_month_partition_ddl_bounds():
+    ddl = build_month_partition_ddl(
+        "weather_data", "historical", datetime(2025, 12, 20, tzinfo=timezone.utc)
+    )
+    assert "weather_data_historical_p2025_12 PARTITION OF weather_data_historical" in ddl
+    assert "FROM ('2025-12-01T00:00:00+00:00') TO ('2026-01-01T00:00:00+00:00')" in ddl
+
+
+def test_build_partition_ddl_includes_list_and_default_partitions():
+    month = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    statements = build_partition_ddl("risk_events", [month])
+
+    assert len(statements) == 6
+    assert any("FOR VALUES IN ('historical') PARTITION BY RANGE (timestamp)" in s for s in statements)
+    assert any("risk_events_predicted_default PARTITION OF risk_events_predicted DEFAULT" in s for s in statements)
+    assert all("IF NOT EXISTS" in s for s in statements)
+
+
+def test_ensure_partitions_creates_current_and_future_months():
+    connection = Mock()
+    executed = ensure_partitions(
+        connection,
+        months_ahead=2,
+        now=datetime(2025, 11, 15, tzinfo=timezone.utc),
+        tables=("weather_data",),
+    )
+
+    assert connection.execute.call_count == len(executed)
+    names = [
+        month_partition_name("weather_data", "historical", datetime(y, m, 1, tzinfo=timezone.utc))
+        for y, m in [(2025, 11), (2025, 12), (2026, 1)]
+    ]
+    for name in names:
+        assert any(name in statement for statement in executed)
+
+
+def test_models_are_partitioned_with_partition_keys_in_primary_key():
+    for model in (WeatherModel, RiskEventModel):
+        ddl = str(CreateTable(model.__table__).compile(dialect=postgresql.dialect()))
+        assert "PARTITION BY LIST (data_type)" in ddl
+        pk_columns = {column.name for column in model.__table__.primary_key.columns}
+        assert {"id", "data_type", "timestamp"} <= pk_columns
+
+
+async def _weather_statement(start: datetime, end: datetime):
+    """WeatherService.query_time_series 实际执行的语句"""
+    session = AsyncMock()
+    result = Mock()
+    result.scalars.return_value.all.return_value = []
+    session.execute.return_value = result
+
+    await WeatherService().query_time_series(
+        session,
+        WeatherQueryRequest(
+            region_code="CN-GD",
+            weather_type=WeatherType.RAINFALL,
+            start_time=start,
+            end_time=end,
+            data_type=DataType.HISTORICAL,
+        ),
+    )
+    return session.execute.call_args.args[0]
+
+
+async def _risk_event_statement(start: datetime, end: datetime):
+    """RiskService.query_events 实际执行的语句"""
+    session = AsyncMock()
+    result = Mock()
+    result.all.return_value = []
+    session.execute.return_value = result
+
+    await RiskService().query_events(
+        session,
+        region_code="CN-GD",
+        weather_type=WeatherType.RAINFALL,
+        data_type=DataType.HISTORICAL,
+        time_range_start=start,
+        time_range_end=end,
+    )
+    return session.execute.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_weather_query_filters_on_partition_keys():
+    statement = await _weather_statement(
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 31, tzinfo=timezone.utc),
+    )
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "weather_data.data_type = " in sql
+    assert "weather_data.timestamp >= " in sql
+    assert "weather_data.timestamp <= " in sql
+
+
+@pytest.mark.asyncio
+async def test_risk_event_query_filters_on_partition_keys():
+    statement = await _risk_event_statement(
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 31, tzinfo=timezone.utc),
+    )
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "risk_events.data_type = " in sql
+    assert "risk_events.timestamp >= " in sql
+    assert "risk_events.timestamp <= " in sql
+
+
+def _scanned_relations(plan: dict) -> set:
+    relations = set()
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Relation Name" in node:
+            relations.add(node["Relation Name"])
+        stack.extend(node.get("Plans", []))
+    return relations
+
+
+def _explain_sql(statement) -> str:
+    compiled = statement.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    return f"EXPLAIN (FORMAT JSON) {compiled}"
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="Requires database connection")
+@pytest.mark.asyncio
+async def test_explain_prunes_to_single_month_partition():
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.models import Base
+
+    start = datetime(2025, 1, 5, tzinfo=timezone.utc)
+    end = datetime(2025, 1, 20, tzinfo=timezone.utc)
+    # 服务层实际生成的查询(而非手写语句), 分区键条件变化时本测试随之失败
+    cases = [
+        (await _weather_statement(start, end), "weather_data"),
+        (await _risk_event_statement(start, end), "risk_events"),
+    ]
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(
+                lambda sync_conn: ensure_partitions(
+                    sync_conn,
+                    months_ahead=1,
+                    now=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                )
+            )
+
+            for statement, table in cases:
+                result = await conn.execute(text(_explain_sql(statement)))
+                plan = result.scalar_one()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+
+                assert _scanned_relations(plan[0]["Plan"]) == {
+                    month_partition_name(table, DataType.HISTORICAL.value, start)
+                }
+    finally:
+        await engine.dispose()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.services.policy_portfolio import IntervalTree, PolicyPortfolioIndex, PolicySnapshot
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _snapshot(policy_id: str, start_day: int, end_day: int, **overrides) -> PolicySnapshot:
+    values = dict(
+        id=policy_id,
+        product_id="daily_rainfall",
+        coverage_region="CN-GD",
+        timezone="Asia/Shanghai",
+        coverage_start=BASE + timedelta(days=start_day),
+        coverage_end=BASE + timedelta(days=end_day),
+        coverage_amount=Decimal("1000.00"),
+    )
+    values.update(overrides)
+    return PolicySnapshot(**values)
+
+
+def _row(snapshot: PolicySnapshot, *, is_active: bool = True, updated_day: int = 0):
+    return SimpleNamespace(
+        **snapshot.__dict__,
+        is_active=is_active,
+        updated_at=BASE + timedelta(days=updated_day),
+    )
+
+
+def _session(rows) -> AsyncMock:
+    session = AsyncMock()
+    result = Mock()
+    result.all.return_value = rows
+    session.execute.return_value = result
+    return session
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_interval_tree_matches_brute_force():
+    rng = random.Random(7)
+    snapshots = []
+    for index in range(300):
+        start = rng.randint(0, 365)
+        snapshots.append(_snapshot(f"p{index:03d}", start, start + rng.randint(0, 90)))
+    tree = IntervalTree(snapshots)
+
+    for _ in range(200):
+        a = BASE + timedelta(days=rng.randint(-10, 470), hours=rng.randint(0, 23))
+        b = a + timedelta(days=rng.choice([0, 0, 3, 30]))
+        expected = {
+            s.id for s in snapshots if s.coverage_start <= b and s.coverage_end >= a
+        }
+        assert {s.id for s in tree.overlapping(a, b)} == expected
+
+
+def test_interval_tree_boundaries_are_inclusive():
+    tree = IntervalTree([_snapshot("p1", 10, 20)])
+
+    assert [s.id for s in tree.covering(BASE + timedelta(days=10))] == ["p1"]
+    assert [s.id for s in tree.covering(BASE + timedelta(days=20))] == ["p1"]
+    assert tree.covering(BASE + timedelta(days=20, seconds=1)) == []
+
+
+@pytest.mark.asyncio
+async def test_covering_filters_by_region_and_product():
+    index = PolicyPortfolioIndex()
+    rows = [
+        _row(_snapshot("gd-1", 0, 30)),
+        _row(_snapshot("gd-2", 0, 30, product_id="weekly_wind")),
+        _row(_snapshot("zj-1", 0, 30, coverage_region="CN-ZJ")),
+        _row(_snapshot("gd-3", 40, 60)),
+    ]
+    await index.load(_session(rows))
+
+    at = BASE + timedelta(days=5)
+    assert [p.id for p in index.covering("CN-GD", at)] == ["gd-1", "gd-2"]
+    assert [p.id for p in index.covering("CN-GD", at, product_id="daily_rainfall")] == ["gd-1"]
+    assert [p.id for p in index.overlapping(None, at, at + timedelta(days=50))] == [
+        "gd-1", "gd-2", "gd-3", "zj-1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ensure_fresh_loads_once_then_refreshes_incrementally():
+    clock = _Clock()
+    index = PolicyPortfolioIndex(refresh_interval=30, full_reload_interval=3600, clock=clock)
+    session = _session([_row(_snapshot("p1", 0, 30), updated_day=1)])
+
+    await index.ensure_fresh(session)
+    await index.ensure_fresh(session)
+    assert session.execute.await_count == 1
+
+    clock.now = 31
+    session.execute.return_value.all.return_value = [
+        _row(_snapshot("p1", 0, 30), is_active=False, updated_day=2),
+        _row(_snapshot("p2", 0, 30, coverage_region="CN-ZJ"), updated_day=2),
+    ]
+    await index.ensure_fresh(session)
+
+    assert session.execute.await_count == 2
+    sql = str(session.execute.call_args.args[0])
+    assert "policies.updated_at >=" in sql
+    at = BASE + timedelta(days=5)
+    assert index.covering("CN-GD", at) == []
+    assert [p.id for p in index.covering("CN-ZJ", at)] == ["p2"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_moves_policy_between_groups():
+    index = PolicyPortfolioIndex()
+    await index.load(_session([_row(_snapshot("p1", 0, 30))]))
+
+    changed = await index.refresh(
+        _session([_row(_snapshot("p1", 0, 30, coverage_region="CN-ZJ"), updated_day=1)])
+    )
+
+    at = BASE + timedelta(days=5)
+    assert changed == 1
+    assert index.covering("CN-GD", at) == []
+    assert [p.id for p in index.covering("CN-ZJ", at)] == ["p1"]
+
+
+def test_upsert_and_discard_apply_local_writes():
+    index = PolicyPortfolioIndex()
+    index.upsert(_snapshot("p1", 0, 30))
+    at = BASE + timedelta(days=1)
+
+    assert [p.id for p in index.covering("CN-GD", at)] == ["p1"]
+    index.discard("p1")
+    assert index.covering("CN-GD", at) == []
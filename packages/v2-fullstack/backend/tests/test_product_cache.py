@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import importlib
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import redis
+from pydantic import ValidationError
+
+from app.schemas.shared import AccessMode
+from app.services.product_cache import INVALIDATION_CHANNEL, ProductCache
+from app.services.product_service import ProductService
+
+# app.services 包把同名单例导出为属性, 这里需要的是模块本身
+product_service_module = importlib.import_module("app.services.product_service")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _product_row(version: str = "v1.0.0") -> SimpleNamespace:
+    return SimpleNamespace(
+        id="daily_rainfall",
+        name="Daily Rainfall Protection",
+        type="daily",
+        weather_type="rainfall",
+        description=None,
+        icon=None,
+        risk_rules={
+            "time_window": {"type": "hourly", "size": 4},
+            "thresholds": {"tier1": "50.0", "tier2": "100.0", "tier3": "150.0"},
+            "calculation": {"aggregation": "sum", "operator": ">=", "unit": "mm"},
+            "weather_type": "rainfall",
+        },
+        payout_rules={
+            "frequency_limit": "once_per_day_per_policy",
+            "payout_percentages": {"tier1": "20.0", "tier2": "50.0", "tier3": "100.0"},
+            "total_cap": "100.0",
+        },
+        version=version,
+        is_active=True,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def _session_returning(row) -> AsyncMock:
+    session = AsyncMock()
+    result = Mock()
+    result.scalar_one_or_none.return_value = row
+    session.execute.return_value = result
+    return session
+
+
+def _service(clock=None, redis_client=None) -> ProductService:
+    client = redis_client or Mock(publish=AsyncMock())
+    cache = ProductCache(ttl_seconds=60, clock=clock or _Clock(), redis_factory=lambda: client)
+    return ProductService(cache=cache)
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_hits_database_once_within_ttl():
+    service = _service()
+    session = _session_returning(_product_row())
+
+    first = await service.get_by_id(session, "daily_rainfall", AccessMode.ADMIN_INTERNAL)
+    second = await service.get_by_id(session, "daily_rainfall", AccessMode.ADMIN_INTERNAL)
+
+    assert session.execute.await_count == 1
+    assert first == second
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_mode_pruning_does_not_mutate_cached_product():
+    service = _service()
+    session = _session_returning(_product_row())
+
+    public = await service.get_by_id(session, "daily_rainfall", AccessMode.DEMO_PUBLIC)
+    admin = await service.get_by_id(session, "daily_rainfall", AccessMode.ADMIN_INTERNAL)
+
+    assert public.payout_rules is None
+    assert admin.payout_rules is not None
+    assert session.execute.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_rules_are_immutable():
+    service = _service()
+    session = _session_returning(_product_row())
+
+    product = await service.get_by_id(session, "daily_rainfall", AccessMode.ADMIN_INTERNAL)
+
+    with pytest.raises(ValidationError):
+        product.risk_rules.thresholds.tier1 = 1
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_reloads_after_ttl_expiry():
+    clock = _Clock()
+    service = _service(clock=clock)
+    session = _session_returning(_product_row())
+
+    await service.get_by_id(session, "daily_rainfall")
+    clock.now = 61
+    await service.get_by_id(session, "daily_rainfall")
+
+    assert session.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates_locally_and_broadcasts(monkeypatch):
+    monkeypatch.setattr(product_service_module, "refresh_columns", AsyncMock())
+    client = Mock(publish=AsyncMock())
+    service = _service(redis_client=client)
+    session = _session_returning(_product_row())
+    await service.get_by_id(session, "daily_rainfall")
+
+    session.execute.return_value.scalar_one_or_none.return_value = _product_row("v1.0.1")
+    update = Mock()
+    update.model_dump.return_value = {"version": "v1.0.1"}
+    await service.update(session, "daily_rainfall", update)
+
+    assert service.cache.get("daily_rainfall") is None
+    channel, message = client.publish.await_args.args
+    assert channel == INVALIDATION_CHANNEL
+    assert json.loads(message) == {"product_id": "daily_rainfall", "version": "v1.0.1"}
+
+
+@pytest.mark.asyncio
+async def test_read_racing_an_invalidation_is_not_cached():
+    service = _service()
+    session = _session_returning(_product_row("v1.0.0"))
+    stale_result = session.execute.return_value
+
+    async def _read_then_concurrent_update(*_args, **_kwargs):
+        # 读到旧行后, 并发更新提交并发布失效
+        await service.cache.publish_invalidation("daily_rainfall", "v1.0.1")
+        return stale_result
+
+    session.execute.side_effect = _read_then_concurrent_update
+    first = await service.get_by_id(session, "daily_rainfall")
+    assert first.version == "v1.0.0"
+    assert service.cache.get("daily_rainfall") is None
+
+    session.execute.side_effect = None
+    await service.get_by_id(session, "daily_rainfall")
+    assert service.cache.get("daily_rainfall") is not None  # 失效之后的读取正常回填
+
+
+def test_clear_voids_writes_from_reads_started_before_it():
+    cache = ProductCache(ttl_seconds=60, redis_factory=Mock)
+    product = ProductService(cache=cache)._model_to_schema(_product_row())
+
+    since = cache.mark()
+    cache.clear()
+
+    assert cache.put(product, since=since) is False
+    assert cache.put(product, since=cache.mark()) is True
+
+
+@pytest.mark.asyncio
+async def test_broadcast_failure_still_invalidates_locally():
+    client = Mock(publish=AsyncMock(side_effect=redis.exceptions.ConnectionError("down")))
+    cache = ProductCache(ttl_seconds=60, redis_factory=lambda: client)
+    service = ProductService(cache=cache)
+    cache.put(service._model_to_schema(_product_row()))
+
+    await cache.publish_invalidation("daily_rainfall", "v1.0.0")
+
+    assert cache.get("daily_rainfall") is None
+
+
+def test_handle_message_invalidates_and_ignores_malformed_payloads():
+    cache = ProductCache(ttl_seconds=60, redis_factory=Mock)
+    service = ProductService(cache=cache)
+    cache.put(service._model_to_schema(_product_row()))
+
+    cache.handle_message({"data": "not-json"})
+    assert cache.get("daily_rainfall") is not None
+
+    cache.handle_message({"data": json.dumps({"product_id": "daily_rainfall", "version": "v2"})})
+    assert cache.get("daily_rainfall") is None
+
+
+def test_get_by_version_only_returns_current_version():
+    cache = ProductCache(ttl_seconds=60, redis_factory=Mock)
+    service = ProductService(cache=cache)
+    cache.put(service._model_to_schema(_product_row("v1.0.0")))
+    cache.put(service._model_to_schema(_product_row("v1.0.1")))
+
+    assert cache.get("daily_rainfall", "v1.0.0") is None
+    assert cache.get("daily_rainfall", "v1.0.1").version == "v1.0.1"
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_access_mode, get_session
+from app.api.v1 import claims, policies, products, risk_events
+from app.schemas.shared import AccessMode
+
+from tests.conftest import count_statements
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+_RISK_PARAMS = {
+    "region_code": "CN-GD",
+    "weather_type": "rainfall",
+    "data_type": "historical",
+    "time_range_start": "2025-01-01T00:00:00Z",
+    "time_range_end": "2025-01-02T00:00:00Z",
+}
+
+
+def _build_client(recorder) -> TestClient:
+    app = FastAPI()
+    for module in (risk_events, claims, policies, products):
+        app.include_router(module.router, prefix="/api/v1")
+
+    async def _override_get_session():
+        yield recorder.session
+
+    app.dependency_overrides[get_session] = _override_get_session
+    app.dependency_overrides[get_access_mode] = lambda: AccessMode.ADMIN_INTERNAL
+    return TestClient(app)
+
+
+def _has_raiseload(statement) -> bool:
+    return any(
+        ("lazy", "raise") in (getattr(option, "strategy", None) or ())
+        for option in getattr(statement, "_with_options", ())
+    )
+
+
+@pytest.mark.parametrize(
+    "path, params, expected_status",
+    [
+        ("/api/v1/risk-events/evt-1", None, 404),
+        ("/api/v1/risk-events", _RISK_PARAMS, 200),
+        ("/api/v1/risk-events/page", _RISK_PARAMS, 200),
+        ("/api/v1/claims/clm-1", None, 404),
+        ("/api/v1/claims", None, 200),
+        ("/api/v1/policies/pol-1", None, 404),
+        ("/api/v1/policies", None, 200),
+        ("/api/v1/products/prod-1", None, 404),
+    ],
+)
+def test_read_endpoints_issue_single_statement(query_recorder, path, params, expected_status):
+    client = _build_client(query_recorder)
+
+    response = client.get(path, params=params)
+
+    assert response.status_code == expected_status
+    query_recorder.assert_count(1)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/risk-events/evt-1",
+        "/api/v1/claims/clm-1",
+        "/api/v1/policies/pol-1",
+        "/api/v1/products/prod-1",
+    ],
+)
+def test_entity_reads_disable_relationship_loading(query_recorder, path):
+    client = _build_client(query_recorder)
+
+    client.get(path)
+
+    assert _has_raiseload(query_recorder.statements[0])
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="Requires database connection")
+@pytest.mark.asyncio
+async def test_risk_event_get_by_id_issues_one_sql_statement():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.models import Base, Product, RiskEvent
+    from app.services.risk_service import risk_service
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_maker() as session:
+            session.add(
+                Product(
+                    id="qc-product",
+                    name="qc",
+                    type="daily",
+                    weather_type="rainfall",
+                    risk_rules={},
+                    payout_rules={},
+                    version="v1",
+                )
+            )
+            session.add(
+                RiskEvent(
+                    id="qc-event",
+                    timestamp=datetime.now(timezone.utc),
+                    region_code="CN-GD",
+                    product_id="qc-product",
+                    product_version="v1",
+                    weather_type="rainfall",
+                    tier_level=1,
+                    trigger_value=10,
+                    threshold_value=5,
+                    data_type="historical",
+                )
+            )
+            await session.commit()
+
+        async with session_maker() as session:
+            with count_statements(engine.sync_engine) as statements:
+                event = await risk_service.get_by_id(session, "qc-event")
+            assert event is not None
+            assert len(statements) == 1
+            await session.rollback()
+    finally:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("DELETE FROM risk_events WHERE id = 'qc-event'")
+            await conn.exec_driver_sql("DELETE FROM products WHERE id = 'qc-product'")
+        await engine.dispose()
@@ -7,13 +7,13 @@
 """
 
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 from app.schemas.product import Calculation, RiskRules, Thresholds, TimeWindow
 from app.schemas.shared import DataType, WeatherType
 from app.schemas.weather import WeatherDataPoint
-from app.services.compute.risk_calculator import RiskCalculator
+from app.services.compute.risk_calculator import RiskCalculator, RiskEvent
 
 
 class TestRiskCalculator:
@@ -165,3 +165,103 @@ class TestRiskCalculator:
                 product_version="v1.0.0",
                 region_timezone="Asia/Shanghai",
             )
+
+
+def _rainfall_rules(operator: str = ">=", window_type: str = "hourly", step=None) -> RiskRules:
+    return RiskRules(
+        time_window=TimeWindow(type=window_type, size=4, step=step),
+        thresholds=Thresholds(tier1=Decimal("50"), tier2=Decimal("100"), tier3=Decimal("150")),
+        calculation=Calculation(aggregation="sum", operator=operator, unit="mm"),
+        weather_type=WeatherType.RAINFALL,
+    )
+
+
+def _event(at: datetime, tier: int = 1, value: str = "60", **overrides) -> RiskEvent:
+    values = dict(
+        timestamp=at,
+        region_code="CN-GD",
+        weather_type=WeatherType.RAINFALL,
+        tier_level=tier,
+        trigger_value=Decimal(value),
+        threshold_value=Decimal("50") * tier,
+        product_id="daily_rainfall",
+        product_version="v1.0.0",
+        data_type=DataType.HISTORICAL,
+    )
+    values.update(overrides)
+    return RiskEvent(**values)
+
+
+class TestRiskEpisodeCompaction:
+    """测试连续触发窗口合并"""
+
+    def test_week_of_hourly_windows_becomes_one_episode(self):
+        calculator = RiskCalculator()
+        start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        events = [_event(start + timedelta(hours=i)) for i in range(168)]
+        events[100] = _event(start + timedelta(hours=100), tier=3, value="160")
+
+        episodes = calculator.compact_episodes(events, _rainfall_rules(), "Asia/Shanghai")
+
+        assert len(episodes) == 1
+        episode = episodes[0]
+        assert episode.window_count == 168
+        assert episode.start_at == start
+        assert episode.end_at == start + timedelta(hours=167)
+        assert (episode.peak_tier, episode.peak_value) == (3, Decimal("160"))
+        assert episode.peak_at == start + timedelta(hours=100)
+        assert episode.threshold_value == Decimal("150")
+
+    def test_untriggered_window_splits_episodes(self):
+        calculator = RiskCalculator()
+        start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        hours = [0, 1, 2, 4, 5]
+
+        episodes = calculator.compact_episodes(
+            [_event(start + timedelta(hours=h)) for h in reversed(hours)],
+            _rainfall_rules(),
+            "Asia/Shanghai",
+        )
+
+        assert [(e.start_at.hour, e.end_at.hour, e.window_count) for e in episodes] == [
+            (0, 2, 3),
+            (4, 5, 2),
+        ]
+
+    def test_step_widens_adjacency_and_series_do_not_merge(self):
+        calculator = RiskCalculator()
+        start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        events = [_event(start + timedelta(hours=h)) for h in (0, 3, 6)]
+        events.append(_event(start + timedelta(hours=3), region_code="CN-ZJ"))
+
+        episodes = calculator.compact_episodes(events, _rainfall_rules(step=3), "Asia/Shanghai")
+
+        assert [(e.region_code, e.window_count) for e in episodes] == [("CN-GD", 3), ("CN-ZJ", 1)]
+
+    def test_peak_for_less_than_operator_is_lowest_value(self):
+        calculator = RiskCalculator()
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        events = [
+            _event(start, value="-2"),
+            _event(start + timedelta(hours=1), value="-4"),
+            _event(start + timedelta(hours=2), value="-3"),
+        ]
+
+        episodes = calculator.compact_episodes(events, _rainfall_rules(operator="<="), "Asia/Shanghai")
+
+        assert episodes[0].peak_value == Decimal("-4")
+
+    def test_monthly_adjacency_uses_region_calendar_months(self):
+        calculator = RiskCalculator()
+        # 2025-01-31 16:00Z == 2025-02-01 00:00 Asia/Shanghai
+        events = [
+            _event(datetime(2025, 1, 1, tzinfo=timezone.utc)),
+            _event(datetime(2025, 1, 31, 16, tzinfo=timezone.utc)),
+            _event(datetime(2025, 4, 1, tzinfo=timezone.utc)),
+        ]
+
+        episodes = calculator.compact_episodes(
+            events, _rainfall_rules(window_type="monthly"), "Asia/Shanghai"
+        )
+
+        assert [e.window_count for e in episodes] == [2, 1]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.product import Calculation, RiskRules, Thresholds, TimeWindow
+from app.schemas.shared import DataType, WeatherType
+from app.services.risk_episode_service import RiskEpisodeService
+
+START = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+RULES = RiskRules(
+    time_window=TimeWindow(type="hourly", size=4),
+    thresholds=Thresholds(tier1=Decimal("50"), tier2=Decimal("100"), tier3=Decimal("150")),
+    calculation=Calculation(aggregation="sum", operator=">=", unit="mm"),
+    weather_type=WeatherType.RAINFALL,
+)
+
+
+def _event_row(hour: int) -> SimpleNamespace:
+    at = START + timedelta(hours=hour)
+    return SimpleNamespace(
+        id=f"re-{hour}",
+        timestamp=at,
+        region_code="CN-GD",
+        product_id="daily_rainfall",
+        product_version="v1",
+        weather_type="rainfall",
+        tier_level=1,
+        trigger_value=Decimal("60"),
+        threshold_value=Decimal("50"),
+        data_type="historical",
+        prediction_run_id=None,
+        created_at=at,
+    )
+
+
+def _rebuild_session(bounds, rows) -> AsyncMock:
+    lock, bounds_result, events_result = Mock(), Mock(), Mock()
+    bounds_result.one.return_value = bounds
+    events_result.all.return_value = rows
+    session = AsyncMock()
+    session.execute.side_effect = [lock, bounds_result, events_result, Mock(), Mock()]
+    return session
+
+
+def _compile(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+@pytest.mark.asyncio
+async def test_rebuild_replaces_episodes_from_persisted_events():
+    session = _rebuild_session((None, None), [_event_row(h) for h in (0, 1, 2, 5)])
+
+    count = await RiskEpisodeService().rebuild_historical(
+        session,
+        product_id="daily_rainfall",
+        region_code="CN-GD",
+        risk_rules=RULES,
+        region_timezone="Asia/Shanghai",
+        time_range_start=START,
+        time_range_end=START + timedelta(hours=6),
+    )
+
+    assert count == 2
+    statements = [call.args[0] for call in session.execute.call_args_list]
+    assert "pg_advisory_xact_lock" in str(_compile(statements[0]))
+    # 窗口两侧各扩一个步长, 以拼接相邻任务写入的事件段
+    events_params = _compile(statements[2]).params
+    assert events_params["timestamp_1"] == START - timedelta(hours=1)
+    assert events_params["timestamp_2"] == START + timedelta(hours=7)
+    assert str(_compile(statements[3])).startswith("DELETE FROM risk_event_episodes")
+    insert_params = _compile(statements[4]).params
+    assert insert_params["window_count_m0"] == 3
+    assert insert_params["window_count_m1"] == 1
+    assert insert_params["id_m0"].startswith("rep_")
+
+
+@pytest.mark.asyncio
+async def test_rebuild_widens_span_to_existing_adjacent_episode():
+    existing_start = START - timedelta(days=2)
+    session = _rebuild_session((existing_start, START), [])
+
+    count = await RiskEpisodeService().rebuild_historical(
+        session,
+        product_id="daily_rainfall",
+        region_code="CN-GD",
+        risk_rules=RULES,
+        region_timezone="Asia/Shanghai",
+        time_range_start=START + timedelta(hours=1),
+        time_range_end=START + timedelta(hours=6),
+    )
+
+    assert count == 0
+    statements = [call.args[0] for call in session.execute.call_args_list]
+    assert _compile(statements[2]).params["timestamp_1"] == existing_start
+    assert len(statements) == 4  # 无事件时只删除, 不插入
+
+
+@pytest.mark.asyncio
+async def test_query_episodes_filters_by_overlap():
+    session = AsyncMock()
+    session.execute.return_value.scalars = Mock(return_value=Mock(all=Mock(return_value=[])))
+
+    await RiskEpisodeService().query_episodes(
+        session,
+        region_code="CN-GD",
+        weather_type=WeatherType.RAINFALL,
+        data_type=DataType.HISTORICAL,
+        time_range_start=START,
+        time_range_end=START + timedelta(days=1),
+        limit=10,
+    )
+
+    sql = str(_compile(session.execute.call_args.args[0]))
+    assert "risk_event_episodes.start_at <= %(start_at_1)s" in sql
+    assert "risk_event_episodes.end_at >= %(end_at_1)s" in sql
+    assert "ORDER BY risk_event_episodes.start_at, risk_event_episodes.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_query_episodes_requires_run_for_predicted():
+    with pytest.raises(ValueError, match="prediction_run_id required"):
+        await RiskEpisodeService().query_episodes(
+            AsyncMock(),
+            region_code="CN-GD",
+            weather_type=WeatherType.RAINFALL,
+            data_type=DataType.PREDICTED,
+            time_range_start=START,
+            time_range_end=START + timedelta(days=1),
+        )
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 from app.schemas.shared import DataType, WeatherType
+from app.schemas.time import TimeGranularity
+from app.schemas.risk_event import RiskEventCreate
+from app.services import risk_service as risk_service_module
 from app.services.risk_service import RiskService
+from app.utils.pagination import decode_keyset_cursor, encode_keyset_cursor
 
 
 @pytest.mark.asyncio
@@ -49,7 +56,7 @@ async def test_query_events_executes_select_and_maps_rows():
     session = AsyncMock()
 
     result = Mock()
-    result.scalars.return_value.all.return_value = []
+    result.all.return_value = []
     session.execute.return_value = result
 
     events = await service.query_events(
@@ -64,3 +71,283 @@ async def test_query_events_executes_select_and_maps_rows():
     assert events == []
     session.execute.assert_awaited()
 
+
+
+def _event_row(event_id: str, hour: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=event_id,
+        timestamp=datetime(2025, 1, 1, hour, tzinfo=timezone.utc),
+        region_code="CN-GD",
+        product_id="prod-1",
+        product_version="v1",
+        weather_type="rainfall",
+        tier_level=1,
+        trigger_value=Decimal("60"),
+        threshold_value=Decimal("50"),
+        data_type="historical",
+        prediction_run_id=None,
+        created_at=datetime(2025, 1, 2, tzinfo=timezone.utc),
+    )
+
+
+_PAGE_FILTERS = dict(
+    region_code="CN-GD",
+    weather_type=WeatherType.RAINFALL,
+    data_type=DataType.HISTORICAL,
+    time_range_start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    time_range_end=datetime(2025, 1, 2, tzinfo=timezone.utc),
+)
+
+
+@pytest.mark.asyncio
+async def test_query_events_page_returns_cursor_when_more_rows():
+    service = RiskService()
+    session = AsyncMock()
+    result = Mock()
+    result.all.return_value = [_event_row("re_1", 0), _event_row("re_2", 1), _event_row("re_3", 2)]
+    session.execute.return_value = result
+
+    page = await service.query_events_page(session, page_size=2, **_PAGE_FILTERS)
+
+    assert [e.id for e in page.items] == ["re_1", "re_2"]
+    assert decode_keyset_cursor(page.next_cursor) == (
+        datetime(2025, 1, 1, 1, tzinfo=timezone.utc),
+        "re_2",
+    )
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ORDER BY risk_events.timestamp, risk_events.id" in sql
+    assert "LIMIT" in sql
+
+
+@pytest.mark.asyncio
+async def test_query_events_page_applies_keyset_predicate():
+    service = RiskService()
+    session = AsyncMock()
+    result = Mock()
+    result.all.return_value = [_event_row("re_3", 2)]
+    session.execute.return_value = result
+    cursor = encode_keyset_cursor(datetime(2025, 1, 1, 1, tzinfo=timezone.utc), "re_2")
+
+    page = await service.query_events_page(session, page_size=2, cursor=cursor, **_PAGE_FILTERS)
+
+    assert [e.id for e in page.items] == ["re_3"]
+    assert page.next_cursor is None
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "(risk_events.timestamp, risk_events.id) > (" in sql
+
+
+@pytest.mark.asyncio
+async def test_query_events_page_rejects_bad_cursor_and_page_size():
+    service = RiskService()
+    session = AsyncMock()
+
+    with pytest.raises(ValueError, match="invalid cursor"):
+        await service.query_events_page(session, cursor="bogus", **_PAGE_FILTERS)
+    with pytest.raises(ValueError, match="page_size"):
+        await service.query_events_page(session, page_size=0, **_PAGE_FILTERS)
+    session.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_query_events_pushes_offset_and_limit_to_database():
+    service = RiskService()
+    session = AsyncMock()
+    result = Mock()
+    result.all.return_value = [_event_row("re_9", 3)]
+    session.execute.return_value = result
+
+    events = await service.query_events(session, offset=20, limit=10, **_PAGE_FILTERS)
+
+    assert [e.id for e in events] == ["re_9"]
+    statement = session.execute.call_args.args[0]
+    assert statement._offset_clause is not None
+    assert statement._limit_clause is not None
+
+
+@pytest.mark.asyncio
+async def test_stream_events_yields_rows_from_server_side_cursor():
+    service = RiskService()
+    session = AsyncMock()
+
+    class _Stream:
+        def __init__(self, rows):
+            self._rows = iter(rows)
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            try:
+                return next(self._rows)
+            except StopIteration:
+                raise StopAsyncIteration
+
+    session.stream.return_value = _Stream([_event_row("re_1", 0), _event_row("re_2", 1)])
+
+    events = [e async for e in service.stream_events(session, **_PAGE_FILTERS)]
+
+    assert [e.id for e in events] == ["re_1", "re_2"]
+    statement = session.stream.call_args.args[0]
+    assert statement.get_execution_options()["yield_per"] == 1000
+
+
+def _aggregate_row(**overrides):
+    values = dict(
+        event_count=3,
+        tier1_count=1,
+        tier2_count=1,
+        tier3_count=1,
+        max_tier_level=3,
+        max_trigger_value=Decimal("88.50"),
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.mark.asyncio
+async def test_aggregate_by_bucket_groups_by_local_day_in_one_query():
+    service = RiskService()
+    session = AsyncMock()
+    result = Mock()
+    result.all.return_value = [
+        _aggregate_row(bucket_start=datetime(2024, 12, 31, 16, tzinfo=timezone.utc)),
+    ]
+    session.execute.return_value = result
+
+    buckets = await service.aggregate_by_bucket(
+        session,
+        region_code="CN-GD",
+        weather_type=WeatherType.RAINFALL,
+        data_type=DataType.HISTORICAL,
+        time_range_start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        time_range_end=datetime(2025, 1, 3, tzinfo=timezone.utc),
+        granularity=TimeGranularity.DAY,
+    )
+
+    assert len(buckets) == 1
+    assert buckets[0].bucket_start == datetime(2024, 12, 31, 16, tzinfo=timezone.utc)
+    assert buckets[0].event_count == 3
+    assert buckets[0].tier3_count == 1
+    assert buckets[0].max_trigger_value == Decimal("88.50")
+
+    session.execute.assert_awaited_once()
+    sql = str(session.execute.call_args.args[0].compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"render_postcompile": True},
+    ))
+    bucket_sql = "date_trunc('day', risk_events.timestamp, 'Asia/Shanghai')"
+    assert sql.count(bucket_sql) == 2  # SELECT + GROUP BY 同一表达式
+    assert "count(*) FILTER (WHERE risk_events.tier_level = " in sql
+    assert "risk_events.data_type = " in sql
+
+
+@pytest.mark.asyncio
+async def test_aggregate_by_bucket_enforces_run_binding():
+    service = RiskService()
+    session = AsyncMock()
+
+    with pytest.raises(ValueError, match="prediction_run_id required"):
+        await service.aggregate_by_bucket(
+            session,
+            region_code="CN-GD",
+            weather_type=WeatherType.RAINFALL,
+            data_type=DataType.PREDICTED,
+            time_range_start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            time_range_end=datetime(2025, 1, 3, tzinfo=timezone.utc),
+        )
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_aggregate_by_region_returns_every_requested_region():
+    service = RiskService()
+    session = AsyncMock()
+    result = Mock()
+    result.all.return_value = [_aggregate_row(region_code="CN-ZJ", event_count=2)]
+    session.execute.return_value = result
+
+    summaries = await service.aggregate_by_region(
+        session,
+        region_codes=["CN-GD", "CN-ZJ", "CN-GD"],
+        weather_type=WeatherType.RAINFALL,
+        data_type=DataType.HISTORICAL,
+        time_range_start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        time_range_end=datetime(2025, 1, 31, tzinfo=timezone.utc),
+    )
+
+    assert [s.region_code for s in summaries] == ["CN-GD", "CN-ZJ"]
+    assert summaries[0].event_count == 0
+    assert summaries[0].max_tier_level is None
+    assert summaries[1].event_count == 2
+
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "risk_events.region_code = ANY (" in sql
+    assert "GROUP BY risk_events.region_code" in sql
+
+
+def _event_payload(index: int) -> RiskEventCreate:
+    return RiskEventCreate(
+        id=f"evt-{index:03d}",
+        timestamp=datetime(2025, 1, 1, index, tzinfo=timezone.utc),
+        region_code="CN-GD",
+        product_id="daily_rainfall",
+        product_version="v1.0.0",
+        weather_type=WeatherType.RAINFALL,
+        tier_level=1,
+        trigger_value=Decimal("10.00"),
+        threshold_value=Decimal("5.00"),
+        data_type=DataType.HISTORICAL,
+    )
+
+
+def _returning_result(stmt):
+    result = Mock()
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    ids = [value for key, value in params.items() if key.startswith("id_m") or key == "id"]
+    result.all.return_value = [
+        SimpleNamespace(
+            id=event_id,
+            timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            region_code="CN-GD",
+            product_id="daily_rainfall",
+            product_version="v1.0.0",
+            weather_type="rainfall",
+            tier_level=1,
+            trigger_value=Decimal("10.00"),
+            threshold_value=Decimal("5.00"),
+            data_type="historical",
+            prediction_run_id=None,
+            created_at=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        )
+        for event_id in ids
+    ]
+    return result
+
+
+@pytest.mark.asyncio
+async def test_batch_create_uses_chunked_insert_returning(monkeypatch):
+    monkeypatch.setattr(risk_service_module, "INSERT_CHUNK_SIZE", 2)
+    service = RiskService()
+    session = AsyncMock()
+    session.execute.side_effect = _returning_result
+
+    events = await service.batch_create(session, [_event_payload(i) for i in range(5)])
+
+    assert [event.id for event in events] == [f"evt-{i:03d}" for i in range(5)]
+    assert session.execute.await_count == 3 + 1  # ceil(5 / 2) + 风险日汇总 upsert
+    session.commit.assert_awaited_once()
+    session.refresh.assert_not_called()
+
+    sql = str(session.execute.call_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO risk_events")
+    assert "RETURNING risk_events.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_batch_create_empty_payload_skips_database():
+    service = RiskService()
+    session = AsyncMock()
+
+    assert await service.batch_create(session, []) == []
+    session.execute.assert_not_awaited()
+    session.commit.assert_not_awaited()
@@ -215,6 +215,46 @@ class TestSharedDimensions:
         )
         
         assert dimensions1.to_cache_key() == dimensions2.to_cache_key()
+    
+    def test_cache_key_includes_point_budget(self):
+        """测试指定max_points时缓存key包含点数预算"""
+        dimensions = SharedDimensions(
+            region_scope=RegionScope.PROVINCE,
+            region_code="CN-GD",
+            time_range=TimeRange(
+                start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                end=datetime(2025, 1, 31, tzinfo=timezone.utc)
+            ),
+            data_type=DataType.HISTORICAL,
+            weather_type=WeatherType.RAINFALL,
+            access_mode=AccessMode.DEMO_PUBLIC,
+            max_points=500,
+        )
+        
+        assert dimensions.to_cache_key().endswith("|points:500")
+    
+    def test_cache_key_includes_resolved_timezone(self):
+        """测试时区决定自然日边界, 不同时区不得共用缓存key"""
+        def _dimensions(region_timezone):
+            return SharedDimensions(
+                region_scope=RegionScope.PROVINCE,
+                region_code="CN-GD",
+                time_range=TimeRange(
+                    start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                    end=datetime(2025, 1, 31, tzinfo=timezone.utc)
+                ),
+                data_type=DataType.HISTORICAL,
+                weather_type=WeatherType.RAINFALL,
+                access_mode=AccessMode.DEMO_PUBLIC,
+                region_timezone=region_timezone,
+            )
+        
+        shanghai = _dimensions("Asia/Shanghai").to_cache_key()
+        
+        assert "tz:Asia/Shanghai" in shanghai
+        assert _dimensions("Asia/Urumqi").to_cache_key() != shanghai
+        # 未指定时按区域映射解析, 与显式默认时区共用条目
+        assert _dimensions(None).to_cache_key() == shanghai
 
 
 class TestOutputDTOs:
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_access_mode
+from app.api.v1.internal import data_products as internal_data_products
+from app.schemas.access_control import DataProductType
+from app.schemas.shared import (
+    AccessMode,
+    DataType,
+    RegionScope,
+    SharedDimensions,
+    TimeRange,
+    WeatherType,
+)
+from app.services.data_product_cache import DataProductCache
+from app.services.data_products_service import build_data_product, map_overlays_service
+from app.services.single_flight import (
+    COALESCED_LOCAL,
+    COALESCED_REMOTE,
+    LEADER,
+    LEASE_WAIT_TIMEOUT,
+    SingleFlight,
+)
+
+data_products_module = importlib.import_module("app.services.data_products_service")
+
+
+def _redis(*, acquired: bool = True, lease_exists: bool = True) -> Mock:
+    """redis.asyncio 客户端: lock() 同步返回 Lock, acquire/release/exists 需 await"""
+    client = Mock()
+    client.lock.return_value = Mock(
+        acquire=AsyncMock(return_value=acquired), release=AsyncMock()
+    )
+    client.exists = AsyncMock(return_value=lease_exists)
+    return client
+
+
+async def _miss():
+    return None
+
+
+def _flight(client: Mock) -> SingleFlight:
+    return SingleFlight(
+        "test-flight",
+        lease_seconds=1,
+        poll_interval_seconds=0.01,
+        redis_factory=lambda: client,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_computation():
+    client = _redis()
+    flight = _flight(client)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "built"
+
+    results = await asyncio.gather(
+        *(flight.run("k", compute, lookup=_miss) for _ in range(10))
+    )
+
+    assert calls == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 9
+    assert flight.stats.snapshot()[LEADER] == 1
+    assert flight.stats.snapshot()[COALESCED_LOCAL] == 9
+    client.lock.return_value.release.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_leader_failure_reaches_waiters_and_clears_flight():
+    flight = _flight(_redis())
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def succeeding():
+        return "ok"
+
+    results = await asyncio.gather(
+        flight.run("k", failing, lookup=_miss),
+        flight.run("k", failing, lookup=_miss),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await flight.run("k", succeeding, lookup=_miss) == ("ok", False)
+
+
+@pytest.mark.asyncio
+async def test_waiter_retries_when_leader_is_cancelled():
+    flight = _flight(_redis())
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "fast"
+
+    leader = asyncio.create_task(flight.run("k", slow, lookup=_miss))
+    await started.wait()
+    waiter = asyncio.create_task(flight.run("k", fast, lookup=_miss))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == ("fast", False)
+
+
+@pytest.mark.asyncio
+async def test_waits_for_other_process_when_lease_is_held():
+    flight = _flight(_redis(acquired=False))
+    results = iter([None, None, "remote"])
+
+    async def compute():
+        raise AssertionError("must not build while another process holds the lease")
+
+    async def lookup():
+        return next(results)
+
+    result = await flight.run("k", compute, lookup=lookup)
+
+    assert result == ("remote", True)
+    assert flight.stats.snapshot()[COALESCED_REMOTE] == 1
+
+
+@pytest.mark.asyncio
+async def test_builds_locally_when_lease_released_without_result():
+    flight = _flight(_redis(acquired=False, lease_exists=False))
+
+    async def compute():
+        return "local"
+
+    assert await flight.run("k", compute, lookup=_miss) == ("local", False)
+    assert flight.stats.snapshot()[LEASE_WAIT_TIMEOUT] == 1
+
+
+@pytest.mark.asyncio
+async def test_builds_without_lease_when_redis_is_down():
+    client = Mock()
+    client.lock.side_effect = redis.exceptions.ConnectionError("down")
+    flight = _flight(client)
+
+    async def compute():
+        return "local"
+
+    assert await flight.run("k", compute, lookup=_miss) == ("local", False)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_data_product_requests_build_once(monkeypatch):
+    unreachable = Mock(pipeline=Mock(side_effect=redis.exceptions.ConnectionError("down")))
+    monkeypatch.setattr(
+        data_products_module,
+        "data_product_cache",
+        DataProductCache(redis_factory=lambda: unreachable),
+    )
+    monkeypatch.setattr(data_products_module, "data_product_flight", _flight(_redis()))
+    calls = 0
+
+    async def builder(dimensions):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return map_overlays_service.build_response(dimensions)
+
+    dimensions = SharedDimensions(
+        region_scope=RegionScope.PROVINCE,
+        region_code="CN-GD",
+        time_range=TimeRange(
+            start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            end=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        ),
+        data_type=DataType.HISTORICAL,
+        weather_type=WeatherType.RAINFALL,
+        access_mode=AccessMode.DEMO_PUBLIC,
+    )
+
+    responses = await asyncio.gather(
+        *(build_data_product(DataProductType.L0_DASHBOARD, dimensions, builder) for _ in range(5))
+    )
+
+    assert calls == 1
+    assert [r.meta.cached for r in responses].count(False) == 1
+    assert len({r.meta.trace_context.trace_id for r in responses}) == 5
+
+
+def test_flight_stats_route_is_admin_only():
+    app = FastAPI()
+    app.include_router(internal_data_products.router, prefix="/api/v1")
+    client = TestClient(app)
+
+    app.dependency_overrides[get_access_mode] = lambda: AccessMode.PARTNER
+    assert client.get("/api/v1/internal/data-products/flight-stats").status_code == 403
+
+    app.dependency_overrides[get_access_mode] = lambda: AccessMode.ADMIN_INTERNAL
+    body = client.get("/api/v1/internal/data-products/flight-stats").json()
+    assert set(body) == {LEADER, COALESCED_LOCAL, COALESCED_REMOTE, LEASE_WAIT_TIMEOUT}
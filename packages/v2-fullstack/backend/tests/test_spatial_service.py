@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.shared import DataType, RegionScope, WeatherType
+from app.schemas.spatial import SpatialAggregationRequest
+from app.seeds.seed_h3_cells import build_cell_mappings
+from app.services.spatial_service import SpatialAggregationService
+
+
+def _request(**overrides) -> SpatialAggregationRequest:
+    payload = dict(
+        weather_type=WeatherType.RAINFALL,
+        start_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        end_time=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        data_type=DataType.HISTORICAL,
+    )
+    payload.update(overrides)
+    return SpatialAggregationRequest(**payload)
+
+
+def _session_with_rows(rows):
+    session = AsyncMock()
+    result = Mock()
+    result.all.return_value = rows
+    session.execute.return_value = result
+    return session
+
+
+def _compiled_sql(session) -> str:
+    statement = session.execute.call_args.args[0]
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"render_postcompile": True},
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_aggregate_by_parent_cell_groups_in_database():
+    service = SpatialAggregationService()
+    bucket = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    session = _session_with_rows([("85411c0ffffffff", bucket, 12, 4, 6, 2, 3)])
+
+    buckets = await service.aggregate_by_parent_cell(
+        session, _request(), parent_resolution=5
+    )
+
+    assert len(buckets) == 1
+    assert buckets[0].group_key == "85411c0ffffffff"
+    assert buckets[0].sum == 12
+    assert buckets[0].count == 3
+
+    sql = _compiled_sql(session)
+    assert "JOIN h3_cell_parents ON h3_cell_parents.h3_index = weather_data.h3_index" in sql
+    assert "GROUP BY h3_cell_parents.parent_index, date_trunc('hour'" in sql
+
+
+@pytest.mark.asyncio
+async def test_aggregate_by_region_district_filters_unmapped_cells():
+    service = SpatialAggregationService()
+    session = _session_with_rows([])
+
+    await service.aggregate_by_region(
+        session,
+        _request(province_code="CN-GD"),
+        region_scope=RegionScope.DISTRICT,
+    )
+
+    sql = _compiled_sql(session)
+    assert "GROUP BY h3_cell_regions.district_code" in sql
+    assert "h3_cell_regions.district_code IS NOT NULL" in sql
+    assert "h3_cell_regions.province_code = " in sql
+
+
+@pytest.mark.asyncio
+async def test_aggregate_rejects_invalid_resolution_and_missing_run_id():
+    service = SpatialAggregationService()
+    session = AsyncMock()
+
+    with pytest.raises(ValueError, match="invalid parent_resolution"):
+        await service.aggregate_by_parent_cell(session, _request(), parent_resolution=16)
+
+    with pytest.raises(ValueError, match="prediction_run_id required"):
+        await service.aggregate_by_region(
+            session,
+            _request(data_type=DataType.PREDICTED),
+            region_scope=RegionScope.PROVINCE,
+        )
+    session.execute.assert_not_called()
+
+
+def test_build_cell_mappings_skips_finer_parents_and_duplicates():
+    fake_h3 = Mock()
+    fake_h3.get_resolution.return_value = 6
+    fake_h3.cell_to_parent.side_effect = lambda cell, res: f"{cell}@{res}"
+    fake_h3.cell_to_latlng.return_value = (23.13, 113.26)  # 广州
+
+    region_rows, parent_rows = build_cell_mappings(
+        [("cell-a", "CN-GD"), ("cell-a", "CN-GD"), ("cell-b", "CN-ZJ")],
+        parent_resolutions=(5, 6, 7),
+        h3_module=fake_h3,
+        district_by_cell={"cell-b": "CN-ZJ-HZ"},
+    )
+
+    assert [row["h3_index"] for row in region_rows] == ["cell-a", "cell-b"]
+    assert region_rows[0]["district_code"] is None
+    assert region_rows[1]["district_code"] == "CN-ZJ-HZ"
+    assert (region_rows[0]["tile_x"], region_rows[0]["tile_y"]) == (3336, 1777)
+    assert {(row["h3_index"], row["parent_resolution"]) for row in parent_rows} == {
+        ("cell-a", 5),
+        ("cell-a", 6),
+        ("cell-b", 5),
+        ("cell-b", 6),
+    }
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.schemas.time import TimeGranularity
+from app.utils.sql_buckets import local_bucket_start, next_local_bucket_start
+from app.utils.time_utils import align_to_natural_day_start, align_to_natural_month_start
+
+
+def test_day_bucket_matches_natural_day_alignment():
+    ts = datetime(2025, 1, 20, 17, 30, tzinfo=timezone.utc)  # 北京时间 01-21 01:30
+    bucket = local_bucket_start(ts, TimeGranularity.DAY, "Asia/Shanghai")
+
+    assert bucket == align_to_natural_day_start(ts, "Asia/Shanghai")
+    assert bucket == datetime(2025, 1, 20, 16, tzinfo=timezone.utc)
+
+
+def test_month_bucket_matches_natural_month_alignment():
+    ts = datetime(2025, 1, 31, 18, tzinfo=timezone.utc)  # 北京时间 02-01 02:00
+    bucket = local_bucket_start(ts, TimeGranularity.MONTH, "Asia/Shanghai")
+
+    assert bucket == align_to_natural_month_start(ts, "Asia/Shanghai")
+    assert bucket == datetime(2025, 1, 31, 16, tzinfo=timezone.utc)
+
+
+def test_week_bucket_starts_on_local_monday():
+    ts = datetime(2025, 1, 19, 17, tzinfo=timezone.utc)  # 北京时间 周一 01-20 01:00
+    bucket = local_bucket_start(ts, TimeGranularity.WEEK, "Asia/Shanghai")
+
+    assert bucket == datetime(2025, 1, 19, 16, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "region_timezone, expected_minute",
+    [("Asia/Shanghai", 0), ("Asia/Kolkata", 30)],
+)
+def test_hour_bucket_uses_local_hour(region_timezone, expected_minute):
+    ts = datetime(2025, 1, 1, 5, 45, tzinfo=timezone.utc)
+    bucket = local_bucket_start(ts, TimeGranularity.HOUR, region_timezone)
+
+    assert bucket.minute == expected_minute
+    assert bucket <= ts
+
+
+@pytest.mark.parametrize(
+    "granularity, expected",
+    [
+        (TimeGranularity.DAY, datetime(2025, 1, 21, 16, tzinfo=timezone.utc)),
+        (TimeGranularity.WEEK, datetime(2025, 1, 26, 16, tzinfo=timezone.utc)),
+        (TimeGranularity.MONTH, datetime(2025, 1, 31, 16, tzinfo=timezone.utc)),
+    ],
+)
+def test_next_bucket_start_steps_one_local_bucket(granularity, expected):
+    ts = datetime(2025, 1, 20, 17, 30, tzinfo=timezone.utc)  # 北京时间 01-21 01:30
+    bucket = local_bucket_start(ts, granularity, "Asia/Shanghai")
+
+    assert next_local_bucket_start(bucket, granularity, "Asia/Shanghai") == expected
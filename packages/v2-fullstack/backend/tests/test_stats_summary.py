@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import importlib
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.claim import ClaimUpdate
+from app.schemas.policy import PolicyUpdate
+from app.schemas.shared import AccessMode
+from app.services.claim_service import ClaimService
+from app.services.policy_service import PolicyService
+from app.services.stats_summary import (
+    ClaimFact,
+    PolicyFact,
+    StatsSummaryService,
+    build_rebuild_statements,
+)
+
+claim_service_module = importlib.import_module("app.services.claim_service")
+
+
+def _claim(**overrides) -> SimpleNamespace:
+    values = dict(
+        region_code="CN-GD",
+        product_id="daily_rainfall",
+        triggered_at=datetime(2025, 1, 1, 17, tzinfo=timezone.utc),
+        status="computed",
+        payout_amount=Decimal("100.00"),
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _upsert_params(session: AsyncMock, call_index: int = 0) -> dict:
+    statement = session.execute.call_args_list[call_index].args[0]
+    return statement.compile(dialect=postgresql.dialect()).params
+
+
+def test_claim_fact_key_uses_region_local_day():
+    # 2025-01-01 17:00 UTC == 2025-01-02 01:00 Asia/Shanghai
+    assert ClaimFact.of(_claim()).key == ("CN-GD", "daily_rainfall", date(2025, 1, 2), "computed")
+
+
+def test_policy_fact_key_uses_policy_timezone_coverage_days_and_status():
+    fact = PolicyFact(
+        coverage_region="CN-GD",
+        product_id="daily_rainfall",
+        timezone="Asia/Shanghai",
+        coverage_start=datetime(2025, 1, 1, 16, tzinfo=timezone.utc),
+        coverage_end=datetime(2025, 3, 31, 15, 59, tzinfo=timezone.utc),
+        is_active=False,
+        coverage_amount=Decimal("1000"),
+    )
+    assert fact.key == (
+        "CN-GD", "daily_rainfall", date(2025, 1, 2), date(2025, 3, 31), "inactive"
+    )
+
+
+@pytest.mark.asyncio
+async def test_apply_claim_changes_upserts_increments_in_one_statement():
+    service = StatsSummaryService()
+    session = AsyncMock()
+
+    touched = await service.apply_claim_changes(
+        session,
+        added=[ClaimFact.of(_claim()), ClaimFact.of(_claim(payout_amount=Decimal("50.00")))],
+        removed=[ClaimFact.of(_claim(status="voided"))],
+    )
+
+    assert touched == 2
+    session.execute.assert_awaited_once()
+    sql = _compile(session.execute.call_args.args[0])
+    assert "ON CONFLICT (region_code, product_id, local_date, status) DO UPDATE" in sql
+    assert "claim_count = (claim_daily_summary.claim_count + excluded.claim_count)" in sql
+    params = _upsert_params(session)
+    assert params["claim_count_m0"] == 2 and params["payout_amount_sum_m0"] == Decimal("150.00")
+    assert params["claim_count_m1"] == -1 and params["status_m1"] == "voided"
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_skips_database_when_deltas_cancel_out():
+    service = StatsSummaryService()
+    session = AsyncMock()
+    fact = ClaimFact.of(_claim())
+
+    assert await service.apply_claim_changes(session, added=[fact], removed=[fact]) == 0
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_claim_update_moves_summary_between_statuses(monkeypatch):
+    monkeypatch.setattr(claim_service_module, "refresh_columns", AsyncMock())
+    monkeypatch.setattr(claim_service_module.ClaimService, "_model_to_schema", Mock())
+    model = _claim(id="cl_1")
+    session = AsyncMock()
+    result = Mock()
+    result.scalar_one_or_none.return_value = model
+    session.execute.return_value = result
+
+    await ClaimService().update(session, "cl_1", ClaimUpdate(status="voided"))
+
+    assert session.execute.await_count == 2  # SELECT + 汇总 upsert
+    assert _compile(session.execute.call_args_list[0].args[0]).endswith("FOR UPDATE")
+    params = _upsert_params(session, 1)
+    deltas = {params[f"status_m{i}"]: params[f"claim_count_m{i}"] for i in range(2)}
+    assert deltas == {"computed": -1, "voided": 1}
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_policy_update_and_delete_lock_the_row(monkeypatch):
+    policy_service_module = importlib.import_module("app.services.policy_service")
+    monkeypatch.setattr(policy_service_module, "refresh_columns", AsyncMock())
+    monkeypatch.setattr(policy_service_module.PolicyService, "_model_to_schema", Mock())
+    monkeypatch.setattr(
+        policy_service_module.PolicyService, "_invalidate_data_products", AsyncMock()
+    )
+    monkeypatch.setattr(policy_service_module.PolicyService, "_sync_portfolio", Mock())
+    monkeypatch.setattr(policy_service_module.policy_portfolio, "discard", Mock())
+    model = SimpleNamespace(
+        id="pol_1",
+        coverage_region="CN-GD",
+        product_id="daily_rainfall",
+        timezone="Asia/Shanghai",
+        coverage_start=datetime(2025, 1, 1, 16, tzinfo=timezone.utc),
+        coverage_end=datetime(2025, 3, 31, 16, tzinfo=timezone.utc),
+        is_active=True,
+        coverage_amount=Decimal("1000"),
+        holder_name="A",
+    )
+    session = AsyncMock()
+    result = Mock()
+    result.scalar_one_or_none.return_value = model
+    session.execute.return_value = result
+    service = PolicyService()
+
+    await service.update(session, "pol_1", PolicyUpdate(coverage_amount=Decimal("2000")))
+    await service.delete(session, "pol_1")
+
+    selects = [session.execute.call_args_list[i].args[0] for i in (0, 2)]
+    assert all(_compile(select).endswith("FOR UPDATE") for select in selects)
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_create_counts_only_inserted_rows():
+    session = AsyncMock()
+    insert_result = Mock()
+    insert_result.all.return_value = [_claim()]
+    session.execute.return_value = insert_result
+    payload = Mock(
+        id="cl_1",
+        policy_id="pol_1",
+        product_id="daily_rainfall",
+        risk_event_id="evt_1",
+        region_code="CN-GD",
+        tier_level=1,
+        payout_percentage=Decimal("20"),
+        payout_amount=Decimal("100.00"),
+        currency="CNY",
+        triggered_at=datetime(2025, 1, 1, 17, tzinfo=timezone.utc),
+        period_start=datetime(2025, 1, 1, 16, tzinfo=timezone.utc),
+        period_end=datetime(2025, 1, 2, 16, tzinfo=timezone.utc),
+        status="computed",
+        product_version="v1",
+        rules_hash="hash",
+        source="task",
+    )
+
+    inserted = await ClaimService().batch_create(session, [payload, payload])
+
+    assert inserted == 1
+    assert "RETURNING claims.region_code" in _compile(session.execute.call_args_list[0].args[0])
+    assert "claim_daily_summary" in _compile(session.execute.call_args_list[1].args[0])
+
+
+@pytest.mark.asyncio
+async def test_stats_endpoints_read_summary_tables():
+    session = AsyncMock()
+    result = Mock()
+    result.one.return_value = (3, Decimal("300.00"))
+    session.execute.return_value = result
+
+    claim_stats = await ClaimService().get_stats(
+        session, region_code="CN-GD", access_mode=AccessMode.ADMIN_INTERNAL
+    )
+    policy_stats = await PolicyService().get_stats(session, product_id="daily_rainfall")
+
+    assert claim_stats.claim_count == 3
+    assert claim_stats.payout_amount_sum == Decimal("300.00")
+    assert policy_stats.policy_count == 3
+    assert policy_stats.coverage_amount_sum is None  # Demo/Public 裁剪
+    claim_sql = _compile(session.execute.call_args_list[0].args[0])
+    policy_sql = _compile(session.execute.call_args_list[1].args[0])
+    assert "FROM claim_daily_summary" in claim_sql and "FROM claims" not in claim_sql
+    assert "FROM policy_daily_summary" in policy_sql and "FROM policies" not in policy_sql
+
+
+def test_rebuild_statements_group_by_same_local_day_expression():
+    statements = build_rebuild_statements(["CN-GD", "CN-GD"])
+
+    assert len(statements) == 4  # 2 x DELETE + claims(每区域) + policies
+    claim_sql = str(statements[2].compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"render_postcompile": True},
+    ))
+    local_day = "CAST(timezone('Asia/Shanghai', claims.triggered_at) AS DATE)"
+    assert claim_sql.count(local_day) == 2  # SELECT + GROUP BY
+    policy_sql = str(statements[3].compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"render_postcompile": True},
+    ))
+    assert policy_sql.count("THEN 'active' ELSE 'inactive' END") == 2
+    assert policy_sql.count("CAST(timezone(policies.timezone, policies.coverage_end) AS DATE)") == 2
+
+
+@pytest.mark.asyncio
+async def test_rebuild_locks_summaries_before_reloading():
+    service = StatsSummaryService()
+    session = AsyncMock()
+    regions = Mock()
+    regions.scalars.return_value.all.return_value = ["CN-GD"]
+    session.execute.return_value = regions
+
+    await service.rebuild(session)
+
+    first_sql = str(session.execute.call_args_list[0].args[0])
+    assert first_sql.startswith(
+        "LOCK TABLE claim_daily_summary, policy_daily_summary, risk_event_daily_summary"
+    )
+    # 锁 + 理赔区域 + 理赔/保单重建(4) + 风险区域 + 风险汇总重建(2)
+    assert session.execute.await_count == 2 + 4 + 1 + 2
+    session.commit.assert_not_awaited()
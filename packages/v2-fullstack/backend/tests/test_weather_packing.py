@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.schemas.shared import DataType, WeatherType
+from app.schemas.weather import WeatherQueryRequest
+from app.services.weather_service import WeatherService
+from app.tools.backfill_weather_packed import build_packed_rows
+from app.utils.weather_packing import (
+    group_into_local_days,
+    local_day_slots,
+    pack_values,
+    unpack_values,
+)
+
+
+def test_pack_roundtrip_preserves_values_and_gaps():
+    slots = [Decimal("1.25"), None, Decimal("-3.10"), Decimal("99999999.99")] + [None] * 20
+    packed, validity = pack_values(slots)
+
+    assert len(packed) == 24 * 8
+    assert len(validity) == 3
+    assert unpack_values(packed, validity, 24) == slots
+
+
+def test_unpack_rejects_mismatched_slot_count():
+    packed, validity = pack_values([Decimal("1")] * 24)
+    with pytest.raises(ValueError, match="slot_count"):
+        unpack_values(packed, validity, 23)
+
+
+def test_local_day_slots_follow_region_timezone_and_dst():
+    day_start, slots = local_day_slots(date(2025, 1, 20), "Asia/Shanghai")
+    assert day_start == datetime(2025, 1, 19, 16, tzinfo=timezone.utc)
+    assert slots == 24
+
+    # 美国夏令时切换日只有 23 小时
+    _, dst_slots = local_day_slots(date(2025, 3, 9), "America/New_York")
+    assert dst_slots == 23
+
+
+def test_group_into_local_days_places_points_in_local_slots():
+    base = datetime(2025, 1, 19, 16, tzinfo=timezone.utc)  # 北京 01-20 00:00
+    days = group_into_local_days(
+        [(base, Decimal("1")), (base + timedelta(hours=23), Decimal("2")), (base + timedelta(hours=24), Decimal("3"))],
+        "Asia/Shanghai",
+    )
+
+    assert days[date(2025, 1, 20)][0] == Decimal("1")
+    assert days[date(2025, 1, 20)][23] == Decimal("2")
+    assert days[date(2025, 1, 21)][0] == Decimal("3")
+
+
+def test_group_into_local_days_rejects_non_hour_aligned_points():
+    with pytest.raises(ValueError, match="hour aligned"):
+        group_into_local_days(
+            [(datetime(2025, 1, 1, 0, 30, tzinfo=timezone.utc), Decimal("1"))],
+            "Asia/Shanghai",
+        )
+
+
+def test_build_packed_rows_skips_partial_edge_days():
+    base = datetime(2025, 1, 19, 16, tzinfo=timezone.utc)
+    points = [(base + timedelta(hours=h), Decimal(h)) for h in range(-2, 50)]
+
+    rows = build_packed_rows(
+        region_code="CN-GD",
+        weather_type="rainfall",
+        data_type="historical",
+        prediction_run_id=None,
+        unit="mm",
+        points=points,
+        start=base,
+        end=base + timedelta(hours=25),
+    )
+
+    assert [row["local_date"] for row in rows] == [date(2025, 1, 20), date(2025, 1, 21)]
+    assert all(row["region_timezone"] == "Asia/Shanghai" for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_query_time_series_packed_unpacks_and_clips_window():
+    service = WeatherService()
+    day_start = datetime(2025, 1, 19, 16, tzinfo=timezone.utc)
+    slots = [Decimal(h) for h in range(24)]
+    slots[5] = None
+    values, validity = pack_values(slots)
+
+    row = Mock(
+        region_code="CN-GD",
+        weather_type="rainfall",
+        data_type="historical",
+        prediction_run_id=None,
+        day_start=day_start,
+        slot_count=24,
+        scale=2,
+        unit="mm",
+        packed_values=values,
+        validity=validity,
+    )
+    session = AsyncMock()
+    result = Mock()
+    result.scalars.return_value.all.return_value = [row]
+    session.execute.return_value = result
+
+    request = WeatherQueryRequest(
+        region_code="CN-GD",
+        weather_type=WeatherType.RAINFALL,
+        start_time=day_start + timedelta(hours=3),
+        end_time=day_start + timedelta(hours=7),
+        data_type=DataType.HISTORICAL,
+    )
+
+    points = await service.query_time_series_packed(session, request)
+
+    assert [p.timestamp for p in points] == [
+        day_start + timedelta(hours=h) for h in (3, 4, 6, 7)
+    ]
+    assert [p.value for p in points] == [Decimal(3), Decimal(4), Decimal(6), Decimal(7)]
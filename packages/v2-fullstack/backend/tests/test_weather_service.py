@@ -5,9 +5,15 @@ from unittest.mock import Mock
 from unittest.mock import AsyncMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 from app.schemas.shared import DataType, WeatherType
-from app.schemas.weather import WeatherQueryRequest, WeatherStats
+from app.schemas.time import TimeGranularity
+from app.schemas.weather import (
+    WeatherMultiRegionQueryRequest,
+    WeatherQueryRequest,
+    WeatherStats,
+)
 from app.services.weather_service import WeatherService
 
 
@@ -57,3 +63,155 @@ async def test_query_stats_maps_result_row():
     assert stats.min == 1
     assert stats.count == 4
 
+
+
+class _Row:
+    def __init__(self, **values):
+        self._mapping = values
+        for key, value in values.items():
+            setattr(self, key, value)
+
+
+class _AsyncRows:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def __aiter__(self):
+        self._iter = iter(self._rows)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def _weather_row(region_code: str, hour: int, value: int) -> _Row:
+    return _Row(
+        timestamp=datetime(2025, 1, 1, hour, tzinfo=timezone.utc),
+        region_code=region_code,
+        weather_type="rainfall",
+        value=value,
+        unit="mm",
+        data_type="historical",
+        prediction_run_id=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_time_series_multi_demultiplexes_rows_by_region():
+    service = WeatherService()
+    session = AsyncMock()
+    session.stream.return_value = _AsyncRows(
+        [
+            _weather_row("CN-GD", 0, 1),
+            _weather_row("CN-GD", 1, 2),
+            _weather_row("CN-ZJ", 0, 3),
+        ]
+    )
+
+    request = WeatherMultiRegionQueryRequest(
+        region_codes=["CN-GD", "CN-ZJ", "CN-SH", "CN-GD"],
+        weather_type=WeatherType.RAINFALL,
+        start_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        end_time=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        data_type=DataType.HISTORICAL,
+    )
+
+    series = await service.query_time_series_multi(session, request)
+
+    assert list(series) == ["CN-GD", "CN-ZJ", "CN-SH"]
+    assert [p.value for p in series["CN-GD"]] == [1, 2]
+    assert [p.value for p in series["CN-ZJ"]] == [3]
+    assert series["CN-SH"] == []
+
+    # 单次往返: 一条 ANY(:region_codes) 语句
+    session.stream.assert_awaited_once()
+    sql = str(session.stream.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "weather_data.region_code = ANY (%(region_codes)s::VARCHAR[])" in sql
+    assert "ORDER BY weather_data.region_code, weather_data.timestamp" in sql
+
+
+@pytest.mark.asyncio
+async def test_query_time_series_multi_requires_run_id_for_predicted():
+    service = WeatherService()
+    session = AsyncMock()
+
+    request = WeatherMultiRegionQueryRequest(
+        region_codes=["CN-GD"],
+        weather_type=WeatherType.RAINFALL,
+        start_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        end_time=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        data_type=DataType.PREDICTED,
+        prediction_run_id=None,
+    )
+
+    with pytest.raises(ValueError, match="prediction_run_id required"):
+        await service.query_time_series_multi(session, request)
+    session.stream.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_query_stats_series_groups_by_local_bucket_in_one_query():
+    service = WeatherService()
+    session = AsyncMock()
+
+    request = WeatherQueryRequest(
+        region_code="CN-GD",
+        weather_type=WeatherType.RAINFALL,
+        start_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        end_time=datetime(2025, 1, 3, tzinfo=timezone.utc),
+        data_type=DataType.HISTORICAL,
+        prediction_run_id=None,
+    )
+
+    result = Mock()
+    result.all.return_value = [
+        (datetime(2024, 12, 31, 16, tzinfo=timezone.utc), 10, 5, 8, 2, 2),
+        (datetime(2025, 1, 1, 16, tzinfo=timezone.utc), 3, 3, 3, 3, 1),
+    ]
+    session.execute.return_value = result
+
+    buckets = await service.query_stats_series(
+        session, request, granularity=TimeGranularity.DAY
+    )
+
+    assert [b.bucket_start for b in buckets] == [
+        datetime(2024, 12, 31, 16, tzinfo=timezone.utc),
+        datetime(2025, 1, 1, 16, tzinfo=timezone.utc),
+    ]
+    assert buckets[0].sum == 10
+    assert buckets[0].count == 2
+    assert buckets[1].max == 3
+
+    session.execute.assert_awaited_once()
+    sql = str(session.execute.call_args.args[0].compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"render_postcompile": True},
+    ))
+    bucket_sql = "date_trunc('day', weather_data.timestamp, 'Asia/Shanghai')"
+    assert sql.count(bucket_sql) == 2  # SELECT + GROUP BY 同一表达式
+    assert "GROUP BY" in sql
+
+
+@pytest.mark.asyncio
+async def test_query_stats_series_rejects_invalid_timezone():
+    service = WeatherService()
+    session = AsyncMock()
+
+    request = WeatherQueryRequest(
+        region_code="CN-GD",
+        weather_type=WeatherType.RAINFALL,
+        start_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        end_time=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        data_type=DataType.HISTORICAL,
+    )
+
+    with pytest.raises(ValueError, match="invalid region_timezone"):
+        await service.query_stats_series(
+            session,
+            request,
+            granularity=TimeGranularity.DAY,
+            region_timezone="Mars/Olympus",
+        )
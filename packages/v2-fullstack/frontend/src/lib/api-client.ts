@@ -16,6 +16,8 @@
 import type { 
   SharedDimensions, 
   DataProductResponse,
+  DataProductBatchItem,
+  DataProductBatchResponse,
   TraceContext 
 } from '@/types';
 
@@ -59,13 +61,20 @@ function generateTraceId(): string {
   return `trace-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`;
 }
 
+/** 条件请求缓存上限(按 method + endpoint + body) */
+const MAX_ETAG_ENTRIES = 50;
+
 /**
  * API Client
+ * 
+ * 条件请求: 响应带 ETag 时记住响应体, 下次同一请求带 If-None-Match;
+ * 304 时直接返回已有响应体(POST 的数据产品请求浏览器不会自动处理)
  */
 export class ApiClient {
   private baseURL: string;
   private timeout: number;
   private defaultHeaders: Record<string, string>;
+  private etagCache = new Map<string, { etag: string; body: unknown }>();
   
   constructor(config: ApiClientConfig = {}) {
     this.baseURL = config.baseURL || API_BASE_URL;
@@ -89,10 +98,13 @@ export class ApiClient {
     const traceId = trace_context?.trace_id || generateTraceId();
     
     const url = `${this.baseURL}${endpoint}`;
+    const etagKey = `${fetchOptions.method ?? 'GET'} ${endpoint} ${fetchOptions.body ?? ''}`;
+    const known = this.etagCache.get(etagKey);
     const headers = {
       ...this.defaultHeaders,
       ...fetchOptions.headers,
       'X-Trace-ID': traceId,
+      ...(known ? { 'If-None-Match': known.etag } : {}),
     };
     
     try {
@@ -107,6 +119,10 @@ export class ApiClient {
       
       clearTimeout(timeoutId);
       
+      if (response.status === 304 && known) {
+        return known.body as T;
+      }
+      
       if (!response.ok) {
         const errorData = await response.json().catch(() => ({}));
         throw new ApiError(
@@ -116,7 +132,12 @@ export class ApiClient {
         );
       }
       
-      return await response.json();
+      const body = await response.json();
+      const etag = response.headers.get('ETag');
+      if (etag) {
+        this.rememberEtag(etagKey, etag, body);
+      }
+      return body;
     } catch (error) {
       if (error instanceof ApiError) {
         throw error;
@@ -133,6 +154,20 @@ export class ApiClient {
     }
   }
   
+  /**
+   * 记住带 ETag 的响应(超过上限时淘汰最早的条目)
+   */
+  private rememberEtag(key: string, etag: string, body: unknown): void {
+    this.etagCache.delete(key);
+    this.etagCache.set(key, { etag, body });
+    if (this.etagCache.size > MAX_ETAG_ENTRIES) {
+      const oldest = this.etagCache.keys().next().value;
+      if (oldest !== undefined) {
+        this.etagCache.delete(oldest);
+      }
+    }
+  }
+  
   /**
    * GET请求
    */
@@ -228,6 +263,20 @@ export const dataProductAPI = {
       options
     );
   },
+  
+  /**
+   * 批量获取数据产品(结果按items顺序返回, 单项失败见status_code/error)
+   */
+  getBatch: (
+    items: DataProductBatchItem[],
+    options?: RequestOptions
+  ) => {
+    return apiClient.post<DataProductBatchResponse>(
+      '/data-products/batch',
+      { items },
+      options
+    );
+  },
 };
 
 /**
@@ -230,6 +230,21 @@ export function getRelativeTime(utcTime: string): string {
 // 快捷时间范围
 // ============================================================================
 
+/**
+ * 最近N天: 终点为下一个UTC零点
+ * 
+ * 缓存key含精确起止时间, 同一天内的请求必须得到相同区间;
+ * 后端 app/services/cache_warming.py 按同一口径预热 7/30/90 天
+ */
+function lastUTCDays(days: number, regionTimezone?: string): TimeRangeUTC {
+  const now = new Date();
+  const end = new Date(
+    Date.UTC(now.getUTCFullYear(), now.getUTCMonth(), now.getUTCDate() + 1)
+  );
+  const start = new Date(end.getTime() - days * 24 * 60 * 60 * 1000);
+  return createTimeRange(start, end, regionTimezone);
+}
+
 /**
  * 创建预设时间范围
  */
@@ -237,20 +252,20 @@ export const TimeRangePresets = {
   /**
    * 最近7天
    */
-  last7Days: (regionTimezone?: string): TimeRangeUTC => {
-    const end = new Date();
-    const start = new Date(end.getTime() - 7 * 24 * 60 * 60 * 1000);
-    return createTimeRange(start, end, regionTimezone);
-  },
+  last7Days: (regionTimezone?: string): TimeRangeUTC =>
+    lastUTCDays(7, regionTimezone),
   
   /**
    * 最近30天
    */
-  last30Days: (regionTimezone?: string): TimeRangeUTC => {
-    const end = new Date();
-    const start = new Date(end.getTime() - 30 * 24 * 60 * 60 * 1000);
-    return createTimeRange(start, end, regionTimezone);
-  },
+  last30Days: (regionTimezone?: string): TimeRangeUTC =>
+    lastUTCDays(30, regionTimezone),
+  
+  /**
+   * 最近90天
+   */
+  last90Days: (regionTimezone?: string): TimeRangeUTC =>
+    lastUTCDays(90, regionTimezone),
   
   /**
    * 本月
@@ -21,6 +21,7 @@ import type {
   WeatherType,
   TimeRangeUTC,
 } from '@/types';
+import { TimeRangePresets } from '@/lib/time-utils';
 
 /**
  * Access State类型
@@ -51,17 +52,11 @@ interface AccessState {
 }
 
 /**
- * 默认时间范围: 最近7天
+ * 默认时间范围: 最近7天(UTC日对齐的标准预设, 后端已预热)
  */
 function getDefaultTimeRange(): TimeRangeUTC {
-  const end = new Date();
-  const start = new Date();
-  start.setDate(start.getDate() - 7);
-  
-  return {
-    start: start.toISOString(),
-    end: end.toISOString(),
-  };
+  const { start, end } = TimeRangePresets.last7Days();
+  return { start, end };
 }
 
 /**
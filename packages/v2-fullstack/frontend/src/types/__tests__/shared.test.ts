@@ -170,6 +170,20 @@ describe('SharedDimensions', () => {
       expect(cacheKey).toContain('run:run-2025-01-20-001');
     });
 
+    it('should include max_points in cache key when set', () => {
+      const dimensions: SharedDimensions = {
+        region_scope: RegionScope.PROVINCE,
+        region_code: 'CN-GD',
+        time_range: baseTimeRange,
+        data_type: DataType.HISTORICAL,
+        weather_type: WeatherType.RAINFALL,
+        access_mode: AccessMode.DEMO_PUBLIC,
+        max_points: 500,
+      };
+
+      expect(toCacheKey(dimensions)).toContain('points:500');
+    });
+
     it('should generate consistent cache keys for identical dimensions', () => {
       const dimensions1: SharedDimensions = {
         region_scope: RegionScope.PROVINCE,
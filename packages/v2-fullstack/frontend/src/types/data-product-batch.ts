@@ -0,0 +1,57 @@
+/**
+ * Data Product Batch Types
+ * 
+ * 一次请求获取多个数据产品(L0/Overlays/L1), 减少 HTTP 往返
+ * 
+ * 硬规则:
+ * - 每一项独立走数据产品管线(缓存 + Mode 裁剪), 各自的 access_mode 独立生效
+ * - 结果与请求顺序一一对应; 单项失败不影响其他项(status_code/error 逐项给出)
+ * 
+ * CRITICAL: 必须与 backend/app/schemas/data_product_batch.py 保持完全一致
+ */
+
+import type { DataProductType } from './access-control';
+import type { DataProductResponse, SharedDimensions } from './shared';
+
+/** 单次批量请求最多项数 */
+export const MAX_BATCH_ITEMS = 10;
+
+/**
+ * 批量请求中的一项
+ */
+export interface DataProductBatchItem {
+  /** 数据产品类型 */
+  data_product: DataProductType;
+  /** 该项的共享维度 */
+  dimensions: SharedDimensions;
+}
+
+/**
+ * 批量数据产品请求
+ */
+export interface DataProductBatchRequest {
+  /** 请求项(1~MAX_BATCH_ITEMS), 结果按相同顺序返回 */
+  items: DataProductBatchItem[];
+}
+
+/**
+ * 批量结果中的一项
+ */
+export interface DataProductBatchResult {
+  /** 数据产品类型 */
+  data_product: DataProductType;
+  /** 该项的 HTTP 语义状态码(200/400/500) */
+  status_code: number;
+  /** 成功时的数据产品响应 */
+  data?: DataProductResponse | null;
+  /** 失败原因 */
+  error?: string | null;
+}
+
+/**
+ * 批量数据产品响应
+ */
+export interface DataProductBatchResponse {
+  /** 与请求项顺序一致的结果 */
+  results: DataProductBatchResult[];
+}
@@ -9,3 +9,4 @@ export * from './shared';
 export * from './access-control';
 export * from './prediction';
 export * from './time';
+export * from './data-product-batch';
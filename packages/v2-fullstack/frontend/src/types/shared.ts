@@ -109,6 +109,8 @@ export interface SharedDimensions {
   prediction_run_id?: string;
   /** 区域时区(如Asia/Shanghai,用于业务边界对齐) */
   region_timezone?: string;
+  /** 时间序列点数预算(超出时服务端降采样; 一旦使用必须入缓存key) */
+  max_points?: number;
 }
 
 /**
@@ -135,6 +137,10 @@ export function toCacheKey(dimensions: SharedDimensions): string {
     parts.push(`run:${dimensions.prediction_run_id}`);
   }
   
+  if (dimensions.max_points) {
+    parts.push(`points:${dimensions.max_points}`);
+  }
+  
   return parts.join('|');
 }
 
@@ -211,6 +217,12 @@ export interface AggregationData {
   unit?: string;
   /** 展示标签(可选) */
   label?: string;
+  /** 指标名(如claim_amount_total), Mode裁剪按指标名生效 */
+  metric?: string | null;
+  /** 聚合维度取值(如aggregation_key=region_code时的区域代码) */
+  dimension_value?: string | null;
+  /** TopN排名(从1开始) */
+  rank?: number | null;
 }
 
 /**
@@ -312,6 +324,8 @@ export interface ResponseMeta {
   cached: boolean;
   /** 缓存key(用于排障) */
   cache_key?: string;
+  /** 返回过期缓存(后台重建中)时的数据年龄(秒) */
+  stale_age_seconds?: number | null;
   /** 警告信息(如数据不完整、降级处理等) */
   warnings?: string[];
   /** 响应时间(UTC, ISO 8601 format) */
@@ -356,6 +370,11 @@ export function validateSharedDimensions(dimensions: SharedDimensions): {
     errors.push('region_code length must be between 2 and 20');
   }
   
+  // 验证max_points
+  if (dimensions.max_points !== undefined && (dimensions.max_points < 10 || dimensions.max_points > 20000)) {
+    errors.push('max_points must be between 10 and 20000');
+  }
+  
   return {
     valid: errors.length === 0,
     errors,